@@ -9,9 +9,6 @@ from __future__ import unicode_literals
 from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
-from future import standard_library
-
-standard_library.install_aliases()
 
 __title__ = 'hpOneView'
 __version__ = '4.8.0'
@@ -47,6 +44,12 @@ import warnings
 PYTHON_VERSION = sys.version_info[:3]
 PY2 = (PYTHON_VERSION[0] == 2)
 if PY2:
+    # The package is imported before any of its modules, so the Python 3 names of the standard library modules
+    # (http.client, urllib.parse...) are available to all of them. Python 3 does not need the future shims
+    from future import standard_library
+
+    standard_library.install_aliases()
+
     if PYTHON_VERSION < (2, 7, 9):
         warning_message = 'Running unsupported Python version: %s, unexpected errors might occur.'
         warning_message += ' Use of Python v2.7.9+ is advised.'
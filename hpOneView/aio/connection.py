@@ -0,0 +1,592 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+connection.py
+~~~~~~~~~~~~~~
+
+This module maintains asynchronous communication with the appliance, using asyncio streams.
+
+Requires Python 3.5 or later.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+import errno
+import json
+import logging
+import socket
+import time
+import traceback
+
+from collections import deque
+from hpOneView.connection import connection, uri, get_members, make_eula_dict, make_initial_password_change_dict
+from hpOneView.connection import ConnectionPool
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.instrumentation import NULL_REQUEST_EVENT, RequestEvent
+from hpOneView.json_backend import RawBody
+
+logger = logging.getLogger(__name__)
+
+HTTPS_PORT = 443
+CHUNK_SIZE = 65536
+MSG_PROXY_TUNNEL_FAILED = 'Proxy tunnel to %s failed with status %s'
+MSG_PROXY_NOT_SUPPORTED = 'Connecting through a proxy requires Python 3.11 or later'
+MSG_MULTIPART_NOT_SUPPORTED = 'Multipart uploads are not supported by the asyncio connection'
+MSG_NOT_SUPPORTED = '%s is not supported by the asyncio connection'
+
+
+class AsyncResponse(object):
+    """
+    Status line and headers of an HTTP response read by AsyncConnection.
+    """
+
+    def __init__(self, status, reason, headers):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+
+class AsyncConnectionPool(object):
+    """
+    Pool of keep-alive asyncio stream connections to a single appliance.
+
+    It follows the limits of ConnectionPool. It is meant to be used from a single event loop, so no locking is done.
+
+    Args:
+        factory: Coroutine function opening a new (reader, writer) stream pair.
+        max_size: Maximum number of idle connections kept open. Zero disables the pool.
+        idle_timeout: Seconds an idle connection is kept before being closed. None keeps it until the server drops it.
+    """
+
+    def __init__(self, factory, max_size=ConnectionPool.DEFAULT_MAX_SIZE,
+                 idle_timeout=ConnectionPool.DEFAULT_IDLE_TIMEOUT):
+        self._factory = factory
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._idle = deque()
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def idle_timeout(self):
+        return self._idle_timeout
+
+    def configure(self, max_size=None, idle_timeout=None):
+        if max_size is not None:
+            self._max_size = max_size
+        if idle_timeout is not None:
+            self._idle_timeout = idle_timeout
+        self.evict_idle()
+
+    async def acquire(self):
+        """
+        Gets a healthy idle connection, or opens a new one when the pool is empty.
+
+        Returns:
+            tuple: StreamReader, StreamWriter and whether the connection was reused.
+        """
+        while self._idle:
+            reader, writer, released_at = self._idle.pop()
+            if self._is_usable(reader, writer, released_at):
+                return reader, writer, True
+            writer.close()
+
+        reader, writer = await self._factory()
+        return reader, writer, False
+
+    def release(self, reader, writer, reusable=True):
+        if reusable and len(self._idle) < self._max_size:
+            self._idle.append((reader, writer, time.time()))
+        else:
+            writer.close()
+        self.evict_idle()
+
+    def evict_idle(self):
+        while len(self._idle) > self._max_size:
+            self._idle.popleft()[1].close()
+        if self._idle_timeout is not None:
+            oldest_allowed = time.time() - self._idle_timeout
+            while self._idle and self._idle[0][2] < oldest_allowed:
+                self._idle.popleft()[1].close()
+
+    def clear(self):
+        while self._idle:
+            self._idle.pop()[1].close()
+
+    def __len__(self):
+        return len(self._idle)
+
+    def _is_usable(self, reader, writer, released_at):
+        if self._idle_timeout is not None and released_at + self._idle_timeout < time.time():
+            return False
+        return not reader.at_eof() and not writer.is_closing()
+
+
+class AsyncConnection(connection):
+    """
+    Asynchronous counterpart of connection. The requests are coroutines driven by the running event loop, so a single
+    thread can keep many requests in flight, to one or many appliances.
+
+    The configuration methods (proxy, trusted SSL bundle, connection pool, pagination, compression, retry policy, hooks
+    and eTag validation) are the same as in connection. The features of connection that the asyncio requests do not
+    implement (response cache, rate limiter, inventory snapshots, range downloads and multipart uploads) raise
+    HPOneViewException instead of being silently ignored.
+    """
+
+    def __init__(self, applianceIp, api_version=300, sslBundle=False, timeout=None,
+                 pool_size=ConnectionPool.DEFAULT_MAX_SIZE, pool_idle_timeout=ConnectionPool.DEFAULT_IDLE_TIMEOUT):
+        super(AsyncConnection, self).__init__(applianceIp, api_version, sslBundle, timeout, pool_size,
+                                              pool_idle_timeout)
+        self._pool = AsyncConnectionPool(self.open_connection, pool_size, pool_idle_timeout)
+
+    async def validateVersion(self):
+        version = await self.get(uri['version'])
+        if 'minimumVersion' in version:
+            if self._apiVersion < version['minimumVersion']:
+                raise HPOneViewException('Unsupported API Version')
+        if 'currentVersion' in version:
+            if self._apiVersion > version['currentVersion']:
+                raise HPOneViewException('Unsupported API Version')
+        self._validateVersion = True
+
+    async def get_by_uri(self, xuri):
+        return await self.get(xuri)
+
+    async def open_connection(self):
+        """
+        Opens a new TLS stream connection to the appliance, through the proxy tunnel when configured.
+
+        Returns:
+            tuple: StreamReader and StreamWriter.
+        """
+        host, port = self.__get_host_and_port()
+        context = self.get_ssl_context()
+
+        if self._doProxy is False:
+            return await asyncio.open_connection(host, port, ssl=context, server_hostname=host)
+
+        reader, writer = await asyncio.open_connection(self._proxyHost, self._proxyPort)
+        if not hasattr(writer, 'start_tls'):
+            writer.close()
+            raise HPOneViewException(MSG_PROXY_NOT_SUPPORTED)
+
+        target = '{0}:{1}'.format(host, port)
+        writer.write('CONNECT {0} HTTP/1.1\r\nHost: {0}\r\n\r\n'.format(target).encode('ascii'))
+        await writer.drain()
+
+        response = await self.__read_response_head(reader)
+        if response.status != 200:
+            writer.close()
+            raise HPOneViewException(MSG_PROXY_TUNNEL_FAILED % (target, response.status))
+
+        await writer.start_tls(context, server_hostname=host)
+        return reader, writer
+
+    async def do_http(self, method, path, body, custom_headers=None, raw=False):
+        http_headers = self._get_request_headers(custom_headers)
+
+        if not self._hooks:
+            return await self.__do_http(method, path, body, http_headers, NULL_REQUEST_EVENT, raw)
+
+        hooks = self._hooks
+        event = RequestEvent(method, path, len(body or ''))
+        for hook in hooks:
+            hook.before_request(event)
+
+        error = None
+        try:
+            return await self.__do_http(method, path, body, http_headers, event, raw)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            event.finish(error)
+            for hook in hooks:
+                hook.after_request(event)
+
+    async def __do_http(self, method, path, body, http_headers, event, raw):
+        resp, tempbytes = await self.__request(method, path, body, http_headers, event=event)
+        event.body_received(len(tempbytes))
+        if self._compression is not None:
+            tempbytes = self._compression.decode(resp, tempbytes)
+
+        if raw and resp.status < 400:
+            return resp, RawBody(tempbytes)
+
+        try:
+            body = event.decode_json(tempbytes) if tempbytes else ''
+        except ValueError:
+            try:
+                body = tempbytes.decode('utf-8')
+            except UnicodeDecodeError:  # Might be binary data
+                return resp, tempbytes
+
+        return resp, body
+
+    async def download_to_stream(self, stream_writer, url, body='', method='GET', custom_headers=None):
+        http_headers = self._get_request_headers(custom_headers)
+
+        resp, tempbytes = await self.__request(method, url, body, http_headers, stream_writer=stream_writer)
+
+        if resp.status >= 400:
+            if self._compression is not None:
+                tempbytes = self._compression.decode(resp, tempbytes)
+            self.__raise_download_error(resp, tempbytes)
+
+        return True
+
+    def enable_response_cache(self, *args, **kwargs):
+        raise HPOneViewException(MSG_NOT_SUPPORTED % 'The response cache')
+
+    def enable_rate_limiter(self, *args, **kwargs):
+        raise HPOneViewException(MSG_NOT_SUPPORTED % 'The rate limiter')
+
+    def add_inventory_snapshot(self, snapshot):
+        raise HPOneViewException(MSG_NOT_SUPPORTED % 'The inventory snapshot')
+
+    def download_range(self, stream_writer, url, start, end):
+        raise HPOneViewException(MSG_NOT_SUPPORTED % 'The range download')
+
+    def post_multipart_with_response_handling(self, uri, file_path, baseName, progress=None):
+        raise HPOneViewException(MSG_MULTIPART_NOT_SUPPORTED)
+
+    def post_multipart(self, uri, fields, files, baseName, verbose=False, progress=None):
+        raise HPOneViewException(MSG_MULTIPART_NOT_SUPPORTED)
+
+    async def __request(self, method, path, body, http_headers, stream_writer=None, event=NULL_REQUEST_EVENT):
+        attempts = self._retry_policy.start(method, http_headers, body)
+        while True:
+            progress = dict(response_started=False)
+            writer = None
+            try:
+                reader, writer, reused = await self._pool.acquire()
+                resp, data, reusable = await asyncio.wait_for(
+                    self.__exchange(reader, writer, method, path, body, http_headers, stream_writer, progress, event),
+                    self._timeout)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, OSError) as e:
+                if writer is not None:
+                    writer.close()
+                error = self.__get_connection_error(e)
+                if writer is not None and reused and not progress['response_started'] and \
+                        isinstance(error, ConnectionError):
+                    # The appliance dropped the idle keep-alive connection, try again on a new one
+                    logger.debug('Keep-alive connection closed by the appliance. Trying again...')
+                    continue
+                # Trying again would write the start of the content twice once a part of it was streamed
+                delay = None if stream_writer is not None and progress['response_started'] else \
+                    attempts.get_error_delay(error)
+                if delay is None:
+                    if error is e:
+                        raise
+                    raise error from e
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                if writer is not None:
+                    writer.close()
+                raise
+
+            self._pool.release(reader, writer, reusable)
+            delay = attempts.get_response_delay(resp) if stream_writer is None else None
+            if delay is None:
+                return resp, data
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def __get_connection_error(error):
+        # The same errors as the sync requests, with an errno, so the retry policy and the task monitors can tell
+        # the transient failures
+        if isinstance(error, asyncio.IncompleteReadError):
+            return ConnectionResetError(errno.ECONNRESET, 'Connection closed by the appliance')
+        if isinstance(error, asyncio.TimeoutError) and not isinstance(error, socket.timeout):
+            return socket.timeout('The request timed out')
+        return error
+
+    async def __exchange(self, reader, writer, method, path, body, http_headers, stream_writer, progress, event):
+        if body is None:
+            data = b''
+        elif isinstance(body, bytes):
+            data = body
+        else:
+            data = body.encode('utf-8')
+
+        lines = ['{0} {1} HTTP/1.1'.format(method, path), 'Host: {0}'.format(self._host)]
+        lines += ['{0}: {1}'.format(name, value) for name, value in http_headers.items()]
+        lines.append('Content-Length: {0}'.format(len(data)))
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8') + data)
+        await writer.drain()
+        event.request_sent()
+
+        resp = await self.__read_response_head(reader)
+        progress['response_started'] = True
+        event.response_received(resp)
+
+        if stream_writer is not None and resp.status < 400:
+            if self._compression is None:
+                reusable = await self.__read_body(reader, resp, method, stream_writer.write)
+            else:
+                decoding_writer = self._compression.get_writer(resp, stream_writer.write)
+                reusable = await self.__read_body(reader, resp, method, decoding_writer.write)
+                decoding_writer.close()
+            return resp, b'', reusable
+
+        chunks = []
+        reusable = await self.__read_body(reader, resp, method, chunks.append)
+        return resp, b''.join(chunks), reusable
+
+    async def __read_response_head(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(status_line, None)
+
+        version, status, reason = (status_line.decode('iso-8859-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('iso-8859-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        return AsyncResponse(int(status), reason, headers)
+
+    async def __read_body(self, reader, resp, method, write):
+        """
+        Reads the response body, passing each chunk to write.
+
+        Returns:
+            bool: Whether the connection can be reused for another request.
+        """
+        keep_alive = resp.getheader('connection', '').lower() != 'close'
+
+        if method == 'HEAD' or resp.status in (204, 304) or 100 <= resp.status < 200:
+            return keep_alive
+
+        if resp.getheader('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    # Skip the trailer headers
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return keep_alive
+                await self.__read_exactly(reader, size, write)
+                await reader.readexactly(2)
+
+        content_length = resp.getheader('content-length')
+        if content_length is not None:
+            await self.__read_exactly(reader, int(content_length), write)
+            return keep_alive
+
+        # The body is delimited by the end of the connection
+        while True:
+            chunk = await reader.read(CHUNK_SIZE)
+            if not chunk:
+                return False
+            write(chunk)
+
+    async def __read_exactly(self, reader, size, write):
+        while size > 0:
+            chunk = await reader.readexactly(min(size, CHUNK_SIZE))
+            write(chunk)
+            size -= len(chunk)
+
+    def __get_host_and_port(self):
+        host, _, port = self._host.rpartition(':')
+        if host and port.isdigit() and ']' not in port:
+            return host.strip('[]'), int(port)
+        return self._host.strip('[]'), HTTPS_PORT
+
+    def __raise_download_error(self, resp, tempbytes):
+        try:
+            body = tempbytes.decode('utf-8')
+            try:
+                body = json.loads(body)
+            except ValueError:
+                pass
+        except UnicodeDecodeError:  # Might be binary data
+            body = tempbytes
+        if not body:
+            body = "Error " + str(resp.status)
+
+        raise HPOneViewException(body)
+
+    ###########################################################################
+    # Utility functions for making requests - the HTTP verbs
+    ###########################################################################
+    async def get(self, uri, raw=False):
+        resp, body = await self.do_http('GET', uri, '', raw=raw)
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+        if resp.status == 302:
+            body = await self.get(resp.getheader('Location'), raw=raw)
+        if type(body) is dict:
+            if 'nextPageUri' in body:
+                self._nextPage = body['nextPageUri']
+            if 'prevPageUri' in body:
+                self._prevPage = body['prevPageUri']
+            if 'total' in body:
+                self._numTotalRecords = body['total']
+            if 'count' in body:
+                self._numDisplayedRecords = body['count']
+        return body
+
+    async def getNextPage(self):
+        body = await self.get(self._nextPage)
+        return get_members(body)
+
+    async def getPrevPage(self):
+        body = await self.get(self._prevPage)
+        return get_members(body)
+
+    async def getLastPage(self):
+        while self._nextPage is not None:
+            members = await self.getNextPage()
+        return members
+
+    async def getFirstPage(self):
+        while self._prevPage is not None:
+            members = await self.getPrevPage()
+        return members
+
+    async def delete(self, uri, custom_headers=None):
+        return await self.__do_rest_call('DELETE', uri, {}, custom_headers=custom_headers)
+
+    async def put(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('PUT', uri, body, custom_headers=custom_headers)
+
+    async def post(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('POST', uri, body, custom_headers=custom_headers)
+
+    async def patch(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('PATCH', uri, body, custom_headers=custom_headers)
+
+    def __body_content_is_task(self, body):
+        return isinstance(body, dict) and 'category' in body and body['category'] == 'tasks'
+
+    async def __get_task_from_response(self, response, body):
+        location = response.getheader('Location')
+        if location:
+            task = await self.get(location)
+        elif 'taskState' in body:
+            # This check is needed to handle a status response 202 without the location header,
+            # as is for PowerDevices. We are not sure if there are more resources with the same behavior.
+            task = body
+        else:
+            # For the resource Label the status is 202 but the response not contains a task.
+            task = None
+        return task
+
+    async def __do_rest_call(self, http_method, uri, body, custom_headers):
+        resp, body = await self.do_http(method=http_method,
+                                        path=uri,
+                                        body=json.dumps(body),
+                                        custom_headers=custom_headers)
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+
+        if resp.status == 304:
+            if body and not isinstance(body, dict):
+                try:
+                    body = json.loads(body)
+                except Exception:
+                    pass
+        elif resp.status == 202:
+            task = await self.__get_task_from_response(resp, body)
+            return task, body
+
+        if self.__body_content_is_task(body):
+            return body, body
+
+        return None, body
+
+    ###########################################################################
+    # EULA
+    ###########################################################################
+    async def get_eula_status(self):
+        return await self.get(uri['eulaStatus'])
+
+    async def set_eula(self, supportAccess='yes'):
+        eula = make_eula_dict(supportAccess)
+        await self.post(uri['eulaSave'], eula)
+
+    ###########################################################################
+    # Initial Setup
+    ###########################################################################
+    async def change_initial_password(self, newPassword):
+        password = make_initial_password_change_dict('Administrator',
+                                                     'admin', newPassword)
+        # This will throw an exception if the password is already changed
+        await self.post(uri['changePassword'], password)
+
+    ###########################################################################
+    # Login/Logout to/from appliance
+    ###########################################################################
+    async def login(self, cred, verbose=False):
+        try:
+            if self._validateVersion is False:
+                await self.validateVersion()
+        except Exception:
+            raise HPOneViewException('Failure during login attempt.\n %s' % traceback.format_exc())
+
+        self._cred = cred
+        try:
+            if self._cred.get("sessionID"):
+                self.set_session_id(self._cred["sessionID"])
+                task, body = await self.put(uri['loginSessions'], None)
+            else:
+                self._cred.pop("sessionID", None)
+                task, body = await self.post(uri['loginSessions'], self._cred)
+        except HPOneViewException:
+            logger.exception('Login failed')
+            raise
+        auth = body['sessionID']
+        # Add the auth ID to the headers dictionary
+        self._headers['auth'] = auth
+        self._session = True
+        if verbose is True:
+            print(('Session Key: ' + auth))
+        logger.info('Logged in successfully')
+
+    async def logout(self, verbose=False):
+        try:
+            await self.delete(uri['loginSessions'])
+        except HPOneViewException:
+            logger.exception('Logout failed')
+            raise
+        if verbose is True:
+            print('Logged Out')
+        del self._headers['auth']
+        self._session = False
+        logger.info('Logged out successfully')
+        return None
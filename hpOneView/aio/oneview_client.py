@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+This module implements an asyncio client for HPE OneView REST API.
+
+Requires Python 3.5 or later.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from hpOneView.aio.connection import AsyncConnection
+from hpOneView.aio.resource import AsyncResourceClient
+from hpOneView.connection import RetryPolicy
+from hpOneView.oneview_client import OneViewClient, ONEVIEW_CLIENT_INVALID_PROXY, RETRY_POLICY_KEYS, get_resource_class
+
+# API client class of the resources exposed by AsyncOneViewClient, named after the OneViewClient properties. The
+# URI of each resource is taken from its class, see get_resource_uri
+RESOURCE_CLASSES = {
+    'certificate_authority': 'CertificateAuthority',
+    'connections': 'Connections',
+    'connection_templates': 'ConnectionTemplates',
+    'fc_networks': 'FcNetworks',
+    'fcoe_networks': 'FcoeNetworks',
+    'ethernet_networks': 'EthernetNetworks',
+    'fabrics': 'Fabrics',
+    'restores': 'Restores',
+    'scopes': 'Scopes',
+    'datacenters': 'Datacenters',
+    'network_sets': 'NetworkSets',
+    'server_hardware': 'ServerHardware',
+    'server_hardware_types': 'ServerHardwareTypes',
+    'id_pools_vsn_ranges': 'IdPoolsRanges',
+    'id_pools_vmac_ranges': 'IdPoolsRanges',
+    'id_pools_vwwn_ranges': 'IdPoolsRanges',
+    'id_pools_ipv4_ranges': 'IdPoolsIpv4Ranges',
+    'id_pools_ipv4_subnets': 'IdPoolsIpv4Subnets',
+    'id_pools': 'IdPools',
+    'switches': 'Switches',
+    'roles': 'Roles',
+    'switch_types': 'SwitchTypes',
+    'logical_switch_groups': 'LogicalSwitchGroups',
+    'logical_switches': 'LogicalSwitches',
+    'tasks': 'Tasks',
+    'enclosure_groups': 'EnclosureGroups',
+    'enclosures': 'Enclosures',
+    'logical_enclosures': 'LogicalEnclosures',
+    'metric_streaming': 'MetricStreaming',
+    'interconnects': 'Interconnects',
+    'interconnect_types': 'InterconnectTypes',
+    'interconnect_link_topologies': 'InterconnectLinkTopologies',
+    'sas_interconnect_types': 'SasInterconnectTypes',
+    'internal_link_sets': 'InternalLinkSets',
+    'logical_interconnect_groups': 'LogicalInterconnectGroups',
+    'logical_interconnects': 'LogicalInterconnects',
+    'sas_logical_interconnects': 'SasLogicalInterconnects',
+    'logical_downlinks': 'LogicalDownlinks',
+    'power_devices': 'PowerDevices',
+    'unmanaged_devices': 'UnmanagedDevices',
+    'racks': 'Racks',
+    'san_managers': 'SanManagers',
+    'endpoints': 'Endpoints',
+    'server_profiles': 'ServerProfiles',
+    'server_profile_templates': 'ServerProfileTemplate',
+    'storage_systems': 'StorageSystems',
+    'storage_pools': 'StoragePools',
+    'storage_volume_templates': 'StorageVolumeTemplates',
+    'storage_volume_attachments': 'StorageVolumeAttachments',
+    'firmware_drivers': 'FirmwareDrivers',
+    'firmware_bundles': 'FirmwareBundles',
+    'uplink_sets': 'UplinkSets',
+    'volumes': 'Volumes',
+    'sas_logical_jbod_attachments': 'SasLogicalJbodAttachments',
+    'managed_sans': 'ManagedSANs',
+    'migratable_vc_domains': 'MigratableVcDomains',
+    'sas_interconnects': 'SasInterconnects',
+    'sas_logical_interconnect_groups': 'SasLogicalInterconnectGroups',
+    'drive_enclosures': 'DriveEnclosures',
+    'sas_logical_jbods': 'SasLogicalJbods',
+    'labels': 'Labels',
+    'index_resources': 'IndexResources',
+    'alerts': 'Alerts',
+    'events': 'Events',
+    'os_deployment_plans': 'OsDeploymentPlans',
+    'os_deployment_servers': 'OsDeploymentServers',
+    'certificate_rabbitmq': 'CertificateRabbitMQ',
+    'users': 'Users',
+    'appliance_device_read_community': 'ApplianceDeviceReadCommunity',
+    'appliance_device_snmp_v1_trap_destinations': 'ApplianceDeviceSNMPv1TrapDestinations',
+    'appliance_device_snmp_v3_trap_destinations': 'ApplianceDeviceSNMPv3TrapDestinations',
+    'appliance_device_snmp_v3_users': 'ApplianceDeviceSNMPv3Users',
+    'appliance_node_information': 'ApplianceNodeInformation',
+    'appliance_time_and_locale_configuration': 'ApplianceTimeAndLocaleConfiguration',
+    'versions': 'Versions',
+    'backups': 'Backups',
+    'login_details': 'LoginDetails',
+    'licenses': 'Licenses',
+}
+
+
+def get_resource_uri(name):
+    """
+    Gets the URI of the resources exposed by an AsyncOneViewClient property.
+
+    Args:
+        name: Property name, a key of RESOURCE_CLASSES.
+
+    Returns:
+        str: URI of the resources.
+    """
+    resource_class = get_resource_class(RESOURCE_CLASSES[name])
+    if RESOURCE_CLASSES[name] == 'IdPoolsRanges':
+        # The ranges share a class, the property names them as id_pools_<type>_ranges
+        return resource_class.URIS[name.split('_')[2]]
+    return resource_class.URI
+
+
+class AsyncOneViewClient(object):
+    """
+    Asynchronous counterpart of OneViewClient.
+
+    The resources are exposed with the same property names as in OneViewClient, each one as an AsyncResourceClient
+    created on first access. Nothing is sent to the appliance before login is awaited, so the client can be used as
+    an async context manager:
+
+        >>> async with AsyncOneViewClient(config) as oneview_client:
+        >>>     networks = await oneview_client.ethernet_networks.get_all()
+    """
+    DEFAULT_API_VERSION = OneViewClient.DEFAULT_API_VERSION
+
+    def __init__(self, config):
+        self.__config = config
+        self.__connection = AsyncConnection(config["ip"], config.get('api_version', self.DEFAULT_API_VERSION),
+                                            config.get('ssl_certificate', False), config.get('timeout'))
+        self.__resources = {}
+        self.__set_proxy(config)
+
+        if config.get("connection_pool"):
+            self.__connection.set_connection_pool(max_size=config["connection_pool"].get("max_size"),
+                                                  idle_timeout=config["connection_pool"].get("idle_timeout"))
+        if config.get("pagination"):
+            self.__connection.set_pagination(page_size=config["pagination"].get("page_size"),
+                                             max_workers=config["pagination"].get("max_workers"))
+        if config.get("retry_policy"):
+            retry_policy = config["retry_policy"]
+            self.__connection.set_retry_policy(RetryPolicy(**dict((key, retry_policy[key]) for key in retry_policy
+                                                                  if key in RETRY_POLICY_KEYS)))
+
+    def __set_proxy(self, config):
+        if "proxy" in config and config["proxy"]:
+            splitted = config["proxy"].split(':')
+            if len(splitted) != 2:
+                raise ValueError(ONEVIEW_CLIENT_INVALID_PROXY)
+
+            self.__connection.set_proxy(splitted[0], int(splitted[1]))
+
+    async def login(self):
+        """
+        Logs in to the appliance with the credentials of the configuration.
+        """
+        await self.__connection.login(self.__config["credentials"])
+
+    async def close(self):
+        """
+        Closes the idle connections to the appliance. The session remains valid.
+        """
+        self.__connection.close_connections()
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def api_version(self):
+        """
+        Gets the OneView API Version.
+
+        Returns:
+            int: API Version.
+        """
+        return self.__connection._apiVersion
+
+    @property
+    def connection(self):
+        """
+        Gets the underlying AsyncConnection used by the AsyncOneViewClient.
+
+        Returns:
+            AsyncConnection:
+        """
+        return self.__connection
+
+    def __getattr__(self, name):
+        if name not in RESOURCE_CLASSES:
+            raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+
+        if name not in self.__resources:
+            self.__resources[name] = AsyncResourceClient(self.__connection, get_resource_uri(name))
+        return self.__resources[name]
+
+    def __dir__(self):
+        return sorted(set(dir(type(self)) + list(self.__dict__) + list(RESOURCE_CLASSES)))
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+import logging
+
+from urllib.parse import quote
+from hpOneView.aio.task_monitor import AsyncTaskMonitor
+from hpOneView.exceptions import HPOneViewUnknownType
+from hpOneView.resources.resource import ResourceClient, get_next_page_uri, get_remaining_pages, build_page_uri
+from hpOneView.resources.resource import RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED, RESOURCE_CLIENT_INVALID_FIELD, \
+    RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncResourceClient(object):
+    """
+    Asynchronous counterpart of ResourceClient, for use with AsyncConnection.
+
+    The URIs are built exactly as in ResourceClient; only the requests and the task waiting are coroutines.
+    """
+
+    def __init__(self, con, uri):
+        self._connection = con
+        self._uri = uri
+        self._task_monitor = AsyncTaskMonitor(con)
+        self._uri_builder = ResourceClient(con, uri)
+
+    def build_query_uri(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None, scope_uris=''):
+        return self._uri_builder.build_query_uri(start=start, count=count, filter=filter, query=query, sort=sort,
+                                                 view=view, fields=fields, uri=uri, scope_uris=scope_uris)
+
+    def build_uri(self, id_or_uri):
+        return self._uri_builder.build_uri(id_or_uri)
+
+    def build_subresource_uri(self, resource_id_or_uri=None, subresource_id_or_uri=None, subresource_path=''):
+        return self._uri_builder.build_subresource_uri(resource_id_or_uri, subresource_id_or_uri, subresource_path)
+
+    async def get_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None, scope_uris=''):
+        """
+        Gets all items according with the given arguments. See ResourceClient.get_all.
+
+        Returns:
+            list: A list of items matching the specified filter.
+        """
+        uri = self.build_query_uri(start=start, count=count, filter=filter,
+                                   query=query, sort=sort, view=view, fields=fields, uri=uri, scope_uris=scope_uris)
+
+        logger.debug('Getting all resources with uri: {0}'.format(uri))
+
+        items = []
+        first_page = True
+
+        while uri:
+            response = await self._connection.get(uri)
+            items += self.__get_members(response)
+            next_page_uri = get_next_page_uri(response, len(items), count)
+
+            pagination = self._connection.get_pagination()
+            if next_page_uri and first_page and pagination['max_workers'] > 1:
+                pages = get_remaining_pages(uri, response, len(items), count, pagination['page_size'])
+                if pages:
+                    items += await self.__get_pages_concurrently(uri, pages)
+                    next_page_uri = None
+
+            first_page = False
+            uri = next_page_uri
+
+        return items
+
+    async def get(self, id_or_uri, raw=False):
+        """
+        Args:
+            id_or_uri: Can be either the resource ID or the resource URI.
+            raw: Returns the body unparsed, as a RawBody, for the callers that store or forward it.
+
+        Returns:
+             The requested resource.
+        """
+        uri = self.build_uri(id_or_uri)
+        logger.debug('Get resource (uri = %s, ID = %s)' % (uri, str(id_or_uri)))
+        return await self._connection.get(uri, raw=raw)
+
+    async def get_schema(self):
+        return await self._connection.get(self._uri + '/schema')
+
+    async def get_by(self, field, value, uri=None):
+        """
+        Gets all items with the field equal to the value. The search is case-insensitive. See ResourceClient.get_by.
+
+        Returns:
+            list
+        """
+        if not field:
+            logger.exception(RESOURCE_CLIENT_INVALID_FIELD)
+            raise ValueError(RESOURCE_CLIENT_INVALID_FIELD)
+
+        filter = "\"{0}='{1}'\"".format(field, value)
+        results = await self.get_all(filter=filter, uri=uri)
+
+        # Workaround when the OneView filter does not work, it will filter again
+        if "." not in field:
+            # This filter only work for the first level
+            results = [item for item in results if str(item.get(field, '')).lower() == value.lower()]
+
+        return results
+
+    async def get_by_name(self, name):
+        """
+        Retrieve a resource by its name.
+
+        Returns:
+            dict
+        """
+        result = await self.get_by('name', name)
+        return result[0] if result else None
+
+    async def create(self, resource, uri=None, timeout=-1, custom_headers=None, default_values={}):
+        """
+        Makes a POST request to create a resource and waits for the task. See ResourceClient.create.
+
+        Returns:
+            Created resource.
+        """
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        resource = self._uri_builder.merge_default_values(resource, default_values)
+
+        task, entity = await self._connection.post(uri or self._uri, resource, custom_headers=custom_headers)
+        return await self.__wait_for_task(task, entity, timeout)
+
+    async def update(self, resource, uri=None, force=False, timeout=-1, custom_headers=None, default_values={}):
+        """
+        Makes a PUT request to update a resource and waits for the task. See ResourceClient.update.
+
+        Returns:
+            Updated resource.
+        """
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        uri = uri or resource['uri']
+        if force:
+            uri += '?force=True'
+
+        resource = self._uri_builder.merge_default_values(resource, default_values)
+
+        task, body = await self._connection.put(uri, resource, custom_headers=custom_headers)
+        return await self.__wait_for_task(task, body, timeout)
+
+    async def delete(self, resource, force=False, timeout=-1, custom_headers=None):
+        """
+        Deletes a resource, given as a dict, ID or URI, and waits for the task. See ResourceClient.delete.
+
+        Returns:
+            bool: Indicates if the resource was successfully deleted.
+        """
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        if isinstance(resource, dict):
+            if 'uri' in resource and resource['uri']:
+                uri = resource['uri']
+            else:
+                logger.exception(RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE)
+                raise HPOneViewUnknownType(RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE)
+        else:
+            uri = self.build_uri(resource)
+
+        if force:
+            uri += '?force=True'
+
+        task, body = await self._connection.delete(uri, custom_headers=custom_headers)
+
+        if not task:
+            # 204 NO CONTENT
+            # Successful return from a synchronous delete operation.
+            return True
+
+        return await self._task_monitor.wait_for_task(task, timeout=timeout)
+
+    async def delete_all(self, filter, force=False, timeout=-1):
+        """
+        Deletes all resources from the appliance that match the provided filter. See ResourceClient.delete_all.
+
+        Returns:
+            bool: Indicates if the resources were successfully deleted.
+        """
+        uri = "{}?filter={}&force={}".format(self._uri, quote(filter), force)
+
+        task, body = await self._connection.delete(uri)
+
+        if not task:
+            return True
+
+        return await self._task_monitor.wait_for_task(task, timeout=timeout)
+
+    async def patch(self, id_or_uri, operation, path, value, timeout=-1, custom_headers=None):
+        """
+        Uses the PATCH to update a resource. See ResourceClient.patch.
+
+        Returns:
+            Updated resource.
+        """
+        patch_request_body = [{'op': operation, 'path': path, 'value': value}]
+
+        return await self.patch_request(id_or_uri=id_or_uri,
+                                        body=patch_request_body,
+                                        timeout=timeout,
+                                        custom_headers=custom_headers)
+
+    async def patch_request(self, id_or_uri, body, timeout=-1, custom_headers=None):
+        """
+        Uses the PATCH to update a resource. See ResourceClient.patch_request.
+
+        Returns:
+            Updated resource.
+        """
+        uri = self.build_uri(id_or_uri)
+
+        custom_headers_copy = custom_headers.copy() if custom_headers else {}
+        if self._connection._apiVersion >= 300 and 'Content-Type' not in custom_headers_copy:
+            custom_headers_copy['Content-Type'] = 'application/json-patch+json'
+
+        task, entity = await self._connection.patch(uri, body, custom_headers=custom_headers_copy)
+        return await self.__wait_for_task(task, entity, timeout)
+
+    async def __wait_for_task(self, task, entity, timeout):
+        if not task:
+            return entity
+
+        return await self._task_monitor.wait_for_task(task, timeout)
+
+    async def __get_pages_concurrently(self, uri, pages):
+        semaphore = asyncio.Semaphore(self._connection.get_pagination()['max_workers'])
+
+        async def get_page(start, count):
+            async with semaphore:
+                return await self.__get_page(uri, start, count)
+
+        results = await asyncio.gather(*[get_page(start, count) for start, count in pages])
+        return [item for page_items in results for item in page_items]
+
+    async def __get_page(self, uri, start, count):
+        items = []
+
+        # The appliance may return fewer items than requested, so the page is completed with further requests
+        while len(items) < count:
+            response = await self._connection.get(build_page_uri(uri, start + len(items), count - len(items)))
+            members = self.__get_members(response)
+            if not members:
+                break
+            items += members
+
+        return items[:count]
+
+    def __get_members(self, mlist):
+        if mlist and 'members' in mlist and mlist['members']:
+            return mlist['members']
+        else:
+            return []
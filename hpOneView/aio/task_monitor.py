@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+import logging
+
+from hpOneView.exceptions import HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewUnknownType
+from hpOneView.resources.task_monitor import TaskMonitor, TASK_PENDING_STATES, TASK_DELETED_NAMES, raise_task_error
+from hpOneView.resources.task_monitor import MSG_INVALID_TASK, MSG_TASK_TYPE_UNRECONIZED, MSG_TIMEOUT, \
+    MSG_UNKNOWN_OBJECT_TYPE, UNLIMITED_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTaskMonitor(object):
+    """
+    Asynchronous counterpart of TaskMonitor. Waiting for a task suspends the calling coroutine instead of
+    blocking the thread.
+    """
+    CONNECTION_FAILURE_TIMEOUT = TaskMonitor.CONNECTION_FAILURE_TIMEOUT
+
+    # Same decision as TaskMonitor, through the retry policy of the connection
+    is_connection_failure = TaskMonitor.is_connection_failure
+
+    def __init__(self, con):
+        self._connection = con
+
+    @staticmethod
+    def get_current_seconds():
+        return TaskMonitor.get_current_seconds()
+
+    async def wait_for_task(self, task, timeout=-1):
+        """
+        Wait for task execution and return associated resource.
+
+        Args:
+            task: task dict
+            timeout: timeout in seconds
+
+        Returns:
+            Associated resource when creating or updating; True when deleting.
+        """
+        await self.__wait_task_completion(task, timeout)
+
+        task = await self.get(task)
+
+        logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
+        logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
+
+        task_response = await self.__get_task_response(task)
+        logger.debug('Task completed')
+        return task_response
+
+    async def get_completed_task(self, task, timeout=-1):
+        """
+        Waits until the task is completed and returns the task resource.
+
+        Args:
+            task: TaskResource
+            timeout: Timeout in seconds
+
+        Returns:
+            dict: TaskResource
+        """
+        await self.__wait_task_completion(task, timeout)
+
+        return await self.get(task)
+
+    async def __wait_task_completion(self, task, timeout):
+        if not task:
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        logger.debug('Waiting for task completion...')
+
+        start_time = self.get_current_seconds()
+        connection_failure_control = dict(last_success=self.get_current_seconds())
+
+        i = 0
+        while await self.is_task_running(task, connection_failure_control):
+            # wait 1 to 10 seconds
+            # the value increases to avoid flooding server with requests
+            i = i + 1 if i < 10 else 10
+
+            await asyncio.sleep(i)
+            if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
+                raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+
+    async def __get_task_response(self, task):
+        raise_task_error(task)
+
+        if 'name' in task and task['name'] in TASK_DELETED_NAMES:
+            return True
+
+        if 'type' in task and task['type'].startswith('Task'):
+            # get associated resource when is not a delete task
+            task, entity = await self.get_associated_resource(task)
+            return entity
+
+        logger.warning('Task completed, unknown response: ' + str(task))
+        return task
+
+    async def is_task_running(self, task, connection_failure_control=None):
+        """
+        Check if a task is running according to: TASK_PENDING_STATES ['New', 'Starting',
+        'Pending', 'Running', 'Suspended', 'Stopping']
+
+        Args:
+            task (dict): OneView Task resource.
+            connection_failure_control (dict):
+                A dictionary instance that contains last_success for error tolerance control.
+
+        Returns:
+            True when in TASK_PENDING_STATES; False when not.
+        """
+        if 'uri' in task:
+            try:
+                task = await self.get(task)
+                if connection_failure_control:
+                    # Updates last success
+                    connection_failure_control['last_success'] = self.get_current_seconds()
+                if 'taskState' in task and task['taskState'] in TASK_PENDING_STATES:
+                    return True
+
+            except Exception as error:
+                logger.error('; '.join(str(e) for e in error.args) + ' when waiting for the task: ' + str(task))
+
+                if not connection_failure_control:
+                    raise error
+
+                if self.is_connection_failure(error):
+                    last_success = connection_failure_control['last_success']
+                    if last_success + self.CONNECTION_FAILURE_TIMEOUT < self.get_current_seconds():
+                        # Timeout reached
+                        raise error
+                    else:
+                        # Return task is running when network instability occurs
+                        return True
+                else:
+                    raise error
+
+        return False
+
+    async def get(self, task):
+        """
+        Retrieve a task by its uri.
+
+        Args:
+            task: task dict, must have 'uri' key.
+
+        Returns:
+            task dict
+        """
+        return await self._connection.get(task['uri'])
+
+    async def get_associated_resource(self, task):
+        """
+        Retrieve a resource associated with a task.
+
+        Args:
+            task: task dict
+
+        Returns:
+            tuple: task (updated), the entity found (dict)
+        """
+        if not task:
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        if task['category'] != 'tasks' and task['category'] != 'backups':
+            # it is an error if type is not in obj, so let the except flow
+            raise HPOneViewUnknownType(MSG_UNKNOWN_OBJECT_TYPE)
+
+        if task['type'] == 'TaskResourceV2':
+            resource_uri = task['associatedResource']['resourceUri']
+
+            if resource_uri and resource_uri.startswith("/rest/appliance/support-dumps/"):
+                # Specific for support dumps
+                return task, resource_uri
+
+        elif task['type'] == 'BACKUP':
+            task = await self._connection.get(task['taskUri'])
+            resource_uri = task['uri']
+        else:
+            raise HPOneViewInvalidResource(MSG_TASK_TYPE_UNRECONIZED % task['type'])
+
+        entity = {}
+
+        if resource_uri:
+            entity = await self._connection.get(resource_uri)
+
+        return task, entity
@@ -34,27 +34,784 @@ from __future__ import unicode_literals
 
 from builtins import open
 from builtins import str
-from future import standard_library
-
-standard_library.install_aliases()
 
+import copy
+import email.utils
 import http.client
 import json
 import logging
 import shutil  # for shutil.copyfileobj()
-import mmap  # so we can upload the iso without having to load it in memory
 import os
+import random
+import select
+import socket
 import ssl
+import threading
 import time
 import traceback
+import zlib
 
+from collections import deque, OrderedDict
+from errno import ECONNABORTED, ECONNREFUSED, ECONNRESET, EINVAL, ENETDOWN, ENETUNREACH, ENOEXEC, EPIPE, ETIMEDOUT
 from hpOneView.exceptions import HPOneViewException
+from hpOneView.json_backend import RawBody
+from hpOneView.instrumentation import NULL_REQUEST_EVENT, RequestEvent, TaskWaitEvent
+from timeit import default_timer
 
 logger = logging.getLogger(__name__)
 
+# Error numbers raised when the appliance dropped an idle keep-alive connection
+DROPPED_CONNECTION_ERROR_NUMBERS = [ECONNRESET, ECONNABORTED, EPIPE]
+
+MULTIPART_BOUNDARY = '----------ThIs_Is_tHe_bouNdaRY_$'
+CRLF = '\r\n'
+
+# Bytes read from the uploaded file and sent at a time
+UPLOAD_CHUNK_SIZE = 1048576
+
+# Bounds of the buffer that receives downloaded content
+DOWNLOAD_MIN_BUFFER_SIZE = 65536
+DOWNLOAD_MAX_BUFFER_SIZE = 4194304
+
+# TLS session resumption requires the SSLSocket.session API (Python 3.6+)
+TLS_SESSION_RESUMPTION_SUPPORTED = hasattr(ssl.SSLSocket, 'session')
+
+
+class TLSSessionCache(object):
+    """
+    Keeps the last TLS session negotiated with the appliance, so new sockets can resume it with an abbreviated
+    handshake instead of a full one. It also counts the full and resumed handshakes.
+    """
+
+    def __init__(self):
+        self._session = None
+        self._full_handshakes = 0
+        self._resumed_handshakes = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        return self._session
+
+    def update(self, sock):
+        """
+        Stores the session of a socket that just completed its handshake.
+
+        Args:
+            sock: Connected SSLSocket.
+        """
+        with self._lock:
+            if sock.session_reused:
+                self._resumed_handshakes += 1
+            else:
+                self._full_handshakes += 1
+            if sock.session is not None:
+                self._session = sock.session
+
+    def clear(self):
+        with self._lock:
+            self._session = None
+
+    def get_stats(self):
+        """
+        Gets the number of full and resumed TLS handshakes.
+
+        Returns:
+            dict: full_handshakes and resumed_handshakes counters.
+        """
+        with self._lock:
+            return dict(full_handshakes=self._full_handshakes,
+                        resumed_handshakes=self._resumed_handshakes)
+
+
+class ResponseCache(object):
+    """
+    Keeps the last body and entity tag returned by GET for each URI, so the next GET can be sent with If-None-Match
+    and the cached body served when the appliance answers 304 Not Modified.
+
+    The least recently used entries are evicted beyond max_size. Each entry is kept for the TTL of its resource type,
+    given by the longest matching URI prefix in resource_ttls, or the default ttl otherwise. A TTL of 0 disables the
+    cache for that resource type.
+    """
+    DEFAULT_MAX_SIZE = 256
+    DEFAULT_TTL = 300
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL, resource_ttls=None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._resource_ttls = sorted((resource_ttls or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_ttl(self, uri):
+        path = uri.split('?')[0]
+        for prefix, ttl in self._resource_ttls:
+            if path == prefix or path.startswith(prefix.rstrip('/') + '/'):
+                return ttl
+        return self._ttl
+
+    def lookup(self, uri):
+        """
+        Gets the cached entry of a URI.
+
+        Returns:
+            tuple: Entity tag and body, or None when the URI is not cached or its entry expired.
+        """
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is None:
+                return None
+            etag, body, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[uri]
+                return None
+            return etag, body
+
+    def revalidated(self, uri, entry):
+        """
+        Records a 304 Not Modified answer for the entry returned by lookup. The entry is kept for another TTL, since
+        the appliance confirmed it is up to date.
+
+        Returns:
+            A copy of the cached body, so the callers cannot change the cached one.
+        """
+        ttl = self.get_ttl(uri)
+        with self._lock:
+            self._hits += 1
+            cached = self._entries.pop(uri, None)
+            if cached is not None:
+                self._entries[uri] = (cached[0], cached[1], time.time() + ttl)
+        return copy.deepcopy(entry[1])
+
+    def update(self, uri, etag, body):
+        """
+        Stores the body returned for a URI, replacing the previous entry.
+        """
+        ttl = self.get_ttl(uri)
+        with self._lock:
+            self._misses += 1
+            self._entries.pop(uri, None)
+            if not etag or ttl <= 0 or self._max_size <= 0:
+                return
+            self._entries[uri] = (etag, copy.deepcopy(body), time.time() + ttl)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, uri):
+        """
+        Removes the entries of a resource, its subresources and its collection, after the resource was changed.
+        """
+        path = uri.split('?')[0].rstrip('/')
+        collection = path.rsplit('/', 1)[0]
+        with self._lock:
+            for key in list(self._entries):
+                key_path = key.split('?')[0].rstrip('/')
+                if key_path in (path, collection) or key_path.startswith(path + '/'):
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Number of cached entries, of GETs served from the cache (hits) and of GETs that downloaded the body.
+        """
+        with self._lock:
+            return dict(entries=len(self._entries), hits=self._hits, misses=self._misses)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class AdaptiveRateLimiter(object):
+    """
+    Paces the requests sent to one appliance with a token bucket whose rate adapts to how the appliance copes.
+
+    The rate grows additively while the responses are fast and successful, and is cut multiplicatively when the
+    appliance answers 429 Too Many Requests or 503 Service Unavailable, or when a response takes longer than the target
+    latency (AIMD). A Retry-After header pauses all the requests for the given delay. Independently of the rate, no more
+    than max_in_flight requests are sent at once.
+    """
+    DEFAULT_RATE = 10
+    DEFAULT_MIN_RATE = 1
+    DEFAULT_MAX_RATE = 100
+    DEFAULT_MAX_IN_FLIGHT = 16
+    DEFAULT_TARGET_LATENCY = 5
+    DEFAULT_MAX_RETRIES = 3
+
+    # Statuses meaning the appliance refused the request because it is overloaded
+    THROTTLED_STATUSES = (429, 503)
+
+    # Upper bound of a pause requested with Retry-After, in seconds
+    MAX_RETRY_AFTER = 120
+
+    def __init__(self, rate=DEFAULT_RATE, min_rate=DEFAULT_MIN_RATE, max_rate=DEFAULT_MAX_RATE,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT, target_latency=DEFAULT_TARGET_LATENCY, increase=1.0,
+                 decrease=0.5, max_retries=DEFAULT_MAX_RETRIES):
+        self.max_retries = max_retries
+        self._min_rate = float(min_rate)
+        self._max_rate = float(max_rate)
+        self._rate = min(max(float(rate), self._min_rate), self._max_rate)
+        self._max_in_flight = max_in_flight
+        self._target_latency = target_latency
+        self._increase = increase
+        self._decrease = decrease
+        self._tokens = 1.0
+        self._updated = time.time()
+        self._paused_until = 0
+        self._last_decrease = 0
+        self._in_flight = 0
+        self._throttled = 0
+        self._slow = 0
+        self._condition = threading.Condition()
+
+    @property
+    def rate(self):
+        """
+        Requests per second currently allowed.
+        """
+        return self._rate
+
+    def acquire(self):
+        """
+        Blocks until a request can be sent: the bucket has a token, the in-flight limit is not reached and the
+        appliance did not ask to pause.
+        """
+        with self._condition:
+            while True:
+                now = time.time()
+                self.__refill(now)
+                if self._in_flight < self._max_in_flight and now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    return
+                if self._in_flight >= self._max_in_flight:
+                    # A release notifies the waiters
+                    self._condition.wait()
+                else:
+                    self._condition.wait(max(self._paused_until - now, (1 - self._tokens) / self._rate))
+
+    def release(self, status=None, latency=None, retry_after=None):
+        """
+        Ends a request and adapts the rate to its outcome.
+
+        Args:
+            status: Status of the response, or None when the request failed without a response.
+            latency: Seconds the request took.
+            retry_after: Seconds the appliance asked to wait before the next request.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            now = time.time()
+            throttled = status in self.THROTTLED_STATUSES
+            slow = latency is not None and latency > self._target_latency
+            if throttled or slow:
+                if throttled:
+                    self._throttled += 1
+                if slow:
+                    self._slow += 1
+                self.__decrease(now)
+            elif status is not None and status < 500:
+                # Adds about `increase` requests per second to the rate every second
+                self._rate = min(self._max_rate, self._rate + self._increase / self._rate)
+            if retry_after:
+                self.__pause(now + min(retry_after, self.MAX_RETRY_AFTER))
+            self._condition.notify_all()
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Current rate, requests in flight, and number of throttled (429/503) and slow responses.
+        """
+        with self._condition:
+            return dict(rate=self._rate, in_flight=self._in_flight, throttled=self._throttled, slow=self._slow)
+
+    def __decrease(self, now):
+        # The responses of requests sent before the previous cut report the same congestion, so they do not cut again
+        if now - self._last_decrease < self._target_latency:
+            return
+        self._last_decrease = now
+        self._rate = max(self._min_rate, self._rate * self._decrease)
+        self._tokens = 0.0
+
+    def __pause(self, until):
+        # The bucket stays empty during the pause, so the requests resume at the current rate instead of in a burst
+        self._paused_until = max(self._paused_until, until)
+        self._tokens = 0.0
+        self._updated = max(self._updated, self._paused_until)
+
+    def __refill(self, now):
+        if now <= self._updated:
+            return
+        # The bucket holds up to one second of requests
+        self._tokens = min(max(self._rate, 1.0), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+def get_retry_after(response):
+    """
+    Gets the delay, in seconds, of the Retry-After header of a response. The header holds either a number of seconds
+    or an HTTP date.
+
+    Returns:
+        float: The delay, or None when the header is missing or invalid.
+    """
+    value = response.getheader('Retry-After') if response is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    date = email.utils.parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(date) - time.time())
+
+
+class ResponseCompression(object):
+    """
+    Asks the appliance to compress the response bodies with gzip or deflate and decodes them as they are received.
+    Counts the bytes received and decoded, so the ratio shows what the compression saves.
+    """
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._responses = 0
+        self._compressed = 0
+        self._bytes_received = 0
+        self._bytes_decoded = 0
+
+    def get_writer(self, response, write):
+        """
+        Gets a writer that decodes the body of a response before passing it to write, one chunk at a time.
+
+        Args:
+            response: Response whose Content-Encoding header tells how the body is encoded.
+            write: Callable receiving the decoded chunks.
+
+        Returns:
+            DecodingWriter: Its close method must be called once the whole body is written.
+        """
+        encoding = (response.getheader('Content-Encoding') or '').strip().lower()
+        return DecodingWriter(write, encoding if encoding in ('gzip', 'deflate') else None, self)
+
+    def decode(self, response, data):
+        """
+        Decodes the whole body of a response.
+
+        Args:
+            response: Response whose Content-Encoding header tells how the body is encoded.
+            data: Body received.
+
+        Returns:
+            bytes: Decoded body.
+        """
+        chunks = []
+        writer = self.get_writer(response, chunks.append)
+        writer.write(data)
+        writer.close()
+        return b''.join(chunks) if writer.encoding else data
+
+    def record(self, compressed, bytes_received, bytes_decoded):
+        with self._lock:
+            self._responses += 1
+            self._compressed += 1 if compressed else 0
+            self._bytes_received += bytes_received
+            self._bytes_decoded += bytes_decoded
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Number of responses and of compressed responses, bytes received and decoded, and their ratio.
+        """
+        with self._lock:
+            ratio = self._bytes_decoded / self._bytes_received if self._bytes_received else None
+            return dict(responses=self._responses, compressed=self._compressed, bytes_received=self._bytes_received,
+                        bytes_decoded=self._bytes_decoded, ratio=ratio)
+
+
+class DecodingWriter(object):
+    """
+    Decodes a gzip or deflate body incrementally, and passes the decoded chunks to a callable.
+    """
+
+    def __init__(self, write, encoding, compression):
+        self.encoding = encoding
+        self._write = write
+        self._compression = compression
+        self._bytes_received = 0
+        self._bytes_decoded = 0
+        if encoding == 'gzip':
+            self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            self._decoder = zlib.decompressobj()
+        self._first_chunk = True
+
+    def write(self, chunk):
+        self._bytes_received += len(chunk)
+        if not self.encoding:
+            self._bytes_decoded += len(chunk)
+            self._write(chunk)
+            return
+        self.__write_decoded(self.__decompress(chunk))
+
+    def close(self):
+        """
+        Writes the end of the decoded body and counts the bytes.
+        """
+        if self.encoding:
+            self.__write_decoded(self._decoder.flush())
+        self._compression.record(self.encoding is not None, self._bytes_received, self._bytes_decoded)
+
+    def __decompress(self, chunk):
+        if not self._first_chunk or self.encoding != 'deflate':
+            return self._decoder.decompress(chunk)
+        self._first_chunk = False
+        try:
+            return self._decoder.decompress(chunk)
+        except zlib.error:
+            # Some servers send deflate data without the zlib header
+            self._decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._decoder.decompress(chunk)
+
+    def __write_decoded(self, data):
+        if data:
+            self._bytes_decoded += len(data)
+            self._write(data)
+
+
+class RetryPolicy(object):
+    """
+    Decides which failed requests are sent again, how many times and after which delay.
+
+    Only idempotent requests are sent again: GET, HEAD, DELETE, and PUT guarded by an eTag, either in the If-Match
+    header or in the body, so a PUT that reached the appliance fails with 412 instead of being applied twice. The delay
+    before the attempt n + 1 is drawn at random between 0 and backoff * 2 ** (n - 1) seconds, capped at max_backoff
+    (full jitter), so the clients that failed together do not come back together.
+    """
+    DEFAULT_MAX_ATTEMPTS = 3
+    DEFAULT_BACKOFF = 1
+    DEFAULT_MAX_BACKOFF = 30
+
+    # Statuses of the gateway and of an appliance that is temporarily unable to answer
+    RETRYABLE_STATUSES = (502, 503, 504)
+
+    # Error numbers raised when the network or the appliance drops the connection
+    RETRYABLE_ERROR_NUMBERS = (ENOEXEC, EINVAL, ENETUNREACH, ETIMEDOUT, ECONNRESET, ECONNABORTED, ENETDOWN,
+                               ECONNREFUSED, EPIPE)
+
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'DELETE')
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF,
+                 retryable_statuses=RETRYABLE_STATUSES, retryable_error_numbers=RETRYABLE_ERROR_NUMBERS):
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retryable_statuses = tuple(retryable_statuses)
+        self.retryable_error_numbers = tuple(retryable_error_numbers)
+
+    def is_idempotent(self, method, headers=None, body=None):
+        """
+        Checks whether sending a request twice has the same effect as sending it once. A PUT is only guarded by
+        an explicit eTag; the wildcard "*" set by disable_etag_validation matches any version, so it is unguarded.
+
+        Args:
+            method: HTTP method.
+            headers (dict): Headers of the request.
+            body: Body of the request, as a dict or as a JSON string.
+
+        Returns:
+            bool
+        """
+        method = method.upper()
+        if method in self.IDEMPOTENT_METHODS:
+            return True
+        if method != 'PUT':
+            return False
+        if headers and self.__is_etag_guard(headers.get('If-Match')):
+            return True
+        if isinstance(body, str) and '"eTag"' in body:
+            try:
+                body = json.loads(body)
+            except ValueError:
+                return False
+        return isinstance(body, dict) and self.__is_etag_guard(body.get('eTag'))
+
+    @staticmethod
+    def __is_etag_guard(etag):
+        if isinstance(etag, str):
+            etag = etag.strip()
+        return bool(etag) and etag != '*'
+
+    def is_retryable_error(self, error):
+        """
+        Checks whether an error is a transient network failure.
+
+        Args:
+            error: Exception raised when sending the request or reading the response.
+
+        Returns:
+            bool
+        """
+        if isinstance(error, (http.client.BadStatusLine, socket.timeout)):
+            return True
+        return getattr(error, 'errno', None) in self.retryable_error_numbers
+
+    def get_delay(self, attempt):
+        """
+        Gets a random delay to wait after a failed attempt.
+
+        Args:
+            attempt: Number of the failed attempt, starting at 1.
+
+        Returns:
+            float: Seconds.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def start(self, method, headers=None, body=None):
+        """
+        Starts counting the attempts of a request.
+
+        Args:
+            method: HTTP method.
+            headers (dict): Headers of the request.
+            body: Body of the request.
+
+        Returns:
+            RetryAttempts
+        """
+        return RetryAttempts(self, self.is_idempotent(method, headers, body))
+
+
+class RetryAttempts(object):
+    """
+    Attempts of one request under a RetryPolicy.
+    """
+
+    def __init__(self, policy, idempotent):
+        self._policy = policy
+        self._idempotent = idempotent
+        self.attempt = 1
+
+    def retry_error(self, error):
+        """
+        Waits before the next attempt when the request failed with a transient error and can be sent again.
+
+        Returns:
+            bool: True when the request must be sent again.
+        """
+        return self.__wait(self.get_error_delay(error))
+
+    def retry_response(self, response):
+        """
+        Waits before the next attempt when the appliance answered a transient error status and the request can be
+        sent again. The delay is at least the Retry-After of the response.
+
+        Returns:
+            bool: True when the request must be sent again.
+        """
+        return self.__wait(self.get_response_delay(response))
+
+    def get_error_delay(self, error):
+        """
+        Decides, without waiting, whether a request that failed with an error is sent again. Used by the asyncio
+        connection, which waits on the event loop instead.
+
+        Returns:
+            float: Seconds to wait before the next attempt, or None when the request must not be sent again.
+        """
+        if not self.__can_retry() or not self._policy.is_retryable_error(error):
+            return None
+        logger.warning('%s: %s. Trying again...' % (type(error).__name__, error))
+        return self.__next_delay(0)
+
+    def get_response_delay(self, response):
+        """
+        Decides, without waiting, whether a request answered with an error status is sent again.
+
+        Returns:
+            float: Seconds to wait before the next attempt, or None when the request must not be sent again.
+        """
+        if not self.__can_retry() or response.status not in self._policy.retryable_statuses:
+            return None
+        logger.warning('The appliance answered %d. Trying again...' % response.status)
+        return self.__next_delay(min(get_retry_after(response) or 0, AdaptiveRateLimiter.MAX_RETRY_AFTER))
+
+    def __can_retry(self):
+        return self._idempotent and self.attempt < self._policy.max_attempts
+
+    def __next_delay(self, min_delay):
+        delay = max(min_delay, self._policy.get_delay(self.attempt))
+        self.attempt += 1
+        return delay
+
+    @staticmethod
+    def __wait(delay):
+        if delay is None:
+            return False
+        time.sleep(delay)
+        return True
+
+
+class ResumableHTTPSConnection(http.client.HTTPSConnection):
+    """
+    HTTPSConnection that offers the session kept in a TLSSessionCache when the socket is wrapped.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._tls_sessions = kwargs.pop('tls_sessions', None)
+        http.client.HTTPSConnection.__init__(self, *args, **kwargs)
+
+    def connect(self):
+        if self._tls_sessions is None or not TLS_SESSION_RESUMPTION_SUPPORTED:
+            return http.client.HTTPSConnection.connect(self)
+
+        http.client.HTTPConnection.connect(self)
+
+        server_hostname = self._tunnel_host if self._tunnel_host else self.host
+        self.sock = self._context.wrap_socket(self.sock,
+                                              server_hostname=server_hostname,
+                                              session=self._tls_sessions.get())
+        self._tls_sessions.update(self.sock)
+
+
+class ConnectionPool(object):
+    """
+    Thread-safe pool of keep-alive HTTPS connections to a single appliance.
+
+    Connections are created on demand by the given factory and kept open after a fully read response, so the
+    following requests skip the TCP and TLS handshakes. Idle connections older than idle_timeout are evicted, and
+    each connection is health-checked before being handed out again.
+
+    Args:
+        factory: Callable returning a new, not yet connected, HTTPSConnection.
+        max_size: Maximum number of idle connections kept open. Zero disables the pool.
+        idle_timeout: Seconds an idle connection is kept before being closed. None keeps it until the server drops it.
+    """
+    DEFAULT_MAX_SIZE = 10
+    DEFAULT_IDLE_TIMEOUT = 60
+
+    def __init__(self, factory, max_size=DEFAULT_MAX_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self._factory = factory
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def idle_timeout(self):
+        return self._idle_timeout
+
+    def configure(self, max_size=None, idle_timeout=None):
+        """
+        Changes the pool limits. Idle connections exceeding the new limits are closed.
+
+        Args:
+            max_size: Maximum number of idle connections kept open.
+            idle_timeout: Seconds an idle connection is kept before being closed.
+        """
+        if max_size is not None:
+            self._max_size = max_size
+        if idle_timeout is not None:
+            self._idle_timeout = idle_timeout
+        self.evict_idle()
+
+    def acquire(self):
+        """
+        Gets a healthy idle connection, or a new one when the pool is empty.
+
+        Returns:
+            HTTPSConnection
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                # The most recently used connection is the most likely to be still alive
+                conn, released_at = self._idle.pop()
+
+            if self._is_usable(conn, released_at):
+                return conn
+            conn.close()
+
+        return self._factory()
+
+    def release(self, conn, reusable=True):
+        """
+        Returns a connection to the pool. The connection is closed instead when it is not reusable or the pool is full.
+
+        Args:
+            conn: Connection previously got from acquire.
+            reusable: False when the response was not fully read or the server asked to close the connection.
+        """
+        if reusable and getattr(conn, 'sock', None) is not None:
+            with self._lock:
+                if len(self._idle) < self._max_size:
+                    self._idle.append((conn, time.time()))
+                    conn = None
+        if conn is not None:
+            conn.close()
+        self.evict_idle()
+
+    def evict_idle(self):
+        """
+        Closes idle connections that exceeded the idle timeout or the pool size.
+        """
+        evicted = []
+        with self._lock:
+            while len(self._idle) > self._max_size:
+                evicted.append(self._idle.popleft()[0])
+            if self._idle_timeout is not None:
+                oldest_allowed = time.time() - self._idle_timeout
+                while self._idle and self._idle[0][1] < oldest_allowed:
+                    evicted.append(self._idle.popleft()[0])
+        for conn in evicted:
+            conn.close()
+
+    def clear(self):
+        """
+        Closes all idle connections.
+        """
+        with self._lock:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+    def __len__(self):
+        return len(self._idle)
+
+    def _is_usable(self, conn, released_at):
+        if self._idle_timeout is not None and released_at + self._idle_timeout < time.time():
+            return False
+
+        sock = getattr(conn, 'sock', None)
+        if sock is None:
+            return False
+
+        try:
+            # An idle keep-alive socket has nothing to read: readability means the server closed it
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (ValueError, OSError):
+            return False
+        return not readable
+
 
 class connection(object):
-    def __init__(self, applianceIp, api_version=300, sslBundle=False, timeout=None):
+    # Maximum number of pages requested concurrently by get_all
+    DEFAULT_PAGINATION_MAX_WORKERS = 4
+
+    def __init__(self, applianceIp, api_version=300, sslBundle=False, timeout=None,
+                 pool_size=ConnectionPool.DEFAULT_MAX_SIZE, pool_idle_timeout=ConnectionPool.DEFAULT_IDLE_TIMEOUT):
         self._session = None
         self._host = applianceIp
         self._cred = None
@@ -73,8 +830,19 @@ class connection(object):
         self._prevPage = None
         self._numTotalRecords = 0
         self._numDisplayedRecords = 0
+        self._pageSize = None
+        self._paginationMaxWorkers = self.DEFAULT_PAGINATION_MAX_WORKERS
         self._validateVersion = False
         self._timeout = timeout
+        self._ssl_context = None
+        self._tls_sessions = TLSSessionCache()
+        self._pool = ConnectionPool(lambda: self.get_connection(), pool_size, pool_idle_timeout)
+        self._response_cache = None
+        self._rate_limiter = None
+        self._retry_policy = RetryPolicy()
+        self._compression = None
+        self._inventory_snapshots = {}
+        self._hooks = ()
 
     def validateVersion(self):
         version = self.get(uri['version'])
@@ -90,12 +858,266 @@ class connection(object):
         self._proxyHost = proxyHost
         self._proxyPort = proxyPort
         self._doProxy = True
+        self._pool.clear()
 
     def set_trusted_ssl_bundle(self, sslBundle):
         if sslBundle:
             self._sslTrustAll = False
+            self._sslTrustedBundle = sslBundle
+            if hasattr(self, '_pool'):
+                # The cached context and sessions were negotiated with the previous trust settings
+                self._ssl_context = None
+                self._tls_sessions.clear()
+                self._pool.clear()
         return sslBundle
 
+    def set_connection_pool(self, max_size=None, idle_timeout=None):
+        """
+        Configures the pool of keep-alive connections used for the requests to the appliance.
+
+        Args:
+            max_size: Maximum number of idle connections kept open. Use 0 to open a new connection for each request.
+            idle_timeout: Seconds an idle connection is kept open before being closed.
+        """
+        self._pool.configure(max_size, idle_timeout)
+
+    def set_pagination(self, page_size=None, max_workers=None):
+        """
+        Configures how the remaining pages of a collection are retrieved once the first page is known.
+
+        Args:
+            page_size: Number of items requested on each remaining page. By default, the number of items returned on
+                the first page is used.
+            max_workers: Maximum number of pages requested concurrently. Use 1 to follow nextPageUri one page at a time.
+        """
+        if page_size is not None:
+            self._pageSize = page_size
+        if max_workers is not None:
+            self._paginationMaxWorkers = max_workers
+
+    def get_pagination(self):
+        """
+        Gets how the remaining pages of a collection are retrieved, as configured with set_pagination.
+
+        Returns:
+            dict: The page_size, None when the size of the first page is used, and the max_workers.
+        """
+        return dict(page_size=self._pageSize, max_workers=self._paginationMaxWorkers)
+
+    def get_tls_handshake_stats(self):
+        """
+        Gets how many TLS handshakes with the appliance were full and how many resumed a previous session.
+
+        Returns:
+            dict: full_handshakes and resumed_handshakes counters.
+        """
+        return self._tls_sessions.get_stats()
+
+    def close_connections(self):
+        """
+        Closes all the idle keep-alive connections to the appliance.
+        """
+        self._pool.clear()
+
+    def enable_response_cache(self, max_size=ResponseCache.DEFAULT_MAX_SIZE, ttl=ResponseCache.DEFAULT_TTL,
+                              resource_ttls=None):
+        """
+        Enables the cache of GET responses. The cached resources are requested with If-None-Match and their body is
+        not downloaded again while the appliance answers 304 Not Modified. The PUT, PATCH, POST and DELETE requests
+        sent through this connection remove the changed resources from the cache.
+
+        Args:
+            max_size: Maximum number of cached responses. The least recently used ones are evicted first.
+            ttl: Seconds a response is kept in the cache.
+            resource_ttls (dict): TTL in seconds by resource type, keyed by URI prefix, for example
+                {'/rest/server-hardware': 600, '/rest/tasks': 0}. A TTL of 0 disables the cache for the resource type.
+        """
+        self._response_cache = ResponseCache(max_size, ttl, resource_ttls)
+
+    def disable_response_cache(self):
+        """
+        Disables the cache of GET responses and discards the cached ones.
+        """
+        self._response_cache = None
+
+    def invalidate_response_cache(self, uri):
+        """
+        Removes a resource, its subresources and its collection from the response cache, if enabled, after the
+        resource was changed by another client.
+
+        Args:
+            uri: URI of the changed resource.
+        """
+        if self._response_cache is not None:
+            self._response_cache.invalidate(uri)
+
+    def get_response_cache_stats(self):
+        """
+        Gets the counters of the cache of GET responses.
+
+        Returns:
+            dict: entries, hits and misses counters; or None when the cache is disabled.
+        """
+        return self._response_cache.get_stats() if self._response_cache is not None else None
+
+    def enable_rate_limiter(self, rate=AdaptiveRateLimiter.DEFAULT_RATE, min_rate=AdaptiveRateLimiter.DEFAULT_MIN_RATE,
+                            max_rate=AdaptiveRateLimiter.DEFAULT_MAX_RATE,
+                            max_in_flight=AdaptiveRateLimiter.DEFAULT_MAX_IN_FLIGHT,
+                            target_latency=AdaptiveRateLimiter.DEFAULT_TARGET_LATENCY,
+                            max_retries=AdaptiveRateLimiter.DEFAULT_MAX_RETRIES):
+        """
+        Paces the REST requests sent through this connection with an adaptive rate limiter. The requests refused with
+        429 or 503 are sent again, after the delay of the Retry-After header when there is one. Downloads and uploads
+        are not paced.
+
+        Args:
+            rate: Initial number of requests per second.
+            min_rate: Lowest rate the limiter slows down to.
+            max_rate: Highest rate the limiter speeds up to.
+            max_in_flight: Maximum number of requests sent at once.
+            target_latency: Seconds above which a response is taken as a sign of overload.
+            max_retries: Number of times a request refused with 429 or 503 is sent again.
+        """
+        self._rate_limiter = AdaptiveRateLimiter(rate=rate, min_rate=min_rate, max_rate=max_rate,
+                                                 max_in_flight=max_in_flight, target_latency=target_latency,
+                                                 max_retries=max_retries)
+
+    def disable_rate_limiter(self):
+        """
+        Stops pacing the requests.
+        """
+        self._rate_limiter = None
+
+    def get_rate_limiter_stats(self):
+        """
+        Gets the state of the rate limiter.
+
+        Returns:
+            dict: rate, in_flight, throttled and slow counters; or None when the rate limiter is disabled.
+        """
+        return self._rate_limiter.get_stats() if self._rate_limiter is not None else None
+
+    def enable_compression(self):
+        """
+        Asks the appliance to compress the bodies of the REST responses and of the downloads with gzip or deflate.
+        The bodies are decoded as they are received. Ranged downloads are never compressed.
+        """
+        self._compression = ResponseCompression()
+
+    def disable_compression(self):
+        """
+        Stops asking for compressed responses.
+        """
+        self._compression = None
+
+    def get_compression_stats(self):
+        """
+        Gets the counters of the compressed responses.
+
+        Returns:
+            dict: responses, compressed, bytes_received, bytes_decoded and ratio; or None when the compression is
+            disabled.
+        """
+        return self._compression.get_stats() if self._compression is not None else None
+
+    def add_inventory_snapshot(self, snapshot):
+        """
+        Registers the inventory snapshot of a collection, used by the ResourceClient lookups on that collection.
+
+        Args:
+            snapshot (InventorySnapshot): Snapshot, registered under its URI.
+        """
+        self._inventory_snapshots[snapshot.uri] = snapshot
+
+    def remove_inventory_snapshot(self, uri):
+        """
+        Unregisters the inventory snapshot of a collection.
+
+        Args:
+            uri: URI of the collection.
+        """
+        self._inventory_snapshots.pop(uri, None)
+
+    def get_inventory_snapshot(self, uri):
+        """
+        Gets the inventory snapshot of a collection.
+
+        Args:
+            uri: URI of the collection.
+
+        Returns:
+            InventorySnapshot: The snapshot, or None when the collection has none.
+        """
+        return self._inventory_snapshots.get(uri)
+
+    def get_inventory_snapshots(self):
+        """
+        Returns:
+            list: The registered inventory snapshots.
+        """
+        return list(self._inventory_snapshots.values())
+
+    def _get_request_headers(self, custom_headers=None):
+        http_headers = self._headers.copy()
+        if self._compression is not None:
+            http_headers['Accept-Encoding'] = ResponseCompression.ACCEPT_ENCODING
+        if custom_headers:
+            http_headers.update(custom_headers)
+        return http_headers
+
+    def set_retry_policy(self, policy):
+        """
+        Sets how the idempotent requests that fail with a transient error are sent again.
+
+        Args:
+            policy (RetryPolicy): Policy to apply, or None to never send a failed request again.
+        """
+        self._retry_policy = policy if policy is not None else RetryPolicy(max_attempts=1)
+
+    def get_retry_policy(self):
+        """
+        Gets the policy applied to the failed requests.
+
+        Returns:
+            RetryPolicy
+        """
+        return self._retry_policy
+
+    def add_hook(self, hook):
+        """
+        Registers a hook to measure the requests and the task waits. See ConnectionHook.
+
+        Args:
+            hook (ConnectionHook): Hook to register.
+        """
+        self._hooks = self._hooks + (hook,)
+
+    def remove_hook(self, hook):
+        """
+        Unregisters a hook registered with add_hook.
+
+        Args:
+            hook (ConnectionHook): Hook to unregister.
+        """
+        self._hooks = tuple(registered for registered in self._hooks if registered is not hook)
+
+    def record_task_wait(self, task_uri, duration, poll_count, error=None):
+        """
+        Passes the measures of a task wait to the registered hooks.
+
+        Args:
+            task_uri: Task URI.
+            duration: Seconds waited.
+            poll_count: Number of requests made to check the task state.
+            error: Exception raised while waiting, if any.
+        """
+        if not self._hooks:
+            return
+
+        event = TaskWaitEvent(task_uri, duration, poll_count, error)
+        for hook in self._hooks:
+            hook.after_task_wait(event)
+
     def get_session(self):
         return self._session
 
@@ -115,85 +1137,245 @@ class connection(object):
     def make_url(self, path):
         return 'https://%s%s' % (self._host, path)
 
-    def do_http(self, method, path, body, custom_headers=None):
-        http_headers = self._headers.copy()
-        if custom_headers:
-            http_headers.update(custom_headers)
+    def do_http(self, method, path, body, custom_headers=None, raw=False):
+        """
+        Sends a request to the appliance.
 
+        Args:
+            method: HTTP method.
+            path: URI of the request.
+            body: Body of the request, as a string.
+            custom_headers: Headers added to the default ones.
+            raw: When True, the body of a successful response is returned unparsed as a RawBody.
+
+        Returns:
+            tuple: The response and its body, parsed from JSON when possible.
+        """
+        http_headers = self._get_request_headers(custom_headers)
+
+        attempts = self._retry_policy.start(method, http_headers, body)
+        while True:
+            resp, resp_body = self.__send_request(method, path, body, http_headers, attempts, raw)
+            if self._rate_limiter is not None and resp.status in AdaptiveRateLimiter.THROTTLED_STATUSES:
+                # The rate limiter already sent the throttled request again
+                return resp, resp_body
+            if not attempts.retry_response(resp):
+                return resp, resp_body
+
+    def __send_request(self, method, path, body, http_headers, attempts, raw):
+        rate_limiter = self._rate_limiter
+        if rate_limiter is None:
+            return self.__instrument_request(method, path, len(body or ''),
+                                             lambda event: self.__do_http(method, path, body, http_headers, event, attempts, raw))
+
+        retries = 0
+        while True:
+            rate_limiter.acquire()
+            started = default_timer()
+            resp = None
+            try:
+                resp, resp_body = self.__instrument_request(
+                    method, path, len(body or ''), lambda event: self.__do_http(method, path, body, http_headers, event, attempts, raw))
+            finally:
+                rate_limiter.release(resp.status if resp is not None else None, default_timer() - started,
+                                     get_retry_after(resp))
+
+            if resp.status not in AdaptiveRateLimiter.THROTTLED_STATUSES or retries >= rate_limiter.max_retries:
+                return resp, resp_body
+            retries += 1
+            logger.debug('The appliance answered %d to %s %s. Sending it again...' % (resp.status, method, path))
+
+    def __do_http(self, method, path, body, http_headers, event, attempts, raw):
         bConnected = False
         conn = None
         while bConnected is False:
+            reused = False
             try:
-                conn = self.get_connection()
+                conn = self._pool.acquire()
+                reused = conn.sock is not None
+                event.connect(conn)
                 conn.request(method, path, body, http_headers)
+                event.request_sent()
                 resp = conn.getresponse()
-                tempbytes = ''
-                try:
-                    tempbytes = resp.read()
-                    tempbody = tempbytes.decode('utf-8')
-                except UnicodeDecodeError:  # Might be binary data
-                    tempbody = tempbytes
-                    conn.close()
-                    bConnected = True
-                    return resp, tempbody
-                if tempbody:
+                event.response_received(resp)
+                tempbytes = resp.read()
+                event.body_received(len(tempbytes))
+                if self._compression is not None:
+                    tempbytes = self._compression.decode(resp, tempbytes)
+                if raw and resp.status < 400:
+                    body = RawBody(tempbytes)
+                elif tempbytes:
+                    # The parser reads the bytes, without decoding them to a string first
                     try:
-                        body = json.loads(tempbody)
+                        body = event.decode_json(tempbytes)
                     except ValueError:
-                        body = tempbody
-                conn.close()
+                        try:
+                            body = tempbytes.decode('utf-8')
+                        except UnicodeDecodeError:  # Might be binary data
+                            conn.close()
+                            bConnected = True
+                            return resp, tempbytes
+                self._pool.release(conn, reusable=not resp.will_close)
                 bConnected = True
-            except http.client.BadStatusLine:
-                logger.warning('Bad Status Line. Trying again...')
-                if conn:
-                    conn.close()
-                time.sleep(1)
+            except (http.client.BadStatusLine, socket.error) as e:
+                self.__handle_connection_error(e, conn, reused, attempts)
                 continue
             except http.client.HTTPException:
+                if conn:
+                    conn.close()
                 raise HPOneViewException('Failure during login attempt.\n %s' % traceback.format_exc())
 
         return resp, body
 
+    def __instrument_request(self, method, uri, bytes_sent, request):
+        hooks = self._hooks
+        if not hooks:
+            return request(NULL_REQUEST_EVENT)
+
+        event = RequestEvent(method, uri, bytes_sent)
+        for hook in hooks:
+            hook.before_request(event)
+
+        error = None
+        try:
+            return request(event)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            event.finish(error)
+            for hook in hooks:
+                hook.after_request(event)
+
     def download_to_stream(self, stream_writer, url, body='', method='GET', custom_headers=None):
+        http_headers = self._get_request_headers(custom_headers)
+
+        self.__instrument_request(
+            method, url, len(body or ''),
+            lambda event: self.__download_to_stream(stream_writer, url, body, method, http_headers, event))
+        return True
+
+    def download_range(self, stream_writer, url, start, end):
+        """
+        Downloads the bytes from start to end (inclusive) of a URI to a stream, with a Range request.
+
+        Args:
+            stream_writer: Object with a write method that receives the content.
+            url: URI of the content.
+            start: Offset of the first byte.
+            end: Offset of the last byte.
+
+        Returns:
+            tuple: The status of the response and the total size of the content, or None when it is unknown.
+            A status 200 means the appliance ignored the Range header and wrote the whole content to the stream.
+        """
         http_headers = self._headers.copy()
-        if custom_headers:
-            http_headers.update(custom_headers)
+        http_headers['Range'] = 'bytes=%d-%d' % (start, end)
+
+        resp = self.__instrument_request(
+            'GET', url, 0,
+            lambda event: self.__download_to_stream(stream_writer, url, '', 'GET', http_headers, event))
 
-        chunk_size = 4096
+        if resp.status == 206:
+            content_range = resp.getheader('Content-Range') or ''
+            total = content_range.rpartition('/')[2]
+        else:
+            total = resp.getheader('Content-Length')
+        return resp.status, int(total) if total and total.isdigit() else None
+
+    def __download_to_stream(self, stream_writer, url, body, method, http_headers, event):
         conn = None
+        attempts = self._retry_policy.start(method, http_headers, body)
 
-        successful_connected = False
-        while not successful_connected:
+        while True:
+            reused = False
+            received = [0]
             try:
-                conn = self.get_connection()
+                conn = self._pool.acquire()
+                reused = conn.sock is not None
+                event.connect(conn)
                 conn.request(method, url, body, http_headers)
+                event.request_sent()
                 resp = conn.getresponse()
+                event.response_received(resp)
 
                 if resp.status >= 400:
                     self.__handle_download_error(resp, conn)
 
-                tempbytes = True
-                while tempbytes:
-                    tempbytes = resp.read(chunk_size)
-                    if tempbytes:  # filter out keep-alive new chunks
-                        stream_writer.write(tempbytes)
-
-                conn.close()
-                successful_connected = True
-            except http.client.BadStatusLine:
-                logger.warning('Bad Status Line. Trying again...')
-                if conn:
-                    conn.close()
-                time.sleep(1)
+                # Writers that keep the chunks must receive copies, the chunks read are views on a reused buffer
+                copy = getattr(stream_writer, 'accepts_memoryview', False) is not True
+                if self._compression is None:
+                    self.__read_body_to_stream(resp, stream_writer, received, event, copy)
+                else:
+                    writer = self._compression.get_writer(resp, stream_writer.write)
+                    self.__read_body_to_stream(resp, writer, received, event, copy)
+                    writer.close()
+
+                self._pool.release(conn, reusable=not resp.will_close)
+                return resp
+            except (http.client.BadStatusLine, socket.error) as e:
+                # Trying again would write the start of the content twice once a part of it was received
+                self.__handle_connection_error(e, conn, reused and not received[0], None if received[0] else attempts)
                 continue
             except http.client.HTTPException:
+                if conn:
+                    conn.close()
                 raise HPOneViewException('Failure during login attempt.\n %s' % traceback.format_exc())
 
-        return successful_connected
+    @staticmethod
+    def __read_body_to_stream(resp, stream_writer, received, event, copy):
+        readinto = getattr(resp, 'readinto', None)
+        if readinto is None:
+            # Python 2 responses can only return new strings
+            tempbytes = resp.read(DOWNLOAD_MIN_BUFFER_SIZE)
+            while tempbytes:
+                received[0] += len(tempbytes)
+                event.body_received(len(tempbytes))
+                stream_writer.write(tempbytes)
+                tempbytes = resp.read(DOWNLOAD_MIN_BUFFER_SIZE)
+            return
+
+        # The same buffer receives every read. It doubles while the reads fill it, so fast links make fewer calls
+        buffer = bytearray(DOWNLOAD_MIN_BUFFER_SIZE)
+        view = memoryview(buffer)
+        count = readinto(view)
+        while count:
+            received[0] += count
+            event.body_received(count)
+            stream_writer.write(bytes(view[:count]) if copy else view[:count])
+            if count == len(buffer) and len(buffer) < DOWNLOAD_MAX_BUFFER_SIZE:
+                buffer = bytearray(len(buffer) * 2)
+                view = memoryview(buffer)
+            count = readinto(view)
+
+    def __handle_connection_error(self, error, conn, reused, attempts):
+        if conn:
+            conn.close()
+
+        if reused and self.__is_dropped_connection(error):
+            # The appliance dropped the idle keep-alive connection, try again on a new one
+            logger.debug('Keep-alive connection closed by the appliance. Trying again...')
+            return
+
+        if attempts is None or not attempts.retry_error(error):
+            if not isinstance(error, http.client.BadStatusLine):
+                raise error
+            # As the other HTTPException, a bad status line that is not sent again is raised as HPOneViewException
+            exception = HPOneViewException('Failure during the request.\n %s' % traceback.format_exc())
+            exception.__cause__ = error
+            raise exception
+
+    @staticmethod
+    def __is_dropped_connection(error):
+        if isinstance(error, http.client.BadStatusLine):
+            return True
+        return getattr(error, 'errno', None) in DROPPED_CONNECTION_ERROR_NUMBERS
 
     def __handle_download_error(self, resp, conn):
         try:
             tempbytes = resp.read()
+            if self._compression is not None:
+                tempbytes = self._compression.decode(resp, tempbytes)
             tempbody = tempbytes.decode('utf-8')
             try:
                 body = json.loads(tempbody)
@@ -208,71 +1390,83 @@ class connection(object):
         conn.close()
         raise HPOneViewException(body)
 
-    def get_connection(self):
-        context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-        if self._sslTrustAll is False:
-            context.verify_mode = ssl.CERT_REQUIRED
-            context.load_verify_locations(self._sslTrustedBundle)
-            if self._doProxy is False:
-                conn = http.client.HTTPSConnection(self._host,
-                                                   context=context,
-                                                   timeout=self._timeout)
+    def get_ssl_context(self):
+        """
+        Gets the SSLContext shared by all the connections to the appliance. It is built on the first call, so the
+        trusted CA bundle is only loaded once.
+
+        Returns:
+            ssl.SSLContext
+        """
+        context = self._ssl_context
+        if context is None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+            if self._sslTrustAll is False:
+                context.verify_mode = ssl.CERT_REQUIRED
+                context.load_verify_locations(self._sslTrustedBundle)
             else:
-                conn = http.client.HTTPSConnection(self._proxyHost,
-                                                   self._proxyPort,
-                                                   context=context,
-                                                   timeout=self._timeout)
-                conn.set_tunnel(self._host, 443)
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return context
+
+    def get_connection(self):
+        context = self.get_ssl_context()
+        if self._doProxy is False:
+            conn = ResumableHTTPSConnection(self._host,
+                                            context=context,
+                                            timeout=self._timeout,
+                                            tls_sessions=self._tls_sessions)
         else:
-            context.verify_mode = ssl.CERT_NONE
-            if self._doProxy is False:
-                conn = http.client.HTTPSConnection(self._host,
-                                                   context=context,
-                                                   timeout=self._timeout)
-            else:
-                conn = http.client.HTTPSConnection(self._proxyHost,
-                                                   self._proxyPort,
-                                                   context=context,
-                                                   timeout=self._timeout)
-                conn.set_tunnel(self._host, 443)
+            conn = ResumableHTTPSConnection(self._proxyHost,
+                                            self._proxyPort,
+                                            context=context,
+                                            timeout=self._timeout,
+                                            tls_sessions=self._tls_sessions)
+            conn.set_tunnel(self._host, 443)
 
         return conn
 
     def _open(self, name, mode):
         return open(name, mode)
 
+    def encode_multipart_envelope(self, baseName):
+        """
+        Builds the multipart/form-data parts sent before and after the content of an uploaded file.
+
+        Returns: (content_type, preamble, epilogue), the last two as bytes
+        """
+        content_type = 'multipart/form-data; boundary=%s' % MULTIPART_BOUNDARY
+        preamble = ('--' + MULTIPART_BOUNDARY + CRLF +
+                    'Content-Disposition: form-data; name="file"; filename="' + baseName + '"' + CRLF +
+                    'Content-Type: application/octet-stream' + CRLF +
+                    CRLF)
+        epilogue = CRLF + '--' + MULTIPART_BOUNDARY + '--' + CRLF + CRLF
+        return content_type, bytearray(preamble, 'utf-8'), bytearray(epilogue, 'utf-8')
+
     def encode_multipart_formdata(self, fields, files, baseName, verbose=False):
         """
         Fields is a sequence of (name, value) elements for regular form fields.
         Files is a sequence of (name, filename, value) elements for data
         to be uploaded as files
 
+        Note: post_multipart no longer uses this method, it streams the file without the encoded copy.
+
         Returns: (content_type, body) ready for httplib.HTTP instance
         """
-        BOUNDARY = '----------ThIs_Is_tHe_bouNdaRY_$'
-        CRLF = '\r\n'
-        content_type = 'multipart/form-data; boundary=%s' % BOUNDARY
         if verbose is True:
             print(('Encoding ' + baseName + ' for upload...'))
+        content_type, preamble, epilogue = self.encode_multipart_envelope(baseName)
         fin = self._open(files, 'rb')
         fout = self._open(files + '.b64', 'wb')
-        fout.write(bytearray('--' + BOUNDARY + CRLF, 'utf-8'))
-        fout.write(bytearray('Content-Disposition: form-data'
-                             '; name="file"; filename="' +
-                             baseName + '"' + CRLF, "utf-8"))
-        fout.write(bytearray('Content-Type: application/octet-stream' + CRLF,
-                             'utf-8'))
-        fout.write(bytearray(CRLF, 'utf-8'))
+        fout.write(preamble)
         shutil.copyfileobj(fin, fout)
-        fout.write(bytearray(CRLF, 'utf-8'))
-        fout.write(bytearray('--' + BOUNDARY + '--' + CRLF, 'utf-8'))
-        fout.write(bytearray(CRLF, 'utf-8'))
+        fout.write(epilogue)
         fout.close()
         fin.close()
         return content_type
 
-    def post_multipart_with_response_handling(self, uri, file_path, baseName):
-        resp, body = self.post_multipart(uri, None, file_path, baseName)
+    def post_multipart_with_response_handling(self, uri, file_path, baseName, progress=None):
+        resp, body = self.post_multipart(uri, None, file_path, baseName, progress=progress)
 
         if resp.status == 202:
             task = self.__get_task_from_response(resp, body)
@@ -283,57 +1477,116 @@ class connection(object):
 
         return None, body
 
-    def post_multipart(self, uri, fields, files, baseName, verbose=False):
-        content_type = self.encode_multipart_formdata(fields, files, baseName,
-                                                      verbose)
-        inputfile = self._open(files + '.b64', 'rb')
-        mappedfile = mmap.mmap(inputfile.fileno(), 0, access=mmap.ACCESS_READ)
+    def post_multipart(self, uri, fields, files, baseName, verbose=False, progress=None):
+        """
+        Uploads a file as multipart/form-data. The file is streamed to the appliance, without an encoded copy on disk.
+
+        Args:
+            progress: Optional callable invoked as progress(bytes_sent, file_size) while the file is sent.
+
+        Returns: (response, body)
+        """
+        content_type, preamble, epilogue = self.encode_multipart_envelope(baseName)
+        fileSize = os.path.getsize(files)
+        totalSize = len(preamble) + fileSize + len(epilogue)
+
+        return self.__instrument_request(
+            'POST', uri, totalSize,
+            lambda event: self.__post_multipart(uri, files, baseName, (content_type, preamble, epilogue), fileSize,
+                                                verbose, progress, event))
+
+    def __post_multipart(self, uri, files, baseName, envelope, fileSize, verbose, progress, event):
+        content_type, preamble, epilogue = envelope
+        totalSize = len(preamble) + fileSize + len(epilogue)
         if verbose is True:
             print(('Uploading ' + files + '...'))
-        conn = self.get_connection()
+        conn = self._pool.acquire()
         # conn.set_debuglevel(1)
-        conn.connect()
-        conn.putrequest('POST', uri)
-        conn.putheader('uploadfilename', baseName)
-        conn.putheader('auth', self._headers['auth'])
-        conn.putheader('Content-Type', content_type)
-        totalSize = os.path.getsize(files + '.b64')
-        conn.putheader('Content-Length', totalSize)
-        conn.putheader('X-API-Version', self._apiVersion)
-        conn.endheaders()
-
-        while mappedfile.tell() < mappedfile.size():
-            # Send 1MB at a time
-            # NOTE: Be careful raising this value as the read chunk
-            # is stored in RAM
-            readSize = 1048576
-            conn.send(mappedfile.read(readSize))
-            if verbose is True:
-                print('%d bytes sent... \r' % mappedfile.tell())
-        mappedfile.close()
-        inputfile.close()
-        os.remove(files + '.b64')
-        response = conn.getresponse()
-        body = response.read().decode('utf-8')
+        try:
+            event.connect(conn)
+            if conn.sock is None:
+                conn.connect()
+            conn.putrequest('POST', uri)
+            conn.putheader('uploadfilename', baseName)
+            conn.putheader('auth', self._headers['auth'])
+            conn.putheader('Content-Type', content_type)
+            conn.putheader('Content-Length', totalSize)
+            conn.putheader('X-API-Version', self._apiVersion)
+            conn.endheaders()
+
+            conn.send(preamble)
+            with self._open(files, 'rb') as inputfile:
+                self.__send_file(conn, inputfile, fileSize, verbose, progress)
+            conn.send(epilogue)
+            event.request_sent()
+            response = conn.getresponse()
+            event.response_received(response)
+            body = response.read()
+        except Exception:
+            conn.close()
+            raise
+
+        event.body_received(len(body))
+        body = body.decode('utf-8')
 
         if body:
             try:
-                body = json.loads(body)
+                body = event.decode_json(body)
             except ValueError:
                 body = response.read().decode('utf-8')
 
-        conn.close()
+        self._pool.release(conn, reusable=not response.will_close)
 
         if response.status >= 400:
             raise HPOneViewException(body)
 
         return response, body
 
+    @staticmethod
+    def __send_file(conn, inputfile, fileSize, verbose, progress):
+        sock = conn.sock
+        if hasattr(sock, 'sendfile') and not isinstance(sock, ssl.SSLSocket):
+            # The kernel copies the file to the socket
+            if progress is None:
+                sock.sendfile(inputfile)
+                return
+            offset = 0
+            while offset < fileSize:
+                sent = sock.sendfile(inputfile, offset, min(UPLOAD_CHUNK_SIZE, fileSize - offset))
+                if not sent:
+                    break
+                offset += sent
+                progress(offset, fileSize)
+            return
+
+        # The TLS encryption happens in user space, so the file is read and sent 1MB at a time
+        # NOTE: Be careful raising this value as the read chunk is stored in RAM
+        sent = 0
+        chunk = inputfile.read(UPLOAD_CHUNK_SIZE)
+        while chunk:
+            conn.send(chunk)
+            sent += len(chunk)
+            if verbose is True:
+                print('%d bytes sent... \r' % sent)
+            if progress is not None:
+                progress(sent, fileSize)
+            chunk = inputfile.read(UPLOAD_CHUNK_SIZE)
+
     ###########################################################################
     # Utility functions for making requests - the HTTP verbs
     ###########################################################################
-    def get(self, uri):
-        resp, body = self.do_http('GET', uri, '')
+    def get(self, uri, raw=False):
+        if raw:
+            resp, body = self.do_http('GET', uri, '', raw=True)
+            if resp.status >= 400:
+                raise HPOneViewException(body)
+            if resp.status == 302:
+                body = self.get(resp.getheader('Location'), raw=True)
+            return body
+        if self._response_cache is not None:
+            resp, body = self.__get_with_response_cache(uri)
+        else:
+            resp, body = self.do_http('GET', uri, '')
         if resp.status >= 400:
             raise HPOneViewException(body)
         if resp.status == 302:
@@ -349,6 +1602,19 @@ class connection(object):
                 self._numDisplayedRecords = body['count']
         return body
 
+    def __get_with_response_cache(self, uri):
+        response_cache = self._response_cache
+        entry = response_cache.lookup(uri)
+        custom_headers = {'If-None-Match': entry[0]} if entry else None
+
+        resp, body = self.do_http('GET', uri, '', custom_headers=custom_headers)
+
+        if resp.status == 304 and entry:
+            return resp, response_cache.revalidated(uri, entry)
+        if resp.status == 200 and isinstance(body, dict):
+            response_cache.update(uri, resp.getheader('ETag') or body.get('eTag'), body)
+        return resp, body
+
     def getNextPage(self):
         body = self.get(self._nextPage)
         return get_members(body)
@@ -396,6 +1662,9 @@ class connection(object):
         return task
 
     def __do_rest_call(self, http_method, uri, body, custom_headers):
+        if self._response_cache is not None:
+            self._response_cache.invalidate(uri)
+
         resp, body = self.do_http(method=http_method,
                                   path=uri,
                                   body=json.dumps(body),
@@ -26,13 +26,15 @@ from __future__ import unicode_literals
 from __future__ import print_function
 from __future__ import division
 from __future__ import absolute_import
-from future import standard_library
-
-standard_library.install_aliases()
 
 import logging
+import sys
 import traceback
-from past.builtins import basestring
+
+if sys.version_info[0] < 3:
+    from past.builtins import basestring
+else:
+    basestring = str
 
 logger = logging.getLogger(__name__)
 
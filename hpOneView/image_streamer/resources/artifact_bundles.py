@@ -25,10 +25,6 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
-from future import standard_library
-
-standard_library.install_aliases()
-
 
 from hpOneView.resources.resource import ResourceClient, extract_id_from_uri
 
@@ -139,34 +135,40 @@ class ArtifactBundles(object):
         uri = self.BACKUPS_PATH + '/' + extract_id_from_uri(id_or_uri)
         return self._client.get(id_or_uri=uri)
 
-    def download_archive_artifact_bundle(self, id_or_uri, file_path):
+    def download_archive_artifact_bundle(self, id_or_uri, file_path, parts=1, checksum=None):
         """
         Downloads an archive for the Artifact Bundle.
 
         Args:
             id_or_uri: ID or URI of the Artifact Bundle.
             file_path(str): Destination file path.
+            parts (int): Number of concurrent range requests, used when the appliance accepts ranged downloads.
+                Defaults to a single request.
+            checksum (str): Optional SHA-256 hex digest the downloaded file must match.
 
         Returns:
             bool: Successfully downloaded.
         """
 
         uri = self.BACKUP_ARCHIVE_PATH + '/' + extract_id_from_uri(id_or_uri)
-        return self._client.download(uri, file_path)
+        return self._client.download(uri, file_path, parts=parts, checksum=checksum)
 
-    def download_artifact_bundle(self, id_or_uri, file_path):
+    def download_artifact_bundle(self, id_or_uri, file_path, parts=1, checksum=None):
         """
         Download the Artifact Bundle.
 
         Args:
             id_or_uri: ID or URI of the Artifact Bundle.
             file_path(str): Destination file path.
+            parts (int): Number of concurrent range requests, used when the appliance accepts ranged downloads.
+                Defaults to a single request.
+            checksum (str): Optional SHA-256 hex digest the downloaded file must match.
 
         Returns:
             bool: Successfully downloaded.
         """
         uri = self.DOWNLOAD_PATH + '/' + extract_id_from_uri(id_or_uri)
-        return self._client.download(uri, file_path)
+        return self._client.download(uri, file_path, parts=parts, checksum=checksum)
 
     def create_backup(self, resource, timeout=-1):
         """
@@ -184,17 +186,18 @@ class ArtifactBundles(object):
         """
         return self._client.create(resource, uri=self.BACKUPS_PATH, timeout=timeout)
 
-    def upload_bundle_from_file(self, file_path):
+    def upload_bundle_from_file(self, file_path, progress=None):
         """
         Restore an Artifact Bundle from a backup file.
 
         Args:
             file_path (str): The File Path to restore the Artifact Bundle.
+            progress: Optional callable that receives an UploadProgress each time a chunk of the file is sent.
 
         Returns:
             dict: Artifact bundle.
         """
-        return self._client.upload(file_path)
+        return self._client.upload(file_path, progress=progress)
 
     def upload_backup_bundle_from_file(self, file_path, deployment_groups_id_or_uri):
         """
@@ -25,10 +25,6 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
-from future import standard_library
-
-standard_library.install_aliases()
-
 
 from hpOneView.resources.resource import ResourceClient, extract_id_from_uri
 from hpOneView.resources.task_monitor import TaskMonitor
@@ -87,7 +83,7 @@ class GoldenImages(object):
         data.update(resource)
         return self._client.create(data, timeout=timeout)
 
-    def upload(self, file_path, golden_image_info):
+    def upload(self, file_path, golden_image_info, progress=None):
         """
         Adds a Golden Image resource from the file that is uploaded from a local drive. Only the .zip format file can
         be used for the upload.
@@ -95,6 +91,7 @@ class GoldenImages(object):
         Args:
             file_path (str): File name to upload.
             golden_image_info (dict): Golden Image information.
+            progress: Optional callable that receives an UploadProgress each time a chunk of the file is sent.
 
         Returns:
             dict: Golden Image.
@@ -103,9 +100,9 @@ class GoldenImages(object):
                                                     quote(golden_image_info.get('name', '')),
                                                     quote(golden_image_info.get('description', '')))
 
-        return self._client.upload(file_path, uri)
+        return self._client.upload(file_path, uri, progress=progress)
 
-    def download_archive(self, id_or_uri, file_path):
+    def download_archive(self, id_or_uri, file_path, parts=1, checksum=None):
         """
         Download the details of the Golden Image capture logs, which has been archived based on the specific attribute
         ID.
@@ -113,26 +110,32 @@ class GoldenImages(object):
         Args:
             id_or_uri: ID or URI of the Golden Image.
             file_path (str): File name to save the archive.
+            parts (int): Number of concurrent range requests, used when the appliance accepts ranged downloads.
+                Defaults to a single request.
+            checksum (str): Optional SHA-256 hex digest the downloaded file must match.
 
         Returns:
             bool: Success.
         """
         uri = self.URI + "/archive/" + extract_id_from_uri(id_or_uri)
-        return self._client.download(uri, file_path)
+        return self._client.download(uri, file_path, parts=parts, checksum=checksum)
 
-    def download(self, id_or_uri, file_path):
+    def download(self, id_or_uri, file_path, parts=1, checksum=None):
         """
         Downloads the content of the selected Golden Image as per the specified attributes.
 
         Args:
             id_or_uri: ID or URI of the Golden Image.
             file_path(str): Destination file path.
+            parts (int): Number of concurrent range requests, used when the appliance accepts ranged downloads.
+                Defaults to a single request.
+            checksum (str): Optional SHA-256 hex digest the downloaded file must match.
 
         Returns:
             bool: Successfully downloaded.
         """
         uri = self.URI + "/download/" + extract_id_from_uri(id_or_uri)
-        return self._client.download(uri, file_path)
+        return self._client.download(uri, file_path, parts=parts, checksum=checksum)
 
     def get(self, id_or_uri):
         """
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+instrumentation.py
+~~~~~~~~~~~~~~~~~~
+
+This module provides hooks to measure the requests sent to the appliance and the time spent waiting for tasks,
+together with an in-memory histogram collector and a Prometheus text exporter.
+
+Examples:
+    >>> collector = HistogramCollector()
+    >>> oneview_client.connection.add_hook(collector)
+    >>> print(export_prometheus_text(collector))
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import re
+import threading
+
+from hpOneView import json_backend
+from timeit import default_timer
+
+# Path segments with a digit and at least 8 characters are resource IDs, like UUIDs and serial numbers
+RESOURCE_ID_SEGMENT = re.compile(r'^(?=.*\d)[^/]{8,}$')
+
+# Upper bounds, in seconds, of the histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+
+def get_uri_template(uri):
+    """
+    Gets the URI without the query and with the resource IDs replaced by {id}, to group the requests by endpoint.
+
+    Args:
+        uri: Request URI.
+
+    Returns:
+        str: URI template, for example /rest/server-profiles/{id}.
+    """
+    path = uri.split('?')[0]
+    return '/'.join('{id}' if RESOURCE_ID_SEGMENT.match(segment) else segment for segment in path.split('/'))
+
+
+class RequestEvent(object):
+    """
+    Measures of a request sent to the appliance. The times are in seconds.
+
+    Attributes:
+        method: HTTP method.
+        uri: Request URI.
+        uri_template: URI template, see get_uri_template.
+        status: HTTP status of the response, None when the request failed.
+        bytes_sent: Size of the request body.
+        bytes_received: Size of the response body.
+        tls_time: Time to open the connection and complete the TLS handshake, None when a keep-alive connection was
+            reused.
+        server_time: Time between sending the request and receiving the response headers.
+        decode_time: Time spent parsing the JSON response body.
+        duration: Total time of the request, including the retries.
+        error: Exception raised by the request, if any.
+    """
+
+    def __init__(self, method, uri, bytes_sent=0):
+        self.method = method
+        self.uri = uri
+        self.uri_template = get_uri_template(uri)
+        self.status = None
+        self.bytes_sent = bytes_sent
+        self.bytes_received = 0
+        self.tls_time = None
+        self.server_time = None
+        self.decode_time = None
+        self.duration = None
+        self.error = None
+        self._started_at = default_timer()
+        self._sent_at = None
+
+    def connect(self, conn):
+        if conn.sock is None:
+            started_at = default_timer()
+            conn.connect()
+            self.tls_time = default_timer() - started_at
+
+    def request_sent(self):
+        self._sent_at = default_timer()
+
+    def response_received(self, resp):
+        self.server_time = default_timer() - self._sent_at
+        self.status = resp.status
+
+    def body_received(self, size):
+        self.bytes_received += size
+
+    def decode_json(self, data):
+        started_at = default_timer()
+        try:
+            return json_backend.loads(data)
+        finally:
+            self.decode_time = (self.decode_time or 0) + default_timer() - started_at
+
+    def finish(self, error=None):
+        self.error = error
+        self.duration = default_timer() - self._started_at
+
+
+class NullRequestEvent(object):
+    """
+    Request event used when no hooks are registered, so the requests are not measured.
+    """
+    __slots__ = ()
+
+    def connect(self, conn):
+        pass
+
+    def request_sent(self):
+        pass
+
+    def response_received(self, resp):
+        pass
+
+    def body_received(self, size):
+        pass
+
+    decode_json = staticmethod(json_backend.loads)
+
+
+NULL_REQUEST_EVENT = NullRequestEvent()
+
+
+class TaskWaitEvent(object):
+    """
+    Measures of the wait for a task to complete.
+
+    Attributes:
+        uri: Task URI.
+        duration: Seconds waited.
+        poll_count: Number of requests made to check the task state.
+        error: Exception raised while waiting, if any.
+    """
+
+    def __init__(self, uri, duration, poll_count, error=None):
+        self.uri = uri
+        self.duration = duration
+        self.poll_count = poll_count
+        self.error = error
+
+
+class ConnectionHook(object):
+    """
+    Base class of the hooks registered with connection.add_hook. The methods are called from the threads sending the
+    requests, so they must be quick and thread-safe.
+    """
+
+    def before_request(self, event):
+        """
+        Called before a request is sent.
+
+        Args:
+            event (RequestEvent): Request measures, only method, uri and bytes_sent are set.
+        """
+        pass
+
+    def after_request(self, event):
+        """
+        Called when a request completed or failed.
+
+        Args:
+            event (RequestEvent): Request measures.
+        """
+        pass
+
+    def after_task_wait(self, event):
+        """
+        Called when TaskMonitor finished waiting for a task.
+
+        Args:
+            event (TaskWaitEvent): Task wait measures.
+        """
+        pass
+
+
+class Histogram(object):
+    """
+    Counts the observed values in cumulative buckets, as a Prometheus histogram.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def get_cumulative_counts(self):
+        """
+        Returns:
+            list: Tuples of bucket upper bound and number of values lower or equal to it, ending with float('inf').
+        """
+        total = 0
+        cumulative = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+
+class HistogramCollector(ConnectionHook):
+    """
+    Hook that keeps the request and task wait measures in histograms and counters, in memory.
+
+    The request histograms are labeled by method and URI template, and the request duration also by status.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def after_request(self, event):
+        labels = (('method', event.method), ('uri', event.uri_template))
+        status = (('status', str(event.status) if event.status is not None else 'error'),)
+
+        with self._lock:
+            self.__observe('oneview_request_duration_seconds', labels + status, event.duration)
+            self.__observe('oneview_request_server_seconds', labels, event.server_time)
+            self.__observe('oneview_request_tls_seconds', labels, event.tls_time)
+            self.__observe('oneview_response_decode_seconds', labels, event.decode_time)
+            self.__increment('oneview_request_sent_bytes_total', labels, event.bytes_sent)
+            self.__increment('oneview_response_received_bytes_total', labels, event.bytes_received)
+
+    def after_task_wait(self, event):
+        labels = (('status', 'error' if event.error else 'completed'),)
+
+        with self._lock:
+            self.__observe('oneview_task_wait_seconds', labels, event.duration)
+            self.__increment('oneview_task_polls_total', labels, event.poll_count)
+
+    def get_histograms(self):
+        """
+        Returns:
+            dict: Copy of the histograms, keyed by metric name and labels.
+        """
+        with self._lock:
+            return dict((key, self.__copy(histogram)) for key, histogram in self._histograms.items())
+
+    def get_counters(self):
+        """
+        Returns:
+            dict: Copy of the counters, keyed by metric name and labels.
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def __observe(self, name, labels, value):
+        if value is None:
+            return
+        histogram = self._histograms.get((name, labels))
+        if histogram is None:
+            histogram = self._histograms[(name, labels)] = Histogram(self._buckets)
+        histogram.observe(value)
+
+    def __increment(self, name, labels, value):
+        self._counters[(name, labels)] = self._counters.get((name, labels), 0) + value
+
+    @staticmethod
+    def __copy(histogram):
+        copy = Histogram(histogram.buckets)
+        copy.counts = list(histogram.counts)
+        copy.sum = histogram.sum
+        copy.count = histogram.count
+        return copy
+
+
+def export_prometheus_text(collector):
+    """
+    Exports the measures of a HistogramCollector in the Prometheus text exposition format.
+
+    Args:
+        collector (HistogramCollector): Collector registered as a connection hook.
+
+    Returns:
+        str: The metrics, one sample per line.
+    """
+    lines = []
+
+    histograms = collector.get_histograms()
+    for name in sorted(set(name for name, _ in histograms)):
+        lines.append('# TYPE {0} histogram'.format(name))
+        for (metric, labels), histogram in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in histogram.get_cumulative_counts():
+                bucket_labels = labels + (('le', '+Inf' if bound == float('inf') else repr(float(bound))),)
+                lines.append('{0}_bucket{1} {2}'.format(name, _format_labels(bucket_labels), count))
+            lines.append('{0}_sum{1} {2}'.format(name, _format_labels(labels), repr(float(histogram.sum))))
+            lines.append('{0}_count{1} {2}'.format(name, _format_labels(labels), histogram.count))
+
+    counters = collector.get_counters()
+    for name in sorted(set(name for name, _ in counters)):
+        lines.append('# TYPE {0} counter'.format(name))
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append('{0}{1} {2}'.format(name, _format_labels(labels), value))
+
+    return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join('{0}="{1}"'.format(name, value) for (name, _), value in zip(labels, escaped)) + '}'
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+json_backend.py
+~~~~~~~~~~~~~~~
+
+This module parses the JSON bodies received from the appliance. The parser is the fastest one installed: orjson, then
+ujson, then the json module of the standard library. The bodies are passed to the parser as bytes, without decoding
+them to a string first.
+
+Examples:
+    >>> from hpOneView import json_backend
+    >>> json_backend.set_backend('json')
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import importlib
+import json
+
+# Parsers tried in order of preference
+BACKENDS = ('orjson', 'ujson', 'json')
+
+MSG_UNKNOWN_BACKEND = "JSON backend '%s' is not installed"
+
+_backend = None
+_loads = None
+
+
+def _import_loads(name):
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        return None
+    return module.loads
+
+
+def _stdlib_loads(data):
+    if isinstance(data, bytes):
+        # The json module of Python 2 and of Python 3 before 3.6 only parses strings
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+def set_backend(name=None):
+    """
+    Selects the JSON parser.
+
+    Args:
+        name: 'orjson', 'ujson' or 'json'. The fastest installed parser when None.
+
+    Raises:
+        ValueError: The parser is not installed.
+    """
+    global _backend, _loads
+    for candidate in ([name] if name else BACKENDS):
+        loads = _stdlib_loads if candidate == 'json' else _import_loads(candidate)
+        if loads is not None:
+            _backend, _loads = candidate, loads
+            return
+    raise ValueError(MSG_UNKNOWN_BACKEND % name)
+
+
+def get_backend():
+    """
+    Returns:
+        str: Name of the JSON parser in use.
+    """
+    return _backend
+
+
+def loads(data):
+    """
+    Parses a JSON document.
+
+    The faster parsers are stricter than the json module: they reject NaN and Infinity, for instance. The documents
+    they reject are parsed again with the json module, so every backend accepts the same documents.
+
+    Args:
+        data: UTF-8 encoded bytes or string.
+
+    Returns:
+        The parsed document.
+
+    Raises:
+        ValueError: The document is not valid JSON, or not valid UTF-8.
+    """
+    try:
+        return _loads(data)
+    except ValueError:
+        if _loads is _stdlib_loads:
+            raise
+    return _stdlib_loads(data)
+
+
+class RawBody(object):
+    """
+    Body of a response returned without being parsed, for the callers that only store or forward it. The JSON
+    document is parsed on the first call to json().
+    """
+    __slots__ = ('content', '_parsed')
+
+    _NOT_PARSED = object()
+
+    def __init__(self, content):
+        self.content = content
+        self._parsed = self._NOT_PARSED
+
+    @property
+    def text(self):
+        """
+        Body decoded from UTF-8.
+        """
+        return self.content.decode('utf-8')
+
+    def json(self):
+        """
+        Returns:
+            The parsed JSON document, or None when the body is empty.
+        """
+        if self._parsed is self._NOT_PARSED:
+            self._parsed = loads(self.content) if self.content else None
+        return self._parsed
+
+    def __len__(self):
+        return len(self.content)
+
+    def __repr__(self):
+        return 'RawBody(%d bytes)' % len(self.content)
+
+
+set_backend()
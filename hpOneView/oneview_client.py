@@ -28,94 +28,155 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from future import standard_library
-
-standard_library.install_aliases()
-
+import importlib
 import json
 import os
-
-from hpOneView.connection import connection
-from hpOneView.image_streamer.image_streamer_client import ImageStreamerClient
-from hpOneView.resources.security.certificate_authority import CertificateAuthority
-from hpOneView.resources.servers.connections import Connections
-from hpOneView.resources.networking.fc_networks import FcNetworks
-from hpOneView.resources.networking.fcoe_networks import FcoeNetworks
-from hpOneView.resources.networking.ethernet_networks import EthernetNetworks
-from hpOneView.resources.networking.connection_templates import ConnectionTemplates
-from hpOneView.resources.networking.fabrics import Fabrics
-from hpOneView.resources.networking.network_sets import NetworkSets
-from hpOneView.resources.data_services.metric_streaming import MetricStreaming
-from hpOneView.resources.networking.switches import Switches
-from hpOneView.resources.networking.switch_types import SwitchTypes
-from hpOneView.resources.activity.tasks import Tasks
-from hpOneView.resources.settings.restores import Restores
-from hpOneView.resources.settings.scopes import Scopes
-from hpOneView.resources.settings.licenses import Licenses
-from hpOneView.resources.servers.enclosures import Enclosures
-from hpOneView.resources.servers.logical_enclosures import LogicalEnclosures
-from hpOneView.resources.servers.enclosure_groups import EnclosureGroups
-from hpOneView.resources.servers.server_hardware import ServerHardware
-from hpOneView.resources.servers.server_hardware_types import ServerHardwareTypes
-from hpOneView.resources.servers.id_pools_ranges import IdPoolsRanges
-from hpOneView.resources.servers.id_pools_ipv4_ranges import IdPoolsIpv4Ranges
-from hpOneView.resources.servers.id_pools_ipv4_subnets import IdPoolsIpv4Subnets
-from hpOneView.resources.servers.id_pools import IdPools
-from hpOneView.resources.networking.interconnects import Interconnects
-from hpOneView.resources.networking.interconnect_types import InterconnectTypes
-from hpOneView.resources.networking.interconnect_link_topologies import InterconnectLinkTopologies
-from hpOneView.resources.networking.sas_interconnect_types import SasInterconnectTypes
-from hpOneView.resources.networking.internal_link_sets import InternalLinkSets
-from hpOneView.resources.uncategorized.unmanaged_devices import UnmanagedDevices
-from hpOneView.resources.networking.logical_downlinks import LogicalDownlinks
-from hpOneView.resources.facilities.power_devices import PowerDevices
-from hpOneView.resources.facilities.racks import Racks
-from hpOneView.resources.facilities.datacenters import Datacenters
-from hpOneView.resources.fc_sans.managed_sans import ManagedSANs
-from hpOneView.resources.fc_sans.san_managers import SanManagers
-from hpOneView.resources.fc_sans.endpoints import Endpoints
-from hpOneView.resources.networking.logical_interconnects import LogicalInterconnects
-from hpOneView.resources.networking.logical_interconnect_groups import LogicalInterconnectGroups
-from hpOneView.resources.networking.sas_logical_interconnects import SasLogicalInterconnects
-from hpOneView.resources.networking.logical_switch_groups import LogicalSwitchGroups
-from hpOneView.resources.networking.logical_switches import LogicalSwitches
-from hpOneView.resources.networking.sas_interconnects import SasInterconnects
-from hpOneView.resources.servers.server_profiles import ServerProfiles
-from hpOneView.resources.servers.server_profile_templates import ServerProfileTemplate
-from hpOneView.resources.storage.sas_logical_jbods import SasLogicalJbods
-from hpOneView.resources.storage.storage_systems import StorageSystems
-from hpOneView.resources.storage.storage_pools import StoragePools
-from hpOneView.resources.storage.storage_volume_templates import StorageVolumeTemplates
-from hpOneView.resources.storage.storage_volume_attachments import StorageVolumeAttachments
-from hpOneView.resources.storage.drive_enclosures import DriveEnclosures
-from hpOneView.resources.settings.firmware_drivers import FirmwareDrivers
-from hpOneView.resources.settings.firmware_bundles import FirmwareBundles
-from hpOneView.resources.settings.backups import Backups
-from hpOneView.resources.storage.volumes import Volumes
-from hpOneView.resources.storage.sas_logical_jbod_attachments import SasLogicalJbodAttachments
-from hpOneView.resources.networking.uplink_sets import UplinkSets
-from hpOneView.resources.servers.migratable_vc_domains import MigratableVcDomains
-from hpOneView.resources.networking.sas_logical_interconnect_groups import SasLogicalInterconnectGroups
-from hpOneView.resources.search.index_resources import IndexResources
-from hpOneView.resources.search.labels import Labels
-from hpOneView.resources.activity.alerts import Alerts
-from hpOneView.resources.activity.events import Events
-from hpOneView.resources.uncategorized.os_deployment_plans import OsDeploymentPlans
-from hpOneView.resources.uncategorized.os_deployment_servers import OsDeploymentServers
-from hpOneView.resources.security.certificate_rabbitmq import CertificateRabbitMQ
-from hpOneView.resources.security.login_details import LoginDetails
-from hpOneView.resources.security.roles import Roles
-from hpOneView.resources.security.users import Users
-from hpOneView.resources.settings.appliance_device_read_community import ApplianceDeviceReadCommunity
-from hpOneView.resources.settings.appliance_device_snmp_v1_trap_destinations import ApplianceDeviceSNMPv1TrapDestinations
-from hpOneView.resources.settings.appliance_device_snmp_v3_trap_destinations import ApplianceDeviceSNMPv3TrapDestinations
-from hpOneView.resources.settings.appliance_device_snmp_v3_users import ApplianceDeviceSNMPv3Users
-from hpOneView.resources.settings.appliance_node_information import ApplianceNodeInformation
-from hpOneView.resources.settings.appliance_time_and_locale_configuration import ApplianceTimeAndLocaleConfiguration
-from hpOneView.resources.settings.versions import Versions
+import sys
+import types
+
+from hpOneView.connection import connection, RetryPolicy
+
+# Modules of the API clients, imported when a OneViewClient property is first accessed so that importing this module
+# stays fast for the tools that only make a few calls
+RESOURCE_MODULES = {
+    'ImageStreamerClient': 'hpOneView.image_streamer.image_streamer_client',
+    'ResourceClient': 'hpOneView.resources.resource',
+    'CertificateAuthority': 'hpOneView.resources.security.certificate_authority',
+    'Connections': 'hpOneView.resources.servers.connections',
+    'FcNetworks': 'hpOneView.resources.networking.fc_networks',
+    'FcoeNetworks': 'hpOneView.resources.networking.fcoe_networks',
+    'EthernetNetworks': 'hpOneView.resources.networking.ethernet_networks',
+    'ConnectionTemplates': 'hpOneView.resources.networking.connection_templates',
+    'Fabrics': 'hpOneView.resources.networking.fabrics',
+    'NetworkSets': 'hpOneView.resources.networking.network_sets',
+    'MetricStreaming': 'hpOneView.resources.data_services.metric_streaming',
+    'Switches': 'hpOneView.resources.networking.switches',
+    'SwitchTypes': 'hpOneView.resources.networking.switch_types',
+    'Tasks': 'hpOneView.resources.activity.tasks',
+    'TaskWatcher': 'hpOneView.resources.task_watcher',
+    'StateChangeConsumer': 'hpOneView.resources.state_change_consumer',
+    'UtilizationAggregator': 'hpOneView.resources.data_services.utilization_aggregator',
+    'Restores': 'hpOneView.resources.settings.restores',
+    'Scopes': 'hpOneView.resources.settings.scopes',
+    'Licenses': 'hpOneView.resources.settings.licenses',
+    'Enclosures': 'hpOneView.resources.servers.enclosures',
+    'LogicalEnclosures': 'hpOneView.resources.servers.logical_enclosures',
+    'EnclosureGroups': 'hpOneView.resources.servers.enclosure_groups',
+    'ServerHardware': 'hpOneView.resources.servers.server_hardware',
+    'ServerHardwareTypes': 'hpOneView.resources.servers.server_hardware_types',
+    'IdPoolsRanges': 'hpOneView.resources.servers.id_pools_ranges',
+    'IdPoolsIpv4Ranges': 'hpOneView.resources.servers.id_pools_ipv4_ranges',
+    'IdPoolsIpv4Subnets': 'hpOneView.resources.servers.id_pools_ipv4_subnets',
+    'IdPools': 'hpOneView.resources.servers.id_pools',
+    'Interconnects': 'hpOneView.resources.networking.interconnects',
+    'InterconnectTypes': 'hpOneView.resources.networking.interconnect_types',
+    'InterconnectLinkTopologies': 'hpOneView.resources.networking.interconnect_link_topologies',
+    'SasInterconnectTypes': 'hpOneView.resources.networking.sas_interconnect_types',
+    'InternalLinkSets': 'hpOneView.resources.networking.internal_link_sets',
+    'UnmanagedDevices': 'hpOneView.resources.uncategorized.unmanaged_devices',
+    'LogicalDownlinks': 'hpOneView.resources.networking.logical_downlinks',
+    'PowerDevices': 'hpOneView.resources.facilities.power_devices',
+    'Racks': 'hpOneView.resources.facilities.racks',
+    'Datacenters': 'hpOneView.resources.facilities.datacenters',
+    'ManagedSANs': 'hpOneView.resources.fc_sans.managed_sans',
+    'SanManagers': 'hpOneView.resources.fc_sans.san_managers',
+    'Endpoints': 'hpOneView.resources.fc_sans.endpoints',
+    'LogicalInterconnects': 'hpOneView.resources.networking.logical_interconnects',
+    'LogicalInterconnectGroups': 'hpOneView.resources.networking.logical_interconnect_groups',
+    'SasLogicalInterconnects': 'hpOneView.resources.networking.sas_logical_interconnects',
+    'LogicalSwitchGroups': 'hpOneView.resources.networking.logical_switch_groups',
+    'LogicalSwitches': 'hpOneView.resources.networking.logical_switches',
+    'SasInterconnects': 'hpOneView.resources.networking.sas_interconnects',
+    'ServerProfiles': 'hpOneView.resources.servers.server_profiles',
+    'ServerProfileTemplate': 'hpOneView.resources.servers.server_profile_templates',
+    'SasLogicalJbods': 'hpOneView.resources.storage.sas_logical_jbods',
+    'StorageSystems': 'hpOneView.resources.storage.storage_systems',
+    'StoragePools': 'hpOneView.resources.storage.storage_pools',
+    'StorageVolumeTemplates': 'hpOneView.resources.storage.storage_volume_templates',
+    'StorageVolumeAttachments': 'hpOneView.resources.storage.storage_volume_attachments',
+    'DriveEnclosures': 'hpOneView.resources.storage.drive_enclosures',
+    'FirmwareDrivers': 'hpOneView.resources.settings.firmware_drivers',
+    'FirmwareBundles': 'hpOneView.resources.settings.firmware_bundles',
+    'Backups': 'hpOneView.resources.settings.backups',
+    'Volumes': 'hpOneView.resources.storage.volumes',
+    'SasLogicalJbodAttachments': 'hpOneView.resources.storage.sas_logical_jbod_attachments',
+    'UplinkSets': 'hpOneView.resources.networking.uplink_sets',
+    'MigratableVcDomains': 'hpOneView.resources.servers.migratable_vc_domains',
+    'SasLogicalInterconnectGroups': 'hpOneView.resources.networking.sas_logical_interconnect_groups',
+    'IndexResources': 'hpOneView.resources.search.index_resources',
+    'Labels': 'hpOneView.resources.search.labels',
+    'Alerts': 'hpOneView.resources.activity.alerts',
+    'Events': 'hpOneView.resources.activity.events',
+    'OsDeploymentPlans': 'hpOneView.resources.uncategorized.os_deployment_plans',
+    'OsDeploymentServers': 'hpOneView.resources.uncategorized.os_deployment_servers',
+    'CertificateRabbitMQ': 'hpOneView.resources.security.certificate_rabbitmq',
+    'LoginDetails': 'hpOneView.resources.security.login_details',
+    'Roles': 'hpOneView.resources.security.roles',
+    'Users': 'hpOneView.resources.security.users',
+    'ApplianceDeviceReadCommunity': 'hpOneView.resources.settings.appliance_device_read_community',
+    'ApplianceDeviceSNMPv1TrapDestinations': 'hpOneView.resources.settings.appliance_device_snmp_v1_trap_destinations',
+    'ApplianceDeviceSNMPv3TrapDestinations': 'hpOneView.resources.settings.appliance_device_snmp_v3_trap_destinations',
+    'ApplianceDeviceSNMPv3Users': 'hpOneView.resources.settings.appliance_device_snmp_v3_users',
+    'ApplianceNodeInformation': 'hpOneView.resources.settings.appliance_node_information',
+    'ApplianceTimeAndLocaleConfiguration': 'hpOneView.resources.settings.appliance_time_and_locale_configuration',
+    'Versions': 'hpOneView.resources.settings.versions',
+}
 
 ONEVIEW_CLIENT_INVALID_PROXY = 'Invalid Proxy format'
 
+# Keys of the retry_policy configuration passed to RetryPolicy
+RETRY_POLICY_KEYS = ('max_attempts', 'backoff', 'max_backoff', 'retryable_statuses', 'retryable_error_numbers')
+
+
+def get_resource_class(name):
+    """
+    Imports the module of an API client class, if not yet imported, and returns the class.
+
+    Args:
+        name: Class name, a key of RESOURCE_MODULES.
+
+    Returns:
+        type
+    """
+    return getattr(importlib.import_module(RESOURCE_MODULES[name]), name)
+
+
+def __getattr__(name):
+    # Keeps `from hpOneView.oneview_client import FcNetworks` working without importing every module upfront
+    if name in RESOURCE_MODULES:
+        return get_resource_class(name)
+    raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+
+
+class _LazyExportsModule(types.ModuleType):
+    """
+    Stands in for this module in sys.modules before Python 3.7, which ignores the module __getattr__. The attributes
+    are read from and written to the module, and the API client classes are imported when first accessed.
+    """
+
+    def __init__(self, module):
+        super(_LazyExportsModule, self).__init__(module.__name__, module.__doc__)
+        for name in ('__file__', '__package__', '__loader__', '__spec__'):
+            if name in vars(module):
+                self.__dict__[name] = vars(module)[name]
+        self.__dict__['_module'] = module
+
+    def __getattr__(self, name):
+        try:
+            return getattr(self.__dict__['_module'], name)
+        except AttributeError:
+            # The module __getattr__ above, which the interpreter does not call
+            return __getattr__(name)
+
+    def __setattr__(self, name, value):
+        setattr(self.__dict__['_module'], name, value)
+
+    def __delattr__(self, name):
+        delattr(self.__dict__['_module'], name)
+
+    def __dir__(self):
+        return dir(self.__dict__['_module'])
+
 
 class OneViewClient(object):
     DEFAULT_API_VERSION = 300
@@ -125,6 +186,13 @@ class OneViewClient(object):
                                        config.get('timeout'))
         self.__image_streamer_ip = config.get("image_streamer_ip")
         self.__set_proxy(config)
+        self.__set_connection_pool(config)
+        self.__set_pagination(config)
+        self.__set_response_cache(config)
+        self.__set_rate_limiter(config)
+        self.__set_retry_policy(config)
+        self.__set_compression(config)
+        self.__set_inventory_snapshots(config)
         self.__connection.login(config["credentials"])
         self.__certificate_authority = None
         self.__connections = None
@@ -137,6 +205,9 @@ class OneViewClient(object):
         self.__switches = None
         self.__switch_types = None
         self.__tasks = None
+        self.__task_watcher = None
+        self.__state_change_consumer = None
+        self.__utilization_aggregator = None
         self.__scopes = None
         self.__enclosures = None
         self.__logical_enclosures = None
@@ -269,6 +340,82 @@ class OneViewClient(object):
             proxy_port = int(splitted[1])
             self.__connection.set_proxy(proxy_host, proxy_port)
 
+    def __set_connection_pool(self, config):
+        """
+        Set the keep-alive connection pool limits if needed
+        Args:
+            config: Config dict
+        """
+        if config.get("connection_pool"):
+            pool = config["connection_pool"]
+            self.__connection.set_connection_pool(max_size=pool.get("max_size"),
+                                                  idle_timeout=pool.get("idle_timeout"))
+
+    def __set_pagination(self, config):
+        """
+        Set how paginated collections are retrieved if needed
+        Args:
+            config: Config dict
+        """
+        if config.get("pagination"):
+            pagination = config["pagination"]
+            self.__connection.set_pagination(page_size=pagination.get("page_size"),
+                                             max_workers=pagination.get("max_workers"))
+
+    def __set_response_cache(self, config):
+        """
+        Enable the cache of GET responses if needed
+        Args:
+            config: Config dict
+        """
+        if config.get("response_cache"):
+            response_cache = config["response_cache"]
+            self.__connection.enable_response_cache(**dict((key, response_cache[key]) for key in response_cache
+                                                           if key in ("max_size", "ttl", "resource_ttls")))
+
+    def __set_rate_limiter(self, config):
+        """
+        Enable the adaptive rate limiter if needed
+        Args:
+            config: Config dict
+        """
+        if config.get("rate_limiter"):
+            rate_limiter = config["rate_limiter"]
+            self.__connection.enable_rate_limiter(**dict((key, rate_limiter[key]) for key in rate_limiter
+                                                         if key in ("rate", "min_rate", "max_rate", "max_in_flight",
+                                                                    "target_latency", "max_retries")))
+
+    def __set_retry_policy(self, config):
+        """
+        Set the retry policy of the failed idempotent requests if needed
+        Args:
+            config: Config dict
+        """
+        if config.get("retry_policy"):
+            retry_policy = config["retry_policy"]
+            self.__connection.set_retry_policy(RetryPolicy(**dict((key, retry_policy[key]) for key in retry_policy
+                                                                  if key in RETRY_POLICY_KEYS)))
+
+    def __set_compression(self, config):
+        """
+        Enable the compression of the responses if needed
+        Args:
+            config: Config dict
+        """
+        if config.get("compression"):
+            self.__connection.enable_compression()
+
+    def __set_inventory_snapshots(self, config):
+        """
+        Enable the inventory snapshots of the collections if needed
+        Args:
+            config: Config dict
+        """
+        for uri, options in (config.get("inventory_snapshots") or {}).items():
+            resource_client = get_resource_class('ResourceClient')(self.__connection, uri)
+            resource_client.enable_inventory_snapshot(**dict((key, options[key]) for key in (options or {})
+                                                             if key in ("indexes", "max_age")))
+
     @property
     def api_version(self):
         """
@@ -296,13 +443,26 @@ class OneViewClient(object):
         Returns:
             ImageStreamerClient:
         """
-        image_streamer = ImageStreamerClient(self.__image_streamer_ip,
-                                             self.__connection.get_session_id(),
-                                             self.__connection._apiVersion,
-                                             self.__connection._sslBundle)
+        image_streamer = get_resource_class('ImageStreamerClient')(self.__image_streamer_ip,
+                                                                   self.__connection.get_session_id(),
+                                                                   self.__connection._apiVersion,
+                                                                   self.__connection._sslBundle)
 
         return image_streamer
 
+    def get_many(self, uris, skip_errors=False):
+        """
+        Gets many resources, from any collections, with as few requests as possible. See ResourceClient.get_many.
+
+        Args:
+            uris (list): Resource URIs.
+            skip_errors (bool): When True, the resources that cannot be retrieved are left out of the result.
+
+        Returns:
+            dict: The resources, keyed by URI.
+        """
+        return get_resource_class('ResourceClient')(self.__connection, '/rest').get_many(uris, skip_errors=skip_errors)
+
     @property
     def certificate_authority(self):
         """
@@ -312,7 +472,7 @@ class OneViewClient(object):
             CertificateAuthority:
         """
         if not self.__certificate_authority:
-            self.__certificate_authority = CertificateAuthority(self.__connection)
+            self.__certificate_authority = get_resource_class('CertificateAuthority')(self.__connection)
         return self.__certificate_authority
 
     @property
@@ -324,7 +484,7 @@ class OneViewClient(object):
             Connections:
         """
         if not self.__connections:
-            self.__connections = Connections(
+            self.__connections = get_resource_class('Connections')(
                 self.__connection)
         return self.__connections
 
@@ -337,7 +497,7 @@ class OneViewClient(object):
             ConnectionTemplates:
         """
         if not self.__connection_templates:
-            self.__connection_templates = ConnectionTemplates(
+            self.__connection_templates = get_resource_class('ConnectionTemplates')(
                 self.__connection)
         return self.__connection_templates
 
@@ -350,7 +510,7 @@ class OneViewClient(object):
             FcNetworks:
         """
         if not self.__fc_networks:
-            self.__fc_networks = FcNetworks(self.__connection)
+            self.__fc_networks = get_resource_class('FcNetworks')(self.__connection)
         return self.__fc_networks
 
     @property
@@ -362,7 +522,7 @@ class OneViewClient(object):
             FcoeNetworks:
         """
         if not self.__fcoe_networks:
-            self.__fcoe_networks = FcoeNetworks(self.__connection)
+            self.__fcoe_networks = get_resource_class('FcoeNetworks')(self.__connection)
         return self.__fcoe_networks
 
     @property
@@ -374,7 +534,7 @@ class OneViewClient(object):
             EthernetNetworks:
         """
         if not self.__ethernet_networks:
-            self.__ethernet_networks = EthernetNetworks(self.__connection)
+            self.__ethernet_networks = get_resource_class('EthernetNetworks')(self.__connection)
         return self.__ethernet_networks
 
     @property
@@ -386,7 +546,7 @@ class OneViewClient(object):
             Fabrics:
         """
         if not self.__fabrics:
-            self.__fabrics = Fabrics(self.__connection)
+            self.__fabrics = get_resource_class('Fabrics')(self.__connection)
         return self.__fabrics
 
     @property
@@ -398,7 +558,7 @@ class OneViewClient(object):
             Restores:
         """
         if not self.__restores:
-            self.__restores = Restores(self.__connection)
+            self.__restores = get_resource_class('Restores')(self.__connection)
         return self.__restores
 
     @property
@@ -410,7 +570,7 @@ class OneViewClient(object):
             Scopes:
         """
         if not self.__scopes:
-            self.__scopes = Scopes(self.__connection)
+            self.__scopes = get_resource_class('Scopes')(self.__connection)
         return self.__scopes
 
     @property
@@ -422,7 +582,7 @@ class OneViewClient(object):
             Datacenters:
         """
         if not self.__datacenters:
-            self.__datacenters = Datacenters(self.__connection)
+            self.__datacenters = get_resource_class('Datacenters')(self.__connection)
         return self.__datacenters
 
     @property
@@ -434,7 +594,7 @@ class OneViewClient(object):
             NetworkSets:
         """
         if not self.__network_sets:
-            self.__network_sets = NetworkSets(self.__connection)
+            self.__network_sets = get_resource_class('NetworkSets')(self.__connection)
         return self.__network_sets
 
     @property
@@ -446,7 +606,7 @@ class OneViewClient(object):
             ServerHardware:
         """
         if not self.__server_hardware:
-            self.__server_hardware = ServerHardware(self.__connection)
+            self.__server_hardware = get_resource_class('ServerHardware')(self.__connection)
         return self.__server_hardware
 
     @property
@@ -458,7 +618,7 @@ class OneViewClient(object):
             ServerHardwareTypes:
         """
         if not self.__server_hardware_types:
-            self.__server_hardware_types = ServerHardwareTypes(
+            self.__server_hardware_types = get_resource_class('ServerHardwareTypes')(
                 self.__connection)
         return self.__server_hardware_types
 
@@ -471,7 +631,7 @@ class OneViewClient(object):
             IdPoolsRanges:
         """
         if not self.__id_pools_vsn_ranges:
-            self.__id_pools_vsn_ranges = IdPoolsRanges('vsn', self.__connection)
+            self.__id_pools_vsn_ranges = get_resource_class('IdPoolsRanges')('vsn', self.__connection)
         return self.__id_pools_vsn_ranges
 
     @property
@@ -483,7 +643,7 @@ class OneViewClient(object):
             IdPoolsRanges:
         """
         if not self.__id_pools_vmac_ranges:
-            self.__id_pools_vmac_ranges = IdPoolsRanges('vmac', self.__connection)
+            self.__id_pools_vmac_ranges = get_resource_class('IdPoolsRanges')('vmac', self.__connection)
         return self.__id_pools_vmac_ranges
 
     @property
@@ -495,7 +655,7 @@ class OneViewClient(object):
             IdPoolsRanges:
         """
         if not self.__id_pools_vwwn_ranges:
-            self.__id_pools_vwwn_ranges = IdPoolsRanges('vwwn', self.__connection)
+            self.__id_pools_vwwn_ranges = get_resource_class('IdPoolsRanges')('vwwn', self.__connection)
         return self.__id_pools_vwwn_ranges
 
     @property
@@ -507,7 +667,7 @@ class OneViewClient(object):
             IdPoolsIpv4Ranges:
         """
         if not self.__id_pools_ipv4_ranges:
-            self.__id_pools_ipv4_ranges = IdPoolsIpv4Ranges(self.__connection)
+            self.__id_pools_ipv4_ranges = get_resource_class('IdPoolsIpv4Ranges')(self.__connection)
         return self.__id_pools_ipv4_ranges
 
     @property
@@ -519,7 +679,7 @@ class OneViewClient(object):
             IdPoolsIpv4Subnets:
         """
         if not self.__id_pools_ipv4_subnets:
-            self.__id_pools_ipv4_subnets = IdPoolsIpv4Subnets(self.__connection)
+            self.__id_pools_ipv4_subnets = get_resource_class('IdPoolsIpv4Subnets')(self.__connection)
         return self.__id_pools_ipv4_subnets
 
     @property
@@ -531,7 +691,7 @@ class OneViewClient(object):
             IdPools:
         """
         if not self.__id_pools:
-            self.__id_pools = IdPools(self.__connection)
+            self.__id_pools = get_resource_class('IdPools')(self.__connection)
         return self.__id_pools
 
     @property
@@ -543,7 +703,7 @@ class OneViewClient(object):
             Switches:
         """
         if not self.__switches:
-            self.__switches = Switches(self.__connection)
+            self.__switches = get_resource_class('Switches')(self.__connection)
         return self.__switches
 
     @property
@@ -555,7 +715,7 @@ class OneViewClient(object):
             Roles:
         """
         if not self.__roles:
-            self.__roles = Roles(self.__connection)
+            self.__roles = get_resource_class('Roles')(self.__connection)
         return self.__roles
 
     @property
@@ -567,7 +727,7 @@ class OneViewClient(object):
             SwitchTypes:
         """
         if not self.__switch_types:
-            self.__switch_types = SwitchTypes(self.__connection)
+            self.__switch_types = get_resource_class('SwitchTypes')(self.__connection)
         return self.__switch_types
 
     @property
@@ -579,7 +739,7 @@ class OneViewClient(object):
             LogicalSwitchGroups:
         """
         if not self.__logical_switch_groups:
-            self.__logical_switch_groups = LogicalSwitchGroups(self.__connection)
+            self.__logical_switch_groups = get_resource_class('LogicalSwitchGroups')(self.__connection)
         return self.__logical_switch_groups
 
     @property
@@ -591,7 +751,7 @@ class OneViewClient(object):
             LogicalSwitches:
         """
         if not self.__logical_switches:
-            self.__logical_switches = LogicalSwitches(self.__connection)
+            self.__logical_switches = get_resource_class('LogicalSwitches')(self.__connection)
         return self.__logical_switches
 
     @property
@@ -603,9 +763,47 @@ class OneViewClient(object):
             Tasks:
         """
         if not self.__tasks:
-            self.__tasks = Tasks(self.__connection)
+            self.__tasks = get_resource_class('Tasks')(self.__connection)
         return self.__tasks
 
+    @property
+    def task_watcher(self):
+        """
+        Gets the TaskWatcher, which waits for many tasks at once with a single poller shared by the callers.
+
+        Returns:
+            TaskWatcher:
+        """
+        if self.__task_watcher is None:
+            self.__task_watcher = get_resource_class('TaskWatcher')(self.__connection)
+        return self.__task_watcher
+
+    @property
+    def state_change_consumer(self):
+        """
+        Gets the StateChangeConsumer, which keeps the inventory snapshots and the response cache in sync with the
+        State-Change Message Bus.
+
+        Returns:
+            StateChangeConsumer:
+        """
+        if self.__state_change_consumer is None:
+            self.__state_change_consumer = get_resource_class('StateChangeConsumer')(self.__connection)
+        return self.__state_change_consumer
+
+    @property
+    def utilization_aggregator(self):
+        """
+        Gets the UtilizationAggregator, which rolls up the utilization of the resources of a data center, rack or
+        enclosure, caching the series retrieved.
+
+        Returns:
+            UtilizationAggregator:
+        """
+        if self.__utilization_aggregator is None:
+            self.__utilization_aggregator = get_resource_class('UtilizationAggregator')(self.__connection)
+        return self.__utilization_aggregator
+
     @property
     def enclosure_groups(self):
         """
@@ -615,7 +813,7 @@ class OneViewClient(object):
             EnclosureGroups:
         """
         if not self.__enclosure_groups:
-            self.__enclosure_groups = EnclosureGroups(self.__connection)
+            self.__enclosure_groups = get_resource_class('EnclosureGroups')(self.__connection)
         return self.__enclosure_groups
 
     @property
@@ -627,7 +825,7 @@ class OneViewClient(object):
             Enclosures:
         """
         if not self.__enclosures:
-            self.__enclosures = Enclosures(self.__connection)
+            self.__enclosures = get_resource_class('Enclosures')(self.__connection)
         return self.__enclosures
 
     @property
@@ -639,7 +837,7 @@ class OneViewClient(object):
             LogicalEnclosures:
         """
         if not self.__logical_enclosures:
-            self.__logical_enclosures = LogicalEnclosures(self.__connection)
+            self.__logical_enclosures = get_resource_class('LogicalEnclosures')(self.__connection)
         return self.__logical_enclosures
 
     @property
@@ -651,7 +849,7 @@ class OneViewClient(object):
             MetricStreaming:
         """
         if not self.__metric_streaming:
-            self.__metric_streaming = MetricStreaming(self.__connection)
+            self.__metric_streaming = get_resource_class('MetricStreaming')(self.__connection)
         return self.__metric_streaming
 
     @property
@@ -663,7 +861,7 @@ class OneViewClient(object):
             Interconnects:
         """
         if not self.__interconnects:
-            self.__interconnects = Interconnects(self.__connection)
+            self.__interconnects = get_resource_class('Interconnects')(self.__connection)
         return self.__interconnects
 
     @property
@@ -675,7 +873,7 @@ class OneViewClient(object):
             InterconnectTypes:
         """
         if not self.__interconnect_types:
-            self.__interconnect_types = InterconnectTypes(self.__connection)
+            self.__interconnect_types = get_resource_class('InterconnectTypes')(self.__connection)
         return self.__interconnect_types
 
     @property
@@ -687,7 +885,7 @@ class OneViewClient(object):
             InterconnectLinkTopologies:
         """
         if not self.__interconnect_link_topologies:
-            self.__interconnect_link_topologies = InterconnectLinkTopologies(self.__connection)
+            self.__interconnect_link_topologies = get_resource_class('InterconnectLinkTopologies')(self.__connection)
         return self.__interconnect_link_topologies
 
     @property
@@ -699,7 +897,7 @@ class OneViewClient(object):
             SasInterconnectTypes:
         """
         if not self.__sas_interconnect_types:
-            self.__sas_interconnect_types = SasInterconnectTypes(self.__connection)
+            self.__sas_interconnect_types = get_resource_class('SasInterconnectTypes')(self.__connection)
         return self.__sas_interconnect_types
 
     @property
@@ -711,7 +909,7 @@ class OneViewClient(object):
             InternalLinkSets:
         """
         if not self.__internal_link_sets:
-            self.__internal_link_sets = InternalLinkSets(self.__connection)
+            self.__internal_link_sets = get_resource_class('InternalLinkSets')(self.__connection)
         return self.__internal_link_sets
 
     @property
@@ -723,7 +921,7 @@ class OneViewClient(object):
             LogicalInterconnectGroups:
         """
         if not self.__logical_interconnect_groups:
-            self.__logical_interconnect_groups = LogicalInterconnectGroups(
+            self.__logical_interconnect_groups = get_resource_class('LogicalInterconnectGroups')(
                 self.__connection)
         return self.__logical_interconnect_groups
 
@@ -736,7 +934,7 @@ class OneViewClient(object):
             LogicalInterconnects:
         """
         if not self.__logical_interconnects:
-            self.__logical_interconnects = LogicalInterconnects(
+            self.__logical_interconnects = get_resource_class('LogicalInterconnects')(
                 self.__connection)
         return self.__logical_interconnects
 
@@ -749,7 +947,7 @@ class OneViewClient(object):
             SasLogicalInterconnects:
         """
         if not self.__sas_logical_interconnects:
-            self.__sas_logical_interconnects = SasLogicalInterconnects(self.__connection)
+            self.__sas_logical_interconnects = get_resource_class('SasLogicalInterconnects')(self.__connection)
         return self.__sas_logical_interconnects
 
     @property
@@ -761,7 +959,7 @@ class OneViewClient(object):
             LogicalDownlinks:
         """
         if not self.__logical_downlinks:
-            self.__logical_downlinks = LogicalDownlinks(
+            self.__logical_downlinks = get_resource_class('LogicalDownlinks')(
                 self.__connection)
         return self.__logical_downlinks
 
@@ -774,7 +972,7 @@ class OneViewClient(object):
             PowerDevices:
         """
         if not self.__power_devices:
-            self.__power_devices = PowerDevices(self.__connection)
+            self.__power_devices = get_resource_class('PowerDevices')(self.__connection)
         return self.__power_devices
 
     @property
@@ -786,7 +984,7 @@ class OneViewClient(object):
             UnmanagedDevices:
         """
         if not self.__unmanaged_devices:
-            self.__unmanaged_devices = UnmanagedDevices(self.__connection)
+            self.__unmanaged_devices = get_resource_class('UnmanagedDevices')(self.__connection)
         return self.__unmanaged_devices
 
     @property
@@ -798,7 +996,7 @@ class OneViewClient(object):
             Racks:
         """
         if not self.__racks:
-            self.__racks = Racks(self.__connection)
+            self.__racks = get_resource_class('Racks')(self.__connection)
         return self.__racks
 
     @property
@@ -810,7 +1008,7 @@ class OneViewClient(object):
             SanManagers:
         """
         if not self.__san_managers:
-            self.__san_managers = SanManagers(self.__connection)
+            self.__san_managers = get_resource_class('SanManagers')(self.__connection)
         return self.__san_managers
 
     @property
@@ -822,7 +1020,7 @@ class OneViewClient(object):
             Endpoints:
         """
         if not self.__endpoints:
-            self.__endpoints = Endpoints(self.__connection)
+            self.__endpoints = get_resource_class('Endpoints')(self.__connection)
         return self.__endpoints
 
     @property
@@ -834,7 +1032,7 @@ class OneViewClient(object):
             ServerProfiles:
         """
         if not self.__server_profiles:
-            self.__server_profiles = ServerProfiles(self.__connection)
+            self.__server_profiles = get_resource_class('ServerProfiles')(self.__connection)
         return self.__server_profiles
 
     @property
@@ -846,7 +1044,7 @@ class OneViewClient(object):
             ServerProfileTemplate:
         """
         if not self.__server_profile_templates:
-            self.__server_profile_templates = ServerProfileTemplate(self.__connection)
+            self.__server_profile_templates = get_resource_class('ServerProfileTemplate')(self.__connection)
         return self.__server_profile_templates
 
     @property
@@ -858,7 +1056,7 @@ class OneViewClient(object):
             StorageSystems:
         """
         if not self.__storage_systems:
-            self.__storage_systems = StorageSystems(self.__connection)
+            self.__storage_systems = get_resource_class('StorageSystems')(self.__connection)
         return self.__storage_systems
 
     @property
@@ -870,7 +1068,7 @@ class OneViewClient(object):
             StoragePools:
         """
         if not self.__storage_pools:
-            self.__storage_pools = StoragePools(self.__connection)
+            self.__storage_pools = get_resource_class('StoragePools')(self.__connection)
         return self.__storage_pools
 
     @property
@@ -882,7 +1080,7 @@ class OneViewClient(object):
             StorageVolumeTemplates:
         """
         if not self.__storage_volume_templates:
-            self.__storage_volume_templates = StorageVolumeTemplates(self.__connection)
+            self.__storage_volume_templates = get_resource_class('StorageVolumeTemplates')(self.__connection)
         return self.__storage_volume_templates
 
     @property
@@ -894,7 +1092,7 @@ class OneViewClient(object):
             StorageVolumeAttachments:
         """
         if not self.__storage_volume_attachments:
-            self.__storage_volume_attachments = StorageVolumeAttachments(self.__connection)
+            self.__storage_volume_attachments = get_resource_class('StorageVolumeAttachments')(self.__connection)
         return self.__storage_volume_attachments
 
     @property
@@ -906,7 +1104,7 @@ class OneViewClient(object):
             FirmwareDrivers:
         """
         if not self.__firmware_drivers:
-            self.__firmware_drivers = FirmwareDrivers(self.__connection)
+            self.__firmware_drivers = get_resource_class('FirmwareDrivers')(self.__connection)
         return self.__firmware_drivers
 
     @property
@@ -918,7 +1116,7 @@ class OneViewClient(object):
             FirmwareBundles:
         """
         if not self.__firmware_bundles:
-            self.__firmware_bundles = FirmwareBundles(self.__connection)
+            self.__firmware_bundles = get_resource_class('FirmwareBundles')(self.__connection)
         return self.__firmware_bundles
 
     @property
@@ -930,7 +1128,7 @@ class OneViewClient(object):
             UplinkSets:
         """
         if not self.__uplink_sets:
-            self.__uplink_sets = UplinkSets(self.__connection)
+            self.__uplink_sets = get_resource_class('UplinkSets')(self.__connection)
         return self.__uplink_sets
 
     @property
@@ -942,7 +1140,7 @@ class OneViewClient(object):
             Volumes:
         """
         if not self.__volumes:
-            self.__volumes = Volumes(self.__connection)
+            self.__volumes = get_resource_class('Volumes')(self.__connection)
         return self.__volumes
 
     @property
@@ -954,7 +1152,7 @@ class OneViewClient(object):
             SasLogicalJbodAttachments:
         """
         if not self.__sas_logical_jbod_attachments:
-            self.__sas_logical_jbod_attachments = SasLogicalJbodAttachments(self.__connection)
+            self.__sas_logical_jbod_attachments = get_resource_class('SasLogicalJbodAttachments')(self.__connection)
         return self.__sas_logical_jbod_attachments
 
     @property
@@ -966,7 +1164,7 @@ class OneViewClient(object):
             ManagedSANs:
         """
         if not self.__managed_sans:
-            self.__managed_sans = ManagedSANs(self.__connection)
+            self.__managed_sans = get_resource_class('ManagedSANs')(self.__connection)
         return self.__managed_sans
 
     @property
@@ -978,7 +1176,7 @@ class OneViewClient(object):
             MigratableVcDomains:
         """
         if not self.__migratable_vc_domains:
-            self.__migratable_vc_domains = MigratableVcDomains(self.__connection)
+            self.__migratable_vc_domains = get_resource_class('MigratableVcDomains')(self.__connection)
         return self.__migratable_vc_domains
 
     @property
@@ -990,7 +1188,7 @@ class OneViewClient(object):
             SasInterconnects:
         """
         if not self.__sas_interconnects:
-            self.__sas_interconnects = SasInterconnects(self.__connection)
+            self.__sas_interconnects = get_resource_class('SasInterconnects')(self.__connection)
         return self.__sas_interconnects
 
     @property
@@ -1002,7 +1200,7 @@ class OneViewClient(object):
             SasLogicalInterconnectGroups:
         """
         if not self.__sas_logical_interconnect_groups:
-            self.__sas_logical_interconnect_groups = SasLogicalInterconnectGroups(self.__connection)
+            self.__sas_logical_interconnect_groups = get_resource_class('SasLogicalInterconnectGroups')(self.__connection)
         return self.__sas_logical_interconnect_groups
 
     @property
@@ -1014,7 +1212,7 @@ class OneViewClient(object):
             DriveEnclosures:
         """
         if not self.__drive_enclures:
-            self.__drive_enclures = DriveEnclosures(self.__connection)
+            self.__drive_enclures = get_resource_class('DriveEnclosures')(self.__connection)
         return self.__drive_enclures
 
     @property
@@ -1026,7 +1224,7 @@ class OneViewClient(object):
             SasLogicalJbod:
         """
         if not self.__sas_logical_jbods:
-            self.__sas_logical_jbods = SasLogicalJbods(self.__connection)
+            self.__sas_logical_jbods = get_resource_class('SasLogicalJbods')(self.__connection)
         return self.__sas_logical_jbods
 
     @property
@@ -1038,7 +1236,7 @@ class OneViewClient(object):
             Labels:
         """
         if not self.__labels:
-            self.__labels = Labels(self.__connection)
+            self.__labels = get_resource_class('Labels')(self.__connection)
         return self.__labels
 
     @property
@@ -1050,7 +1248,7 @@ class OneViewClient(object):
             IndexResources:
         """
         if not self.__index_resources:
-            self.__index_resources = IndexResources(self.__connection)
+            self.__index_resources = get_resource_class('IndexResources')(self.__connection)
         return self.__index_resources
 
     @property
@@ -1062,7 +1260,7 @@ class OneViewClient(object):
             Alerts:
         """
         if not self.__alerts:
-            self.__alerts = Alerts(self.__connection)
+            self.__alerts = get_resource_class('Alerts')(self.__connection)
         return self.__alerts
 
     @property
@@ -1074,7 +1272,7 @@ class OneViewClient(object):
             Events:
         """
         if not self.__events:
-            self.__events = Events(self.__connection)
+            self.__events = get_resource_class('Events')(self.__connection)
         return self.__events
 
     @property
@@ -1086,7 +1284,7 @@ class OneViewClient(object):
             OsDeploymentPlans:
         """
         if not self.__os_deployment_plans:
-            self.__os_deployment_plans = OsDeploymentPlans(self.__connection)
+            self.__os_deployment_plans = get_resource_class('OsDeploymentPlans')(self.__connection)
         return self.__os_deployment_plans
 
     @property
@@ -1098,7 +1296,7 @@ class OneViewClient(object):
             OsDeploymentServers:
         """
         if not self.__os_deployment_servers:
-            self.__os_deployment_servers = OsDeploymentServers(self.__connection)
+            self.__os_deployment_servers = get_resource_class('OsDeploymentServers')(self.__connection)
         return self.__os_deployment_servers
 
     @property
@@ -1110,7 +1308,7 @@ class OneViewClient(object):
             CertificateRabbitMQ:
         """
         if not self.__certificate_rabbitmq:
-            self.__certificate_rabbitmq = CertificateRabbitMQ(self.__connection)
+            self.__certificate_rabbitmq = get_resource_class('CertificateRabbitMQ')(self.__connection)
         return self.__certificate_rabbitmq
 
     @property
@@ -1122,7 +1320,7 @@ class OneViewClient(object):
             Users:
         """
         if not self.__users:
-            self.__users = Users(self.__connection)
+            self.__users = get_resource_class('Users')(self.__connection)
         return self.__users
 
     @property
@@ -1134,7 +1332,7 @@ class OneViewClient(object):
             ApplianceDeviceReadCommunity:
         """
         if not self.__appliance_device_read_community:
-            self.__appliance_device_read_community = ApplianceDeviceReadCommunity(self.__connection)
+            self.__appliance_device_read_community = get_resource_class('ApplianceDeviceReadCommunity')(self.__connection)
         return self.__appliance_device_read_community
 
     @property
@@ -1146,7 +1344,7 @@ class OneViewClient(object):
             ApplianceDeviceSNMPv1TrapDestinations:
         """
         if not self.__appliance_device_snmp_v1_trap_destinations:
-            self.__appliance_device_snmp_v1_trap_destinations = ApplianceDeviceSNMPv1TrapDestinations(self.__connection)
+            self.__appliance_device_snmp_v1_trap_destinations = get_resource_class('ApplianceDeviceSNMPv1TrapDestinations')(self.__connection)
         return self.__appliance_device_snmp_v1_trap_destinations
 
     @property
@@ -1158,7 +1356,7 @@ class OneViewClient(object):
             ApplianceDeviceSNMPv3TrapDestinations:
         """
         if not self.__appliance_device_snmp_v3_trap_destinations:
-            self.__appliance_device_snmp_v3_trap_destinations = ApplianceDeviceSNMPv3TrapDestinations(self.__connection)
+            self.__appliance_device_snmp_v3_trap_destinations = get_resource_class('ApplianceDeviceSNMPv3TrapDestinations')(self.__connection)
         return self.__appliance_device_snmp_v3_trap_destinations
 
     @property
@@ -1170,7 +1368,7 @@ class OneViewClient(object):
             ApplianceDeviceSNMPv3Users:
         """
         if not self.__appliance_device_snmp_v3_users:
-            self.__appliance_device_snmp_v3_users = ApplianceDeviceSNMPv3Users(self.__connection)
+            self.__appliance_device_snmp_v3_users = get_resource_class('ApplianceDeviceSNMPv3Users')(self.__connection)
         return self.__appliance_device_snmp_v3_users
 
     @property
@@ -1182,7 +1380,7 @@ class OneViewClient(object):
             ApplianceNodeInformation:
         """
         if not self.__appliance_node_information:
-            self.__appliance_node_information = ApplianceNodeInformation(self.__connection)
+            self.__appliance_node_information = get_resource_class('ApplianceNodeInformation')(self.__connection)
         return self.__appliance_node_information
 
     @property
@@ -1194,7 +1392,7 @@ class OneViewClient(object):
             ApplianceTimeAndLocaleConfiguration:
         """
         if not self.__appliance_time_and_locale_configuration:
-            self.__appliance_time_and_locale_configuration = ApplianceTimeAndLocaleConfiguration(self.__connection)
+            self.__appliance_time_and_locale_configuration = get_resource_class('ApplianceTimeAndLocaleConfiguration')(self.__connection)
         return self.__appliance_time_and_locale_configuration
 
     @property
@@ -1206,7 +1404,7 @@ class OneViewClient(object):
             Version:
         """
         if not self.__versions:
-            self.__versions = Versions(self.__connection)
+            self.__versions = get_resource_class('Versions')(self.__connection)
         return self.__versions
 
     @property
@@ -1218,7 +1416,7 @@ class OneViewClient(object):
             Backups:
         """
         if not self.__backups:
-            self.__backups = Backups(self.__connection)
+            self.__backups = get_resource_class('Backups')(self.__connection)
         return self.__backups
 
     @property
@@ -1230,7 +1428,7 @@ class OneViewClient(object):
         List of login details
         """
         if not self.__login_details:
-            self.__login_details = LoginDetails(self.__connection)
+            self.__login_details = get_resource_class('LoginDetails')(self.__connection)
         return self.__login_details
 
     @property
@@ -1241,5 +1439,9 @@ class OneViewClient(object):
         List of licenses
         """
         if not self.__licenses:
-            self.__licenses = Licenses(self.__connection)
+            self.__licenses = get_resource_class('Licenses')(self.__connection)
         return self.__licenses
+
+
+if sys.version_info < (3, 7):
+    sys.modules[__name__] = _LazyExportsModule(sys.modules[__name__])
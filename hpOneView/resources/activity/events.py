@@ -26,11 +26,6 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from future import standard_library
-
-standard_library.install_aliases()
-
-
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -91,6 +86,40 @@ class Events(object):
         """
         return self._client.get_all(start=start, count=count, filter=filter, query=query, sort=sort, view=view)
 
+    def iter_all(self, start=0, count=-1, filter='', query='', sort='', view='', prefetch=True):
+        """
+        Iterates over all the events based upon filters provided, one page at a time.
+
+        Args:
+            start:
+                 The first item to return, using 0-based indexing. If not specified, the default is 0 - start with the
+                 first available item.
+            count:
+                The number of resources to return. A count of -1 requests all items. The actual number of items in
+                the response may differ from the requested count if the sum of start and count exceed the total number
+                of items.
+            filter (list or str):
+                 A general filter/query string to narrow the list of items returned. The default is no filter; all
+                 resources are returned.
+            query:
+                 A general query string to narrow the list of resources returned. The default is no query (all
+                 resources are returned).
+            sort:
+                The sort order of the returned data set. By default, the sort order is based on create time, with the
+                oldest entry first.
+            view:
+                 Returns a specific subset of the attributes of the resource or collection, by specifying the name of a
+                 predefined view. The default view is expand (show all attributes of the resource and all elements of
+                 collections of resources).
+            prefetch:
+                Requests the next page while the events of the current page are being consumed. Enabled by default.
+
+        Returns:
+            generator: The events.
+        """
+        return self._client.iter_all(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
+                                     prefetch=prefetch)
+
     def get_by(self, field, value):
         """
         Gets all events that match the filter.
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.resources.resource import DEFAULT_BULK_MAX_WORKERS
+from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.resources.task_watcher import TaskWatcher
+
+logger = logging.getLogger(__name__)
+
+MSG_NOT_SUBMITTED = 'The request was not submitted because a previous item failed.'
+
+
+class RateLimiter(object):
+    """
+    Spaces out the requests made from many threads so that at most the given number start each second.
+    """
+
+    def __init__(self, rate):
+        self._interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = TaskMonitor.get_current_seconds()
+            wait = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class BulkItemResult(object):
+    """
+    Outcome of one item of a bulk operation.
+
+    Attributes:
+        item: The resource given to the bulk operation.
+        result: The associated resource of the task, the response body, or True for a deletion.
+        error: The exception raised for the item, or None.
+        submitted: Whether the request of the item was sent to the appliance.
+    """
+
+    def __init__(self, item):
+        self.item = item
+        self.result = None
+        self.error = None
+        self.submitted = False
+
+    @property
+    def ok(self):
+        return self.submitted and self.error is None
+
+
+class BulkResult(object):
+    """
+    Outcome of a bulk operation.
+
+    Attributes:
+        items (list): A BulkItemResult for each item, in the order they were given.
+    """
+
+    def __init__(self, items):
+        self.items = items
+
+    @property
+    def succeeded(self):
+        """
+        list: Results of the items that succeeded.
+        """
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self):
+        """
+        list: Results of the items whose request or task failed.
+        """
+        return [item for item in self.items if item.submitted and item.error is not None]
+
+    @property
+    def skipped(self):
+        """
+        list: Results of the items not submitted after a failure, when failing fast.
+        """
+        return [item for item in self.items if not item.submitted]
+
+    def __len__(self):
+        return len(self.items)
+
+
+class BulkExecutor(object):
+    """
+    Sends the requests of many items with bounded concurrency and waits for all their tasks together.
+
+    Requests are sent by a pool of threads, and each returned task is handed to a TaskWatcher that polls the pending
+    tasks in batches. Waiting for the tasks therefore does not hold a thread, so the number of requests in flight is
+    bounded by max_workers while any number of tasks run on the appliance.
+    """
+
+    def __init__(self, con, max_workers=DEFAULT_BULK_MAX_WORKERS, fail_fast=False, rate_limit=None,
+                 poll_interval=TaskWatcher.DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            con: Connection to the appliance.
+            max_workers: Maximum number of concurrent requests.
+            fail_fast: When True, items not yet submitted are skipped after the first failure. Tasks already
+                running on the appliance are still waited for.
+            rate_limit: Maximum number of requests started per second, or None for no limit.
+            poll_interval: Seconds between two polls of the pending tasks.
+        """
+        self._connection = con
+        self._max_workers = max(max_workers, 1)
+        self._fail_fast = fail_fast
+        self._rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self._poll_interval = poll_interval
+
+    def run(self, items, submit, timeout=-1):
+        """
+        Runs a request for each item.
+
+        Args:
+            items (list): The items.
+            submit: Callable that sends the request of an item and returns the task (or None) and the response body,
+                like connection.post.
+            timeout: Timeout in seconds for each task.
+
+        Returns:
+            BulkResult: The result of each item.
+        """
+        results = [BulkItemResult(item) for item in items]
+        if not results:
+            return BulkResult(results)
+
+        watcher = TaskWatcher(self._connection, poll_interval=self._poll_interval)
+        stop = threading.Event()
+        watched = []
+
+        def run_item(result):
+            future = self.__submit(result, submit, watcher, timeout, stop)
+            if future is not None:
+                watched.append((result, future))
+
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(results))) as executor:
+            for _ in executor.map(run_item, results):
+                pass
+
+        for result, future in watched:
+            try:
+                result.result = future.result()
+            except Exception as error:
+                self.__fail(result, error, stop)
+
+        for result in results:
+            if not result.submitted:
+                result.error = HPOneViewException(MSG_NOT_SUBMITTED)
+
+        return BulkResult(results)
+
+    def __submit(self, result, submit, watcher, timeout, stop):
+        if self._rate_limiter and not stop.is_set():
+            self._rate_limiter.acquire()
+        if stop.is_set():
+            return None
+
+        result.submitted = True
+        try:
+            task, body = submit(result.item)
+            if not task:
+                result.result = body if body else True
+                return None
+            future = watcher.watch(task, timeout)
+        except Exception as error:
+            self.__fail(result, error, stop)
+            return None
+
+        if self._fail_fast:
+            def stop_on_error(done):
+                if done.exception() is not None:
+                    stop.set()
+            future.add_done_callback(stop_on_error)
+        return future
+
+    def __fail(self, result, error, stop):
+        logger.warning('Bulk operation failed for %s: %s' % (result.item, error))
+        result.error = error
+        if self._fail_fast:
+            stop.set()
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import calendar
+import datetime
+import math
+
+from array import array
+from collections import OrderedDict
+from itertools import groupby
+
+NAN = float('nan')
+
+# Samples kept by default for each resource: 24 hours of 5 minute samples
+DEFAULT_CAPACITY = 288
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+TIMESTAMP_FORMATS = ('%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S')
+
+
+def _mean(values):
+    return math.fsum(values) / len(values)
+
+
+AGGREGATES = {
+    'mean': _mean,
+    'min': min,
+    'max': max,
+    'sum': math.fsum,
+    'last': lambda values: values[-1],
+}
+
+
+def parse_timestamp(value):
+    """
+    Converts an appliance timestamp to seconds since the epoch.
+
+    Args:
+        value: ISO 8601 UTC string, such as '2018-05-03T10:15:00.000Z', or milliseconds since the epoch.
+
+    Returns:
+        float
+    """
+    if not isinstance(value, (str, type(u''))):
+        return float(value) / 1000
+    value = value.rstrip('Z')
+    for timestamp_format in TIMESTAMP_FORMATS:
+        try:
+            parsed = datetime.datetime.strptime(value, timestamp_format)
+        except ValueError:
+            continue
+        return calendar.timegm(parsed.timetuple()) + parsed.microsecond / 1e6
+    raise ValueError('Invalid timestamp: %s' % value)
+
+
+def format_timestamp(seconds):
+    """
+    Converts seconds since the epoch to the ISO 8601 UTC format of the appliance filters.
+
+    Args:
+        seconds: Seconds since the epoch.
+
+    Returns:
+        str: Timestamp such as '2018-05-03T10:15:00.000Z'.
+    """
+    parsed = EPOCH + datetime.timedelta(seconds=seconds)
+    return parsed.strftime('%Y-%m-%dT%H:%M:%S.') + '%03dZ' % (parsed.microsecond // 1000)
+
+
+def downsample(times, values, interval, how='mean'):
+    """
+    Aggregates samples into buckets of interval seconds, aligned on multiples of interval since the epoch. The NaN
+    values are skipped and the buckets without value are omitted.
+
+    Args:
+        times: Sample times in seconds, in ascending order.
+        values: Sample values.
+        interval: Bucket width in seconds.
+        how: 'mean', 'min', 'max', 'sum' or 'last'.
+
+    Returns:
+        tuple: The start time of each bucket and its aggregated value, as two array('d').
+    """
+    aggregate = AGGREGATES[how]
+    bucket_times, bucket_values = array('d'), array('d')
+    samples = ((time, value) for time, value in zip(times, values) if value == value)
+    for bucket, bucket_samples in groupby(samples, key=lambda sample: math.floor(sample[0] / interval)):
+        bucket_times.append(bucket * interval)
+        bucket_values.append(aggregate([value for _, value in bucket_samples]))
+    return bucket_times, bucket_values
+
+
+def percentile(values, q):
+    """
+    Computes a percentile with linear interpolation between the closest ranks, like numpy.percentile. The NaN values
+    are skipped.
+
+    Args:
+        values: Sample values.
+        q: Percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile, or NaN when there is no value.
+    """
+    ordered = sorted(value for value in values if value == value)
+    if not ordered:
+        return NAN
+    rank = (len(ordered) - 1) * q / 100.0
+    lower = int(math.floor(rank))
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class MetricBuffer(object):
+    """
+    Keeps the last samples of the metrics of one resource in columns: an array of sample times, and an array of values
+    for each metric, all of the same length. Once capacity samples are kept, each new sample overwrites the oldest one,
+    so the memory used is bounded: about 8 bytes per sample for the times, and the size of the array typecode per
+    sample for each metric.
+
+    The arrays support the buffer protocol, so numpy.frombuffer can wrap the values returned without a copy.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, typecode='d'):
+        """
+        Args:
+            capacity: Maximum number of samples kept.
+            typecode: Typecode of the value arrays, 'd' for double precision or 'f' to halve the memory used.
+        """
+        self.capacity = capacity
+        self._typecode = typecode
+        self._times = array('d')
+        self._columns = OrderedDict()
+        self._next = 0
+
+    @property
+    def metrics(self):
+        """
+        Names of the metrics received.
+        """
+        return list(self._columns)
+
+    @property
+    def last_time(self):
+        """
+        Time of the newest sample, or None when the buffer is empty.
+        """
+        return self._times[self._next - 1] if self._times else None
+
+    @property
+    def nbytes(self):
+        """
+        Bytes used by the arrays of the buffer.
+        """
+        return sum(len(column) * column.itemsize for column in [self._times] + list(self._columns.values()))
+
+    def append(self, time, samples):
+        """
+        Adds a sample of the metrics. Samples not newer than the last one are ignored, since messages may overlap.
+
+        Args:
+            time: Sample time, in seconds.
+            samples (dict): Value of each metric. The metrics missing from the sample get NaN.
+
+        Returns:
+            bool: Whether the sample was added.
+        """
+        return self.extend([time], dict((metric, [value]) for metric, value in samples.items())) == 1
+
+    def extend(self, times, columns):
+        """
+        Adds many samples, a column at a time. The samples not newer than the last one are ignored, since messages
+        may overlap.
+
+        Args:
+            times (list): Sample times in seconds, in ascending order.
+            columns (dict): Values of each metric, in the order of times. The metrics missing get NaN.
+
+        Returns:
+            int: Number of samples added.
+        """
+        last_time = self.last_time
+        offset = bisect.bisect_right(times, last_time) if last_time is not None else 0
+        if self.capacity <= 0 or offset >= len(times):
+            return 0
+        added = len(times) - offset
+        # The samples that the newest ones would overwrite are not written
+        offset = max(offset, len(times) - self.capacity)
+
+        for metric in columns:
+            if metric not in self._columns:
+                self._columns[metric] = array(self._typecode, [NAN]) * len(self._times)
+
+        while offset < len(times):
+            if len(self._times) < self.capacity:
+                count = min(len(times) - offset, self.capacity - len(self._times))
+                self._times.extend(times[offset:offset + count])
+                for metric, column in self._columns.items():
+                    values = columns.get(metric)
+                    column.extend(values[offset:offset + count] if values is not None else [NAN] * count)
+                self._next = len(self._times) % self.capacity
+            else:
+                count = min(len(times) - offset, self.capacity - self._next)
+                end = self._next + count
+                self._times[self._next:end] = array('d', times[offset:offset + count])
+                for metric, column in self._columns.items():
+                    values = columns.get(metric)
+                    column[self._next:end] = array(self._typecode, values[offset:offset + count]
+                                                   if values is not None else [NAN] * count)
+                self._next = end % self.capacity
+            offset += count
+        return added
+
+    def times(self):
+        """
+        Returns:
+            array: Sample times in seconds, from the oldest to the newest.
+        """
+        return self.__ordered(self._times)
+
+    def values(self, metric):
+        """
+        Args:
+            metric: Metric name.
+
+        Returns:
+            array: Values of the metric, in the order of times. Empty when the metric was not received.
+        """
+        column = self._columns.get(metric)
+        if column is None:
+            return array(self._typecode)
+        return self.__ordered(column)
+
+    def downsample(self, metric, interval, how='mean'):
+        """
+        Aggregates the values of a metric into buckets of interval seconds. See downsample.
+
+        Returns:
+            tuple: Start time of each bucket and aggregated value, as two array('d').
+        """
+        return downsample(self.times(), self.values(metric), interval, how)
+
+    def percentile(self, metric, q):
+        """
+        Computes a percentile of the values of a metric. See percentile.
+        """
+        return percentile(self.values(metric), q)
+
+    def __len__(self):
+        return len(self._times)
+
+    def __ordered(self, column):
+        if len(column) < self.capacity or self._next == 0:
+            return column[:]
+        return column[self._next:] + column[:self._next]
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import logging
+import threading
+import time
+
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from hpOneView.exceptions import HPOneViewValueError
+from hpOneView.resources.data_services.metric_buffers import AGGREGATES, MetricBuffer, downsample, percentile
+from hpOneView.resources.resource import ResourceClient, UTILIZATION_DEFAULT_SPAN
+
+logger = logging.getLogger(__name__)
+
+MSG_INVALID_AGGREGATE = 'Invalid aggregate: %s'
+
+# Containment levels of the topology, from the widest: a scope is expanded into the resources of the lower levels only
+LEVELS = OrderedDict([
+    ('datacenters', 0),
+    ('racks', 1),
+    ('enclosures', 2),
+    ('server-hardware', 3),
+    ('power-devices', 3),
+])
+
+
+def get_category(uri):
+    """
+    Gets the category of a resource URI, such as 'racks' for '/rest/racks/1'.
+    """
+    parts = uri.split('?')[0].split('/')
+    return parts[2] if len(parts) > 3 and parts[1] == 'rest' else None
+
+
+def find_uris(document):
+    """
+    Finds the URIs of the resources of the known categories in a document, such as a rack topology or the contents
+    of a data center, whatever the nesting.
+
+    Returns:
+        list: Resource URIs, without subresource paths, in the order found.
+    """
+    found = OrderedDict()
+    pending = [document]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, dict):
+            pending.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            pending.extend(reversed(item))
+        elif isinstance(item, (str, type(u''))) and get_category(item) in LEVELS:
+            found['/'.join(item.split('?')[0].split('/')[:4])] = True
+    return list(found)
+
+
+class SeriesCache(object):
+    """
+    Keeps the utilization series retrieved for each resource, metric and view, with the time span they cover, so the
+    next queries over overlapping spans only request the missing parts. The least recently used series are evicted
+    beyond max_size.
+    """
+    DEFAULT_MAX_SIZE = 20000
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_missing(self, key, start, end):
+        """
+        Gets the parts of a span not covered by the cached series.
+
+        Returns:
+            list: Start and end of each missing part.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < start or entry[0] > end:
+                self._misses += 1
+                return [(start, end)]
+            self._entries[key] = self._entries.pop(key)
+            missing = []
+            if start < entry[0]:
+                missing.append((start, entry[0]))
+            if end > entry[1]:
+                missing.append((entry[1], end))
+            if missing:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return missing
+
+    def put(self, key, start, end, times, values):
+        """
+        Adds the samples retrieved for a span. They are merged with the cached series when the spans overlap, and
+        replace it otherwise.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and entry[1] >= start and entry[0] <= end:
+                samples = dict(zip(entry[2], entry[3]))
+                samples.update(zip(times, values))
+                start, end = min(start, entry[0]), max(end, entry[1])
+                times = sorted(samples)
+                values = [samples[sample_time] for sample_time in times]
+            self._entries[key] = (start, end, array('d', times), array('d', values))
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, key, start, end):
+        """
+        Gets the cached samples of a span.
+
+        Returns:
+            tuple: Sample times and values, as two arrays.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return array('d'), array('d')
+        lower = bisect.bisect_left(entry[2], start)
+        upper = bisect.bisect_right(entry[2], end)
+        return entry[2][lower:upper], entry[3][lower:upper]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Number of cached series, of queries fully answered from the cache (hits) and of queries that
+            requested the appliance, and bytes used by the samples.
+        """
+        with self._lock:
+            return dict(entries=len(self._entries), hits=self._hits, misses=self._misses,
+                        nbytes=sum(len(entry[2]) * 16 for entry in self._entries.values()))
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class UtilizationAggregator(object):
+    """
+    Rolls up the utilization of the resources in a scope, such as the power of the servers in a rack or the
+    temperature of the enclosures in a data center.
+
+    The scope is expanded down the topology: data centers into their racks, racks into the devices of their topology,
+    enclosures into the servers of their bays, until the resources of the measured categories. The utilization of
+    these members is retrieved with at most max_workers concurrent requests, resampled into buckets of the same width,
+    and aggregated by bucket. The series retrieved are cached, so the queries over overlapping spans only request the
+    missing samples.
+
+    Examples:
+        >>> rollup = oneview_client.utilization_aggregator.aggregate(rack_uri, 'AveragePower', interval=3600)
+        >>> rollup.values('sum'), rollup.values('p95')
+    """
+    DEFAULT_CATEGORIES = ('server-hardware',)
+
+    # Concurrent requests to the appliance
+    DEFAULT_MAX_WORKERS = 8
+
+    # Seconds before now during which the samples may not be collected yet, so they are not cached
+    RECENT_SPAN = 900
+
+    def __init__(self, con, categories=DEFAULT_CATEGORIES, max_workers=DEFAULT_MAX_WORKERS,
+                 cache_size=SeriesCache.DEFAULT_MAX_SIZE):
+        """
+        Args:
+            con: Connection.
+            categories: Categories of the resources measured: 'server-hardware', 'enclosures' or 'power-devices'.
+                Enclosures are not expanded into their servers when they are measured, so their power is not counted
+                twice.
+            max_workers: Maximum number of concurrent requests.
+            cache_size: Maximum number of series cached.
+        """
+        self._connection = con
+        self._categories = tuple(categories)
+        self._max_workers = max_workers
+        self._cache = SeriesCache(cache_size)
+        self._clients = {}
+
+    def get_members(self, scope):
+        """
+        Gets the resources measured in a scope.
+
+        Args:
+            scope: URI of a data center, rack, enclosure, server hardware or power device, a topology document such as
+                the one returned by Racks.get_device_topology, or a list of them.
+
+        Returns:
+            list: URIs of the resources of the measured categories.
+        """
+        members = OrderedDict()
+        visited = set()
+        pending = []
+        for item in (scope if isinstance(scope, list) else [scope]):
+            # The resources of a topology document are below the level of the document
+            category = get_category(item.get('uri') or '') if isinstance(item, dict) else None
+            pending.append((LEVELS.get(category), item))
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            while pending:
+                expand = []
+                for level, item in pending:
+                    uris = find_uris(item) if isinstance(item, (dict, list)) else [item]
+                    for uri in uris:
+                        category = get_category(uri)
+                        if uri in visited or category not in LEVELS:
+                            continue
+                        if level is not None and LEVELS[category] <= level:
+                            continue
+                        visited.add(uri)
+                        if category in self._categories:
+                            members[uri] = True
+                        elif category in ('datacenters', 'racks', 'enclosures'):
+                            expand.append(uri)
+                pending = list(zip([LEVELS[get_category(uri)] for uri in expand],
+                                   executor.map(self.__get_contents, expand)))
+
+        return list(members)
+
+    def get_series(self, uris, metric, start, end, view=None):
+        """
+        Gets the utilization series of a metric for many resources, requesting only the samples not cached.
+
+        Args:
+            uris: Resource URIs.
+            metric: Metric name, such as 'AveragePower'.
+            start: Start of the span, in seconds since the epoch.
+            end: End of the span, in seconds since the epoch.
+            view: Resolution of the samples, 'native', 'hour' or 'day'.
+
+        Returns:
+            dict: Sample times and values of each resource, as two arrays, keyed by URI.
+        """
+        requests = [(uri, span) for uri in uris for span in self._cache.get_missing((uri, metric, view), start, end)]
+        recent = {}
+        if requests:
+            logger.debug('Requesting %d utilization spans for %d resources' % (len(requests), len(uris)))
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                for (uri, _), samples in zip(requests, executor.map(
+                        lambda request: self.__fetch(request[0], metric, request[1], view), requests)):
+                    if samples is not None:
+                        recent[uri] = samples
+
+        series = OrderedDict()
+        for uri in uris:
+            times, values = self._cache.get((uri, metric, view), start, end)
+            if uri in recent:
+                times, values = times + recent[uri][0], values + recent[uri][1]
+            series[uri] = times, values
+        return series
+
+    def aggregate(self, scope, metric, start=None, end=None, interval=3600, view=None, aggregates=('sum', 'max'),
+                  how='mean'):
+        """
+        Aggregates the utilization of a metric over the resources of a scope.
+
+        Each member series is first resampled into buckets of interval seconds, aligned on multiples of interval since
+        the epoch, then the values of the members are aggregated by bucket.
+
+        Args:
+            scope: Scope, see get_members.
+            metric: Metric name, such as 'AveragePower' or 'AmbientTemperature'.
+            start: Start of the span, in seconds since the epoch. 24 hours before the end by default.
+            end: End of the span, in seconds since the epoch. Now by default.
+            interval: Bucket width in seconds.
+            view: Resolution of the samples retrieved, 'native', 'hour' or 'day'.
+            aggregates: Aggregates computed over the members for each bucket: 'sum', 'mean', 'min', 'max', or a
+                percentile such as 'p95'.
+            how: Aggregate resampling each member series: 'mean', 'min', 'max', 'sum' or 'last'.
+
+        Returns:
+            MetricBuffer: The start time of each bucket, a column for each aggregate, and a 'count' column with the
+            number of members with a value in the bucket.
+        """
+        for name in aggregates:
+            self.__get_aggregate(name)
+        end = end if end is not None else time.time()
+        start = start if start is not None else end - UTILIZATION_DEFAULT_SPAN
+
+        buckets = {}
+        for times, values in self.get_series(self.get_members(scope), metric, start, end, view).values():
+            for bucket, value in zip(*downsample(times, values, interval, how)):
+                buckets.setdefault(bucket, []).append(value)
+
+        bucket_times = sorted(buckets)
+        columns = dict((name, [self.__get_aggregate(name)(buckets[bucket]) for bucket in bucket_times])
+                       for name in aggregates)
+        columns['count'] = [len(buckets[bucket]) for bucket in bucket_times]
+        result = MetricBuffer(capacity=len(bucket_times))
+        result.extend(bucket_times, columns)
+        return result
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def get_cache_stats(self):
+        """
+        Returns:
+            dict: See SeriesCache.get_stats.
+        """
+        return self._cache.get_stats()
+
+    def __get_contents(self, uri):
+        if get_category(uri) == 'racks':
+            return self._connection.get(uri + '/deviceTopology')
+        return self._connection.get(uri)
+
+    def __fetch(self, uri, metric, span, view):
+        collection = uri.rsplit('/', 1)[0]
+        client = self._clients.get(collection)
+        if client is None:
+            client = self._clients[collection] = ResourceClient(self._connection, collection)
+        series = client.get_utilization_series(uri, fields=metric, start=span[0], end=span[1], view=view,
+                                               max_workers=1)
+        times, values = series.times(), series.values(metric)
+        if metric not in series.metrics:
+            times = array('d')
+
+        # The recent samples may not be collected yet: they are not cached, so they are requested again next time
+        covered_end = min(span[1], time.time() - self.RECENT_SPAN)
+        count = bisect.bisect_right(times, covered_end) if covered_end > span[0] else 0
+        if covered_end > span[0]:
+            self._cache.put((uri, metric, view), span[0], covered_end, times[:count], values[:count])
+        if count < len(times):
+            return times[count:], values[count:]
+        return None
+
+    @staticmethod
+    def __get_aggregate(name):
+        if name in AGGREGATES:
+            return AGGREGATES[name]
+        if name.startswith('p'):
+            try:
+                q = float(name[1:])
+            except ValueError:
+                q = None
+            if q is not None and 0 <= q <= 100:
+                return lambda values: percentile(values, q)
+        raise HPOneViewValueError(MSG_INVALID_AGGREGATE % name)
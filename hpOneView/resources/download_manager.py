@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import os
+import socket
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from hpOneView.exceptions import HPOneViewException, HPOneViewValueError
+from hpOneView.resources.upload_manager import file_checksum
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_PARTS = 4
+DOWNLOAD_MIN_PART_SIZE = 8388608
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_BACKOFF = 1
+
+# Parts are written at their offset with os.pwrite, which is not available on Windows and Python 2
+PARALLEL_DOWNLOAD_SUPPORTED = hasattr(os, 'pwrite')
+
+MSG_CHECKSUM_MISMATCH = 'The {0} checksum of {1} is {2}, expected {3}.'
+MSG_RANGE_NOT_HONORED = 'The appliance did not honor the range request for {0}.'
+MSG_RANGE_INCOMPLETE = 'The download of bytes {0}-{1} of {2} stopped at {3}.'
+
+
+def split_range(start, end, parts, min_part_size):
+    """
+    Splits the bytes from start to end (exclusive) into at most the given number of contiguous ranges.
+
+    Returns:
+        list: Tuples with the first and the last (inclusive) byte of each range.
+    """
+    size = end - start
+    count = max(1, min(parts, size // min_part_size))
+    ranges = []
+    for index in range(count):
+        first = start + size * index // count
+        last = start + size * (index + 1) // count - 1
+        ranges.append((first, last))
+    return ranges
+
+
+class _FileWriter(object):
+    """
+    Writes a stream into a file descriptor from an offset, without moving the file position shared by the threads.
+    """
+
+    # The chunks are written before write returns, so the connection can pass views on its read buffer
+    accepts_memoryview = True
+
+    def __init__(self, fd, offset):
+        self._fd = fd
+        self.offset = offset
+
+    def write(self, data):
+        view = memoryview(data)
+        while len(view):
+            written = os.pwrite(self._fd, view, self.offset)
+            self.offset += written
+            view = view[written:]
+
+
+class DownloadManager(object):
+    """
+    Downloads large files from the appliance with parallel range requests.
+
+    The first request asks for the first part of the file. When the appliance answers with 206 Partial Content, the
+    file is preallocated and the remaining bytes are split into ranges downloaded concurrently, each written at its
+    offset. When the appliance ignores the Range header the whole file arrives in that first response, so the download
+    costs a single request either way. When it does not report the total size, the whole file is streamed again in a
+    single request. A range interrupted by a network error is resumed from its last written byte.
+
+    Examples:
+        >>> DownloadManager(connection, parts=8).download(backup['downloadUri'], '/tmp/backup.bkp')
+    """
+
+    def __init__(self, con, parts=DOWNLOAD_PARTS, min_part_size=DOWNLOAD_MIN_PART_SIZE, retries=DOWNLOAD_RETRIES):
+        """
+        Args:
+            con: Connection to the appliance.
+            parts: Maximum number of concurrent range requests.
+            min_part_size: Smallest range, in bytes, worth a request of its own.
+            retries: Number of times an interrupted range is resumed.
+        """
+        self._connection = con
+        self._parts = parts
+        self._min_part_size = min_part_size
+        self._retries = retries
+
+    def download(self, uri, file_path, checksum=None, algorithm='sha256'):
+        """
+        Downloads the content of a URI to a file.
+
+        Args:
+            uri: URI of the content.
+            file_path: Destination file path.
+            checksum: Optional hex digest the downloaded file must match.
+            algorithm: Name of the hashlib algorithm of the checksum.
+
+        Returns:
+            bool: Successfully downloaded.
+
+        Raises:
+            HPOneViewValueError: The checksum of the file does not match.
+        """
+        if self._parts > 1 and PARALLEL_DOWNLOAD_SUPPORTED:
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                self.__download_ranges(fd, uri)
+            finally:
+                os.close(fd)
+        else:
+            with open(file_path, 'wb') as output_file:
+                self._connection.download_to_stream(output_file, uri)
+
+        if checksum:
+            actual = file_checksum(file_path, algorithm)
+            if actual.lower() != checksum.lower():
+                raise HPOneViewValueError(MSG_CHECKSUM_MISMATCH.format(algorithm, file_path, actual, checksum))
+
+        return True
+
+    def __download_ranges(self, fd, uri):
+        status, total, first_end = self.__download_range(fd, uri, 0, self._min_part_size - 1, resumable=False)
+        if status != 206:
+            # The appliance ignored the Range header, the whole content arrived in the first response
+            return
+        if total is None:
+            if first_end >= self._min_part_size:
+                # The total size is unknown (Content-Range: bytes 0-N/*), so it cannot be split into ranges and the
+                # whole content is streamed again in a single request
+                self._connection.download_to_stream(_FileWriter(fd, 0), uri)
+            return
+        if total <= first_end:
+            return
+
+        os.ftruncate(fd, total)
+        ranges = split_range(first_end, total, self._parts, self._min_part_size)
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [executor.submit(self.__download_range, fd, uri, start, end) for start, end in ranges]
+            for future in futures:
+                status = future.result()[0]
+                if status != 206:
+                    raise HPOneViewException(MSG_RANGE_NOT_HONORED.format(uri))
+
+    def __download_range(self, fd, uri, start, end, resumable=True):
+        writer = _FileWriter(fd, start)
+        attempt = 0
+        while True:
+            if writer.offset > end:
+                # Every byte of the range was written before the error
+                return 206, None, writer.offset
+            try:
+                status, total = self._connection.download_range(writer, uri, writer.offset, end)
+            except socket.error as e:
+                error = e
+                if not resumable:
+                    # Until the appliance answered with 206, the response may be the whole file from its start
+                    writer.offset = start
+            else:
+                if status != 206 or not self.__is_incomplete(writer.offset, end, total, resumable):
+                    return status, total, writer.offset
+                # The response ended before the last byte of the range, without a network error
+                error = HPOneViewException(MSG_RANGE_INCOMPLETE.format(start, end, uri, writer.offset))
+
+            attempt += 1
+            if attempt > self._retries:
+                raise error
+            logger.warning('Download of bytes %d-%d of %s interrupted at %d (%s). Resuming...' %
+                           (start, end, uri, writer.offset, error))
+            time.sleep(DOWNLOAD_BACKOFF * attempt)
+
+    @staticmethod
+    def __is_incomplete(offset, end, total, resumable):
+        if total is None:
+            # Only the first range may be shorter than requested, when it is the whole content of unknown size
+            return resumable and offset <= end
+        return offset <= min(end, total - 1)
@@ -26,11 +26,6 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from future import standard_library
-
-standard_library.install_aliases()
-
-
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -332,6 +327,27 @@ class PowerDevices(object):
 
         return self._client.get_utilization(id_or_uri, fields, filter, refresh, view)
 
+    def get_utilization_series(self, ids_or_uris, fields=None, start=None, end=None, view=None, refresh=False):
+        """
+        Retrieves the utilization data of power devices for a time span as arrays, requesting all the segments of the
+        span. See get_utilization for the supported metrics and views.
+
+        Args:
+            ids_or_uris: Power device ID or URI, or a list of them to retrieve them concurrently.
+            fields: Name of the metrics to be retrieved in the format METRIC[,METRIC]... All the metrics when omitted.
+            start: Start of the span, as a datetime, an ISO 8601 string or seconds since the epoch. 24 hours before the
+                end when omitted.
+            end: End of the span, in the same formats. The latest sample when omitted.
+            view: Resolution of the samples, 'native', 'hour' or 'day'.
+            refresh: Queues a request to obtain the most recent utilization data.
+
+        Returns:
+            MetricBuffer: The sample times and the values of each metric. A dict of MetricBuffer keyed by URI when a
+            list is given.
+        """
+        return self._client.get_utilization_series(ids_or_uris, fields=fields, start=start, end=end, view=view,
+                                                   refresh=refresh)
+
     def get_by(self, field, value):
         """
         Gets all power devices that match the filter
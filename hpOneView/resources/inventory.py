@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import copy
+import logging
+import threading
+import time
+
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Fields indexed by every snapshot
+DEFAULT_INDEXES = ('name', 'uri', 'serialNumber', 'macAddress', 'wwn')
+
+# Seconds after which a snapshot is loaded again before answering
+DEFAULT_MAX_AGE = 300
+
+
+def index_key(value):
+    """
+    Gets the key of a field value in the indexes, matching the case-insensitive comparison of ResourceClient.get_by.
+    """
+    return str(value).lower()
+
+
+class InventorySnapshot(object):
+    """
+    Copy of a resource collection held in memory, with hash indexes on some of its fields, so the lookups by one of
+    these fields are answered without a request to the appliance.
+
+    The collection is loaded with a single get_all on the first lookup, and loaded again on the first lookup made more
+    than max_age seconds later. Between two loads, the snapshot only sees the changes applied with put and remove, the
+    ones made through ResourceClient create, update, patch and delete for instance.
+    """
+
+    def __init__(self, uri, load, indexes=None, max_age=DEFAULT_MAX_AGE):
+        """
+        Args:
+            uri: URI of the collection.
+            load: Callable returning all the resources of the collection.
+            indexes: Fields indexed in addition to DEFAULT_INDEXES. Only the top level fields can be indexed.
+            max_age: Seconds after which the snapshot is loaded again, or None to only load it again on refresh.
+        """
+        self.uri = uri
+        self.max_age = max_age
+        self._load = load
+        self._fields = tuple(OrderedDict.fromkeys(DEFAULT_INDEXES + tuple(indexes or ())))
+        self._resources = None
+        self._indexes = None
+        self._loaded_at = None
+        self._loads = 0
+        self._hits = 0
+        self._lock = threading.RLock()
+
+    @property
+    def fields(self):
+        """
+        Indexed fields.
+        """
+        return self._fields
+
+    @property
+    def age(self):
+        """
+        Seconds since the snapshot was loaded, or None when it was not loaded yet.
+        """
+        return time.time() - self._loaded_at if self._loaded_at is not None else None
+
+    def is_stale(self):
+        """
+        Returns:
+            bool: Whether the snapshot must be loaded before answering.
+        """
+        if self._loaded_at is None:
+            return True
+        return self.max_age is not None and time.time() - self._loaded_at > self.max_age
+
+    def is_indexed(self, field):
+        return field in self._fields
+
+    def add_index(self, field):
+        """
+        Indexes one more field.
+
+        Args:
+            field: Top level field of the resources.
+        """
+        with self._lock:
+            if field in self._fields:
+                return
+            self._fields += (field,)
+            if self._resources is not None:
+                index = self._indexes[field] = {}
+                for uri, resource in self._resources.items():
+                    self.__add_to_index(index, resource.get(field), uri)
+
+    def refresh(self):
+        """
+        Loads the whole collection, replacing the resources and the indexes of the snapshot.
+        """
+        with self._lock:
+            loaded_at = time.time()
+            resources = OrderedDict()
+            for resource in self._load():
+                resources[resource.get('uri')] = resource
+            indexes = dict((field, {}) for field in self._fields)
+            for uri, resource in resources.items():
+                for field, index in indexes.items():
+                    self.__add_to_index(index, resource.get(field), uri)
+            self._resources, self._indexes, self._loaded_at = resources, indexes, loaded_at
+            self._loads += 1
+            logger.debug('Inventory snapshot of %s loaded: %d resources' % (self.uri, len(resources)))
+
+    def invalidate(self):
+        """
+        Makes the next lookup load the collection again.
+        """
+        with self._lock:
+            self._loaded_at = None
+
+    def get_by(self, field, value):
+        """
+        Gets the resources whose field is equal to value, ignoring the case.
+
+        Args:
+            field: Indexed field.
+            value: Value searched.
+
+        Returns:
+            list: Copies of the matching resources, in the order of the collection.
+        """
+        with self._lock:
+            if self.is_stale():
+                self.refresh()
+            uris = self._indexes[field].get(index_key(value), ())
+            self._hits += 1
+            return [copy.deepcopy(self._resources[uri]) for uri in uris]
+
+    def put(self, resource):
+        """
+        Adds a resource to the snapshot, or replaces the one with the same URI.
+
+        Args:
+            resource (dict): Resource with its uri.
+        """
+        uri = resource.get('uri')
+        if not uri:
+            return
+        with self._lock:
+            if self._resources is None:
+                return
+            self.__remove(uri)
+            self._resources[uri] = copy.deepcopy(resource)
+            for field, index in self._indexes.items():
+                self.__add_to_index(index, resource.get(field), uri)
+
+    def remove(self, uri):
+        """
+        Removes a resource from the snapshot.
+
+        Args:
+            uri: URI of the resource.
+        """
+        with self._lock:
+            if self._resources is not None:
+                self.__remove(uri)
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Number of resources, seconds since the last load, number of loads and of lookups answered.
+        """
+        with self._lock:
+            return dict(resources=len(self), age=self.age, loads=self._loads, hits=self._hits)
+
+    def __len__(self):
+        return len(self._resources) if self._resources is not None else 0
+
+    def __remove(self, uri):
+        resource = self._resources.pop(uri, None)
+        if resource is None:
+            return
+        for field, index in self._indexes.items():
+            value = resource.get(field)
+            if value is None:
+                continue
+            key = index_key(value)
+            uris = [indexed for indexed in index.get(key, ()) if indexed != uri]
+            if uris:
+                index[key] = uris
+            else:
+                index.pop(key, None)
+
+    @staticmethod
+    def __add_to_index(index, value, uri):
+        if value is not None:
+            index.setdefault(index_key(value), []).append(uri)
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import socket
+import ssl
+import threading
+
+from collections import deque
+from hpOneView.exceptions import HPOneViewException
+
+try:
+    import amqp
+except ImportError:
+    amqp = None
+
+logger = logging.getLogger(__name__)
+
+MSG_AMQP_NOT_INSTALLED = 'The amqp package is required to receive the message bus messages'
+MSG_ALREADY_STARTED = 'The consumer is already started'
+
+# Exchanges of the State-Change Message Bus and of the Metric Streaming Message Bus
+SCMB_EXCHANGE = 'scmb'
+MSMB_EXCHANGE = 'msmb'
+
+
+class AmqpMessageSource(object):
+    """
+    Receives the messages of a message bus of the appliance, the State-Change Message Bus (SCMB) or the Metric
+    Streaming Message Bus (MSMB), from its RabbitMQ server, authenticated with the client certificate generated with
+    CertificateRabbitMQ. Requires the amqp package.
+
+    Iterating over the source yields the body of each message until close is called.
+    """
+    PORT = 5671
+
+    # Seconds the iteration waits for a message before checking whether the source was closed
+    DEFAULT_WAIT = 1
+
+    def __init__(self, host, routing_keys=None, ca_certs='caroot.pem', certfile='client.pem', keyfile='key.pem',
+                 exchange=SCMB_EXCHANGE, wait=DEFAULT_WAIT):
+        """
+        Args:
+            host: Appliance hostname or IP.
+            routing_keys: Routing keys bound to the queue, 'scmb.server-hardware.#' for instance. All the messages of
+                the exchange by default.
+            ca_certs: File with the certificate of the appliance CA.
+            certfile: File with the client certificate.
+            keyfile: File with the client key.
+            exchange: SCMB_EXCHANGE or MSMB_EXCHANGE.
+            wait: Seconds waited for a message before checking whether the source was closed.
+        """
+        self._host = host
+        self._exchange = exchange
+        self._routing_keys = routing_keys or [exchange + '.#']
+        self._ssl_options = {'ca_certs': ca_certs,
+                             'certfile': certfile,
+                             'keyfile': keyfile,
+                             'cert_reqs': ssl.CERT_REQUIRED,
+                             'ssl_version': ssl.PROTOCOL_TLSv1_2,
+                             'server_side': False}
+        self._wait = wait
+        self._connection = None
+        self._received = deque()
+        self._closed = False
+
+    def open(self):
+        """
+        Connects to the message bus and binds a queue to the routing keys. The messages published from then on are
+        received. A source closed before it was opened, by a consumer stopped right after it started for instance,
+        does not connect.
+        """
+        if amqp is None:
+            raise HPOneViewException(MSG_AMQP_NOT_INSTALLED)
+        if self._connection is not None or self._closed:
+            return
+        self._connection = amqp.Connection('%s:%d' % (self._host, self.PORT), login_method='EXTERNAL',
+                                           ssl=self._ssl_options)
+        self._connection.connect()
+        channel = self._connection.channel()
+        queue, _, _ = channel.queue_declare(exclusive=True)
+        for routing_key in self._routing_keys:
+            channel.queue_bind(queue, self._exchange, routing_key)
+        channel.basic_consume(queue, callback=self._received.append, no_ack=True)
+
+    def close(self):
+        """
+        Stops the iteration and disconnects from the message bus. A closed source cannot be opened again.
+        """
+        self._closed = True
+
+    def __iter__(self):
+        self.open()
+        try:
+            while not self._closed:
+                while self._received:
+                    yield self._received.popleft().body
+                try:
+                    self._connection.drain_events(timeout=self._wait)
+                except socket.timeout:
+                    pass
+        finally:
+            connection, self._connection = self._connection, None
+            if connection is not None:
+                connection.close()
+
+
+class MessageConsumer(object):
+    """
+    Base of the consumers applying the messages of a message bus, in the foreground with consume or in a background
+    thread with start and stop.
+
+    The messages come from a source, any iterable of message bodies: an AmqpMessageSource reading the appliance bus, or
+    a list or queue of recorded messages in tests. The optional open and close methods of the source are called when
+    the consumption starts and stops.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._source = None
+        self._messages = 0
+        self._errors = 0
+
+    def handle(self, message):
+        """
+        Applies one message.
+
+        Args:
+            message: Message body, as JSON bytes or string, or already parsed.
+        """
+        raise NotImplementedError()
+
+    def consume(self, source):
+        """
+        Applies the messages of a source until it is exhausted or closed. The messages that cannot be applied are
+        logged and skipped.
+
+        Args:
+            source: Iterable of message bodies.
+        """
+        if hasattr(source, 'open'):
+            source.open()
+        self._opened()
+
+        for message in source:
+            with self._lock:
+                self._messages += 1
+            try:
+                self.handle(message)
+            except Exception as error:
+                with self._lock:
+                    self._errors += 1
+                logger.warning('%s could not apply a message: %s' % (type(self).__name__, error))
+
+    def start(self, source):
+        """
+        Consumes the messages of a source in a background thread.
+
+        Args:
+            source: Iterable of message bodies.
+
+        Returns:
+            threading.Thread: The consuming thread.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                raise HPOneViewException(MSG_ALREADY_STARTED)
+            self._source = source
+            self._thread = threading.Thread(target=self.consume, args=(source,), name=type(self).__name__)
+            self._thread.daemon = True
+            self._thread.start()
+            return self._thread
+
+    def stop(self, timeout=None):
+        """
+        Closes the source consumed in the background and waits for the thread to finish.
+
+        Args:
+            timeout: Seconds to wait for the thread, or None to wait until it finishes.
+        """
+        with self._lock:
+            source, thread = self._source, self._thread
+            self._source = self._thread = None
+        if hasattr(source, 'close'):
+            source.close()
+        if thread is not None:
+            thread.join(timeout)
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Number of messages received and of messages that could not be applied.
+        """
+        with self._lock:
+            return dict(messages=self._messages, errors=self._errors)
+
+    def _opened(self):
+        # Called once the source is open, before the first message
+        pass
@@ -26,11 +26,6 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from future import standard_library
-
-standard_library.install_aliases()
-
-
 from hpOneView.resources.resource import ResourceClient
 from hpOneView.resources.resource import merge_default_values
 
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from builtins import str
+
+import logging
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.resources.resource import ResourceClient
+
+logger = logging.getLogger(__name__)
+
+# Attributes whose URIs are not resources to load: the tasks and the file transfers
+NON_REFERENCE_KEY_SUFFIXES = ('taskuri', 'taskuris', 'downloaduri', 'uploaduri')
+
+
+def get_references(resource):
+    """
+    Gets the URIs referenced by a resource: the values of the attributes named '...Uri' and '...Uris', at any level
+    of the resource, that point to a REST resource. Task and file transfer URIs, and URIs with a query string, are not
+    references.
+
+    Args:
+        resource (dict): Resource.
+
+    Returns:
+        list: The referenced URIs, in the order they were found.
+    """
+    references = []
+    pending = [resource]
+
+    while pending:
+        value = pending.pop(0)
+        if isinstance(value, list):
+            pending += value
+            continue
+        if not isinstance(value, dict):
+            continue
+
+        for key, attribute in value.items():
+            if key.lower().endswith(NON_REFERENCE_KEY_SUFFIXES):
+                continue
+            if key.endswith('Uri') and _is_resource_uri(attribute):
+                references.append(attribute)
+            elif key.endswith('Uris') and isinstance(attribute, list):
+                references += [uri for uri in attribute if _is_resource_uri(uri)]
+            elif isinstance(attribute, (dict, list)):
+                pending.append(attribute)
+
+    return references
+
+
+def _is_resource_uri(value):
+    return isinstance(value, str) and value.startswith('/rest/') and not value.startswith('/rest/tasks/') and \
+        '?' not in value
+
+
+class ReferenceLoader(object):
+    """
+    Loads resources together with the resources they reference, down to a given depth.
+
+    The referenced resources of each level are retrieved concurrently with ResourceClient.get_many. Each resource is
+    retrieved only once per call, even when referenced by many others.
+
+    Examples:
+        >>> profiles = oneview_client.server_profiles.get_all()
+        >>> resources = ReferenceLoader(oneview_client.connection).load(profiles, depth=2)
+        >>> server_hardware_type = resources[resources[profiles[0]['serverHardwareUri']]['serverHardwareTypeUri']]
+    """
+
+    def __init__(self, con):
+        self._connection = con
+        self._client = ResourceClient(con, '/rest')
+
+    def load(self, resources, depth=1):
+        """
+        Loads the resources referenced by the given resources.
+
+        Args:
+            resources (list): Resources to start from.
+            depth: Number of reference levels to follow. 0 returns only the given resources.
+
+        Returns:
+            dict: The given resources and the ones they reference, keyed by URI. The references that could not be
+            retrieved are not included.
+        """
+        loaded = dict((resource['uri'], resource) for resource in resources if resource.get('uri'))
+        level = list(resources)
+
+        for _ in range(depth):
+            uris = [uri for resource in level for uri in get_references(resource) if uri not in loaded]
+            if not uris:
+                break
+
+            fetched = self.__get_many(uris)
+            loaded.update(fetched)
+            level = list(fetched.values())
+
+        return loaded
+
+    def __get_many(self, uris):
+        resources = self._client.get_many(uris, skip_errors=True)
+
+        # Only the references that could not be retrieved are tried again, one at a time
+        failed = list(OrderedDict.fromkeys(uri for uri in uris if uri not in resources))
+        if failed:
+            with ThreadPoolExecutor(max_workers=max(self._connection.get_pagination()['max_workers'], 1)) as executor:
+                for uri, resource in zip(failed, executor.map(self.__get_or_none, failed)):
+                    if resource is not None:
+                        resources[uri] = resource
+        return resources
+
+    def __get_or_none(self, uri):
+        try:
+            return self._connection.get(uri)
+        except HPOneViewException as error:
+            logger.warning('Reference {0} could not be retrieved: {1}'.format(uri, error))
+            return None
@@ -26,16 +26,21 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from future import standard_library
-from future.utils import lmap
-
-standard_library.install_aliases()
-
+import calendar
+import datetime
 import logging
-import os
+import re
 
+from collections import OrderedDict
+from functools import partial
+
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.resources.data_services.metric_buffers import MetricBuffer, NAN, format_timestamp, parse_timestamp
+from hpOneView.resources.download_manager import DownloadManager
+from hpOneView.resources.inventory import InventorySnapshot, DEFAULT_MAX_AGE
+from hpOneView.resources.upload_manager import UploadManager, UPLOAD_RETRIES
 from hpOneView.exceptions import HPOneViewUnknownType, HPOneViewException
 from hpOneView.exceptions import HPOneViewValueError
 
@@ -47,10 +52,99 @@ UNRECOGNIZED_URI = 'Unrecognized URI for this resource'
 RESOURCE_CLIENT_TASK_EXPECTED = "Failed: Expected a TaskResponse."
 RESOURCE_ID_OR_URI_REQUIRED = 'It is required to inform the Resource ID or URI.'
 
+# Maximum number of URIs in the filter of each request made by get_many
+GET_MANY_MAX_URIS_PER_FILTER = 50
+
+# Concurrent requests of create_many, update_many and delete_many
+DEFAULT_BULK_MAX_WORKERS = 8
+
+# Seconds of utilization data returned when no start is given
+UTILIZATION_DEFAULT_SPAN = 24 * 3600
+
+START_QUERY_PARAM = re.compile(r'(?<=[?&])start=(\d+)')
+COUNT_QUERY_PARAM = re.compile(r'(?<=[?&])count=(-?\d+)')
+
 
 logger = logging.getLogger(__name__)
 
 
+def build_uri_filter(uris):
+    """
+    Builds a filter matching the resources with any of the given URIs.
+
+    Args:
+        uris (list): Resource URIs.
+
+    Returns:
+        str: The filter.
+    """
+    return '"uri in ({0})"'.format(','.join("'{0}'".format(uri) for uri in uris))
+
+
+def get_next_page_uri(response, items_count, requested_count):
+    """
+    Gets the URI of the next page of a collection, when more items must be retrieved.
+
+    Args:
+        response: Page of the collection.
+        items_count: Number of items retrieved so far.
+        requested_count: Number of items requested. A count of -1 requests all items.
+
+    Returns:
+        str: The nextPageUri, or None when all the requested items were retrieved.
+    """
+    next_page_is_empty = response.get('nextPageUri') is None
+    has_different_next_page = not response.get('uri') == response.get('nextPageUri')
+    has_next_page = not next_page_is_empty and has_different_next_page
+
+    if items_count >= requested_count and requested_count != -1:
+        return None
+
+    return response.get('nextPageUri') if has_next_page else None
+
+
+def get_remaining_pages(uri, response, fetched_count, requested_count, page_size=None):
+    """
+    Splits the items remaining after the first page of a collection into pages, using the total in the response.
+
+    Args:
+        uri: URI of the first page, with the start and count query parameters.
+        response: First page of the collection.
+        fetched_count: Number of items in the first page.
+        requested_count: Number of items requested. A count of -1 requests all items.
+        page_size: Number of items of each page. By default, the number of items in the first page.
+
+    Returns:
+        list: (start, count) of each remaining page. Empty when the response does not tell the total.
+    """
+    total = response.get('total')
+    start = START_QUERY_PARAM.search(uri)
+    if not isinstance(total, int) or not start or not COUNT_QUERY_PARAM.search(uri) or not fetched_count:
+        return []
+
+    first_item = int(start.group(1)) + fetched_count
+    last_item = total if requested_count == -1 else min(total, int(start.group(1)) + requested_count)
+    page_size = page_size or fetched_count
+
+    return [(offset, min(page_size, last_item - offset)) for offset in range(first_item, last_item, page_size)]
+
+
+def build_page_uri(uri, start, count):
+    """
+    Replaces the start and count query parameters of a collection URI.
+
+    Args:
+        uri: Collection URI with the start and count query parameters.
+        start: The first item to return.
+        count: The number of items to return.
+
+    Returns:
+        str: The page URI.
+    """
+    uri = START_QUERY_PARAM.sub('start={0}'.format(start), uri, count=1)
+    return COUNT_QUERY_PARAM.sub('count={0}'.format(count), uri, count=1)
+
+
 def merge_resources(resource1, resource2):
     """
     Updates a copy of resource1 with resource2 values and returns the merged dictionary.
@@ -83,7 +177,7 @@ def merge_default_values(resource_list, default_values):
     def merge_item(resource):
         return merge_resources(default_values, resource)
 
-    return lmap(merge_item, resource_list)
+    return [merge_item(item) for item in resource_list]
 
 
 class ResourceClient(object):
@@ -214,6 +308,55 @@ class ResourceClient(object):
 
         return result
 
+    def iter_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None, scope_uris='',
+                 prefetch=True):
+        """
+        Iterates over all items according with the given arguments, one page at a time.
+
+        Unlike get_all, the items are not collected into a list, so the memory used stays bounded by the page size
+        regardless of the collection size.
+
+        Args:
+            start:
+                The first item to return, using 0-based indexing.
+                If not specified, the default is 0 - start with the first available item.
+            count:
+                The number of resources to return. A count of -1 requests all items (default).
+            filter (list or str):
+                A general filter/query string to narrow the list of items returned. The default is no
+                filter; all resources are returned.
+            query:
+                A single query parameter can do what would take multiple parameters or multiple GET requests using
+                filter. Use query for more complex queries. NOTE: This parameter is experimental for OneView 2.0.
+            sort:
+                The sort order of the returned data set. By default, the sort order is based on create time with the
+                oldest entry first.
+            view:
+                Returns a specific subset of the attributes of the resource or collection by specifying the name of a
+                predefined view. The default view is expand (show all attributes of the resource and all elements of
+                the collections or resources).
+            fields:
+                Name of the fields.
+            uri:
+                A specific URI (optional)
+            scope_uris:
+                An expression to restrict the resources returned according to the scopes to
+                which they are assigned.
+            prefetch:
+                Requests the next page while the items of the current page are being consumed. Enabled by default.
+
+        Returns:
+            generator: The items matching the specified filter.
+        """
+        uri = self.build_query_uri(start=start, count=count, filter=filter,
+                                   query=query, sort=sort, view=view, fields=fields, uri=uri, scope_uris=scope_uris)
+
+        logger.debug('Iterating over all resources with uri: {0}'.format(uri))
+
+        for members in self.__iter_pages(uri, count, prefetch):
+            for member in members:
+                yield member
+
     def delete_all(self, filter, force=False, timeout=-1):
         """
         Deletes all resources from the appliance that match the provided filter.
@@ -244,7 +387,55 @@ class ResourceClient(object):
         return self._task_monitor.wait_for_task(task, timeout=timeout)
 
     def delete(self, resource, force=False, timeout=-1, custom_headers=None):
+        uri = self.__build_delete_uri(resource, force)
+
+        logger.debug("Delete resource (uri = %s, resource = %s)" %
+                     (self._uri, str(resource)))
+
+        task, body = self._connection.delete(uri, custom_headers=custom_headers)
+
+        if task:
+            task = self._task_monitor.wait_for_task(task, timeout=timeout)
+        self.__remove_from_inventory(uri.split('?')[0])
+
+        if not task:
+            # 204 NO CONTENT
+            # Successful return from a synchronous delete operation.
+            return True
+
+        return task
+
+    def delete_many(self, resources, force=False, timeout=-1, custom_headers=None,
+                    max_workers=DEFAULT_BULK_MAX_WORKERS, fail_fast=False, rate_limit=None):
+        """
+        Deletes many resources with concurrent requests, then waits for all their tasks together.
+
+        Args:
+            resources (list): Resource dictionaries with the 'uri' key, IDs or URIs.
+            force:
+                If set to true, the operation completes despite any problems with network connectivity or errors
+                on the resource itself. The default is false.
+            timeout:
+                Timeout in seconds for each task. The timeout does not abort the operation in OneView; it just stops
+                waiting for its completion.
+            custom_headers:
+                Allows set specific HTTP headers.
+            max_workers:
+                Maximum number of concurrent requests.
+            fail_fast:
+                When True, the items not submitted yet are skipped after the first failure.
+            rate_limit:
+                Maximum number of requests started per second. No limit by default.
+
+        Returns:
+            BulkResult: The result of each resource, in the given order, with the succeeded, failed and skipped ones.
+        """
+        def submit(resource):
+            return self._connection.delete(self.__build_delete_uri(resource, force), custom_headers=custom_headers)
 
+        return self.__run_bulk(resources, submit, timeout, max_workers, fail_fast, rate_limit)
+
+    def __build_delete_uri(self, resource, force):
         if not resource:
             logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
             raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
@@ -261,29 +452,18 @@ class ResourceClient(object):
         if force:
             uri += '?force=True'
 
-        logger.debug("Delete resource (uri = %s, resource = %s)" %
-                     (self._uri, str(resource)))
-
-        task, body = self._connection.delete(uri, custom_headers=custom_headers)
-
-        if not task:
-            # 204 NO CONTENT
-            # Successful return from a synchronous delete operation.
-            return True
-
-        task = self._task_monitor.wait_for_task(task, timeout=timeout)
-
-        return task
+        return uri
 
     def get_schema(self):
         logger.debug('Get schema (uri = %s, resource = %s)' %
                      (self._uri, self._uri))
         return self._connection.get(self._uri + '/schema')
 
-    def get(self, id_or_uri):
+    def get(self, id_or_uri, raw=False):
         """
         Args:
             id_or_uri: Can be either the resource ID or the resource URI.
+            raw: Returns the body unparsed, as a RawBody, for the callers that store or forward it.
 
         Returns:
              The requested resource.
@@ -291,7 +471,60 @@ class ResourceClient(object):
         uri = self.build_uri(id_or_uri)
         logger.debug('Get resource (uri = %s, ID = %s)' %
                      (uri, str(id_or_uri)))
-        return self._connection.get(uri)
+        return self._connection.get(uri, raw=raw)
+
+    def get_many(self, ids_or_uris, skip_errors=False):
+        """
+        Gets many resources with as few requests as possible.
+
+        The URIs are de-duplicated and grouped by collection. The resources of each collection are retrieved with
+        filtered get_all requests, at most 50 URIs each, and the resources missing from the results are retrieved with
+        GET requests. The requests are sent concurrently.
+
+        Note:
+            The resources retrieved through their collection are returned as listed by the collection.
+
+        Args:
+            ids_or_uris (list): Resource IDs or URIs.
+            skip_errors (bool): When True, the resources whose GET request fails with HPOneViewException (a 404 for a
+                stale reference, or a 403) are logged and left out of the result. By default, the first of these
+                errors is raised once all the requests are done.
+
+        Returns:
+            dict: The resources, keyed by URI.
+        """
+        uris = list(OrderedDict.fromkeys(self.build_uri(id_or_uri) for id_or_uri in ids_or_uris))
+
+        collections = OrderedDict()
+        for uri in uris:
+            collections.setdefault(uri.rsplit('/', 1)[0], []).append(uri)
+
+        batches = [(collection, collection_uris[index:index + GET_MANY_MAX_URIS_PER_FILTER])
+                   for collection, collection_uris in collections.items()
+                   for index in range(0, len(collection_uris), GET_MANY_MAX_URIS_PER_FILTER)]
+        batches = [batch for batch in batches if len(batch[1]) > 1]
+
+        resources = {}
+        with ThreadPoolExecutor(max_workers=max(self._connection.get_pagination()['max_workers'], 1)) as executor:
+            for batch_resources in executor.map(lambda batch: self.__get_batch(*batch), batches):
+                resources.update(batch_resources)
+
+            missing = [uri for uri in uris if uri not in resources]
+            logger.debug('Got {0} resources from {1} collection requests, getting {2} one at a time'.format(
+                len(resources), len(batches), len(missing)))
+            results = list(executor.map(self.__get_or_error, missing))
+
+        errors = []
+        for uri, (resource, error) in zip(missing, results):
+            if error is None:
+                resources[uri] = resource
+            else:
+                logger.warning('Resource {0} could not be retrieved: {1}'.format(uri, error))
+                errors.append(error)
+
+        if errors and not skip_errors:
+            raise errors[0]
+        return resources
 
     def get_collection(self, id_or_uri, filter=''):
         """
@@ -385,6 +618,42 @@ class ResourceClient(object):
 
         return self.__do_put(uri, resource, timeout, custom_headers)
 
+    def update_many(self, resources, force=False, timeout=-1, custom_headers=None, default_values={},
+                    max_workers=DEFAULT_BULK_MAX_WORKERS, fail_fast=False, rate_limit=None):
+        """
+        Updates many resources with concurrent PUT requests, then waits for all their tasks together.
+
+        Args:
+            resources (list): OneView resource dictionaries, each with its 'uri'.
+            force:
+                If set to true, the operation completes despite any problems with network connectivity or errors
+                on the resource itself. The default is false.
+            timeout:
+                Timeout in seconds for each task. The timeout does not abort the operation in OneView; it just stops
+                waiting for its completion.
+            custom_headers:
+                Allows set specific HTTP headers.
+            default_values:
+                Dictionary with default values grouped by OneView API version, merged with each resource.
+            max_workers:
+                Maximum number of concurrent requests.
+            fail_fast:
+                When True, the items not submitted yet are skipped after the first failure.
+            rate_limit:
+                Maximum number of requests started per second. No limit by default.
+
+        Returns:
+            BulkResult: The result of each resource, in the given order, with the succeeded, failed and skipped ones.
+        """
+        def submit(resource):
+            if not resource:
+                raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            uri = resource['uri'] + ('?force=True' if force else '')
+            return self._connection.put(uri, self.merge_default_values(resource, default_values),
+                                        custom_headers=custom_headers)
+
+        return self.__run_bulk(resources, submit, timeout, max_workers, fail_fast, rate_limit)
+
     def create_with_zero_body(self, uri=None, timeout=-1, custom_headers=None):
         """
         Makes a POST request to create a resource when no request body is required.
@@ -449,7 +718,48 @@ class ResourceClient(object):
 
         return self.__do_post(uri, resource, timeout, custom_headers)
 
-    def upload(self, file_path, uri=None, timeout=-1):
+    def create_many(self, resources, uri=None, timeout=-1, custom_headers=None, default_values={},
+                    max_workers=DEFAULT_BULK_MAX_WORKERS, fail_fast=False, rate_limit=None):
+        """
+        Creates many resources with concurrent POST requests, then waits for all their tasks together.
+
+        Examples:
+            >>> result = client.create_many([{'name': 'net-%d' % vlan, 'vlanId': vlan} for vlan in range(400)],
+            ...                             rate_limit=20)
+            >>> networks = [item.result for item in result.succeeded]
+
+        Args:
+            resources (list): OneView resource dictionaries.
+            uri:
+                A specific URI (optional).
+            timeout:
+                Timeout in seconds for each task. The timeout does not abort the operation in OneView; it just stops
+                waiting for its completion.
+            custom_headers:
+                Allows set specific HTTP headers.
+            default_values:
+                Dictionary with default values grouped by OneView API version, merged with each resource.
+            max_workers:
+                Maximum number of concurrent requests.
+            fail_fast:
+                When True, the items not submitted yet are skipped after the first failure.
+            rate_limit:
+                Maximum number of requests started per second. No limit by default.
+
+        Returns:
+            BulkResult: The result of each resource, in the given order, with the succeeded, failed and skipped ones.
+        """
+        uri = uri or self._uri
+
+        def submit(resource):
+            if not resource:
+                raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            return self._connection.post(uri, self.merge_default_values(resource, default_values),
+                                         custom_headers=custom_headers)
+
+        return self.__run_bulk(resources, submit, timeout, max_workers, fail_fast, rate_limit)
+
+    def upload(self, file_path, uri=None, timeout=-1, progress=None, retries=UPLOAD_RETRIES):
         """
         Makes a multipart request.
 
@@ -461,6 +771,10 @@ class ResourceClient(object):
             timeout:
                 Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            progress:
+                Optional callable that receives an UploadProgress each time a chunk of the file is sent.
+            retries:
+                Number of times the upload is started again after a transient network error.
 
         Returns:
             dict: Response body.
@@ -468,8 +782,8 @@ class ResourceClient(object):
         if not uri:
             uri = self._uri
 
-        upload_file_name = os.path.basename(file_path)
-        task, entity = self._connection.post_multipart_with_response_handling(uri, file_path, upload_file_name)
+        manager = UploadManager(self._connection, retries=retries, progress=progress)
+        task, entity = manager.upload(uri, file_path)
 
         if not task:
             return entity
@@ -525,10 +839,10 @@ class ResourceClient(object):
 
         task, entity = self._connection.patch(uri, body, custom_headers=custom_headers_copy)
 
-        if not task:
-            return entity
+        if task:
+            entity = self._task_monitor.wait_for_task(task, timeout)
 
-        return self._task_monitor.wait_for_task(task, timeout)
+        return self.__put_in_inventory(entity)
 
     def get_by(self, field, value, uri=None):
         """
@@ -555,6 +869,10 @@ class ResourceClient(object):
         logger.debug('Get by (uri = %s, field = %s, value = %s)' %
                      (uri, field, str(value)))
 
+        snapshot = self._connection.get_inventory_snapshot(uri)
+        if snapshot is not None and snapshot.is_indexed(field):
+            return snapshot.get_by(field, value)
+
         filter = "\"{0}='{1}'\"".format(field, value)
         results = self.get_all(filter=filter, uri=uri)
 
@@ -565,6 +883,29 @@ class ResourceClient(object):
 
         return results
 
+    def enable_inventory_snapshot(self, indexes=None, max_age=DEFAULT_MAX_AGE):
+        """
+        Keeps a snapshot of the collection in memory, indexed by name, uri, serialNumber, macAddress, wwn and the
+        given fields, so that get_by and get_by_name answer without a request to the appliance. The snapshot is shared
+        by all the clients of the collection on the same connection. See InventorySnapshot.
+
+        Args:
+            indexes: Top level fields indexed in addition to the default ones.
+            max_age: Seconds after which the collection is loaded again, or None to only load it again on refresh.
+
+        Returns:
+            InventorySnapshot
+        """
+        snapshot = InventorySnapshot(self._uri, self.get_all, indexes=indexes, max_age=max_age)
+        self._connection.add_inventory_snapshot(snapshot)
+        return snapshot
+
+    def disable_inventory_snapshot(self):
+        """
+        Drops the snapshot of the collection, so get_by queries the appliance again.
+        """
+        self._connection.remove_inventory_snapshot(self._uri)
+
     def get_by_name(self, name):
         """
         Retrieve a resource by its name.
@@ -671,6 +1012,44 @@ class ResourceClient(object):
 
         return self._connection.get(uri)
 
+    def get_utilization_series(self, ids_or_uris, fields=None, start=None, end=None, view=None, refresh=False,
+                               max_workers=None):
+        """
+        Retrieves the utilization data of a time span as arrays, requesting all the segments of the span.
+
+        The appliance segments the data of large spans: the first response covers the end of the span, and the width
+        of its slice tells how the rest of the span is segmented, so the remaining segments are requested concurrently.
+        The samples are merged by time, without duplicates. When a list of resources is given, the resources are
+        requested concurrently, each with one segment at a time.
+
+        Args:
+            ids_or_uris: Resource ID or URI, or a list of them.
+            fields: Name of the metrics to be retrieved in the format METRIC[,METRIC]... All the metrics when omitted.
+            start: Start of the span, as a datetime, an ISO 8601 string or seconds since the epoch. 24 hours before the
+                end when omitted.
+            end: End of the span, in the same formats. The latest sample when omitted.
+            view: Resolution of the samples, 'native', 'hour' or 'day'. See get_utilization.
+            refresh: Queues a request to obtain the most recent utilization data from the iLO. See get_utilization.
+            max_workers: Maximum number of concurrent requests. The pagination workers of the connection by default.
+
+        Returns:
+            MetricBuffer: The sample times, in seconds by ascending order, and an array of values for each metric, with
+            NaN for the missing samples. A dict of MetricBuffer keyed by URI when a list of resources is given.
+        """
+        start = self.__to_seconds(start)
+        end = self.__to_seconds(end)
+        max_workers = max(max_workers or self._connection.get_pagination()['max_workers'], 1)
+
+        if not isinstance(ids_or_uris, list):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return self.__get_utilization_series(ids_or_uris, fields, start, end, view, refresh, executor)
+
+        uris = list(OrderedDict.fromkeys(self.build_uri(id_or_uri) for id_or_uri in ids_or_uris))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            series = executor.map(lambda uri: self.__get_utilization_series(uri, fields, start, end, view, refresh),
+                                  uris)
+            return OrderedDict(zip(uris, series))
+
     def create_report(self, uri, timeout=-1):
         """
         Creates a report and returns the output.
@@ -722,17 +1101,22 @@ class ResourceClient(object):
 
             return uri
 
-    def download(self, uri, file_path):
+    def download(self, uri, file_path, parts=1, checksum=None):
         """
         Downloads the contents of the requested URI to a stream.
 
         Args:
             uri: URI
             file_path: File path destination
+            parts: Number of concurrent range requests used to download a large file.
+            checksum: Optional SHA-256 hex digest the downloaded file must match.
 
         Returns:
             bool: Indicates if the file was successfully downloaded.
         """
+        if parts > 1 or checksum:
+            return DownloadManager(self._connection, parts=parts).download(uri, file_path, checksum=checksum)
+
         with open(file_path, 'wb') as file:
             return self._connection.download_to_stream(file, uri)
 
@@ -741,6 +1125,72 @@ class ResourceClient(object):
             logger.exception('Get by uri : unrecognized uri: (%s)' % path)
             raise HPOneViewUnknownType(UNRECOGNIZED_URI)
 
+    def __get_utilization_series(self, id_or_uri, fields, start, end, view, refresh, executor=None):
+        samples = {}
+        first = self.__get_utilization_range(id_or_uri, fields, start, end, view, refresh, samples, follow=False)
+
+        if first.get('sliceStartTime') and first.get('sliceEndTime'):
+            slice_start = parse_timestamp(first['sliceStartTime'])
+            slice_end = parse_timestamp(first['sliceEndTime'])
+            lower = start if start is not None else (end if end is not None else slice_end) - UTILIZATION_DEFAULT_SPAN
+            if first.get('oldestSampleTime'):
+                lower = max(lower, parse_timestamp(first['oldestSampleTime']))
+
+            width = slice_end - slice_start
+            ranges = []
+            while width > 0 and slice_start > lower:
+                ranges.append((max(lower, slice_start - width), slice_start))
+                slice_start -= width
+
+            def get_range(span):
+                return self.__get_utilization_range(id_or_uri, fields, span[0], span[1], view, False, samples)
+
+            list(executor.map(get_range, ranges) if executor else map(get_range, ranges))
+
+        times = sorted(samples)
+        metrics = sorted(set(metric for values in samples.values() for metric in values))
+        buffer = MetricBuffer(capacity=len(times))
+        buffer.extend(times, dict((metric, [samples[time].get(metric, NAN) for time in times]) for metric in metrics))
+        return buffer
+
+    def __get_utilization_range(self, id_or_uri, fields, start, end, view, refresh, samples, follow=True):
+        # Requests the span, then the earlier segments until the start of the span or the oldest sample
+        first = None
+        while True:
+            filters = []
+            if start is not None:
+                filters.append('startDate=' + format_timestamp(start))
+            if end is not None:
+                filters.append('endDate=' + format_timestamp(end))
+            response = self.get_utilization(id_or_uri, fields=fields, filter=filters, refresh=refresh, view=view)
+            first = first or response
+
+            for metric in response.get('metricList') or []:
+                for sample_time, value in metric.get('metricSamples') or []:
+                    # Dict updates are atomic, so the concurrent segments can share the samples
+                    values = samples.setdefault(parse_timestamp(sample_time), {})
+                    values[metric.get('metricName')] = float(value) if value is not None else NAN
+
+            if not follow:
+                return first
+            slice_start = parse_timestamp(response['sliceStartTime']) if response.get('sliceStartTime') else None
+            oldest = parse_timestamp(response['oldestSampleTime']) if response.get('oldestSampleTime') else None
+            if start is None or slice_start is None or slice_start <= start or (oldest and slice_start <= oldest):
+                return first
+            if end is not None and slice_start >= end:
+                return first
+            end = slice_start
+
+    @staticmethod
+    def __to_seconds(value):
+        if value is None or isinstance(value, (int, float)):
+            return value
+        if isinstance(value, datetime.datetime):
+            if value.utcoffset() is not None:
+                value = value.replace(tzinfo=None) - value.utcoffset()
+            return calendar.timegm(value.timetuple()) + value.microsecond / 1e6
+        return parse_timestamp(value)
+
     def __make_query_filter(self, filters):
         if isinstance(filters, list):
             formated_filter = "&filter=".join(quote(f) for f in filters)
@@ -755,24 +1205,50 @@ class ResourceClient(object):
         else:
             return []
 
+    def __run_bulk(self, items, submit, timeout, max_workers, fail_fast, rate_limit):
+        # Imported here because the task watcher depends on this module
+        from hpOneView.resources.bulk_executor import BulkExecutor
+
+        executor = BulkExecutor(self._connection, max_workers=max_workers, fail_fast=fail_fast, rate_limit=rate_limit)
+        try:
+            return executor.run(list(items), submit, timeout)
+        finally:
+            # The snapshot is loaded again once, rather than updated item by item
+            snapshot = self._connection.get_inventory_snapshot(self._uri)
+            if snapshot is not None:
+                snapshot.invalidate()
+
     def __do_post(self, uri, resource, timeout, custom_headers):
         task, entity = self._connection.post(uri, resource, custom_headers=custom_headers)
 
-        if not task:
-            return entity
+        if task:
+            entity = self._task_monitor.wait_for_task(task, timeout)
 
-        return self._task_monitor.wait_for_task(task, timeout)
+        return self.__put_in_inventory(entity)
 
     def __do_put(self, uri, resource, timeout, custom_headers):
         task, body = self._connection.put(uri, resource, custom_headers=custom_headers)
 
-        if not task:
-            return body
+        if task:
+            body = self._task_monitor.wait_for_task(task, timeout)
 
-        return self._task_monitor.wait_for_task(task, timeout)
+        return self.__put_in_inventory(body)
+
+    def __put_in_inventory(self, resource):
+        if isinstance(resource, dict) and resource.get('uri'):
+            snapshot = self._connection.get_inventory_snapshot(resource['uri'].rsplit('/', 1)[0])
+            if snapshot is not None:
+                snapshot.put(resource)
+        return resource
+
+    def __remove_from_inventory(self, uri):
+        snapshot = self._connection.get_inventory_snapshot(uri.rsplit('/', 1)[0])
+        if snapshot is not None:
+            snapshot.remove(uri)
 
     def __do_requests_to_getall(self, uri, requested_count):
         items = []
+        first_page = True
 
         while uri:
             logger.debug('Making HTTP request to get all resources. Uri: {0}'.format(uri))
@@ -781,20 +1257,88 @@ class ResourceClient(object):
             items += members
 
             logger.debug("Response getAll: nextPageUri = {0}, members list length: {1}".format(uri, str(len(members))))
-            uri = self.__get_next_page(response, items, requested_count)
+            next_page_uri = get_next_page_uri(response, len(items), requested_count)
+
+            if next_page_uri and first_page:
+                # The first page tells how many items remain, so the other pages can be requested concurrently
+                pages = self.__split_remaining_pages(uri, response, len(items), requested_count)
+                if pages:
+                    items += self.__get_pages_concurrently(uri, pages)
+                    next_page_uri = None
+
+            first_page = False
+            uri = next_page_uri
 
         logger.debug('Total # of members found = {0}'.format(str(len(items))))
         return items
 
-    def __get_next_page(self, response, items, requested_count):
-        next_page_is_empty = response.get('nextPageUri') is None
-        has_different_next_page = not response.get('uri') == response.get('nextPageUri')
-        has_next_page = not next_page_is_empty and has_different_next_page
+    def __split_remaining_pages(self, uri, response, fetched_count, requested_count):
+        pagination = self._connection.get_pagination()
+        if pagination['max_workers'] <= 1:
+            return []
+        return get_remaining_pages(uri, response, fetched_count, requested_count, pagination['page_size'])
 
-        if len(items) >= requested_count and requested_count != -1:
-            return None
+    def __get_or_error(self, uri):
+        try:
+            return self._connection.get(uri), None
+        except HPOneViewException as error:
+            return None, error
+
+    def __get_batch(self, collection, uris):
+        try:
+            members = self.get_all(count=len(uris), filter=build_uri_filter(uris), uri=collection)
+        except HPOneViewException as error:
+            logger.debug('Could not get the resources from the collection {0}: {1}'.format(collection, error))
+            return {}
+
+        return dict((member['uri'], member) for member in members if member.get('uri') in uris)
+
+    def __get_pages_concurrently(self, uri, pages):
+        max_workers = min(self._connection.get_pagination()['max_workers'], len(pages))
+        logger.debug('Getting {0} remaining pages with {1} workers'.format(len(pages), max_workers))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda page: self.__get_page(uri, *page), pages)
+            return [item for page_items in results for item in page_items]
+
+    def __get_page(self, uri, start, count):
+        items = []
+
+        # The appliance may return fewer items than requested, so the page is completed with further requests
+        while len(items) < count:
+            page_uri = build_page_uri(uri, start + len(items), count - len(items))
+            members = self.__get_members(self._connection.get(page_uri))
+            if not members:
+                break
+            items += members
 
-        return response.get('nextPageUri') if has_next_page else None
+        return items[:count]
+
+    def __iter_pages(self, uri, requested_count, prefetch):
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        items_count = 0
+
+        try:
+            next_page = self.__request_page(executor, uri)
+            while next_page:
+                response = next_page()
+                members = self.__get_members(response)
+                items_count += len(members)
+
+                logger.debug("Response iterAll: nextPageUri = {0}, members list length: {1}".format(
+                    response.get('nextPageUri'), str(len(members))))
+                next_page_uri = get_next_page_uri(response, items_count, requested_count)
+                next_page = self.__request_page(executor, next_page_uri) if next_page_uri else None
+
+                yield members
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def __request_page(self, executor, uri):
+        if executor:
+            return executor.submit(self._connection.get, uri).result
+        return partial(self._connection.get, uri)
 
     def merge_default_values(self, resource, default_values):
         if not default_values:
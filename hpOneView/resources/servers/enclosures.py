@@ -25,11 +25,8 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
-from future import standard_library
-
-standard_library.install_aliases()
-
 
+from hpOneView.resources.reference_loader import ReferenceLoader
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -118,6 +115,21 @@ class Enclosures(object):
         """
         return self._client.get(id_or_uri)
 
+    def get_with_references(self, id_or_uri, depth=1):
+        """
+        Retrieves an enclosure together with the resources it references, such as its enclosure group, logical
+        enclosure and scopes.
+
+        Args:
+            id_or_uri: ID or URI of the Enclosure.
+            depth: Number of reference levels to follow.
+
+        Returns:
+            dict: The enclosure and the referenced resources, keyed by URI.
+        """
+        resource = self._client.get(id_or_uri)
+        return ReferenceLoader(self._connection).load([resource], depth)
+
     def patch(self, id_or_uri, operation, path, value, timeout=-1):
         """
         Uses the PATCH to update a resource for a given enclosure.
@@ -332,6 +344,27 @@ class Enclosures(object):
         """
         return self._client.get_utilization(id_or_uri, fields=fields, filter=filter, refresh=refresh, view=view)
 
+    def get_utilization_series(self, ids_or_uris, fields=None, start=None, end=None, view=None, refresh=False):
+        """
+        Retrieves the utilization data of enclosures for a time span as arrays, requesting all the segments of the
+        span. See get_utilization for the supported metrics and views.
+
+        Args:
+            ids_or_uris: Enclosure ID or URI, or a list of them to retrieve them concurrently.
+            fields: Name of the metrics to be retrieved in the format METRIC[,METRIC]... All the metrics when omitted.
+            start: Start of the span, as a datetime, an ISO 8601 string or seconds since the epoch. 24 hours before the
+                end when omitted.
+            end: End of the span, in the same formats. The latest sample when omitted.
+            view: Resolution of the samples, 'native', 'hour' or 'day'.
+            refresh: Queues a request to obtain the most recent utilization data.
+
+        Returns:
+            MetricBuffer: The sample times and the values of each metric. A dict of MetricBuffer keyed by URI when a
+            list is given.
+        """
+        return self._client.get_utilization_series(ids_or_uris, fields=fields, start=start, end=end, view=view,
+                                                   refresh=refresh)
+
     def generate_csr(self, csr_data, id_or_uri, bay_number=None):
         """
         Creates a Certificate Signing Request (CSR) for an enclosure.
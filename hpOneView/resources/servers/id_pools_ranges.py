@@ -25,9 +25,6 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
-from future import standard_library
-
-standard_library.install_aliases()
 
 from hpOneView.resources.resource import ResourceClient
 from hpOneView import HPOneViewValueError
@@ -39,20 +36,17 @@ class IdPoolsRanges(object):
 
     Has common function used by: vMAC, vSN, vWWN
     """
+    URIS = {
+        'vmac': '/rest/id-pools/vmac/ranges',
+        'vsn': '/rest/id-pools/vsn/ranges',
+        'vwwn': '/rest/id-pools/vwwn/ranges',
+    }
 
     def __init__(self, type, con):
-
-        uri = ""
-        if type == 'vmac':
-            uri = '/rest/id-pools/vmac/ranges'
-        elif type == 'vsn':
-            uri = '/rest/id-pools/vsn/ranges'
-        elif type == 'vwwn':
-            uri = '/rest/id-pools/vwwn/ranges'
-        else:
+        if type not in self.URIS:
             raise HPOneViewValueError("Invalid type: {0}, types allowed: vmac, vsn, vwwn, ".format(type))
 
-        self._client = ResourceClient(con, uri)
+        self._client = ResourceClient(con, self.URIS[type])
 
     def create(self, resource, timeout=-1):
         """
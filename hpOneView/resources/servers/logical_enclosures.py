@@ -25,11 +25,8 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
-from future import standard_library
-
-standard_library.install_aliases()
-
 
+from hpOneView.resources.reference_loader import ReferenceLoader
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -153,6 +150,21 @@ class LogicalEnclosures(object):
         """
         return self._client.get(id_or_uri)
 
+    def get_with_references(self, id_or_uri, depth=1):
+        """
+        Retrieves a logical enclosure together with its enclosures, enclosure group, firmware baseline and the other
+        resources it references.
+
+        Args:
+            id_or_uri: ID or URI of logical enclosure.
+            depth: Number of reference levels to follow.
+
+        Returns:
+            dict: The logical enclosure and the referenced resources, keyed by URI.
+        """
+        resource = self._client.get(id_or_uri)
+        return ReferenceLoader(self._connection).load([resource], depth)
+
     def update(self, resource, timeout=-1):
         """
         Updates the given logical enclosure that is passed in. The fields that can be updated on the logical enclosure
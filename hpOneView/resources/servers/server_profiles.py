@@ -26,11 +26,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from future import standard_library
-
-standard_library.install_aliases()
-
-
+from hpOneView.resources.reference_loader import ReferenceLoader
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -199,6 +195,22 @@ class ServerProfiles(object):
         """
         return self._client.get(id_or_uri=id_or_uri)
 
+    def get_with_references(self, id_or_uri, depth=1):
+        """
+        Retrieves a server profile together with the resources it references: server hardware, server hardware type,
+        enclosure group, networks of the connections, volumes, and so on. With a depth greater than 1, the references
+        of the referenced resources are followed as well.
+
+        Args:
+            id_or_uri: Can be either the server profile resource ID or URI.
+            depth: Number of reference levels to follow.
+
+        Returns:
+            dict: The server profile and the referenced resources, keyed by URI.
+        """
+        resource = self._client.get(id_or_uri)
+        return ReferenceLoader(self._connection).load([resource], depth)
+
     def get_by(self, field, value):
         """
         Gets all server profiles that match a specified filter.
@@ -25,10 +25,6 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
-from future import standard_library
-
-standard_library.install_aliases()
-
 
 from hpOneView.resources.resource import ResourceClient
 
@@ -82,20 +78,23 @@ class Backups(object):
         """
         return self._client.create_with_zero_body(timeout=timeout)
 
-    def download(self, id_or_uri, file_path):
+    def download(self, id_or_uri, file_path, parts=1, checksum=None):
         """
         Downloads a backup archive previously created on the appliance. Uploaded backup files cannot be downloaded.
 
         Args:
             id_or_uri: ID or URI of the Artifact Bundle.
             file_path(str): Destination file path.
+            parts (int): Number of concurrent range requests, used when the appliance accepts ranged downloads.
+                Defaults to a single request.
+            checksum (str): Optional SHA-256 hex digest the downloaded file must match.
 
         Returns:
             bool: Successfully downloaded.
         """
-        return self._client.download(id_or_uri, file_path)
+        return self._client.download(id_or_uri, file_path, parts=parts, checksum=checksum)
 
-    def upload(self, file_path):
+    def upload(self, file_path, progress=None):
         """
         Uploads an appliance backup file in preparation of a restore. Any existing backup on the appliance is removed.
 
@@ -104,11 +103,12 @@ class Backups(object):
 
         Args:
             file_path (str): The local backup filepath
+            progress: Optional callable that receives an UploadProgress each time a chunk of the file is sent.
 
         Returns:
             dict: Details of the uploaded backup.
         """
-        return self._client.upload(file_path)
+        return self._client.upload(file_path, progress=progress)
 
     def get_config(self):
         """
@@ -26,12 +26,9 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from future import standard_library
-
-standard_library.install_aliases()
-
-
 from hpOneView.resources.resource import ResourceClient
+from hpOneView.resources.settings.firmware_drivers import FirmwareDrivers
+from hpOneView.resources.upload_manager import file_checksum
 
 
 class FirmwareBundles(object):
@@ -40,12 +37,14 @@ class FirmwareBundles(object):
 
     """
     URI = '/rest/firmware-bundles'
+    CHECKSUM_FIELD = 'checksum'
+    CHECKSUM_ALGORITHM = 'sha256'
 
     def __init__(self, con):
         self._connection = con
         self._client = ResourceClient(con, self.URI)
 
-    def upload(self, file_path, timeout=-1):
+    def upload(self, file_path, timeout=-1, progress=None, skip_existing=False):
         """
         Upload an SPP ISO image file or a hotfix file to the appliance.
         The API supports upload of one hotfix at a time into the system.
@@ -55,8 +54,29 @@ class FirmwareBundles(object):
             file_path: Full path to firmware.
             timeout: Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            progress: Optional callable that receives an UploadProgress each time a chunk of the file is sent.
+            skip_existing: When True, the SHA-256 checksum of the file is compared with the checksum of the firmware
+                drivers already on the appliance, and the upload is skipped when one of them matches.
 
         Returns:
-          dict: Information about the updated firmware bundle.
+          dict: Information about the updated firmware bundle, or the existing firmware driver when the upload was
+            skipped.
         """
-        return self._client.upload(file_path, timeout=timeout)
+        if skip_existing:
+            existing = self.__get_existing_driver(file_path)
+            if existing:
+                return existing
+
+        return self._client.upload(file_path, timeout=timeout, progress=progress)
+
+    def __get_existing_driver(self, file_path):
+        drivers = [driver for driver in FirmwareDrivers(self._connection).get_all() if driver.get(self.CHECKSUM_FIELD)]
+        if not drivers:
+            # Hashing a multi-gigabyte SPP is only worth it when there is a checksum to compare with
+            return None
+
+        checksum = file_checksum(file_path, self.CHECKSUM_ALGORITHM)
+        for driver in drivers:
+            if driver[self.CHECKSUM_FIELD].lower() == checksum:
+                return driver
+        return None
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from hpOneView import json_backend
+from hpOneView.resources.message_bus import MessageConsumer
+
+CHANGE_CREATED = 'Created'
+CHANGE_UPDATED = 'Updated'
+CHANGE_DELETED = 'Deleted'
+
+
+class StateChangeConsumer(MessageConsumer):
+    """
+    Keeps the inventory snapshots and the response cache of a connection in sync with the State-Change Message Bus
+    (SCMB), so they do not need to be loaded again periodically.
+
+    Each Created or Updated message puts the resource it carries in the snapshot of its collection, each Deleted
+    message removes it, and every message removes the changed resource from the response cache. The snapshots are
+    invalidated when the consumption starts, since the changes made before are not received.
+
+    Examples:
+        >>> ResourceClient(oneview_client.connection, '/rest/server-hardware').enable_inventory_snapshot(max_age=None)
+        >>> oneview_client.state_change_consumer.start(AmqpMessageSource(host, ['scmb.server-hardware.#']))
+    """
+
+    def __init__(self, con):
+        super(StateChangeConsumer, self).__init__()
+        self._connection = con
+        self._applied = 0
+
+    def handle(self, message):
+        """
+        Applies one SCMB message.
+
+        Args:
+            message: Message body, as JSON bytes or string, or already parsed.
+
+        Returns:
+            bool: Whether an inventory snapshot was changed.
+        """
+        if not isinstance(message, dict):
+            message = json_backend.loads(message)
+        resource = message.get('resource')
+        if not isinstance(resource, dict):
+            resource = None
+        uri = message.get('resourceUri') or (resource or {}).get('uri')
+        if not uri:
+            return False
+
+        self._connection.invalidate_response_cache(uri)
+
+        snapshot = self._connection.get_inventory_snapshot(uri.rsplit('/', 1)[0])
+        if snapshot is None:
+            return False
+
+        change_type = message.get('changeType')
+        if change_type == CHANGE_DELETED:
+            snapshot.remove(uri)
+        elif change_type in (CHANGE_CREATED, CHANGE_UPDATED) and resource and resource.get('uri') == uri:
+            snapshot.put(resource)
+        elif change_type in (CHANGE_CREATED, CHANGE_UPDATED):
+            # The message does not carry the resource, only this one is requested
+            snapshot.put(self._connection.get(uri))
+        else:
+            return False
+
+        with self._lock:
+            self._applied += 1
+        return True
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Number of messages received, of messages applied to a snapshot and of messages that failed.
+        """
+        stats = super(StateChangeConsumer, self).get_stats()
+        with self._lock:
+            stats['applied'] = self._applied
+        return stats
+
+    def _opened(self):
+        for snapshot in self._connection.get_inventory_snapshots():
+            snapshot.invalidate()
@@ -26,16 +26,12 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from future import standard_library
-
-standard_library.install_aliases()
-
-
 import logging
 import time
 
-from errno import ECONNABORTED, ETIMEDOUT, ENOEXEC, EINVAL, ENETUNREACH, ECONNRESET, ENETDOWN, ECONNREFUSED
+from hpOneView.connection import RetryPolicy
 from hpOneView.exceptions import HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewTaskError, HPOneViewUnknownType
+from timeit import default_timer
 
 TASK_PENDING_STATES = ['New', 'Starting', 'Pending', 'Running', 'Suspended', 'Stopping']
 TASK_ERROR_STATES = ['Error', 'Warning', 'Terminated', 'Killed']
@@ -47,18 +43,45 @@ MSG_UNKNOWN_EXCEPTION = 'Unknown Exception'
 MSG_TIMEOUT = 'Waited %s seconds for task to complete, aborting'
 MSG_INVALID_TASK = 'Invalid task was provided'
 
+TASK_DELETED_NAMES = ['Delete', 'Remove', 'Delete server hardware type', 'Remove SAN manager']
+
 UNLIMITED_TIMEOUT = -1
 
 logger = logging.getLogger(__name__)
 
 
+def raise_task_error(task):
+    """
+    Raises an HPOneViewTaskError when the task finished in an error state, using the first task error message.
+
+    Args:
+        task (dict): OneView Task resource.
+    """
+    if task['taskState'] in TASK_ERROR_STATES and task['taskState'] != 'Warning':
+        msg = None
+        error_code = None
+        if 'taskErrors' in task and len(task['taskErrors']) > 0:
+            err = task['taskErrors'][0]
+            if 'message' in err:
+                msg = err['message']
+
+            error_code = err.get('errorCode')
+
+        if msg:
+            raise HPOneViewTaskError(msg, error_code)
+        elif 'taskStatus' in task and task['taskStatus']:
+            raise HPOneViewTaskError(task['taskStatus'], error_code)
+        else:
+            raise HPOneViewTaskError(MSG_UNKNOWN_EXCEPTION, error_code)
+
+
 class TaskMonitor(object):
     # Seconds to wait when a network failure occurs
     CONNECTION_FAILURE_TIMEOUT = 90
 
-    # Known error numbers when the connection drops
-    CONNECTION_FAILURE_ERROR_NUMBERS = [ENOEXEC, EINVAL, ENETUNREACH, ETIMEDOUT, ECONNRESET,
-                                        ECONNABORTED, ENETUNREACH, ENETDOWN, ECONNREFUSED]
+    # Deprecated, kept for compatibility and no longer read: the connection failures are decided by the retry policy
+    # of the connection, see is_connection_failure and RetryPolicy.retryable_error_numbers
+    CONNECTION_FAILURE_ERROR_NUMBERS = list(RetryPolicy.RETRYABLE_ERROR_NUMBERS)
 
     def __init__(self, con):
         self._connection = con
@@ -85,7 +108,7 @@ class TaskMonitor(object):
         logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
         logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
 
-        task_response = self.__get_task_response(task)
+        task_response = self.get_task_response(task)
         logger.debug('Task completed')
         return task_response
 
@@ -114,43 +137,43 @@ class TaskMonitor(object):
         start_time = self.get_current_seconds()
         connection_failure_control = dict(last_success=self.get_current_seconds())
 
-        i = 0
-        while self.is_task_running(task, connection_failure_control):
-            # wait 1 to 10 seconds
-            # the value increases to avoid flooding server with requests
-            i = i + 1 if i < 10 else 10
-
-            logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
-            logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
-
-            time.sleep(i)
-            if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
-                raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
-
-    def __get_task_response(self, task):
-        deleted_states = ['Delete',
-                          'Remove',
-                          'Delete server hardware type',
-                          'Remove SAN manager']
-
-        if task['taskState'] in TASK_ERROR_STATES and task['taskState'] != 'Warning':
-            msg = None
-            error_code = None
-            if 'taskErrors' in task and len(task['taskErrors']) > 0:
-                err = task['taskErrors'][0]
-                if 'message' in err:
-                    msg = err['message']
-
-                error_code = err.get('errorCode')
-
-            if msg:
-                raise HPOneViewTaskError(msg, error_code)
-            elif 'taskStatus' in task and task['taskStatus']:
-                raise HPOneViewTaskError(task['taskStatus'], error_code)
-            else:
-                raise HPOneViewTaskError(MSG_UNKNOWN_EXCEPTION, error_code)
-
-        if 'name' in task and task['name'] in deleted_states:
+        started_at = default_timer()
+        poll_count = 1
+        error = None
+
+        try:
+            i = 0
+            while self.is_task_running(task, connection_failure_control):
+                # wait 1 to 10 seconds
+                # the value increases to avoid flooding server with requests
+                i = i + 1 if i < 10 else 10
+
+                logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
+                logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
+
+                time.sleep(i)
+                if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
+                    raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+                poll_count += 1
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._connection.record_task_wait(task.get('uri'), default_timer() - started_at, poll_count, error)
+
+    def get_task_response(self, task):
+        """
+        Gets the response of a finished task, raising an HPOneViewTaskError when the task failed.
+
+        Args:
+            task (dict): Finished OneView Task resource.
+
+        Returns:
+            Associated resource when creating or updating; True when deleting.
+        """
+        raise_task_error(task)
+
+        if 'name' in task and task['name'] in TASK_DELETED_NAMES:
             return True
 
         if 'type' in task and task['type'].startswith('Task'):
@@ -195,7 +218,7 @@ class TaskMonitor(object):
                 if not connection_failure_control:
                     raise error
 
-                if hasattr(error, 'errno') and error.errno in self.CONNECTION_FAILURE_ERROR_NUMBERS:
+                if self.is_connection_failure(error):
                     last_success = connection_failure_control['last_success']
                     if last_success + self.CONNECTION_FAILURE_TIMEOUT < self.get_current_seconds():
                         # Timeout reached
@@ -208,6 +231,21 @@ class TaskMonitor(object):
 
         return False
 
+    def is_connection_failure(self, error):
+        """
+        Checks whether an error raised when polling a task is a transient network failure, according to the retry
+        policy of the connection. A failure raised as HPOneViewException is checked through its cause.
+
+        Args:
+            error: Exception raised by the request.
+
+        Returns:
+            bool
+        """
+        policy = self._connection.get_retry_policy()
+        cause = getattr(error, '__cause__', None)
+        return policy.is_retryable_error(error) or (cause is not None and policy.is_retryable_error(cause))
+
     def get(self, task):
         """
         Retrieve a task by its uri.
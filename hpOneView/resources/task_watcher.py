@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import threading
+import time
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from hpOneView.exceptions import HPOneViewException, HPOneViewTimeout, HPOneViewUnknownType
+from hpOneView.resources.activity.tasks import Tasks
+from hpOneView.resources.resource import build_uri_filter
+from hpOneView.resources.task_monitor import TaskMonitor, TASK_PENDING_STATES, MSG_INVALID_TASK, MSG_TIMEOUT, \
+    UNLIMITED_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class TaskWatcher(object):
+    """
+    Waits for many tasks at once without blocking the callers.
+
+    A single background thread polls all the watched tasks, with one Tasks.get_all request for each batch of task URIs
+    per poll cycle, and resolves the future returned by watch when the task finishes. The thread stops when there are
+    no tasks left to watch.
+
+    Examples:
+        >>> futures = [task_watcher.watch(task) for task in tasks]
+        >>> profiles = [future.result() for future in futures]
+    """
+    # Seconds between two poll cycles
+    DEFAULT_POLL_INTERVAL = 2
+
+    # Maximum number of task URIs in the filter of each request
+    DEFAULT_BATCH_SIZE = 50
+
+    def __init__(self, con, poll_interval=DEFAULT_POLL_INTERVAL, batch_size=DEFAULT_BATCH_SIZE):
+        self._connection = con
+        self._tasks = Tasks(con)
+        self._task_monitor = TaskMonitor(con)
+        self._poll_interval = poll_interval
+        self._batch_size = batch_size
+        self._batch_supported = True
+        self._watched = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def watch(self, task, timeout=-1):
+        """
+        Starts watching a task.
+
+        Args:
+            task (dict): OneView Task resource, must have the 'uri' key.
+            timeout: Timeout in seconds. The future fails with HPOneViewTimeout when it expires.
+
+        Returns:
+            Future: Resolved with the associated resource when creating or updating, or True when deleting.
+        """
+        return self.watch_all([task], timeout)[0]
+
+    def watch_all(self, tasks, timeout=-1):
+        """
+        Starts watching many tasks. They are all registered before the next poll cycle.
+
+        Args:
+            tasks (list): OneView Task resources.
+            timeout: Timeout in seconds for each task.
+
+        Returns:
+            list: A future for each task, in the same order.
+        """
+        if not all(task and task.get('uri') for task in tasks):
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        deadline = None if timeout == UNLIMITED_TIMEOUT else TaskMonitor.get_current_seconds() + timeout
+        futures = [Future() for _ in tasks]
+
+        with self._lock:
+            for task, future in zip(tasks, futures):
+                self._watched.setdefault(task['uri'], []).append((future, deadline, timeout))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run, name='TaskWatcher')
+                self._thread.daemon = True
+                self._thread.start()
+
+        return futures
+
+    def wait_for_tasks(self, tasks, timeout=-1):
+        """
+        Waits for many tasks and returns their associated resources. The first task error is raised.
+
+        Args:
+            tasks (list): OneView Task resources.
+            timeout: Timeout in seconds for each task.
+
+        Returns:
+            list: Associated resource when creating or updating; True when deleting; for each task, in the same order.
+        """
+        return [future.result() for future in self.watch_all(tasks, timeout)]
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(watchers) for watchers in self._watched.values())
+
+    def __run(self):
+        error = None
+        try:
+            self.__poll_until_done()
+        except Exception as e:
+            logger.exception('The task watcher stopped on an unexpected error')
+            error = e
+        finally:
+            with self._lock:
+                # A watch arriving after the loop returned may already have started the next thread
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                watchers = [] if error is None else [watcher for uri in self._watched for watcher in self._watched[uri]]
+                if error is not None:
+                    self._watched.clear()
+            self.__set_exception(watchers, error)
+
+    def __poll_until_done(self):
+        last_success = TaskMonitor.get_current_seconds()
+
+        while True:
+            with self._lock:
+                uris = [uri for uri, watchers in self._watched.items() if any(not f.done() for f, _, _ in watchers)]
+                for uri in list(self._watched):
+                    if uri not in uris:
+                        del self._watched[uri]
+                if not uris:
+                    self._thread = None
+                    return
+
+            for index in range(0, len(uris), self._batch_size):
+                batch = uris[index:index + self._batch_size]
+                try:
+                    tasks = self.__poll(batch)
+                    last_success = TaskMonitor.get_current_seconds()
+                except Exception as error:
+                    if self.__is_connection_failure(error, last_success):
+                        logger.warning('Connection failure when polling the tasks, trying again: ' + str(error))
+                        continue
+                    self.__fail(batch, error)
+                    continue
+
+                for task in tasks:
+                    if task.get('taskState') not in TASK_PENDING_STATES:
+                        self.__resolve(task)
+
+            self.__expire()
+            time.sleep(self._poll_interval)
+
+    def __poll(self, uris):
+        tasks = []
+        if self._batch_supported:
+            try:
+                tasks = self._tasks.get_all(count=len(uris), filter=build_uri_filter(uris))
+            except HPOneViewException as error:
+                logger.warning('Tasks could not be polled in batches, polling one at a time: ' + str(error))
+                self._batch_supported = False
+
+        # Tasks missing from the batch response are polled one at a time
+        tasks = [task for task in tasks if task.get('uri') in uris]
+        polled = set(task['uri'] for task in tasks)
+        tasks += [self._connection.get(uri) for uri in uris if uri not in polled]
+        return tasks
+
+    def __resolve(self, task):
+        with self._lock:
+            watchers = self._watched.pop(task['uri'], [])
+
+        try:
+            response = self._task_monitor.get_task_response(task)
+        except Exception as error:
+            self.__set_exception(watchers, error)
+        else:
+            for future, _, _ in watchers:
+                if self.__set_running(future):
+                    future.set_result(response)
+
+    def __fail(self, uris, error):
+        with self._lock:
+            watchers = [watcher for uri in uris for watcher in self._watched.pop(uri, [])]
+        self.__set_exception(watchers, error)
+
+    def __expire(self):
+        now = TaskMonitor.get_current_seconds()
+        expired = []
+        with self._lock:
+            for uri, watchers in self._watched.items():
+                expired += [watcher for watcher in watchers if watcher[1] is not None and watcher[1] < now]
+                watchers[:] = [watcher for watcher in watchers if watcher[1] is None or watcher[1] >= now]
+
+        for future, _, timeout in expired:
+            if self.__set_running(future):
+                future.set_exception(HPOneViewTimeout(MSG_TIMEOUT % str(timeout)))
+
+    def __set_exception(self, watchers, error):
+        for future, _, _ in watchers:
+            if self.__set_running(future):
+                future.set_exception(error)
+
+    @staticmethod
+    def __set_running(future):
+        # Once running, the future can no longer be cancelled by the caller while its outcome is set
+        return not future.done() and future.set_running_or_notify_cancel()
+
+    def __is_connection_failure(self, error, last_success):
+        if not self._task_monitor.is_connection_failure(error):
+            return False
+        return last_success + TaskMonitor.CONNECTION_FAILURE_TIMEOUT >= TaskMonitor.get_current_seconds()
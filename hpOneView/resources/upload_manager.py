@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import hashlib
+import http.client
+import logging
+import os
+import socket
+import time
+
+from timeit import default_timer
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_RETRIES = 3
+UPLOAD_BACKOFF = 2
+UPLOAD_MAX_BACKOFF = 60
+
+CHECKSUM_CHUNK_SIZE = 1048576
+
+TRANSIENT_UPLOAD_ERRORS = (socket.error, http.client.HTTPException)
+
+
+def file_checksum(file_path, algorithm='sha256'):
+    """
+    Computes the hex digest of a file, reading it 1MB at a time.
+
+    Args:
+        file_path: Path of the file.
+        algorithm: Name of a hashlib algorithm.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+    digest = hashlib.new(algorithm)
+    with open(file_path, 'rb') as input_file:
+        for chunk in iter(lambda: input_file.read(CHECKSUM_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadProgress(object):
+    """
+    Progress of one upload attempt, given to the progress callback of the UploadManager.
+
+    Attributes:
+        file_path: Path of the file being uploaded.
+        attempt: Number of the attempt, starting at 1. A retried upload restarts from the first byte.
+        bytes_sent: Bytes of the file sent so far.
+        total_bytes: Size of the file, None until the first chunk is sent.
+        elapsed: Seconds since the attempt started.
+    """
+
+    def __init__(self, file_path, attempt):
+        self.file_path = file_path
+        self.attempt = attempt
+        self.bytes_sent = 0
+        self.total_bytes = None
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self):
+        """
+        Average upload rate of the attempt, in bytes per second.
+        """
+        if not self.elapsed:
+            return 0.0
+        return self.bytes_sent / self.elapsed
+
+    @property
+    def percent(self):
+        """
+        Percentage of the file sent.
+        """
+        if not self.total_bytes:
+            return 0.0
+        return 100.0 * self.bytes_sent / self.total_bytes
+
+    @property
+    def complete(self):
+        """
+        Whether the whole file was sent.
+        """
+        return self.total_bytes is not None and self.bytes_sent >= self.total_bytes
+
+
+class UploadManager(object):
+    """
+    Uploads files to the appliance, reporting the progress and retrying on transient network errors.
+
+    The OneView upload endpoints accept the whole file in a single multipart request, so a failed attempt restarts
+    from the first byte after an exponential back-off. An attempt is only retried while the file was not fully sent:
+    once the appliance has the whole file it may already be processing it, and sending it again could duplicate it.
+
+    Examples:
+        >>> def show(status):
+        ...     print('%.1f%% at %d bytes/s' % (status.percent, status.throughput))
+        >>> UploadManager(connection, progress=show).upload('/rest/firmware-bundles', '/tmp/spp.iso')
+    """
+
+    def __init__(self, con, retries=UPLOAD_RETRIES, backoff=UPLOAD_BACKOFF, max_backoff=UPLOAD_MAX_BACKOFF,
+                 progress=None):
+        """
+        Args:
+            con: Connection to the appliance.
+            retries: Maximum number of new attempts after a transient error.
+            backoff: Seconds to wait before the first retry. The wait doubles on each retry.
+            max_backoff: Upper bound, in seconds, of the wait between retries.
+            progress: Optional callable that receives an UploadProgress each time a chunk is sent.
+        """
+        self._connection = con
+        self._retries = retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._progress = progress
+
+    def upload(self, uri, file_path):
+        """
+        Uploads a file as multipart/form-data.
+
+        Args:
+            uri: URI of the upload endpoint.
+            file_path: Path of the file to upload.
+
+        Returns:
+            tuple: The task (or None) and the response body.
+        """
+        base_name = os.path.basename(file_path)
+        attempt = 1
+        while True:
+            status = UploadProgress(file_path, attempt)
+            try:
+                return self._connection.post_multipart_with_response_handling(
+                    uri, file_path, base_name, progress=self.__track(status))
+            except TRANSIENT_UPLOAD_ERRORS as e:
+                if attempt > self._retries or status.complete:
+                    raise
+                delay = min(self._backoff * 2 ** (attempt - 1), self._max_backoff)
+                logger.warning('Upload of %s failed after %d bytes (%s). Retrying in %s seconds...' %
+                               (file_path, status.bytes_sent, e, delay))
+                time.sleep(delay)
+                attempt += 1
+
+    def __track(self, status):
+        started = default_timer()
+
+        def update(bytes_sent, total_bytes):
+            status.bytes_sent = bytes_sent
+            status.total_bytes = total_bytes
+            status.elapsed = default_timer() - started
+            if self._progress is not None:
+                self._progress(status)
+
+        return update
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import gzip
+import socket
+import sys
+import unittest
+
+import mock
+
+from hpOneView.exceptions import HPOneViewException
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from hpOneView.aio.connection import AsyncConnection, AsyncConnectionPool, MSG_MULTIPART_NOT_SUPPORTED
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio client requires Python 3.5 or later')
+class AsyncConnectionTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.connection = AsyncConnection('127.0.0.1')
+        self.writer = mock.Mock()
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def run_coroutine(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def completed(self, result):
+        future = self.loop.create_future()
+        future.set_result(result)
+        return future
+
+    def stream(self, *responses):
+        reader = asyncio.StreamReader()
+        for response in responses:
+            reader.feed_data(response)
+        return reader
+
+    def sent_data(self):
+        return b''.join(c[0][0] for c in self.writer.write.call_args_list)
+
+    def test_get_should_send_the_request_and_parse_the_json_body(self):
+        reader = self.stream(b'HTTP/1.1 200 OK\r\nContent-Length: 14\r\n\r\n{"name": "a1"}')
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((reader, self.writer, False)))
+        self.writer.drain.return_value = self.completed(None)
+
+        result = self.run_coroutine(self.connection.get('/rest/fake'))
+
+        self.assertEqual(result, {'name': 'a1'})
+        self.assertTrue(self.sent_data().startswith(b'GET /rest/fake HTTP/1.1\r\nHost: 127.0.0.1\r\n'))
+        self.assertEqual(len(self.connection._pool), 1)
+
+    def test_post_should_send_the_json_body_with_content_length(self):
+        reader = self.stream(b'HTTP/1.1 201 Created\r\nContent-Length: 2\r\n\r\n{}')
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((reader, self.writer, False)))
+        self.writer.drain.return_value = self.completed(None)
+
+        self.run_coroutine(self.connection.post('/rest/fake', {'name': 'a1'}))
+
+        self.assertIn(b'Content-Length: 14\r\n\r\n{"name": "a1"}', self.sent_data())
+
+    def test_do_http_should_read_chunked_body(self):
+        reader = self.stream(b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+                             b'5\r\n{"a":\r\n3\r\n 1}\r\n0\r\n\r\n')
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((reader, self.writer, False)))
+        self.writer.drain.return_value = self.completed(None)
+
+        resp, body = self.run_coroutine(self.connection.do_http('GET', '/rest/fake', ''))
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(body, {'a': 1})
+
+    def test_do_http_should_not_reuse_connection_closed_by_the_appliance(self):
+        reader = self.stream(b'HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 2\r\n\r\n{}')
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((reader, self.writer, False)))
+        self.writer.drain.return_value = self.completed(None)
+
+        self.run_coroutine(self.connection.do_http('GET', '/rest/fake', ''))
+
+        self.writer.close.assert_called_once_with()
+        self.assertEqual(len(self.connection._pool), 0)
+
+    def test_do_http_should_retry_on_new_connection_when_reused_one_was_dropped(self):
+        dropped = self.stream()
+        dropped.feed_eof()
+        fresh = self.stream(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}')
+        self.connection._pool.acquire = mock.Mock(side_effect=[self.completed((dropped, self.writer, True)),
+                                                               self.completed((fresh, self.writer, False))])
+        self.writer.drain.return_value = self.completed(None)
+
+        resp, body = self.run_coroutine(self.connection.do_http('GET', '/rest/fake', ''))
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(self.connection._pool.acquire.call_count, 2)
+
+    def test_do_http_should_raise_when_new_connection_was_dropped(self):
+        dropped = self.stream()
+        dropped.feed_eof()
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((dropped, self.writer, False)))
+        self.writer.drain.return_value = self.completed(None)
+        self.connection.set_retry_policy(None)
+
+        self.assertRaises(ConnectionResetError, self.run_coroutine, self.connection.do_http('GET', '/rest/fake', ''))
+        self.writer.close.assert_called_once_with()
+
+    @mock.patch('hpOneView.aio.connection.asyncio.sleep', new_callable=mock.Mock)
+    def test_do_http_should_retry_idempotent_request_reset_during_the_exchange(self, mock_sleep):
+        mock_sleep.return_value = self.completed(None)
+        reset = self.stream(b'HTTP/1.1 200 OK\r\nContent-Length: 20\r\n\r\n{"na')
+        reset.feed_eof()
+        fresh = self.stream(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}')
+        self.connection._pool.acquire = mock.Mock(side_effect=[self.completed((reset, self.writer, False)),
+                                                               self.completed((fresh, self.writer, False))])
+        self.writer.drain.return_value = self.completed(None)
+
+        resp, body = self.run_coroutine(self.connection.do_http('GET', '/rest/fake', ''))
+
+        self.assertEqual((resp.status, body), (200, {}))
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    @mock.patch('hpOneView.aio.connection.asyncio.sleep', new_callable=mock.Mock)
+    def test_do_http_should_not_retry_post_reset_during_the_exchange(self, mock_sleep):
+        reset = self.stream(b'HTTP/1.1 200 OK\r\nContent-Length: 20\r\n\r\n{"na')
+        reset.feed_eof()
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((reset, self.writer, False)))
+        self.writer.drain.return_value = self.completed(None)
+
+        self.assertRaises(ConnectionResetError, self.run_coroutine, self.connection.do_http('POST', '/rest/fake', '{}'))
+        mock_sleep.assert_not_called()
+
+    @mock.patch('hpOneView.aio.connection.asyncio.sleep', new_callable=mock.Mock)
+    def test_do_http_should_retry_idempotent_request_on_retryable_status(self, mock_sleep):
+        mock_sleep.return_value = self.completed(None)
+        unavailable = self.stream(b'HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n')
+        available = self.stream(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}')
+        self.connection._pool.acquire = mock.Mock(side_effect=[self.completed((unavailable, self.writer, False)),
+                                                               self.completed((available, self.writer, False))])
+        self.writer.drain.return_value = self.completed(None)
+
+        resp, body = self.run_coroutine(self.connection.do_http('GET', '/rest/fake', ''))
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    def test_do_http_should_raise_socket_timeout_when_the_request_times_out(self):
+        self.connection._timeout = 0.01
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((self.stream(), self.writer, False)))
+        self.writer.drain.return_value = self.completed(None)
+        self.connection.set_retry_policy(None)
+
+        self.assertRaises(socket.timeout, self.run_coroutine, self.connection.do_http('GET', '/rest/fake', ''))
+
+    def test_get_should_raise_exception_on_error_status(self):
+        reader = self.stream(b'HTTP/1.1 404 Not Found\r\nContent-Length: 21\r\n\r\n{"message": "absent"}')
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((reader, self.writer, False)))
+        self.writer.drain.return_value = self.completed(None)
+
+        try:
+            self.run_coroutine(self.connection.get('/rest/fake'))
+        except HPOneViewException as e:
+            self.assertEqual(e.oneview_response, {'message': 'absent'})
+        else:
+            self.fail('Expected exception was not raised')
+
+    def test_download_to_stream_should_write_body_to_the_stream(self):
+        reader = self.stream(b'HTTP/1.1 200 OK\r\nContent-Length: 6\r\n\r\nbinary')
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((reader, self.writer, False)))
+        self.writer.drain.return_value = self.completed(None)
+        stream = mock.Mock()
+
+        result = self.run_coroutine(self.connection.download_to_stream(stream, '/rest/fake/file'))
+
+        self.assertTrue(result)
+        stream.write.assert_called_once_with(b'binary')
+
+    def test_download_to_stream_should_decode_compressed_body(self):
+        encoded = gzip.compress(b'binary' * 100)
+        reader = self.stream(b'HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\nContent-Length: %d\r\n\r\n' % len(encoded) +
+                             encoded)
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((reader, self.writer, False)))
+        self.writer.drain.return_value = self.completed(None)
+        self.connection.enable_compression()
+        written = []
+        stream = mock.Mock(write=written.append)
+
+        self.run_coroutine(self.connection.download_to_stream(stream, '/rest/fake/file'))
+
+        self.assertEqual(b''.join(written), b'binary' * 100)
+        self.assertIn(b'Accept-Encoding: gzip, deflate\r\n', self.sent_data())
+
+    def test_features_of_the_sync_requests_should_raise_exception(self):
+        unsupported = [lambda: self.connection.enable_response_cache(),
+                       lambda: self.connection.enable_rate_limiter(rate=10),
+                       lambda: self.connection.add_inventory_snapshot(mock.Mock()),
+                       lambda: self.connection.download_range(mock.Mock(), '/rest/fake/file', 0, 10)]
+
+        for call in unsupported:
+            self.assertRaises(HPOneViewException, call)
+        self.assertIsNone(self.connection._response_cache)
+
+    def test_post_multipart_should_raise_exception(self):
+        try:
+            self.connection.post_multipart_with_response_handling('/rest/fake', '/path/file', 'file')
+        except HPOneViewException as e:
+            self.assertEqual(e.msg, MSG_MULTIPART_NOT_SUPPORTED)
+        else:
+            self.fail('Expected exception was not raised')
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio client requires Python 3.5 or later')
+class AsyncConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.factory = mock.Mock()
+        self.pool = AsyncConnectionPool(self.factory, max_size=2, idle_timeout=60)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def idle_stream(self):
+        reader, writer = mock.Mock(), mock.Mock()
+        reader.at_eof.return_value = False
+        writer.is_closing.return_value = False
+        return reader, writer
+
+    def test_acquire_should_open_connection_when_pool_is_empty(self):
+        reader, writer = self.idle_stream()
+        future = self.loop.create_future()
+        future.set_result((reader, writer))
+        self.factory.return_value = future
+
+        self.assertEqual(self.loop.run_until_complete(self.pool.acquire()), (reader, writer, False))
+
+    def test_acquire_should_reuse_released_connection(self):
+        reader, writer = self.idle_stream()
+        self.pool.release(reader, writer)
+
+        self.assertEqual(self.loop.run_until_complete(self.pool.acquire()), (reader, writer, True))
+        self.factory.assert_not_called()
+
+    def test_acquire_should_discard_connection_closed_by_the_appliance(self):
+        reader, writer = self.idle_stream()
+        reader.at_eof.return_value = True
+        self.pool.release(reader, writer)
+        future = self.loop.create_future()
+        future.set_result(self.idle_stream())
+        self.factory.return_value = future
+
+        self.loop.run_until_complete(self.pool.acquire())
+
+        writer.close.assert_called_once_with()
+        self.factory.assert_called_once_with()
+
+    def test_release_should_close_connections_over_max_size(self):
+        streams = [self.idle_stream() for _ in range(3)]
+        for reader, writer in streams:
+            self.pool.release(reader, writer)
+
+        self.assertEqual(len(self.pool), 2)
+        streams[2][1].close.assert_called_once_with()
+
+    def test_release_should_close_non_reusable_connection(self):
+        reader, writer = self.idle_stream()
+
+        self.pool.release(reader, writer, reusable=False)
+
+        self.assertEqual(len(self.pool), 0)
+        writer.close.assert_called_once_with()
+
+    def test_clear_should_close_idle_connections(self):
+        reader, writer = self.idle_stream()
+        self.pool.release(reader, writer)
+
+        self.pool.clear()
+
+        self.assertEqual(len(self.pool), 0)
+        writer.close.assert_called_once_with()
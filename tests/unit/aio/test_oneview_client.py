@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import sys
+import unittest
+
+import mock
+
+from hpOneView.oneview_client import OneViewClient
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from hpOneView.aio.connection import AsyncConnection
+    from hpOneView.aio.oneview_client import AsyncOneViewClient, RESOURCE_CLASSES
+    from hpOneView.aio.resource import AsyncResourceClient
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio client requires Python 3.5 or later')
+class AsyncOneViewClientTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.config = {"ip": "172.16.102.59",
+                       "api_version": 300,
+                       "credentials": {"userName": "administrator", "password": ""}}
+        self._oneview = AsyncOneViewClient(self.config)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def completed(self, result):
+        future = self.loop.create_future()
+        future.set_result(result)
+        return future
+
+    def test_should_not_login_on_creation(self):
+        with mock.patch.object(AsyncConnection, 'login', new_callable=mock.Mock) as mock_login:
+            AsyncOneViewClient(self.config)
+
+        mock_login.assert_not_called()
+
+    @mock.patch.object(AsyncConnection, 'login', new_callable=mock.Mock)
+    def test_login_should_use_config_credentials(self, mock_login):
+        mock_login.return_value = self.completed(None)
+
+        self.loop.run_until_complete(self._oneview.login())
+
+        mock_login.assert_called_once_with({"userName": "administrator", "password": ""})
+
+    @mock.patch.object(AsyncConnection, 'close_connections')
+    @mock.patch.object(AsyncConnection, 'login', new_callable=mock.Mock)
+    def test_context_manager_should_login_and_close(self, mock_login, mock_close):
+        mock_login.return_value = self.completed(None)
+
+        self.loop.run_until_complete(self._oneview.__aenter__())
+        self.loop.run_until_complete(self._oneview.__aexit__(None, None, None))
+
+        mock_login.assert_called_once_with(self.config["credentials"])
+        mock_close.assert_called_once_with()
+
+    def test_api_version(self):
+        self.assertEqual(self._oneview.api_version, 300)
+        self.assertIsInstance(self._oneview.connection, AsyncConnection)
+
+    def test_should_apply_proxy_pool_and_pagination_config(self):
+        self.config.update(proxy="127.0.0.1:3128", connection_pool={"max_size": 4}, pagination={"max_workers": 2})
+
+        oneview = AsyncOneViewClient(self.config)
+
+        self.assertEqual(oneview.connection._proxyHost, "127.0.0.1")
+        self.assertEqual(oneview.connection._pool.max_size, 4)
+        self.assertEqual(oneview.connection.get_pagination()['max_workers'], 2)
+
+    def test_should_apply_retry_policy_config(self):
+        self.config.update(retry_policy={"max_attempts": 5, "backoff": 2})
+
+        oneview = AsyncOneViewClient(self.config)
+
+        self.assertEqual(oneview.connection.get_retry_policy().max_attempts, 5)
+
+    def test_should_raise_on_invalid_proxy(self):
+        self.config.update(proxy="127.0.0.1")
+
+        self.assertRaises(ValueError, AsyncOneViewClient, self.config)
+
+    def test_ethernet_networks_has_right_type_and_uri(self):
+        self.assertIsInstance(self._oneview.ethernet_networks, AsyncResourceClient)
+        self.assertEqual(self._oneview.ethernet_networks._uri, '/rest/ethernet-networks')
+
+    def test_id_pools_ranges_have_the_uri_of_their_type(self):
+        self.assertEqual(self._oneview.id_pools_vsn_ranges._uri, '/rest/id-pools/vsn/ranges')
+        self.assertEqual(self._oneview.id_pools_vmac_ranges._uri, '/rest/id-pools/vmac/ranges')
+        self.assertEqual(self._oneview.id_pools_vwwn_ranges._uri, '/rest/id-pools/vwwn/ranges')
+
+    def test_resources_should_be_named_after_the_oneview_client_properties(self):
+        self.assertFalse([name for name in RESOURCE_CLASSES if not isinstance(getattr(OneViewClient, name, None), property)])
+
+    def test_lazy_loading_resources(self):
+        self.assertIs(self._oneview.server_profiles, self._oneview.server_profiles)
+
+    def test_unknown_attribute_should_raise_attribute_error(self):
+        self.assertRaises(AttributeError, getattr, self._oneview, 'unknown_resources')
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import sys
+import unittest
+
+import mock
+
+from hpOneView.exceptions import HPOneViewUnknownType
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from hpOneView.aio.connection import AsyncConnection
+    from hpOneView.aio.resource import AsyncResourceClient
+    from hpOneView.aio.task_monitor import AsyncTaskMonitor
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio client requires Python 3.5 or later')
+class AsyncResourceClientTest(unittest.TestCase):
+    URI = "/rest/testuri"
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.connection = AsyncConnection('127.0.0.1', 300)
+        self.resource_client = AsyncResourceClient(self.connection, self.URI)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_coroutine(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def completed(self, result):
+        future = self.loop.create_future()
+        future.set_result(result)
+        return future
+
+    def mock_connection(self, method, *results):
+        mocked = mock.Mock(side_effect=[self.completed(result) for result in results])
+        setattr(self.connection, method, mocked)
+        return mocked
+
+    def test_get_all_should_follow_next_page_uri(self):
+        mock_get = self.mock_connection(
+            'get',
+            {'nextPageUri': self.URI + '?start=1&count=1', 'members': [{'id': '1'}]},
+            {'nextPageUri': None, 'members': [{'id': '2'}]})
+
+        result = self.run_coroutine(self.resource_client.get_all())
+
+        self.assertEqual(result, [{'id': '1'}, {'id': '2'}])
+        mock_get.assert_has_calls([mock.call(self.URI + '?start=0&count=-1'), mock.call(self.URI + '?start=1&count=1')])
+
+    def test_get_all_should_request_remaining_pages_concurrently(self):
+        mock_get = self.mock_connection(
+            'get',
+            {'nextPageUri': self.URI + '?start=2&count=2', 'total': 6, 'members': [{'id': '1'}, {'id': '2'}]},
+            {'members': [{'id': '3'}, {'id': '4'}]},
+            {'members': [{'id': '5'}, {'id': '6'}]})
+
+        result = self.run_coroutine(self.resource_client.get_all())
+
+        self.assertEqual([item['id'] for item in result], ['1', '2', '3', '4', '5', '6'])
+        mock_get.assert_has_calls([mock.call(self.URI + '?start=2&count=2'), mock.call(self.URI + '?start=4&count=2')])
+
+    def test_get_should_use_built_uri(self):
+        mock_get = self.mock_connection('get', {'name': 'resource1'})
+
+        result = self.run_coroutine(self.resource_client.get('12345'))
+
+        self.assertEqual(result, {'name': 'resource1'})
+        mock_get.assert_called_once_with(self.URI + '/12345', raw=False)
+
+    def test_get_by_name_should_filter_results(self):
+        self.mock_connection('get', {'members': [{'name': 'Other'}, {'name': 'EXpected'}]})
+
+        result = self.run_coroutine(self.resource_client.get_by_name('expected'))
+
+        self.assertEqual(result, {'name': 'EXpected'})
+
+    def test_get_by_should_raise_when_field_is_empty(self):
+        self.assertRaises(ValueError, self.run_coroutine, self.resource_client.get_by('', 'value'))
+
+    def test_create_should_return_entity_when_there_is_no_task(self):
+        mock_post = self.mock_connection('post', (None, {'name': 'created'}))
+
+        result = self.run_coroutine(self.resource_client.create({'name': 'name'}))
+
+        self.assertEqual(result, {'name': 'created'})
+        mock_post.assert_called_once_with(self.URI, {'name': 'name'}, custom_headers=None)
+
+    @mock.patch.object(AsyncTaskMonitor, 'wait_for_task', new_callable=mock.Mock)
+    def test_update_should_wait_for_task(self, mock_wait4task):
+        task = {'uri': '/rest/tasks/1'}
+        self.mock_connection('put', (task, {}))
+        mock_wait4task.return_value = self.completed({'name': 'updated'})
+
+        result = self.run_coroutine(self.resource_client.update({'uri': self.URI + '/1', 'name': 'updated'}))
+
+        self.assertEqual(result, {'name': 'updated'})
+        mock_wait4task.assert_called_once_with(task, -1)
+
+    def test_delete_should_return_true_when_there_is_no_task(self):
+        mock_delete = self.mock_connection('delete', (None, {}))
+
+        self.assertTrue(self.run_coroutine(self.resource_client.delete('1', force=True)))
+        mock_delete.assert_called_once_with(self.URI + '/1?force=True', custom_headers=None)
+
+    def test_delete_should_raise_when_dict_has_no_uri(self):
+        self.assertRaises(HPOneViewUnknownType, self.run_coroutine, self.resource_client.delete({'name': 'name'}))
+
+    def test_patch_should_use_json_patch_content_type(self):
+        mock_patch = self.mock_connection('patch', (None, {'name': 'patched'}))
+
+        self.run_coroutine(self.resource_client.patch('1', 'replace', '/name', 'patched'))
+
+        mock_patch.assert_called_once_with(self.URI + '/1', [{'op': 'replace', 'path': '/name', 'value': 'patched'}],
+                                           custom_headers={'Content-Type': 'application/json-patch+json'})
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import errno
+import socket
+import sys
+import unittest
+
+import mock
+
+from hpOneView.connection import RetryPolicy
+from hpOneView.exceptions import HPOneViewTaskError, HPOneViewTimeout, HPOneViewUnknownType
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from hpOneView.aio.connection import AsyncConnection
+    from hpOneView.aio.task_monitor import AsyncTaskMonitor
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio client requires Python 3.5 or later')
+class AsyncTaskMonitorTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.connection = AsyncConnection('127.0.0.1')
+        self.task_monitor = AsyncTaskMonitor(self.connection)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_coroutine(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def completed(self, result):
+        future = self.loop.create_future()
+        future.set_result(result)
+        return future
+
+    def mock_get(self, *results):
+        self.connection.get = mock.Mock(side_effect=[self.completed(result) for result in results])
+        return self.connection.get
+
+    @mock.patch('hpOneView.aio.task_monitor.asyncio.sleep', new_callable=mock.Mock)
+    def test_wait_for_task_should_return_associated_resource(self, mock_sleep):
+        mock_sleep.return_value = self.completed(None)
+        running = {'uri': '/rest/tasks/1', 'taskState': 'Running'}
+        completed = {'uri': '/rest/tasks/1', 'taskState': 'Completed', 'type': 'TaskResourceV2', 'category': 'tasks',
+                     'associatedResource': {'resourceUri': '/rest/resource/1'}}
+        mock_get = self.mock_get(running, completed, completed, {'name': 'resource1'})
+
+        result = self.run_coroutine(self.task_monitor.wait_for_task({'uri': '/rest/tasks/1'}))
+
+        self.assertEqual(result, {'name': 'resource1'})
+        mock_sleep.assert_called_once_with(1)
+        mock_get.assert_called_with('/rest/resource/1')
+
+    def test_wait_for_task_should_return_true_for_delete_task(self):
+        self.mock_get(*[{'uri': '/rest/tasks/1', 'taskState': 'Completed', 'name': 'Delete'}] * 2)
+
+        self.assertTrue(self.run_coroutine(self.task_monitor.wait_for_task({'uri': '/rest/tasks/1'})))
+
+    def test_wait_for_task_should_raise_task_error(self):
+        task = {'uri': '/rest/tasks/1', 'taskState': 'Error', 'taskErrors': [{'message': 'Failed', 'errorCode': 'E1'}]}
+        self.mock_get(task, task)
+
+        try:
+            self.run_coroutine(self.task_monitor.wait_for_task({'uri': '/rest/tasks/1'}))
+        except HPOneViewTaskError as e:
+            self.assertEqual(e.msg, 'Failed')
+            self.assertEqual(e.error_code, 'E1')
+        else:
+            self.fail('Expected exception was not raised')
+
+    @mock.patch('hpOneView.aio.task_monitor.asyncio.sleep', new_callable=mock.Mock)
+    @mock.patch.object(AsyncTaskMonitor, 'get_current_seconds')
+    def test_wait_for_task_should_raise_timeout(self, mock_seconds, mock_sleep):
+        mock_sleep.return_value = self.completed(None)
+        mock_seconds.side_effect = [0, 0, 0, 20]
+        self.mock_get(*[{'uri': '/rest/tasks/1', 'taskState': 'Running'}] * 2)
+
+        self.assertRaises(HPOneViewTimeout, self.run_coroutine,
+                          self.task_monitor.wait_for_task({'uri': '/rest/tasks/1'}, timeout=10))
+
+    def test_is_task_running_should_tolerate_the_connection_failures_of_the_retry_policy(self):
+        self.connection.get = mock.Mock(side_effect=socket.timeout())
+        control = dict(last_success=self.task_monitor.get_current_seconds())
+
+        self.assertTrue(self.run_coroutine(self.task_monitor.is_task_running({'uri': '/rest/tasks/1'}, control)))
+
+        self.connection.get_retry_policy().retryable_error_numbers = ()
+        self.connection.get = mock.Mock(side_effect=OSError(errno.ECONNRESET, 'reset'))
+        self.assertRaises(OSError, self.run_coroutine,
+                          self.task_monitor.is_task_running({'uri': '/rest/tasks/1'}, control))
+
+    def test_is_task_running_should_tolerate_a_connection_reset_during_the_poll(self):
+        reader = asyncio.StreamReader(loop=self.loop)
+        reader.feed_data(b'HTTP/1.1 200 OK\r\nContent-Length: 50\r\n\r\n{"uri": ')
+        reader.feed_eof()
+        writer = mock.Mock()
+        writer.drain.return_value = self.completed(None)
+        self.connection._pool.acquire = mock.Mock(return_value=self.completed((reader, writer, False)))
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=1))
+        control = dict(last_success=self.task_monitor.get_current_seconds())
+
+        running = self.run_coroutine(self.task_monitor.is_task_running({'uri': '/rest/tasks/1'}, control))
+
+        self.assertTrue(running)
+        writer.close.assert_called_once_with()
+
+    def test_wait_for_task_should_raise_when_task_is_empty(self):
+        self.assertRaises(HPOneViewUnknownType, self.run_coroutine, self.task_monitor.wait_for_task({}))
+
+    def test_get_completed_task_should_return_the_task(self):
+        task = {'uri': '/rest/tasks/1', 'taskState': 'Completed'}
+        self.mock_get(task, task)
+
+        self.assertEqual(self.run_coroutine(self.task_monitor.get_completed_task({'uri': '/rest/tasks/1'})), task)
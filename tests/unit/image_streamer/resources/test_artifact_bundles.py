@@ -129,7 +129,7 @@ class ArtifactBundlesTest(TestCase):
         destination = '~/image.zip'
         self._client.download_artifact_bundle('0ABDE00534F', destination)
 
-        mock_download.assert_called_once_with('/rest/artifact-bundles/download/0ABDE00534F', destination)
+        mock_download.assert_called_once_with('/rest/artifact-bundles/download/0ABDE00534F', destination, parts=1, checksum=None)
 
     @mock.patch.object(ResourceClient, 'download')
     def test_download_called_once_by_uri(self, mock_download):
@@ -138,7 +138,7 @@ class ArtifactBundlesTest(TestCase):
 
         self._client.download_artifact_bundle(uri, destination)
 
-        mock_download.assert_called_once_with('/rest/artifact-bundles/download/0ABDE00534F', destination)
+        mock_download.assert_called_once_with('/rest/artifact-bundles/download/0ABDE00534F', destination, parts=1, checksum=None)
 
     @mock.patch.object(ResourceClient, 'download')
     def test_download_archive_artifact_bundle_by_id_called_once(self, mock_download):
@@ -148,7 +148,7 @@ class ArtifactBundlesTest(TestCase):
         self._client.download_archive_artifact_bundle(id, destination)
 
         expected_uri = '/rest/artifact-bundles/backups/archive/78836581-2b6f-4e26-9969-5667fb5837b4'
-        mock_download.assert_called_once_with(expected_uri, destination)
+        mock_download.assert_called_once_with(expected_uri, destination, parts=1, checksum=None)
 
     @mock.patch.object(ResourceClient, 'download')
     def test_download_archive_artifact_bundle_by_uri_called_once(self, mock_download):
@@ -158,7 +158,7 @@ class ArtifactBundlesTest(TestCase):
         self._client.download_archive_artifact_bundle(uri, destination)
 
         expected_uri = '/rest/artifact-bundles/backups/archive/78836581-2b6f-4e26-9969-5667fb5837b4'
-        mock_download.assert_called_once_with(expected_uri, destination)
+        mock_download.assert_called_once_with(expected_uri, destination, parts=1, checksum=None)
 
     @mock.patch.object(ResourceClient, 'create')
     def test_create_backup_called_once(self, mock_create):
@@ -177,7 +177,7 @@ class ArtifactBundlesTest(TestCase):
 
         self._client.upload_bundle_from_file(filepath)
 
-        mock_upload.assert_called_once_with(filepath)
+        mock_upload.assert_called_once_with(filepath, progress=None)
 
     @mock.patch.object(ResourceClient, 'upload')
     def test_upload_backup_artifact_bundle_called_once(self, mock_upload):
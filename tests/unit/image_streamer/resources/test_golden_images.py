@@ -120,7 +120,7 @@ class GoldenImagesTest(TestCase):
 
         expected_uri = '/rest/golden-images?name=GoldenImageName&description=Description%20of%20this%20Golden%20Image'
 
-        mock_upload.assert_called_once_with(filepath, expected_uri)
+        mock_upload.assert_called_once_with(filepath, expected_uri, progress=None)
 
     @mock.patch.object(ResourceClient, 'upload')
     def test_upload_without_description(self, mock_upload):
@@ -134,7 +134,7 @@ class GoldenImagesTest(TestCase):
 
         expected_uri = '/rest/golden-images?name=GoldenImageName&description='
 
-        mock_upload.assert_called_once_with(filepath, expected_uri)
+        mock_upload.assert_called_once_with(filepath, expected_uri, progress=None)
 
     @mock.patch.object(ResourceClient, 'upload')
     def test_upload_with_empty_information(self, mock_upload):
@@ -145,7 +145,7 @@ class GoldenImagesTest(TestCase):
 
         expected_uri = '/rest/golden-images?name=&description='
 
-        mock_upload.assert_called_once_with(filepath, expected_uri)
+        mock_upload.assert_called_once_with(filepath, expected_uri, progress=None)
 
     @mock.patch.object(ResourceClient, 'download')
     def test_download_archive_called_once_with_id(self, mock_download):
@@ -155,7 +155,7 @@ class GoldenImagesTest(TestCase):
         self._client.download_archive(id, file_path)
 
         mock_download.assert_called_once_with('/rest/golden-images/archive/3518be0e-17c1-4189-8f81-83f3724f6155',
-                                              file_path)
+                                              file_path, parts=1, checksum=None)
 
     @mock.patch.object(ResourceClient, 'download')
     def test_download_archive_called_once_with_uri(self, mock_download):
@@ -165,7 +165,7 @@ class GoldenImagesTest(TestCase):
         self._client.download_archive(uri, file_path)
 
         mock_download.assert_called_once_with('/rest/golden-images/archive/3518be0e-17c1-4189-8f81-83f3724f6155',
-                                              file_path)
+                                              file_path, parts=1, checksum=None)
 
     @mock.patch.object(ResourceClient, 'download')
     def test_download_called_once_with_uri(self, mock_download):
@@ -175,7 +175,7 @@ class GoldenImagesTest(TestCase):
         self._client.download(uri, file_path)
 
         mock_download.assert_called_once_with('/rest/golden-images/download/3518be0e-17c1-4189-8f81-83f3724f6155',
-                                              file_path)
+                                              file_path, parts=1, checksum=None)
 
     @mock.patch.object(ResourceClient, 'download')
     def test_download_called_once_with_id(self, mock_download):
@@ -185,4 +185,4 @@ class GoldenImagesTest(TestCase):
         self._client.download(id, file_path)
 
         mock_download.assert_called_once_with('/rest/golden-images/download/3518be0e-17c1-4189-8f81-83f3724f6155',
-                                              file_path)
+                                              file_path, parts=1, checksum=None)
@@ -45,6 +45,15 @@ class AlertsTest(TestCase):
                                          filter="name='name'",
                                          query='', sort='name:ascending', start=0, view='day')
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all(self, mock_iter_all):
+        self._client.iter_all(filter="name='name'",
+                              sort='name:ascending',
+                              prefetch=False)
+        mock_iter_all.assert_called_once_with(count=-1,
+                                              filter="name='name'",
+                                              query='', sort='name:ascending', start=0, view='', prefetch=False)
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_specific(self, mock_get):
         self._client.get('35323930-4936-4450-5531-303153474820')
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import math
+from unittest import TestCase
+
+from hpOneView.resources.data_services.metric_buffers import MetricBuffer, downsample, parse_timestamp, percentile
+
+
+class MetricBuffersTest(TestCase):
+    def test_parse_timestamp(self):
+        self.assertEqual(parse_timestamp('2018-05-03T10:15:00.500Z'), 1525342500.5)
+        self.assertEqual(parse_timestamp('2018-05-03T10:15:00Z'), 1525342500)
+        self.assertEqual(parse_timestamp(1525342500500), 1525342500.5)
+        self.assertRaises(ValueError, parse_timestamp, 'yesterday')
+
+    def test_downsample_should_aggregate_aligned_buckets_and_skip_nan(self):
+        times, values = downsample([0, 60, 300, 360, 900], [1, 3, float('nan'), 4, 5], 300)
+
+        self.assertEqual(list(times), [0, 300, 900])
+        self.assertEqual(list(values), [2, 4, 5])
+
+    def test_downsample_with_max(self):
+        times, values = downsample([0, 60, 300, 360], [1, 3, 2, 4], 300, how='max')
+
+        self.assertEqual(list(values), [3, 4])
+
+    def test_percentile_should_interpolate_like_numpy(self):
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2.5)
+        self.assertEqual(percentile([4, 1, float('nan'), 3, 2], 100), 4)
+        self.assertAlmostEqual(percentile(range(1, 11), 95), 9.55)
+        self.assertTrue(math.isnan(percentile([], 50)))
+
+
+class MetricBufferTest(TestCase):
+    def setUp(self):
+        self.buffer = MetricBuffer(capacity=4)
+
+    def test_append_should_keep_the_metrics_in_columns(self):
+        self.buffer.append(0, {'AveragePower': 200})
+        self.buffer.append(300, {'AveragePower': 210, 'AmbientTemperature': 21})
+
+        self.assertEqual(self.buffer.metrics, ['AveragePower', 'AmbientTemperature'])
+        self.assertEqual(list(self.buffer.times()), [0, 300])
+        self.assertEqual(list(self.buffer.values('AveragePower')), [200, 210])
+        self.assertTrue(math.isnan(self.buffer.values('AmbientTemperature')[0]))
+        self.assertEqual(len(self.buffer.values('PeakPower')), 0)
+
+    def test_should_overwrite_the_oldest_samples_beyond_capacity(self):
+        for time in range(6):
+            self.buffer.append(time, {'AveragePower': time * 10})
+
+        self.assertEqual(list(self.buffer.times()), [2, 3, 4, 5])
+        self.assertEqual(list(self.buffer.values('AveragePower')), [20, 30, 40, 50])
+        self.assertEqual(self.buffer.nbytes, 2 * 4 * 8)
+
+    def test_extend_should_wrap_around_and_ignore_the_samples_already_received(self):
+        self.buffer.extend([0, 1, 2], {'AveragePower': [0, 10, 20]})
+
+        added = self.buffer.extend([1, 2, 3, 4, 5], {'AveragePower': [10, 20, 30, 40, 50]})
+
+        self.assertEqual(added, 3)
+        self.assertEqual(list(self.buffer.times()), [2, 3, 4, 5])
+        self.assertEqual(list(self.buffer.values('AveragePower')), [20, 30, 40, 50])
+
+    def test_extend_with_more_samples_than_capacity_should_keep_the_newest(self):
+        self.buffer.extend(list(range(10)), {'AveragePower': list(range(10))})
+
+        self.assertEqual(list(self.buffer.values('AveragePower')), [6, 7, 8, 9])
+
+    def test_float_typecode(self):
+        buffer = MetricBuffer(capacity=4, typecode='f')
+        buffer.append(0, {'AveragePower': 200})
+
+        self.assertEqual(buffer.values('AveragePower').typecode, 'f')
+        self.assertEqual(buffer.nbytes, 8 + 4)
+
+    def test_downsample_and_percentile(self):
+        self.buffer.extend([0, 60, 300, 360], {'AveragePower': [1, 3, 5, 7]})
+
+        self.assertEqual(list(self.buffer.downsample('AveragePower', 300)[1]), [2, 6])
+        self.assertEqual(self.buffer.percentile('AveragePower', 50), 4)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import json
+import math
+from unittest import TestCase
+
+from hpOneView.resources.data_services.metric_stream_consumer import MetricStreamConsumer, decode_samples
+
+SERVER_URI = '/rest/server-hardware/1'
+
+
+def msmb_message(uri=SERVER_URI, start='2018-05-03T10:00:00.000Z', power=(200, 210), temperature=(21, 22)):
+    return {"uri": uri,
+            "startTime": start,
+            "sampleIntervalInSeconds": "300",
+            "numberOfSamples": str(len(power)),
+            "resourceType": "server-hardware",
+            "resourceDataList": [
+                {"metricName": "AveragePower", "metricSampleList": [{"sampleValue": value} for value in power]},
+                {"metricName": "AmbientTemperature", "valueArray": list(temperature)}]}
+
+
+class MetricStreamConsumerTest(TestCase):
+    def setUp(self):
+        self.consumer = MetricStreamConsumer(capacity=3)
+
+    def test_decode_samples_should_time_the_samples_from_start_time(self):
+        times, columns = decode_samples(msmb_message())
+
+        self.assertEqual(times, [1525341600, 1525341900])
+        self.assertEqual(columns, {"AveragePower": [200, 210], "AmbientTemperature": [21, 22]})
+
+    def test_decode_samples_should_align_the_metrics_on_their_sample_times(self):
+        message = {"startTime": 0, "resourceDataList": [
+            {"metricName": "AveragePower", "metricSampleList": [{"sampleTime": 600000, "sampleValue": 2},
+                                                                {"sampleTime": 300000, "sampleValue": 1}]},
+            {"metricName": "PeakPower", "metricSampleList": [[600000, 5]]}]}
+
+        times, columns = decode_samples(message)
+
+        self.assertEqual(times, [300, 600])
+        self.assertEqual(columns["AveragePower"], [1, 2])
+        self.assertTrue(math.isnan(columns["PeakPower"][0]))
+        self.assertEqual(columns["PeakPower"][1], 5)
+
+    def test_handle_should_add_the_samples_to_the_buffer_of_the_resource(self):
+        added = self.consumer.handle(json.dumps(msmb_message()).encode())
+
+        times, values = self.consumer.get_series(SERVER_URI, "AveragePower")
+        self.assertEqual(added, 2)
+        self.assertEqual(list(times), [1525341600, 1525341900])
+        self.assertEqual(list(values), [200, 210])
+        self.assertEqual(self.consumer.get_buffer(SERVER_URI).percentile("AmbientTemperature", 50), 21.5)
+
+    def test_handle_should_ignore_the_samples_already_received(self):
+        self.consumer.handle(msmb_message())
+
+        added = self.consumer.handle(msmb_message(start='2018-05-03T10:05:00.000Z', power=(210, 220)))
+
+        self.assertEqual(added, 1)
+        self.assertEqual(list(self.consumer.get_series(SERVER_URI, "AveragePower")[1]), [200, 210, 220])
+
+    def test_should_drop_the_least_recently_updated_resource_beyond_max_resources(self):
+        consumer = MetricStreamConsumer(max_resources=2)
+
+        consumer.handle(msmb_message(uri='/rest/server-hardware/1'))
+        consumer.handle(msmb_message(uri='/rest/server-hardware/2'))
+        consumer.handle(msmb_message(uri='/rest/server-hardware/1', start='2018-05-03T11:00:00.000Z'))
+        consumer.handle(msmb_message(uri='/rest/server-hardware/3'))
+
+        self.assertEqual(consumer.get_uris(), ['/rest/server-hardware/1', '/rest/server-hardware/3'])
+        self.assertIsNone(consumer.get_buffer('/rest/server-hardware/2'))
+
+    def test_get_series_of_an_unknown_resource_should_be_empty(self):
+        times, values = self.consumer.get_series('/rest/server-hardware/9', "AveragePower")
+
+        self.assertEqual((len(times), len(values)), (0, 0))
+
+    def test_consume_should_count_the_messages_and_bytes(self):
+        self.consumer.consume([msmb_message(), b"not json"])
+
+        self.assertEqual(self.consumer.get_stats(),
+                         dict(messages=2, errors=1, samples=2, resources=1, nbytes=3 * 2 * 8))
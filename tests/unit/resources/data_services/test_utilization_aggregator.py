@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the 'Software'), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from unittest import TestCase
+
+import mock
+
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewValueError
+from hpOneView.resources.data_services.metric_buffers import MetricBuffer
+from hpOneView.resources.data_services.utilization_aggregator import SeriesCache, UtilizationAggregator, find_uris
+from hpOneView.resources.resource import ResourceClient
+
+DAY = 1525305600
+
+DOCUMENTS = {
+    '/rest/datacenters/dc1': {"uri": "/rest/datacenters/dc1",
+                              "contents": [{"resourceUri": "/rest/racks/r1"}, {"resourceUri": "/rest/racks/r2"}]},
+    '/rest/racks/r1/deviceTopology': {"uri": "/rest/racks/r1", "datacenterUri": "/rest/datacenters/dc1",
+                                      "children": [{"uri": "/rest/enclosures/e1"},
+                                                   {"uri": "/rest/server-hardware/s1"},
+                                                   {"uri": "/rest/power-devices/p1"}]},
+    '/rest/racks/r2/deviceTopology': {"uri": "/rest/racks/r2",
+                                      "children": [{"uri": "/rest/server-hardware/s2/firmware"}]},
+    '/rest/enclosures/e1': {"uri": "/rest/enclosures/e1", "enclosureGroupUri": "/rest/enclosure-groups/eg1",
+                            "deviceBays": [{"deviceUri": "/rest/server-hardware/b1"}, {"deviceUri": None}]},
+}
+
+
+def fake_series(values_by_uri):
+    """
+    Fakes get_utilization_series with 5 minute samples of AveragePower: the value of a server is constant.
+    """
+    def get_utilization_series(uri, fields=None, start=None, end=None, view=None, max_workers=None):
+        series = MetricBuffer(capacity=1000)
+        first = int(start // 300 + (1 if start % 300 else 0)) * 300
+        times = [float(sample_time) for sample_time in range(first, int(end) + 1, 300)]
+        series.extend(times, {fields: [values_by_uri[uri]] * len(times)})
+        return series
+    return get_utilization_series
+
+
+class UtilizationAggregatorTest(TestCase):
+    def setUp(self):
+        self.connection = connection('127.0.0.1', 300)
+        self.aggregator = UtilizationAggregator(self.connection, max_workers=2)
+
+    def test_find_uris(self):
+        uris = find_uris(DOCUMENTS['/rest/racks/r2/deviceTopology'])
+
+        self.assertEqual(uris, ['/rest/racks/r2', '/rest/server-hardware/s2'])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_members_should_expand_the_topology_down_to_the_servers(self, mock_get):
+        mock_get.side_effect = DOCUMENTS.get
+
+        members = self.aggregator.get_members('/rest/datacenters/dc1')
+
+        self.assertEqual(sorted(members), ['/rest/server-hardware/b1', '/rest/server-hardware/s1',
+                                           '/rest/server-hardware/s2'])
+        self.assertEqual(mock_get.call_count, 4)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_members_of_a_topology_should_not_expand_its_data_center(self, mock_get):
+        mock_get.side_effect = DOCUMENTS.get
+        aggregator = UtilizationAggregator(self.connection, categories=['enclosures', 'server-hardware'])
+
+        members = aggregator.get_members(DOCUMENTS['/rest/racks/r1/deviceTopology'])
+
+        self.assertEqual(members, ['/rest/enclosures/e1', '/rest/server-hardware/s1'])
+        mock_get.assert_not_called()
+
+    @mock.patch.object(ResourceClient, 'get_utilization_series')
+    @mock.patch.object(connection, 'get')
+    def test_aggregate_should_sum_and_take_the_maximum_by_bucket(self, mock_get, mock_get_utilization_series):
+        mock_get.side_effect = DOCUMENTS.get
+        mock_get_utilization_series.side_effect = fake_series({'/rest/server-hardware/s2': 100,
+                                                               '/rest/server-hardware/s3': 300})
+
+        rollup = self.aggregator.aggregate(['/rest/racks/r2', '/rest/server-hardware/s3'], 'AveragePower',
+                                           start=DAY, end=DAY + 7200 - 300, interval=3600)
+
+        self.assertEqual(list(rollup.times()), [DAY, DAY + 3600])
+        self.assertEqual(list(rollup.values('sum')), [400, 400])
+        self.assertEqual(list(rollup.values('max')), [300, 300])
+        self.assertEqual(list(rollup.values('count')), [2, 2])
+
+    @mock.patch.object(ResourceClient, 'get_utilization_series')
+    def test_aggregate_with_percentiles(self, mock_get_utilization_series):
+        uris = ['/rest/server-hardware/s%d' % index for index in range(1, 5)]
+        mock_get_utilization_series.side_effect = fake_series(dict(zip(uris, [100, 200, 300, 400])))
+
+        rollup = self.aggregator.aggregate(uris, 'AveragePower', start=DAY, end=DAY + 3300, interval=3600,
+                                           aggregates=('sum', 'max', 'mean', 'p50'))
+
+        self.assertEqual(list(rollup.values('sum')), [1000])
+        self.assertEqual(list(rollup.values('max')), [400])
+        self.assertEqual(list(rollup.values('mean')), [250])
+        self.assertEqual(list(rollup.values('p50')), [250])
+        self.assertEqual(list(rollup.values('count')), [4])
+
+    @mock.patch.object(ResourceClient, 'get_utilization_series')
+    def test_aggregate_should_only_request_the_spans_not_cached(self, mock_get_utilization_series):
+        mock_get_utilization_series.side_effect = fake_series({'/rest/server-hardware/s1': 100})
+
+        self.aggregator.aggregate('/rest/server-hardware/s1', 'AveragePower', start=DAY, end=DAY + 7200)
+        self.aggregator.aggregate('/rest/server-hardware/s1', 'AveragePower', start=DAY + 3600, end=DAY + 7200)
+        rollup = self.aggregator.aggregate('/rest/server-hardware/s1', 'AveragePower', start=DAY + 3600,
+                                           end=DAY + 10800)
+
+        self.assertEqual(mock_get_utilization_series.call_count, 2)
+        mock_get_utilization_series.assert_called_with('/rest/server-hardware/s1', fields='AveragePower',
+                                                       start=DAY + 7200, end=DAY + 10800, view=None, max_workers=1)
+        self.assertEqual(list(rollup.times()), [DAY + 3600, DAY + 7200, DAY + 10800])
+        self.assertEqual(list(rollup.values('count')), [1, 1, 1])
+        self.assertEqual(self.aggregator.get_cache_stats()['hits'], 1)
+
+    @mock.patch.object(ResourceClient, 'get_utilization_series')
+    def test_aggregate_should_not_cache_the_recent_samples(self, mock_get_utilization_series):
+        mock_get_utilization_series.side_effect = fake_series({'/rest/server-hardware/s1': 100})
+
+        with mock.patch('hpOneView.resources.data_services.utilization_aggregator.time') as mock_time:
+            mock_time.time.return_value = DAY + 3600
+            self.aggregator.aggregate('/rest/server-hardware/s1', 'AveragePower', start=DAY, interval=300)
+            rollup = self.aggregator.aggregate('/rest/server-hardware/s1', 'AveragePower', start=DAY, interval=300)
+
+        self.assertEqual(len(rollup), 13)
+        mock_get_utilization_series.assert_called_with('/rest/server-hardware/s1', fields='AveragePower',
+                                                       start=DAY + 2700, end=DAY + 3600, view=None, max_workers=1)
+
+    def test_aggregate_with_invalid_aggregate(self):
+        self.assertRaises(HPOneViewValueError, self.aggregator.aggregate, [], 'AveragePower', aggregates=['p101'])
+        self.assertRaises(HPOneViewValueError, self.aggregator.aggregate, [], 'AveragePower', aggregates=['median'])
+
+
+class SeriesCacheTest(TestCase):
+    def setUp(self):
+        self.cache = SeriesCache(max_size=2)
+        self.cache.put('s1', 0, 600, [0, 300, 600], [1, 2, 3])
+
+    def test_get_missing(self):
+        self.assertEqual(self.cache.get_missing('s1', 300, 600), [])
+        self.assertEqual(self.cache.get_missing('s1', -300, 900), [(-300, 0), (600, 900)])
+        self.assertEqual(self.cache.get_missing('s1', 1200, 1500), [(1200, 1500)])
+        self.assertEqual(self.cache.get_missing('s2', 0, 600), [(0, 600)])
+
+    def test_put_should_merge_the_overlapping_spans(self):
+        self.cache.put('s1', 600, 1200, [600, 900, 1200], [3, 4, 5])
+
+        times, values = self.cache.get('s1', 300, 900)
+
+        self.assertEqual(list(times), [300, 600, 900])
+        self.assertEqual(list(values), [2, 3, 4])
+        self.assertEqual(self.cache.get_missing('s1', 0, 1200), [])
+
+    def test_put_should_replace_a_disjoint_span(self):
+        self.cache.put('s1', 1200, 1500, [1200], [5])
+
+        self.assertEqual(self.cache.get_missing('s1', 0, 600), [(0, 600)])
+
+    def test_should_evict_the_least_recently_used_series(self):
+        self.cache.put('s2', 0, 600, [], [])
+        self.cache.get_missing('s1', 0, 600)
+        self.cache.put('s3', 0, 600, [], [])
+
+        self.assertEqual(self.cache.get_missing('s2', 0, 600), [(0, 600)])
+        self.assertEqual(self.cache.get_missing('s1', 0, 600), [])
+        self.assertEqual(len(self.cache), 2)
@@ -56,6 +56,15 @@ class PowerDevicesTest(TestCase):
 
         mock_get.assert_called_once_with('35323930-4936-4450-5531-303153474820', None, None, False, None)
 
+    @mock.patch.object(ResourceClient, 'get_utilization_series')
+    def test_get_utilization_series(self, mock_get_utilization_series):
+        self._power_devices.get_utilization_series(['09USE7335NW3', '09USE7335NW4'], fields='AveragePower',
+                                                   start='2016-05-30T03:29:42.361Z', view='hour')
+
+        mock_get_utilization_series.assert_called_once_with(['09USE7335NW3', '09USE7335NW4'], fields='AveragePower',
+                                                            start='2016-05-30T03:29:42.361Z', end=None, view='hour',
+                                                            refresh=False)
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all_called_once(self, mock_get_all):
         filter = 'name=TestName'
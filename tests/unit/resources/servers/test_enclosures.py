@@ -27,6 +27,7 @@ import mock
 
 from hpOneView.connection import connection
 from hpOneView.resources.servers.enclosures import Enclosures
+from hpOneView.resources.reference_loader import ReferenceLoader
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -74,6 +75,17 @@ class EnclosuresTest(TestCase):
 
         mock_get.assert_called_once_with('3518be0e-17c1-4189-8f81-83f3724f6155')
 
+    @mock.patch.object(ReferenceLoader, 'load')
+    @mock.patch.object(ResourceClient, 'get')
+    def test_get_with_references_called_once(self, mock_get, mock_load):
+        resource = {'uri': '/rest/fake/1'}
+        mock_get.return_value = resource
+
+        self._enclosures.get_with_references('1', depth=2)
+
+        mock_get.assert_called_once_with('1')
+        mock_load.assert_called_once_with([resource], 2)
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_with_uri_called_once(self, mock_get):
         uri = '/rest/enclosures/3518be0e-17c1-4189-8f81-83f3724f6155'
@@ -242,6 +254,15 @@ class EnclosuresTest(TestCase):
         mock_get.assert_called_once_with('/rest/enclosures/09USE7335NW3',
                                          fields=None, filter=None, refresh=False, view=None)
 
+    @mock.patch.object(ResourceClient, 'get_utilization_series')
+    def test_get_utilization_series(self, mock_get_utilization_series):
+        self._enclosures.get_utilization_series(['09USE7335NW3', '09USE7335NW4'], fields='AveragePower',
+                                                start='2016-05-30T03:29:42.361Z', view='hour')
+
+        mock_get_utilization_series.assert_called_once_with(['09USE7335NW3', '09USE7335NW4'], fields='AveragePower',
+                                                            start='2016-05-30T03:29:42.361Z', end=None, view='hour',
+                                                            refresh=False)
+
     @mock.patch.object(ResourceClient, 'create')
     def test_generate_csr(self, mock_create):
         bay_number = 1
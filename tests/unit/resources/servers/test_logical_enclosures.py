@@ -27,6 +27,7 @@ import mock
 
 from hpOneView.connection import connection
 from hpOneView.resources.servers.logical_enclosures import LogicalEnclosures
+from hpOneView.resources.reference_loader import ReferenceLoader
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -101,6 +102,17 @@ class LogicalEnclosuresTest(TestCase):
 
         mock_get.assert_called_once_with(logical_enclosure_id)
 
+    @mock.patch.object(ReferenceLoader, 'load')
+    @mock.patch.object(ResourceClient, 'get')
+    def test_get_with_references_called_once(self, mock_get, mock_load):
+        resource = {'uri': '/rest/fake/1'}
+        mock_get.return_value = resource
+
+        self._logical_enclosures.get_with_references('1', depth=2)
+
+        mock_get.assert_called_once_with('1')
+        mock_load.assert_called_once_with([resource], 2)
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_with_uri_called_once(self, mock_get):
         logical_enclosure_uri = '/rest/enclosures/3518be0e-17c1-4189-8f81-83f3724f6155'
@@ -53,6 +53,15 @@ class ServerHardwareTest(TestCase):
         mock_get.assert_called_once_with(
             '09USE7335NW3', fields=None, filter=None, refresh=False, view=None)
 
+    @mock.patch.object(ResourceClient, 'get_utilization_series')
+    def test_get_utilization_series(self, mock_get_utilization_series):
+        self._server_hardware.get_utilization_series(['09USE7335NW3', '09USE7335NW4'], fields='AveragePower',
+                                                     start='2016-05-30T03:29:42.361Z', view='hour')
+
+        mock_get_utilization_series.assert_called_once_with(['09USE7335NW3', '09USE7335NW4'], fields='AveragePower',
+                                                            start='2016-05-30T03:29:42.361Z', end=None, view='hour',
+                                                            refresh=False)
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all_called_once(self, mock_get_all):
         filter = 'name=TestName'
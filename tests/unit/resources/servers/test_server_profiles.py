@@ -26,6 +26,7 @@ from unittest import TestCase
 import mock
 
 from hpOneView.connection import connection
+from hpOneView.resources.reference_loader import ReferenceLoader
 from hpOneView.resources.resource import ResourceClient
 from hpOneView.resources.servers.server_profiles import ServerProfiles
 
@@ -53,6 +54,17 @@ class ServerProfilesTest(TestCase):
         self._resource.get(id)
         mock_get.assert_called_once_with(id_or_uri=id)
 
+    @mock.patch.object(ReferenceLoader, 'load')
+    @mock.patch.object(ResourceClient, 'get')
+    def test_get_with_references_called_once(self, mock_get, mock_load):
+        resource = {'uri': '/rest/fake/1'}
+        mock_get.return_value = resource
+
+        self._resource.get_with_references('1', depth=2)
+
+        mock_get.assert_called_once_with('1')
+        mock_load.assert_called_once_with([resource], 2)
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_property(self, mock_get_by):
         profile_property = "name"
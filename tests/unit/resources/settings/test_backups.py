@@ -71,7 +71,7 @@ class BackupsTest(TestCase):
 
         self._client.download(download_uri, destination)
 
-        mock_download.assert_called_once_with('/rest/backups/archive/appliance_backup_2017-04-20_182809', destination)
+        mock_download.assert_called_once_with('/rest/backups/archive/appliance_backup_2017-04-20_182809', destination, parts=1, checksum=None)
 
     @mock.patch.object(ResourceClient, 'upload')
     def test_upload_artifact_bundle_called_once(self, mock_upload):
@@ -79,7 +79,7 @@ class BackupsTest(TestCase):
 
         self._client.upload(filepath)
 
-        mock_upload.assert_called_once_with(filepath)
+        mock_upload.assert_called_once_with(filepath, progress=None)
 
     @mock.patch.object(ResourceClient, 'get')
     def test_get_config_called_once(self, mock_get):
@@ -27,6 +27,7 @@ import mock
 
 from hpOneView.connection import connection
 from hpOneView.resources.settings.firmware_bundles import FirmwareBundles
+from hpOneView.resources.settings.firmware_drivers import FirmwareDrivers
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -42,4 +43,41 @@ class FirmwareBundlesTest(unittest.TestCase):
 
         self._firmware_bundles.upload(firmware_path)
 
-        mock_upload.assert_called_once_with(firmware_path, timeout=-1)
+        mock_upload.assert_called_once_with(firmware_path, timeout=-1, progress=None)
+
+    @mock.patch.object(ResourceClient, 'upload')
+    @mock.patch.object(FirmwareDrivers, 'get_all')
+    @mock.patch('hpOneView.resources.settings.firmware_bundles.file_checksum')
+    def test_upload_should_skip_when_checksum_exists(self, mock_checksum, mock_get_all, mock_upload):
+        driver = {'name': 'SPP', 'checksum': 'ABC123'}
+        mock_checksum.return_value = 'abc123'
+        mock_get_all.return_value = [{'name': 'Other', 'checksum': 'def456'}, driver]
+
+        result = self._firmware_bundles.upload("test/SPPgen9snap6.2015_0405.81.iso", skip_existing=True)
+
+        self.assertEqual(result, driver)
+        mock_checksum.assert_called_once_with("test/SPPgen9snap6.2015_0405.81.iso", 'sha256')
+        mock_upload.assert_not_called()
+
+    @mock.patch.object(ResourceClient, 'upload')
+    @mock.patch.object(FirmwareDrivers, 'get_all')
+    @mock.patch('hpOneView.resources.settings.firmware_bundles.file_checksum')
+    def test_upload_should_upload_when_checksum_is_not_found(self, mock_checksum, mock_get_all, mock_upload):
+        mock_checksum.return_value = 'abc123'
+        mock_get_all.return_value = [{'name': 'Other', 'checksum': 'def456'}, {'name': 'No checksum'}]
+        progress = mock.Mock()
+
+        self._firmware_bundles.upload("test/SPPgen9snap6.2015_0405.81.iso", skip_existing=True, progress=progress)
+
+        mock_upload.assert_called_once_with("test/SPPgen9snap6.2015_0405.81.iso", timeout=-1, progress=progress)
+
+    @mock.patch.object(ResourceClient, 'upload')
+    @mock.patch.object(FirmwareDrivers, 'get_all')
+    @mock.patch('hpOneView.resources.settings.firmware_bundles.file_checksum')
+    def test_upload_should_not_hash_when_no_driver_has_a_checksum(self, mock_checksum, mock_get_all, mock_upload):
+        mock_get_all.return_value = [{'name': 'No checksum'}, {'name': 'Empty checksum', 'checksum': ''}]
+
+        self._firmware_bundles.upload("test/SPPgen9snap6.2015_0405.81.iso", skip_existing=True)
+
+        mock_checksum.assert_not_called()
+        mock_upload.assert_called_once_with("test/SPPgen9snap6.2015_0405.81.iso", timeout=-1, progress=None)
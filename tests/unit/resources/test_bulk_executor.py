@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import unittest
+
+import mock
+
+from concurrent.futures import Future
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException, HPOneViewTaskError
+from hpOneView.resources.bulk_executor import BulkExecutor, RateLimiter
+from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.resources.task_watcher import TaskWatcher
+
+
+def completed_future(result=None, error=None):
+    future = Future()
+    if error:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+class BulkExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = connection('127.0.0.1', 300)
+
+    def __submit(self, item):
+        if item.get('error'):
+            raise HPOneViewException(item['error'])
+        if item.get('task'):
+            return {'uri': '/rest/tasks/' + item['name']}, None
+        return None, {'name': item['name'], 'sync': True}
+
+    @mock.patch.object(TaskWatcher, 'watch')
+    def test_run_should_return_the_results_in_order(self, mock_watch):
+        mock_watch.side_effect = lambda task, timeout: completed_future({'name': task['uri'].rsplit('/', 1)[1]})
+        items = [{'name': 'a', 'task': True}, {'name': 'b'}, {'name': 'c', 'task': True}]
+
+        result = BulkExecutor(self.connection, max_workers=3).run(items, self.__submit, timeout=60)
+
+        self.assertEqual([item.result for item in result.items],
+                         [{'name': 'a'}, {'name': 'b', 'sync': True}, {'name': 'c'}])
+        self.assertEqual(len(result.succeeded), 3)
+        self.assertEqual(result.failed, [])
+        mock_watch.assert_has_calls([mock.call({'uri': '/rest/tasks/a'}, 60)])
+
+    @mock.patch.object(TaskWatcher, 'watch')
+    def test_run_should_keep_failures_apart(self, mock_watch):
+        task_error = HPOneViewTaskError('Task failed')
+        mock_watch.return_value = completed_future(error=task_error)
+        items = [{'name': 'a'}, {'name': 'b', 'error': 'Bad request'}, {'name': 'c', 'task': True}]
+
+        result = BulkExecutor(self.connection).run(items, self.__submit)
+
+        self.assertEqual([item.item['name'] for item in result.succeeded], ['a'])
+        self.assertEqual([item.item['name'] for item in result.failed], ['b', 'c'])
+        self.assertEqual(result.failed[0].error.msg, 'Bad request')
+        self.assertIs(result.failed[1].error, task_error)
+        self.assertEqual(result.skipped, [])
+
+    @mock.patch.object(TaskWatcher, 'watch')
+    def test_run_should_skip_the_remaining_items_when_failing_fast(self, mock_watch):
+        items = [{'name': 'a'}, {'name': 'b', 'error': 'Bad request'}, {'name': 'c'}, {'name': 'd'}]
+
+        result = BulkExecutor(self.connection, max_workers=1, fail_fast=True).run(items, self.__submit)
+
+        self.assertEqual([item.item['name'] for item in result.succeeded], ['a'])
+        self.assertEqual([item.item['name'] for item in result.failed], ['b'])
+        self.assertEqual([item.item['name'] for item in result.skipped], ['c', 'd'])
+        self.assertIsInstance(result.skipped[0].error, HPOneViewException)
+
+    @mock.patch.object(TaskWatcher, 'watch')
+    def test_run_should_stop_submitting_when_a_task_fails_and_failing_fast(self, mock_watch):
+        mock_watch.return_value = completed_future(error=HPOneViewTaskError('Task failed'))
+        items = [{'name': 'a', 'task': True}, {'name': 'b'}]
+
+        result = BulkExecutor(self.connection, max_workers=1, fail_fast=True).run(items, self.__submit)
+
+        self.assertEqual(len(result.failed), 1)
+        self.assertEqual([item.item['name'] for item in result.skipped], ['b'])
+
+    def test_run_should_return_empty_result_without_items(self):
+        result = BulkExecutor(self.connection).run([], self.__submit)
+
+        self.assertEqual(len(result), 0)
+
+    @mock.patch.object(RateLimiter, 'acquire')
+    def test_run_should_acquire_the_rate_limiter_for_each_request(self, mock_acquire):
+        items = [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}]
+
+        BulkExecutor(self.connection, rate_limit=10).run(items, self.__submit)
+
+        self.assertEqual(mock_acquire.call_count, 3)
+
+
+class RateLimiterTest(unittest.TestCase):
+    @mock.patch('time.sleep')
+    @mock.patch.object(TaskMonitor, 'get_current_seconds')
+    def test_acquire_should_space_out_the_requests(self, mock_seconds, mock_sleep):
+        mock_seconds.return_value = 100.0
+        limiter = RateLimiter(4)
+
+        limiter.acquire()
+        limiter.acquire()
+        limiter.acquire()
+
+        mock_sleep.assert_has_calls([mock.call(0.25), mock.call(0.5)])
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(TaskMonitor, 'get_current_seconds')
+    def test_acquire_should_not_wait_after_an_idle_period(self, mock_seconds, mock_sleep):
+        mock_seconds.side_effect = [100.0, 105.0]
+        limiter = RateLimiter(4)
+
+        limiter.acquire()
+        limiter.acquire()
+
+        mock_sleep.assert_not_called()
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import hashlib
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+import mock
+
+from errno import ECONNRESET
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException, HPOneViewValueError
+from hpOneView.resources import download_manager
+from hpOneView.resources.download_manager import DownloadManager, split_range
+
+CONTENT = bytes(bytearray(i % 251 for i in range(1000)))
+
+
+class FakeAppliance(object):
+    """
+    Serves CONTENT to download_range, optionally ignoring the Range header, hiding the total size, failing once in
+    the middle of a range or ending responses after half of their range: the first one of each range, or all of them.
+    """
+
+    def __init__(self, ranges=True, fail_at=None, total=len(CONTENT), short=None):
+        self.ranges = ranges
+        self.fail_at = fail_at
+        self.total = total
+        self.short = short
+        self.short_ranges = set()
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def download_range(self, stream_writer, url, start, end):
+        with self.lock:
+            self.requests.append((start, end))
+        if not self.ranges:
+            stream_writer.write(CONTENT)
+            return 200, len(CONTENT)
+
+        data = CONTENT[start:end + 1]
+        if self.fail_at is not None and start < self.fail_at <= end:
+            fail_at, self.fail_at = self.fail_at, None
+            stream_writer.write(data[:fail_at - start])
+            raise socket.error(ECONNRESET, 'Connection reset')
+        with self.lock:
+            short = self.short == 'always' or (self.short == 'once' and end not in self.short_ranges)
+            self.short_ranges.add(end)
+        stream_writer.write(data[:len(data) // 2] if short else data)
+        return 206, self.total
+
+    def download_to_stream(self, stream_writer, url):
+        with self.lock:
+            self.requests.append(None)
+        stream_writer.write(CONTENT)
+        return True
+
+
+@unittest.skipIf(not download_manager.PARALLEL_DOWNLOAD_SUPPORTED, 'os.pwrite is not available')
+class DownloadManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = connection('127.0.0.1', 300)
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'backup.bkp')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def __download(self, appliance, **kwargs):
+        manager = DownloadManager(self.connection, parts=4, min_part_size=100)
+        with mock.patch.object(connection, 'download_range', side_effect=appliance.download_range), \
+                mock.patch.object(connection, 'download_to_stream', side_effect=appliance.download_to_stream):
+            result = manager.download('/rest/backups/archive/backup', self.file_path, **kwargs)
+        with open(self.file_path, 'rb') as downloaded:
+            return result, downloaded.read()
+
+    def test_download_should_request_the_ranges_in_parallel(self):
+        appliance = FakeAppliance()
+
+        result, content = self.__download(appliance)
+
+        self.assertTrue(result)
+        self.assertEqual(content, CONTENT)
+        self.assertEqual(sorted(appliance.requests), [(0, 99), (100, 324), (325, 549), (550, 774), (775, 999)])
+
+    def test_download_should_write_the_whole_content_when_range_is_ignored(self):
+        appliance = FakeAppliance(ranges=False)
+
+        result, content = self.__download(appliance)
+
+        self.assertEqual(content, CONTENT)
+        self.assertEqual(appliance.requests, [(0, 99)])
+
+    def test_download_should_stream_the_whole_content_when_the_total_size_is_unknown(self):
+        appliance = FakeAppliance(total=None)
+
+        result, content = self.__download(appliance)
+
+        self.assertEqual(content, CONTENT)
+        self.assertEqual(appliance.requests, [(0, 99), None])
+
+    @mock.patch('time.sleep')
+    def test_download_should_resume_an_interrupted_range(self, mock_sleep):
+        appliance = FakeAppliance(fail_at=400)
+
+        result, content = self.__download(appliance)
+
+        self.assertEqual(content, CONTENT)
+        self.assertIn((400, 549), appliance.requests)
+
+    @mock.patch('time.sleep')
+    def test_download_should_resume_the_ranges_ended_early(self, mock_sleep):
+        appliance = FakeAppliance(short='once')
+
+        result, content = self.__download(appliance)
+
+        self.assertTrue(result)
+        self.assertEqual(content, CONTENT)
+        self.assertEqual(len(appliance.requests), 10)
+
+    @mock.patch('time.sleep')
+    def test_download_should_raise_when_the_ranges_keep_ending_early(self, mock_sleep):
+        self.assertRaises(HPOneViewException, self.__download, FakeAppliance(short='always'))
+
+    def test_download_should_verify_the_checksum(self):
+        result, content = self.__download(FakeAppliance(), checksum=hashlib.sha256(CONTENT).hexdigest().upper())
+
+        self.assertTrue(result)
+
+    def test_download_should_raise_when_the_checksum_does_not_match(self):
+        self.assertRaises(HPOneViewValueError, self.__download, FakeAppliance(), checksum='0' * 64)
+
+    @mock.patch.object(connection, 'download_to_stream')
+    def test_download_should_stream_when_there_is_a_single_part(self, mock_download_to_stream):
+        manager = DownloadManager(self.connection, parts=1)
+
+        manager.download('/rest/backups/archive/backup', self.file_path)
+
+        mock_download_to_stream.assert_called_once_with(mock.ANY, '/rest/backups/archive/backup')
+
+
+class SplitRangeTest(unittest.TestCase):
+    def test_split_range(self):
+        self.assertEqual(split_range(100, 1000, 3, 100), [(100, 399), (400, 699), (700, 999)])
+
+    def test_split_range_should_respect_the_min_part_size(self):
+        self.assertEqual(split_range(0, 250, 8, 100), [(0, 124), (125, 249)])
+
+    def test_split_range_should_return_one_range_for_small_content(self):
+        self.assertEqual(split_range(0, 50, 4, 100), [(0, 49)])
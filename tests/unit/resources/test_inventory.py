@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import unittest
+
+import mock
+
+from hpOneView.resources.inventory import InventorySnapshot
+
+SERVERS = [
+    {"uri": "/rest/server-hardware/1", "name": "Encl1, bay 1", "serialNumber": "SN01", "mpHostInfo": "ilo-1"},
+    {"uri": "/rest/server-hardware/2", "name": "Encl1, bay 2", "serialNumber": "SN02", "mpHostInfo": "ilo-2"},
+    {"uri": "/rest/server-hardware/3", "name": "encl1, BAY 1", "serialNumber": "SN03"},
+]
+
+
+class InventorySnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.load = mock.Mock(return_value=[dict(server) for server in SERVERS])
+        self.snapshot = InventorySnapshot("/rest/server-hardware", self.load, indexes=["mpHostInfo"])
+
+    def test_should_index_the_default_fields_and_the_given_ones(self):
+        self.assertEqual(self.snapshot.fields, ("name", "uri", "serialNumber", "macAddress", "wwn", "mpHostInfo"))
+        self.assertTrue(self.snapshot.is_indexed("mpHostInfo"))
+        self.assertFalse(self.snapshot.is_indexed("model"))
+
+    def test_should_load_once_on_the_first_lookup(self):
+        self.assertEqual(len(self.snapshot), 0)
+        self.assertIsNone(self.snapshot.age)
+
+        self.snapshot.get_by("serialNumber", "SN01")
+        self.snapshot.get_by("mpHostInfo", "ilo-2")
+
+        self.load.assert_called_once_with()
+        self.assertEqual(self.snapshot.get_stats()["loads"], 1)
+        self.assertEqual(self.snapshot.get_stats()["hits"], 2)
+        self.assertEqual(len(self.snapshot), 3)
+
+    def test_get_by_should_ignore_the_case_and_keep_the_collection_order(self):
+        result = self.snapshot.get_by("name", "ENCL1, bay 1")
+
+        self.assertEqual([server["uri"] for server in result], ["/rest/server-hardware/1", "/rest/server-hardware/3"])
+
+    def test_get_by_should_return_copies(self):
+        self.snapshot.get_by("serialNumber", "SN01")[0]["name"] = "changed"
+
+        self.assertEqual(self.snapshot.get_by("serialNumber", "SN01")[0]["name"], "Encl1, bay 1")
+
+    def test_get_by_should_return_an_empty_list_when_nothing_matches(self):
+        self.assertEqual(self.snapshot.get_by("wwn", "10:00:00"), [])
+
+    @mock.patch('hpOneView.resources.inventory.time')
+    def test_should_load_again_when_older_than_max_age(self, mock_time):
+        mock_time.time.return_value = 1000
+        self.snapshot.get_by("serialNumber", "SN01")
+        mock_time.time.return_value = 1000 + self.snapshot.max_age
+        self.snapshot.get_by("serialNumber", "SN01")
+        self.assertEqual(self.load.call_count, 1)
+
+        mock_time.time.return_value = 1001 + self.snapshot.max_age
+        self.snapshot.get_by("serialNumber", "SN01")
+
+        self.assertEqual(self.load.call_count, 2)
+
+    @mock.patch('hpOneView.resources.inventory.time')
+    def test_should_not_expire_without_max_age(self, mock_time):
+        snapshot = InventorySnapshot("/rest/server-hardware", self.load, max_age=None)
+        mock_time.time.return_value = 1000
+        snapshot.get_by("name", "x")
+        mock_time.time.return_value = 10 ** 9
+
+        self.assertFalse(snapshot.is_stale())
+
+    def test_invalidate_should_load_again_on_the_next_lookup(self):
+        self.snapshot.get_by("name", "x")
+        self.snapshot.invalidate()
+        self.snapshot.get_by("name", "x")
+
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_put_should_replace_the_indexed_values(self):
+        self.snapshot.refresh()
+
+        self.snapshot.put({"uri": "/rest/server-hardware/1", "name": "renamed", "serialNumber": "SN01"})
+
+        self.assertEqual(self.snapshot.get_by("name", "Encl1, bay 1")[0]["uri"], "/rest/server-hardware/3")
+        self.assertEqual(self.snapshot.get_by("name", "renamed")[0]["uri"], "/rest/server-hardware/1")
+        self.assertEqual(self.snapshot.get_by("mpHostInfo", "ilo-1"), [])
+
+    def test_put_should_add_a_new_resource(self):
+        self.snapshot.refresh()
+
+        self.snapshot.put({"uri": "/rest/server-hardware/4", "name": "new"})
+
+        self.assertEqual(len(self.snapshot), 4)
+        self.assertEqual(self.snapshot.get_by("uri", "/rest/server-hardware/4")[0]["name"], "new")
+
+    def test_put_and_remove_should_be_ignored_before_the_first_load(self):
+        self.snapshot.put({"uri": "/rest/server-hardware/4", "name": "new"})
+        self.snapshot.remove("/rest/server-hardware/1")
+
+        self.assertEqual(len(self.snapshot), 0)
+
+    def test_remove_should_drop_the_resource_from_the_indexes(self):
+        self.snapshot.refresh()
+
+        self.snapshot.remove("/rest/server-hardware/2")
+
+        self.assertEqual(self.snapshot.get_by("serialNumber", "SN02"), [])
+        self.assertEqual(self.snapshot.get_by("mpHostInfo", "ilo-2"), [])
+        self.assertEqual(len(self.snapshot), 2)
+
+    def test_add_index_should_index_the_loaded_resources(self):
+        self.snapshot.refresh()
+
+        self.snapshot.add_index("model")
+        self.snapshot.put({"uri": "/rest/server-hardware/4", "model": "SY 480 Gen9"})
+
+        self.assertEqual(self.snapshot.get_by("model", "sy 480 gen9")[0]["uri"], "/rest/server-hardware/4")
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import socket
+import threading
+import unittest
+
+import mock
+
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.resources.message_bus import AmqpMessageSource, MessageConsumer, MSMB_EXCHANGE
+
+
+class DelayedSource(AmqpMessageSource):
+    """
+    Opens only once closed, as a source stopped before its consuming thread got to open it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(DelayedSource, self).__init__(*args, **kwargs)
+        self.closing = threading.Event()
+
+    def open(self):
+        self.closing.wait(5)
+        super(DelayedSource, self).open()
+
+    def close(self):
+        super(DelayedSource, self).close()
+        self.closing.set()
+
+
+class AmqpMessageSourceTest(unittest.TestCase):
+    @mock.patch('hpOneView.resources.message_bus.amqp')
+    def test_should_bind_the_routing_keys_and_yield_the_message_bodies(self, mock_amqp):
+        amqp_connection = mock_amqp.Connection.return_value
+        channel = amqp_connection.channel.return_value
+        channel.queue_declare.return_value = ("queue", 0, 0)
+        source = AmqpMessageSource("10.0.0.1", routing_keys=["scmb.server-hardware.#", "scmb.enclosures.#"])
+
+        def drain_events(timeout):
+            callback = channel.basic_consume.call_args[1]["callback"]
+            if amqp_connection.drain_events.call_count == 1:
+                callback(mock.Mock(body=b"message"))
+            else:
+                raise socket.timeout()
+
+        amqp_connection.drain_events.side_effect = drain_events
+
+        for body in source:
+            self.assertEqual(body, b"message")
+            source.close()
+
+        mock_amqp.Connection.assert_called_once_with("10.0.0.1:5671", login_method="EXTERNAL", ssl=mock.ANY)
+        channel.queue_bind.assert_has_calls([mock.call("queue", "scmb", "scmb.server-hardware.#"),
+                                             mock.call("queue", "scmb", "scmb.enclosures.#")])
+        amqp_connection.close.assert_called_once_with()
+
+    @mock.patch('hpOneView.resources.message_bus.amqp', None)
+    def test_open_should_fail_without_the_amqp_package(self):
+        self.assertRaises(HPOneViewException, AmqpMessageSource("10.0.0.1").open)
+
+    @mock.patch('hpOneView.resources.message_bus.amqp')
+    def test_should_bind_all_the_messages_of_the_exchange_by_default(self, mock_amqp):
+        channel = mock_amqp.Connection.return_value.channel.return_value
+        channel.queue_declare.return_value = ("queue", 0, 0)
+
+        AmqpMessageSource("10.0.0.1", exchange=MSMB_EXCHANGE).open()
+
+        channel.queue_bind.assert_called_once_with("queue", "msmb", "msmb.#")
+
+    @mock.patch('hpOneView.resources.message_bus.amqp')
+    def test_should_not_connect_when_closed_before_being_opened(self, mock_amqp):
+        source = AmqpMessageSource("10.0.0.1")
+        source.close()
+
+        self.assertEqual(list(source), [])
+        mock_amqp.Connection.assert_not_called()
+
+    @mock.patch('hpOneView.resources.message_bus.amqp')
+    def test_consumer_stopped_right_after_start_should_finish(self, mock_amqp):
+        mock_amqp.Connection.return_value.channel.return_value.queue_declare.return_value = ("queue", 0, 0)
+        mock_amqp.Connection.return_value.drain_events.side_effect = socket.timeout()
+        consumer = MessageConsumer()
+
+        thread = consumer.start(DelayedSource("10.0.0.1", wait=0.01))
+        consumer.stop(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        mock_amqp.Connection.assert_not_called()
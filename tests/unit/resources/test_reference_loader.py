@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import unittest
+
+import mock
+
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.resources.reference_loader import ReferenceLoader, get_references
+from hpOneView.resources.resource import ResourceClient
+
+PROFILE = {
+    'uri': '/rest/server-profiles/1',
+    'serverHardwareUri': '/rest/server-hardware/1',
+    'enclosureGroupUri': '/rest/enclosure-groups/1',
+    'firmware': {'firmwareBaselineUri': None},
+    'connections': [{'networkUri': '/rest/ethernet-networks/1'}, {'networkUri': '/rest/ethernet-networks/2'}],
+    'sanStorage': {'volumeAttachments': [{'volumeUri': '/rest/storage-volumes/1'}]},
+    'initialScopeUris': ['/rest/scopes/1'],
+    'taskUri': 'not a rest resource',
+}
+
+
+class GetReferencesTest(unittest.TestCase):
+    def test_get_references_should_find_uris_at_any_level(self):
+        self.assertEqual(sorted(get_references(PROFILE)), ['/rest/enclosure-groups/1', '/rest/ethernet-networks/1',
+                                                           '/rest/ethernet-networks/2', '/rest/scopes/1',
+                                                           '/rest/server-hardware/1', '/rest/storage-volumes/1'])
+
+    def test_get_references_should_ignore_resource_uri(self):
+        self.assertEqual(get_references({'uri': '/rest/fake/1', 'name': 'name'}), [])
+
+    def test_get_references_should_ignore_tasks_downloads_and_queries(self):
+        backup = {'uri': '/rest/backups/1',
+                  'taskUri': '/rest/tasks/1',
+                  'associatedTaskUri': '/rest/tasks/2',
+                  'downloadUri': '/rest/backups/archive/1',
+                  'parentUri': '/rest/tasks/3',
+                  'utilizationUri': '/rest/server-hardware/1/utilization?fields=CpuUtilization',
+                  'childTaskUris': ['/rest/tasks/4'],
+                  'scopeUris': ['/rest/scopes/1', '/rest/scopes?filter=name']}
+
+        self.assertEqual(get_references(backup), ['/rest/scopes/1'])
+
+
+class ReferenceLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = connection('127.0.0.1')
+        self.loader = ReferenceLoader(self.connection)
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    def test_load_should_get_each_level_with_one_call(self, mock_get_many):
+        hardware = {'uri': '/rest/server-hardware/1', 'serverHardwareTypeUri': '/rest/server-hardware-types/1',
+                    'serverProfileUri': '/rest/server-profiles/1'}
+        hardware_type = {'uri': '/rest/server-hardware-types/1'}
+        mock_get_many.side_effect = [{hardware['uri']: hardware}, {hardware_type['uri']: hardware_type}]
+        profile = {'uri': '/rest/server-profiles/1', 'serverHardwareUri': hardware['uri']}
+
+        result = self.loader.load([profile], depth=2)
+
+        self.assertEqual(result, {profile['uri']: profile, hardware['uri']: hardware,
+                                  hardware_type['uri']: hardware_type})
+        self.assertEqual(mock_get_many.call_args_list, [mock.call([hardware['uri']], skip_errors=True),
+                                                        mock.call([hardware_type['uri']], skip_errors=True)])
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    def test_load_should_get_shared_references_once(self, mock_get_many):
+        profiles = [{'uri': '/rest/server-profiles/{0}'.format(i), 'enclosureGroupUri': '/rest/enclosure-groups/1'}
+                    for i in range(3)]
+        mock_get_many.return_value = {'/rest/enclosure-groups/1': {'uri': '/rest/enclosure-groups/1'}}
+
+        result = self.loader.load(profiles)
+
+        self.assertEqual(len(result), 4)
+        mock_get_many.assert_called_once_with(['/rest/enclosure-groups/1'] * 3, skip_errors=True)
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    def test_load_with_depth_0_should_return_given_resources(self, mock_get_many):
+        result = self.loader.load([PROFILE], depth=0)
+
+        self.assertEqual(result, {PROFILE['uri']: PROFILE})
+        mock_get_many.assert_not_called()
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch.object(ResourceClient, 'get_many')
+    def test_load_should_skip_references_that_could_not_be_retrieved(self, mock_get_many, mock_get):
+        mock_get_many.return_value = {'/rest/enclosure-groups/1': {'uri': '/rest/enclosure-groups/1'}}
+        mock_get.side_effect = HPOneViewException('Not found')
+
+        result = self.loader.load([{'uri': '/rest/server-profiles/1', 'serverHardwareUri': '/rest/server-hardware/1',
+                                    'enclosureGroupUri': '/rest/enclosure-groups/1'}])
+
+        mock_get_many.assert_called_once_with(['/rest/server-hardware/1', '/rest/enclosure-groups/1'], skip_errors=True)
+        mock_get.assert_called_once_with('/rest/server-hardware/1')
+        self.assertEqual(sorted(result), ['/rest/enclosure-groups/1', '/rest/server-profiles/1'])
@@ -20,15 +20,22 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 ###
+import datetime
 import io
 import unittest
+import socket
 import mock
 
+from concurrent.futures import Future
+from errno import ECONNRESET
 from mock import call
 from tests.test_utils import mock_builtin
 
 from hpOneView.connection import connection
+from hpOneView.resources.data_services.metric_buffers import format_timestamp, parse_timestamp
 from hpOneView.exceptions import HPOneViewUnknownType, HPOneViewException, HPOneViewValueError
+from hpOneView.resources.download_manager import DownloadManager
+from hpOneView.resources.task_watcher import TaskWatcher
 from hpOneView.resources.resource import merge_resources, merge_default_values
 from hpOneView.resources.resource import ResourceClient, RESOURCE_CLIENT_INVALID_ID, UNRECOGNIZED_URI, TaskMonitor, \
     RESOURCE_CLIENT_TASK_EXPECTED, RESOURCE_ID_OR_URI_REQUIRED, transform_list_to_dict, extract_id_from_uri
@@ -68,6 +75,28 @@ class FakeResource(object):
         return self._client.get(uri)
 
 
+def fake_utilization(times, slice_size):
+    """
+    Fakes the appliance utilization API over 5 minute samples at the given times (in seconds), returning at most
+    slice_size samples per response, newest first, like the appliance.
+    """
+    def get_utilization(id_or_uri, fields=None, filter=None, refresh=False, view=None):
+        dates = dict(item.split('=') for item in filter)
+        end = parse_timestamp(dates['endDate']) if 'endDate' in dates else times[-1]
+        start = parse_timestamp(dates['startDate']) if 'startDate' in dates else end - 24 * 3600
+        selected = [time for time in times if start <= time <= end][-slice_size:]
+        slice_start = selected[0] if selected else end
+        return {"sliceStartTime": format_timestamp(slice_start),
+                "sliceEndTime": format_timestamp(end),
+                "oldestSampleTime": format_timestamp(times[0]),
+                "newestSampleTime": format_timestamp(times[-1]),
+                "metricList": [{"metricName": "AveragePower",
+                                "metricSamples": [[time * 1000, time // 300] for time in reversed(selected)]},
+                               {"metricName": "PeakPower",
+                                "metricSamples": [[time * 1000, None] for time in reversed(selected)]}]}
+    return get_utilization
+
+
 class ResourceClientTest(unittest.TestCase):
     URI = "/rest/testuri"
 
@@ -263,6 +292,189 @@ class ResourceClientTest(unittest.TestCase):
 
         self.assertEqual(result, [])
 
+    @mock.patch.object(connection, 'get')
+    def test_get_all_should_request_remaining_pages_from_total(self, mock_get):
+        responses = {
+            '/rest/testuri?start=0&count=-1': {'nextPageUri': '/rest/testuri?start=2&count=2', 'total': 7,
+                                               'members': [{'id': '1'}, {'id': '2'}]},
+            '/rest/testuri?start=2&count=2': {'members': [{'id': '3'}, {'id': '4'}]},
+            '/rest/testuri?start=4&count=2': {'members': [{'id': '5'}, {'id': '6'}]},
+            '/rest/testuri?start=6&count=1': {'members': [{'id': '7'}]}}
+        mock_get.side_effect = lambda uri: responses[uri]
+
+        result = self.resource_client.get_all()
+
+        expected_items = [{'id': '1'}, {'id': '2'}, {'id': '3'}, {'id': '4'}, {'id': '5'}, {'id': '6'}, {'id': '7'}]
+        self.assertEqual(result, expected_items)
+        self.assertEqual(mock_get.call_count, 4)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_should_request_remaining_pages_with_configured_page_size(self, mock_get):
+        self.connection.set_pagination(page_size=3)
+        responses = {
+            '/rest/testuri?start=0&count=-1': {'nextPageUri': '/rest/testuri?start=2&count=2', 'total': 5,
+                                               'members': [{'id': '1'}, {'id': '2'}]},
+            '/rest/testuri?start=2&count=3': {'members': [{'id': '3'}, {'id': '4'}, {'id': '5'}]}}
+        mock_get.side_effect = lambda uri: responses[uri]
+
+        result = self.resource_client.get_all()
+
+        self.assertEqual(result, [{'id': '1'}, {'id': '2'}, {'id': '3'}, {'id': '4'}, {'id': '5'}])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_should_limit_remaining_pages_to_requested_count(self, mock_get):
+        responses = {
+            '/rest/testuri?start=10&count=5': {'nextPageUri': '/rest/testuri?start=12&count=2', 'total': 100,
+                                               'members': [{'id': '11'}, {'id': '12'}]},
+            '/rest/testuri?start=12&count=2': {'members': [{'id': '13'}, {'id': '14'}]},
+            '/rest/testuri?start=14&count=1': {'members': [{'id': '15'}]}}
+        mock_get.side_effect = lambda uri: responses[uri]
+
+        result = self.resource_client.get_all(start=10, count=5)
+
+        self.assertEqual(result, [{'id': '11'}, {'id': '12'}, {'id': '13'}, {'id': '14'}, {'id': '15'}])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_should_complete_pages_shorter_than_requested(self, mock_get):
+        self.connection.set_pagination(page_size=4)
+        responses = {
+            '/rest/testuri?start=0&count=-1': {'nextPageUri': '/rest/testuri?start=2&count=2', 'total': 6,
+                                               'members': [{'id': '1'}, {'id': '2'}]},
+            '/rest/testuri?start=2&count=4': {'members': [{'id': '3'}]},
+            '/rest/testuri?start=3&count=3': {'members': [{'id': '4'}, {'id': '5'}, {'id': '6'}]}}
+        mock_get.side_effect = lambda uri: responses[uri]
+
+        result = self.resource_client.get_all()
+
+        self.assertEqual(result, [{'id': '1'}, {'id': '2'}, {'id': '3'}, {'id': '4'}, {'id': '5'}, {'id': '6'}])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_should_follow_next_page_uri_when_concurrency_is_disabled(self, mock_get):
+        self.connection.set_pagination(max_workers=1)
+        uri_list = ['/rest/testuri?start=0&count=-1',
+                    '/rest/testuri?start=2&count=2']
+
+        mock_get.side_effect = [{'nextPageUri': uri_list[1], 'total': 3, 'members': [{'id': '1'}, {'id': '2'}]},
+                                {'nextPageUri': None, 'total': 3, 'members': [{'id': '3'}]}]
+
+        result = self.resource_client.get_all()
+
+        self.assertEqual(result, [{'id': '1'}, {'id': '2'}, {'id': '3'}])
+        self.assertEqual(mock_get.call_args_list, [call(uri_list[0]), call(uri_list[1])])
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_yield_items_of_all_pages(self, mock_get):
+        uri_list = ['/rest/testuri?start=0&count=-1',
+                    '/rest/testuri?start=3&count=3']
+
+        mock_get.side_effect = [{'nextPageUri': uri_list[1], 'total': 4, 'members': [{'id': '1'}, {'id': '2'}]},
+                                {'nextPageUri': None, 'members': [{'id': '3'}, {'id': '4'}]}]
+
+        result = self.resource_client.iter_all()
+
+        self.assertEqual(list(result), [{'id': '1'}, {'id': '2'}, {'id': '3'}, {'id': '4'}])
+        self.assertEqual(mock_get.call_args_list, [call(uri_list[0]), call(uri_list[1])])
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_request_pages_on_demand_when_prefetch_is_disabled(self, mock_get):
+        mock_get.side_effect = [{'nextPageUri': '/rest/testuri?start=1&count=1', 'members': [{'id': '1'}]},
+                                {'nextPageUri': None, 'members': [{'id': '2'}]}]
+
+        result = self.resource_client.iter_all(prefetch=False)
+
+        self.assertEqual(next(result), {'id': '1'})
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(next(result), {'id': '2'})
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_stop_when_requested_count_reached(self, mock_get):
+        mock_get.side_effect = [{'nextPageUri': '/rest/testuri?start=2&count=2', 'members': [{'id': '1'}, {'id': '2'}]}]
+
+        result = self.resource_client.iter_all(count=2)
+
+        self.assertEqual(list(result), [{'id': '1'}, {'id': '2'}])
+        mock_get.assert_called_once_with('/rest/testuri?start=0&count=2')
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_build_query_uri(self, mock_get):
+        mock_get.return_value = {'nextPageUri': None, 'members': []}
+
+        list(self.resource_client.iter_all(start=1, count=10, filter='name=a', sort='name:ascending'))
+
+        mock_get.assert_called_once_with('/rest/testuri?start=1&count=10&filter=name%3Da&sort=name%3Aascending')
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_get_resources_of_collection_with_one_filtered_request(self, mock_get):
+        filtered_uri = "/rest/testuri?start=0&count=2&filter=%22uri%20in%20%28%27/rest/testuri/1%27%2C%27/rest/testuri/2%27%29%22"
+        mock_get.return_value = {'members': [{'uri': '/rest/testuri/2'}, {'uri': '/rest/testuri/1'}]}
+
+        result = self.resource_client.get_many(['1', '/rest/testuri/2', '/rest/testuri/1'])
+
+        self.assertEqual(result, {'/rest/testuri/1': {'uri': '/rest/testuri/1'}, '/rest/testuri/2': {'uri': '/rest/testuri/2'}})
+        mock_get.assert_called_once_with(filtered_uri)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_get_resources_missing_from_collection_one_at_a_time(self, mock_get):
+        def get(uri):
+            if '?' in uri:
+                return {'members': [{'uri': '/rest/testuri/1'}]}
+            return {'uri': uri, 'name': 'single'}
+        mock_get.side_effect = get
+
+        result = self.resource_client.get_many(['/rest/testuri/1', '/rest/testuri/2'])
+
+        self.assertEqual(result['/rest/testuri/2'], {'uri': '/rest/testuri/2', 'name': 'single'})
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_fall_back_to_single_gets_when_filter_fails(self, mock_get):
+        def get(uri):
+            if '?' in uri:
+                raise HPOneViewException('Invalid filter')
+            return {'uri': uri}
+        mock_get.side_effect = get
+
+        result = self.resource_client.get_many(['/rest/testuri/1', '/rest/testuri/2'])
+
+        self.assertEqual(sorted(result), ['/rest/testuri/1', '/rest/testuri/2'])
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_get_single_resource_of_collection_without_filter(self, mock_get):
+        mock_get.return_value = {'uri': '/rest/testuri/1'}
+
+        result = self.resource_client.get_many(['/rest/testuri/1'])
+
+        self.assertEqual(result, {'/rest/testuri/1': {'uri': '/rest/testuri/1'}})
+        mock_get.assert_called_once_with('/rest/testuri/1')
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_raise_the_error_of_a_resource_that_could_not_be_retrieved(self, mock_get):
+        def get(uri):
+            if uri == '/rest/testuri/2':
+                raise HPOneViewException('Not found')
+            return {'uri': uri}
+        mock_get.side_effect = get
+
+        self.assertRaises(HPOneViewException, self.resource_client.get_many, ['/rest/testuri/1', '/rest/testuri/2'])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_many_should_skip_the_resources_that_could_not_be_retrieved(self, mock_get):
+        def get(uri):
+            if '?' in uri:
+                return {'members': [{'uri': '/rest/testuri/1'}]}
+            raise HPOneViewException('Not found')
+        mock_get.side_effect = get
+
+        result = self.resource_client.get_many(['/rest/testuri/1', '/rest/testuri/2'], skip_errors=True)
+
+        self.assertEqual(result, {'/rest/testuri/1': {'uri': '/rest/testuri/1'}})
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_get_many_should_validate_uris(self):
+        self.assertRaises(HPOneViewUnknownType, self.resource_client.get_many, ['/rest/other/1'])
+
     @mock.patch.object(connection, 'delete')
     @mock.patch.object(TaskMonitor, 'wait_for_task')
     def test_delete_all_called_once(self, mock_wait4task, mock_delete):
@@ -335,7 +547,12 @@ class ResourceClientTest(unittest.TestCase):
     @mock.patch.object(connection, 'get')
     def test_get_by_id_uri(self, mock_get):
         self.resource_client.get('12345')
-        mock_get.assert_called_once_with(self.URI + "/12345")
+        mock_get.assert_called_once_with(self.URI + "/12345", raw=False)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_should_return_raw_body(self, mock_get):
+        self.resource_client.get('12345', raw=True)
+        mock_get.assert_called_once_with(self.URI + "/12345", raw=True)
 
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_name_with_result(self, mock_get_by):
@@ -408,6 +625,52 @@ class ResourceClientTest(unittest.TestCase):
         self.assertEqual(response, [{'name': 'expected'}, {'name': 'not expected'}])
         mock_get_all.assert_called_once_with(filter="\"connection.name='expected'\"", uri='/rest/testuri')
 
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_get_by_should_use_the_inventory_snapshot(self, mock_get_all):
+        mock_get_all.return_value = [{"uri": "/rest/testuri/1", "name": "EXpected"},
+                                     {"uri": "/rest/testuri/2", "name": "not expected"}]
+        self.resource_client.enable_inventory_snapshot()
+
+        self.resource_client.get_by('name', 'exPEcted')
+        response = ResourceClient(self.connection, self.URI).get_by_name('expected')
+
+        self.assertEqual(response, {"uri": "/rest/testuri/1", "name": "EXpected"})
+        mock_get_all.assert_called_once_with()
+
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_get_by_should_query_the_fields_not_indexed(self, mock_get_all):
+        self.resource_client.enable_inventory_snapshot()
+
+        self.resource_client.get_by('connection.name', 'expected')
+
+        mock_get_all.assert_called_once_with(filter="\"connection.name='expected'\"", uri='/rest/testuri')
+
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_get_by_should_query_after_disable_inventory_snapshot(self, mock_get_all):
+        self.resource_client.enable_inventory_snapshot()
+        self.resource_client.disable_inventory_snapshot()
+
+        self.resource_client.get_by('name', 'MyFibreNetwork')
+
+        mock_get_all.assert_called_once_with(filter="\"name='MyFibreNetwork'\"", uri='/rest/testuri')
+
+    @mock.patch.object(connection, 'post')
+    @mock.patch.object(connection, 'delete')
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_create_and_delete_should_update_the_inventory_snapshot(self, mock_get_all, mock_delete, mock_post):
+        mock_get_all.return_value = [{"uri": "/rest/testuri/1", "name": "first"}]
+        mock_post.return_value = None, {"uri": "/rest/testuri/2", "name": "second"}
+        mock_delete.return_value = None, self.response_body
+        snapshot = self.resource_client.enable_inventory_snapshot()
+        snapshot.refresh()
+
+        self.resource_client.create({"name": "second"})
+        self.resource_client.delete("/rest/testuri/1", force=True)
+
+        self.assertEqual(snapshot.get_by('name', 'second')[0]["uri"], "/rest/testuri/2")
+        self.assertEqual(snapshot.get_by('name', 'first'), [])
+        mock_get_all.assert_called_once_with()
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_by_property_with_uri(self, mock_get_all):
         self.resource_client.get_by('name', 'MyFibreNetwork', uri='/rest/testuri/5435534/sub')
@@ -927,7 +1190,7 @@ class ResourceClientTest(unittest.TestCase):
         uri = self.URI + "/ad28cf21-8b15-4f92-bdcf-51cb2042db32"
         self.resource_client.get(uri)
 
-        mock_get.assert_called_once_with(uri)
+        mock_get.assert_called_once_with(uri, raw=False)
 
     def test_get_with_uri_with_incompatible_url_shoud_fail(self):
         message = "Unrecognized URI for this resource"
@@ -999,6 +1262,53 @@ class ResourceClientTest(unittest.TestCase):
 
         mock_get.assert_called_once_with(expected_uri)
 
+    @mock.patch.object(ResourceClient, 'get_utilization')
+    def test_get_utilization_series_should_stitch_the_segments(self, mock_get_utilization):
+        times = list(range(1525305600, 1525305600 + 100 * 300, 300))
+        mock_get_utilization.side_effect = fake_utilization(times, slice_size=12)
+
+        series = self.resource_client.get_utilization_series('09USE7335NW3', fields='AveragePower',
+                                                             start='2018-05-03T00:00:00.000Z', end=times[-1])
+
+        self.assertEqual(list(series.times()), times)
+        self.assertEqual(list(series.values('AveragePower')), [time // 300 for time in times])
+        self.assertTrue(all(value != value for value in series.values('PeakPower')))
+        self.assertEqual(mock_get_utilization.call_count, 9)
+        mock_get_utilization.assert_any_call('09USE7335NW3', fields='AveragePower', refresh=False, view=None,
+                                             filter=['startDate=2018-05-03T00:00:00.000Z',
+                                                     'endDate=2018-05-03T08:15:00.000Z'])
+
+    @mock.patch.object(ResourceClient, 'get_utilization')
+    def test_get_utilization_series_should_stop_at_the_oldest_sample(self, mock_get_utilization):
+        times = list(range(1525305600, 1525305600 + 30 * 300, 300))
+        mock_get_utilization.side_effect = fake_utilization(times, slice_size=12)
+
+        series = self.resource_client.get_utilization_series('09USE7335NW3')
+
+        self.assertEqual(list(series.times()), times)
+        self.assertEqual(mock_get_utilization.call_count, 3)
+
+    @mock.patch.object(ResourceClient, 'get_utilization')
+    def test_get_utilization_series_should_follow_the_segments_of_a_range(self, mock_get_utilization):
+        # Denser data at the start of the span: the ranges computed from the first slice are segmented again
+        times = list(range(0, 3000, 100)) + list(range(3000, 9000, 300))
+        mock_get_utilization.side_effect = fake_utilization(times, slice_size=10)
+
+        series = self.resource_client.get_utilization_series('09USE7335NW3', start=0, end=times[-1])
+
+        self.assertEqual(list(series.times()), times)
+
+    @mock.patch.object(ResourceClient, 'get_utilization')
+    def test_get_utilization_series_for_many_resources(self, mock_get_utilization):
+        times = list(range(1525305600, 1525305600 + 20 * 300, 300))
+        mock_get_utilization.side_effect = fake_utilization(times, slice_size=8)
+
+        series = self.resource_client.get_utilization_series(['1', '/rest/testuri/2', '1'], start=times[0],
+                                                             end=datetime.datetime(2018, 5, 3, 1, 35))
+
+        self.assertEqual(list(series), ['/rest/testuri/1', '/rest/testuri/2'])
+        self.assertEqual(list(series['/rest/testuri/2'].times()), times)
+
     def test_get_utilization_with_empty(self):
 
         try:
@@ -1184,6 +1494,61 @@ class ResourceClientTest(unittest.TestCase):
 
         mock_post.assert_called_once_with(self.URI, dict_to_create, custom_headers=None)
 
+    @mock.patch.object(connection, 'post')
+    def test_create_many_should_post_each_resource(self, mock_post):
+        mock_post.side_effect = lambda uri, resource, custom_headers: (None, resource)
+        resources = [{'name': 'net-1'}, {'name': 'net-2'}]
+
+        result = self.resource_client.create_many(resources, custom_headers=self.custom_headers)
+
+        self.assertEqual([item.result['name'] for item in result.succeeded], ['net-1', 'net-2'])
+        mock_post.assert_has_calls([mock.call(self.URI, {'name': 'net-1'}, custom_headers=self.custom_headers),
+                                    mock.call(self.URI, {'name': 'net-2'}, custom_headers=self.custom_headers)],
+                                   any_order=True)
+
+    @mock.patch.object(connection, 'post')
+    def test_create_many_should_return_missing_resource_as_failure(self, mock_post):
+        mock_post.return_value = None, {'name': 'net-1'}
+
+        result = self.resource_client.create_many([{'name': 'net-1'}, None])
+
+        self.assertEqual(len(result.succeeded), 1)
+        self.assertIsInstance(result.failed[0].error, ValueError)
+
+    @mock.patch.object(connection, 'put')
+    @mock.patch.object(TaskWatcher, 'watch')
+    def test_update_many_should_wait_for_the_tasks(self, mock_watch, mock_put):
+        updated = Future()
+        updated.set_result({'name': 'updated'})
+        mock_watch.return_value = updated
+        mock_put.return_value = self.task, None
+
+        result = self.resource_client.update_many([{'uri': self.URI + '/1'}], force=True, timeout=30)
+
+        self.assertEqual(result.items[0].result, {'name': 'updated'})
+        mock_put.assert_called_once_with(self.URI + '/1?force=True', {'uri': self.URI + '/1'}, custom_headers=None)
+        mock_watch.assert_called_once_with(self.task, 30)
+
+    @mock.patch.object(connection, 'delete')
+    def test_delete_many_should_build_the_uri_of_each_resource(self, mock_delete):
+        mock_delete.return_value = None, None
+
+        result = self.resource_client.delete_many(['1', {'uri': self.URI + '/2'}], max_workers=1)
+
+        self.assertEqual([item.result for item in result.items], [True, True])
+        mock_delete.assert_has_calls([mock.call(self.URI + '/1', custom_headers=None),
+                                      mock.call(self.URI + '/2', custom_headers=None)])
+
+    @mock.patch.object(connection, 'delete')
+    def test_delete_many_should_skip_remaining_resources_when_failing_fast(self, mock_delete):
+        mock_delete.side_effect = HPOneViewException('Not found')
+
+        result = self.resource_client.delete_many(['1', '2', '3'], max_workers=1, fail_fast=True)
+
+        self.assertEqual(len(result.failed), 1)
+        self.assertEqual(len(result.skipped), 2)
+        mock_delete.assert_called_once_with(self.URI + '/1', custom_headers=None)
+
     def test_merge_api_default_values(self):
         resource = {'name': 'resource1'}
         default_values = {
@@ -1217,7 +1582,7 @@ class ResourceClientTest(unittest.TestCase):
 
         self.resource_client.upload(filepath, uri)
 
-        mock_post_multipart.assert_called_once_with(uri, filepath, 'SPPgen9snap6.2015_0405.81.iso')
+        mock_post_multipart.assert_called_once_with(uri, filepath, 'SPPgen9snap6.2015_0405.81.iso', progress=mock.ANY)
 
     @mock.patch.object(connection, 'post_multipart_with_response_handling')
     def test_upload_should_call_post_multipart_with_resource_uri_when_not_uri_provided(self, mock_post_multipart):
@@ -1226,7 +1591,7 @@ class ResourceClientTest(unittest.TestCase):
 
         self.resource_client.upload(filepath)
 
-        mock_post_multipart.assert_called_once_with('/rest/testuri', mock.ANY, mock.ANY)
+        mock_post_multipart.assert_called_once_with('/rest/testuri', mock.ANY, mock.ANY, progress=mock.ANY)
 
     @mock.patch.object(connection, 'post_multipart_with_response_handling')
     @mock.patch.object(TaskMonitor, 'wait_for_task')
@@ -1278,6 +1643,19 @@ class ResourceClientTest(unittest.TestCase):
 
         self.assertEqual(result, fake_response_body)
 
+    @mock.patch.object(connection, 'post_multipart_with_response_handling')
+    @mock.patch('time.sleep')
+    def test_upload_should_retry_when_connection_is_reset(self, mock_sleep, mock_post_multipart):
+        fake_response_body = mock.Mock()
+        filepath = "test/SPPgen9snap6.2015_0405.81.iso"
+        mock_post_multipart.side_effect = [socket.error(ECONNRESET, 'Connection reset'), (None, fake_response_body)]
+
+        result = self.resource_client.upload(filepath)
+
+        self.assertEqual(result, fake_response_body)
+        self.assertEqual(mock_post_multipart.call_count, 2)
+        mock_sleep.assert_called_once_with(2)
+
     @mock.patch.object(connection, 'download_to_stream')
     @mock.patch(mock_builtin('open'))
     def test_download_should_call_download_to_stream_with_given_uri(self, mock_open, mock_download_to_stream):
@@ -1326,6 +1704,16 @@ class ResourceClientTest(unittest.TestCase):
 
         self.assertFalse(result)
 
+    @mock.patch.object(DownloadManager, 'download')
+    def test_download_should_use_download_manager_when_many_parts(self, mock_download):
+        uri = '/rest/testuri/3ec91dd2-0ebb-4484-8b2d-90d065114315'
+        mock_download.return_value = True
+
+        result = self.resource_client.download(uri, '~/archive.log', parts=4, checksum='abc')
+
+        self.assertTrue(result)
+        mock_download.assert_called_once_with(uri, '~/archive.log', checksum='abc')
+
     def test_transform_list_to_dict(self):
         list = ['one', 'two', {'tree': 3}, 'four', 5]
 
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import json
+import unittest
+
+import mock
+
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.resources.resource import ResourceClient
+from hpOneView.resources.state_change_consumer import StateChangeConsumer
+
+SERVERS = [{"uri": "/rest/server-hardware/1", "name": "Encl1, bay 1", "serialNumber": "SN01"},
+           {"uri": "/rest/server-hardware/2", "name": "Encl1, bay 2", "serialNumber": "SN02"}]
+
+
+def scmb_message(change_type, uri, resource=None):
+    return json.dumps({"changeType": change_type, "resourceUri": uri, "resource": resource, "eTag": "1"}).encode()
+
+
+class StateChangeConsumerTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = connection('127.0.0.1', 300)
+        self.load = mock.Mock(return_value=[dict(server) for server in SERVERS])
+        self.snapshot = ResourceClient(self.connection, '/rest/server-hardware').enable_inventory_snapshot()
+        self.snapshot._load = self.load
+        self.snapshot.refresh()
+        self.consumer = StateChangeConsumer(self.connection)
+
+    def test_created_message_should_add_the_resource(self):
+        resource = {"uri": "/rest/server-hardware/3", "name": "Encl1, bay 3"}
+
+        applied = self.consumer.handle(scmb_message("Created", "/rest/server-hardware/3", resource))
+
+        self.assertTrue(applied)
+        self.assertEqual(self.snapshot.get_by("name", "encl1, bay 3"), [resource])
+        self.load.assert_called_once_with()
+
+    def test_updated_message_should_replace_the_resource(self):
+        resource = {"uri": "/rest/server-hardware/1", "name": "renamed", "serialNumber": "SN01"}
+
+        self.consumer.handle(scmb_message("Updated", "/rest/server-hardware/1", resource))
+
+        self.assertEqual(self.snapshot.get_by("serialNumber", "SN01"), [resource])
+        self.assertEqual(self.snapshot.get_by("name", "Encl1, bay 1"), [])
+
+    def test_deleted_message_should_remove_the_resource(self):
+        self.consumer.handle(scmb_message("Deleted", "/rest/server-hardware/2"))
+
+        self.assertEqual(self.snapshot.get_by("serialNumber", "SN02"), [])
+        self.assertEqual(len(self.snapshot), 1)
+
+    @mock.patch.object(connection, 'get')
+    def test_message_without_resource_should_get_only_the_changed_resource(self, mock_get):
+        mock_get.return_value = {"uri": "/rest/server-hardware/2", "name": "renamed"}
+
+        self.consumer.handle({"changeType": "Updated", "resourceUri": "/rest/server-hardware/2"})
+
+        mock_get.assert_called_once_with("/rest/server-hardware/2")
+        self.assertEqual(self.snapshot.get_by("name", "renamed")[0]["uri"], "/rest/server-hardware/2")
+
+    def test_message_of_a_collection_without_snapshot_should_be_ignored(self):
+        applied = self.consumer.handle(scmb_message("Created", "/rest/enclosures/1", {"uri": "/rest/enclosures/1"}))
+
+        self.assertFalse(applied)
+        self.assertEqual(len(self.snapshot), 2)
+
+    @mock.patch.object(connection, 'invalidate_response_cache')
+    def test_every_message_should_invalidate_the_response_cache(self, mock_invalidate):
+        self.consumer.handle(scmb_message("Updated", "/rest/enclosures/1", {"uri": "/rest/enclosures/1"}))
+        self.consumer.handle(scmb_message("Deleted", "/rest/server-hardware/1"))
+
+        mock_invalidate.assert_has_calls([mock.call("/rest/enclosures/1"), mock.call("/rest/server-hardware/1")])
+
+    def test_consume_should_invalidate_the_snapshots_and_skip_the_invalid_messages(self):
+        source = [b"not json", scmb_message("Deleted", "/rest/server-hardware/2")]
+
+        self.consumer.consume(source)
+
+        self.assertTrue(self.snapshot.is_stale())
+        self.assertEqual(self.consumer.get_stats(), dict(messages=2, applied=1, errors=1))
+
+    def test_start_should_consume_in_background_until_stopped(self):
+        source = mock.MagicMock()
+        source.__iter__.return_value = iter([scmb_message("Deleted", "/rest/server-hardware/2")])
+
+        self.consumer.start(source).join(5)
+        self.consumer.stop()
+
+        source.open.assert_called_once_with()
+        source.close.assert_called_once_with()
+        self.assertEqual(self.consumer.get_stats()["applied"], 1)
+
+    def test_start_should_fail_when_already_started(self):
+        source = mock.MagicMock()
+        source.__iter__.return_value = iter([])
+        with mock.patch('threading.Thread'):
+            self.consumer.start(source)
+            self.assertRaises(HPOneViewException, self.consumer.start, source)
@@ -25,10 +25,11 @@ import unittest
 from mock import mock, call
 from errno import ETIMEDOUT, ECONNABORTED
 
-from hpOneView.connection import connection
+from hpOneView.connection import connection, RetryPolicy
 from hpOneView.resources.task_monitor import TaskMonitor, MSG_UNKNOWN_OBJECT_TYPE, MSG_TASK_TYPE_UNRECONIZED, \
     MSG_TIMEOUT, MSG_UNKNOWN_EXCEPTION, MSG_INVALID_TASK
-from hpOneView.exceptions import HPOneViewUnknownType, HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewTaskError
+from http.client import BadStatusLine
+from hpOneView.exceptions import HPOneViewException, HPOneViewUnknownType, HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewTaskError
 
 ERR_MSG = "Message error"
 
@@ -210,6 +211,25 @@ class TaskMonitorTest(unittest.TestCase):
         self.assertRaises(EnvironmentError, self.task_monitor.is_task_running, {"uri": "uri"},
                           conn_failure_control)
 
+    @mock.patch.object(TaskMonitor, 'get')
+    def test_is_task_running_should_use_error_numbers_of_retry_policy(self, mock_get):
+        mock_get.side_effect = EnvironmentError(ECONNABORTED, ERR_MSG)
+        self.connection.set_retry_policy(RetryPolicy(retryable_error_numbers=[ETIMEDOUT]))
+
+        conn_failure_control = dict(last_success=self.task_monitor.get_current_seconds())
+
+        self.assertRaises(EnvironmentError, self.task_monitor.is_task_running, {"uri": "uri"}, conn_failure_control)
+
+    @mock.patch.object(TaskMonitor, 'get')
+    def test_is_task_running_should_tolerate_a_wrapped_bad_status_line(self, mock_get):
+        error = HPOneViewException('Failure during the request.')
+        error.__cause__ = BadStatusLine(0)
+        mock_get.side_effect = error
+
+        conn_failure_control = dict(last_success=self.task_monitor.get_current_seconds())
+
+        self.assertTrue(self.task_monitor.is_task_running({"uri": "uri"}, conn_failure_control))
+
     @mock.patch.object(TaskMonitor, 'is_task_running')
     def test_wait_for_task_timeout(self, mock_is_running):
 
@@ -343,6 +363,29 @@ class TaskMonitorTest(unittest.TestCase):
 
         self.assertEqual(ret_entity, {"resource": "resource1"})
 
+    @mock.patch.object(connection, 'record_task_wait')
+    @mock.patch.object(TaskMonitor, 'is_task_running')
+    @mock.patch.object(TaskMonitor, 'get')
+    @mock.patch('time.sleep')
+    def test_wait_for_task_should_record_the_wait(self, mock_sleep, mock_get, mock_is_running, mock_record):
+        task = {"uri": "uri", "name": "Delete", "taskState": "Completed"}
+        mock_is_running.side_effect = [True, True, False]
+        mock_get.return_value = task
+
+        self.task_monitor.wait_for_task(task.copy())
+
+        mock_record.assert_called_once_with("uri", mock.ANY, 3, None)
+
+    @mock.patch.object(connection, 'record_task_wait')
+    @mock.patch.object(TaskMonitor, 'is_task_running')
+    def test_wait_for_task_should_record_the_failed_wait(self, mock_is_running, mock_record):
+        error = HPOneViewUnknownType(ERR_MSG)
+        mock_is_running.side_effect = error
+
+        self.assertRaises(HPOneViewUnknownType, self.task_monitor.wait_for_task, {"uri": "uri"})
+
+        mock_record.assert_called_once_with("uri", mock.ANY, 1, error)
+
     @mock.patch.object(TaskMonitor, 'is_task_running')
     @mock.patch.object(TaskMonitor, 'get')
     def test_wait_for_task_unexpected_result(self, mock_get, mock_is_running):
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import socket
+import unittest
+
+import mock
+from errno import ECONNABORTED
+
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException, HPOneViewTaskError, HPOneViewTimeout, HPOneViewUnknownType
+from hpOneView.resources.activity.tasks import Tasks
+from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.resources.task_watcher import TaskWatcher
+
+RESULT_TIMEOUT = 5
+
+
+def task(number, state='Completed', **kwargs):
+    task = dict(uri='/rest/tasks/{0}'.format(number), taskState=state, name='Delete')
+    task.update(kwargs)
+    return task
+
+
+@mock.patch('hpOneView.resources.task_watcher.time.sleep')
+class TaskWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = connection('127.0.0.1')
+        self.task_watcher = TaskWatcher(self.connection, poll_interval=0, batch_size=2)
+
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_poll_tasks_in_batches(self, mock_get_all, mock_sleep):
+        mock_get_all.side_effect = [[task(1), task(2)], [task(3)]]
+
+        futures = self.task_watcher.watch_all([task(1, 'Running'), task(2, 'Running'), task(3, 'Running')])
+
+        self.assertEqual([f.result(RESULT_TIMEOUT) for f in futures], [True, True, True])
+        mock_get_all.assert_has_calls([
+            mock.call(count=2, filter="\"uri in ('/rest/tasks/1','/rest/tasks/2')\""),
+            mock.call(count=1, filter="\"uri in ('/rest/tasks/3')\"")])
+
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_keep_polling_running_tasks(self, mock_get_all, mock_sleep):
+        mock_get_all.side_effect = [[task(1, 'Running')], [task(1, 'Running')], [task(1)]]
+
+        future = self.task_watcher.watch(task(1, 'Running'))
+
+        self.assertTrue(future.result(RESULT_TIMEOUT))
+        self.assertEqual(mock_get_all.call_count, 3)
+
+    @mock.patch.object(TaskMonitor, 'get_associated_resource')
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_resolve_with_associated_resource(self, mock_get_all, mock_associated, mock_sleep):
+        completed = task(1, type='TaskResourceV2', name='Create')
+        mock_get_all.return_value = [completed]
+        mock_associated.return_value = (completed, {'name': 'profile'})
+
+        future = self.task_watcher.watch(task(1, 'Running'))
+
+        self.assertEqual(future.result(RESULT_TIMEOUT), {'name': 'profile'})
+        mock_associated.assert_called_once_with(completed)
+
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_fail_with_task_error(self, mock_get_all, mock_sleep):
+        mock_get_all.return_value = [task(1, 'Error', taskErrors=[{'message': 'Failed', 'errorCode': 'E1'}])]
+
+        future = self.task_watcher.watch(task(1, 'Running'))
+
+        self.assertRaises(HPOneViewTaskError, future.result, RESULT_TIMEOUT)
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_get_tasks_missing_from_the_batch(self, mock_get_all, mock_get, mock_sleep):
+        mock_get_all.return_value = [task(1)]
+        mock_get.return_value = task(2)
+
+        futures = self.task_watcher.watch_all([task(1, 'Running'), task(2, 'Running')])
+
+        self.assertEqual([f.result(RESULT_TIMEOUT) for f in futures], [True, True])
+        mock_get.assert_called_once_with('/rest/tasks/2')
+
+    @mock.patch.object(connection, 'get')
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_poll_one_at_a_time_when_filter_is_not_supported(self, mock_get_all, mock_get, mock_sleep):
+        mock_get_all.side_effect = HPOneViewException('Invalid filter')
+        mock_get.side_effect = [task(1, 'Running'), task(1)]
+
+        future = self.task_watcher.watch(task(1, 'Running'))
+
+        self.assertTrue(future.result(RESULT_TIMEOUT))
+        mock_get_all.assert_called_once_with(count=1, filter="\"uri in ('/rest/tasks/1')\"")
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_tolerate_connection_failures(self, mock_get_all, mock_sleep):
+        mock_get_all.side_effect = [socket.error(ECONNABORTED, 'Connection aborted'), [task(1)]]
+
+        future = self.task_watcher.watch(task(1, 'Running'))
+
+        self.assertTrue(future.result(RESULT_TIMEOUT))
+
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_fail_on_unexpected_errors(self, mock_get_all, mock_sleep):
+        mock_get_all.side_effect = ValueError('Unexpected')
+
+        future = self.task_watcher.watch(task(1, 'Running'))
+
+        self.assertRaises(ValueError, future.result, RESULT_TIMEOUT)
+
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_skip_the_futures_cancelled_by_the_caller(self, mock_get_all, mock_sleep):
+        futures = []
+
+        def get_all(**kwargs):
+            futures[0].cancel()
+            return [task(1), task(2)]
+
+        mock_get_all.side_effect = get_all
+        futures += self.task_watcher.watch_all([task(1, 'Running'), task(2, 'Running')])
+
+        self.assertTrue(futures[1].result(RESULT_TIMEOUT))
+        self.assertTrue(futures[0].cancelled())
+
+    @mock.patch.object(TaskWatcher, '_TaskWatcher__expire')
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_fail_the_watched_tasks_when_the_poller_stops(self, mock_get_all, mock_expire, mock_sleep):
+        mock_get_all.return_value = [task(1, 'Running')]
+        mock_expire.side_effect = [RuntimeError('Unexpected'), None]
+
+        future = self.task_watcher.watch(task(1, 'Running'))
+
+        self.assertRaises(RuntimeError, future.result, RESULT_TIMEOUT)
+        mock_get_all.return_value = [task(2)]
+        self.assertTrue(self.task_watcher.watch(task(2, 'Running')).result(RESULT_TIMEOUT))
+
+    @mock.patch.object(TaskMonitor, 'get_current_seconds')
+    @mock.patch.object(Tasks, 'get_all')
+    def test_watch_should_fail_with_timeout(self, mock_get_all, mock_seconds, mock_sleep):
+        mock_get_all.return_value = [task(1, 'Running')]
+        mock_seconds.side_effect = [0, 0, 0, 20]
+
+        future = self.task_watcher.watch(task(1, 'Running'), timeout=10)
+
+        self.assertRaises(HPOneViewTimeout, future.result, RESULT_TIMEOUT)
+
+    def test_watch_should_raise_when_task_is_invalid(self, mock_sleep):
+        self.assertRaises(HPOneViewUnknownType, self.task_watcher.watch, {})
+
+    @mock.patch.object(Tasks, 'get_all')
+    def test_wait_for_tasks_should_return_results_in_order(self, mock_get_all, mock_sleep):
+        mock_get_all.return_value = [task(2), task(1)]
+
+        result = self.task_watcher.wait_for_tasks([task(1, 'Running'), task(2, 'Running')])
+
+        self.assertEqual(result, [True, True])
+        self.assertEqual(len(self.task_watcher), 0)
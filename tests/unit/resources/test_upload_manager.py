@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import hashlib
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+
+import mock
+
+from errno import ECONNRESET
+from hpOneView.connection import connection
+from hpOneView.resources.upload_manager import UploadManager, UploadProgress, file_checksum
+
+
+class UploadManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = connection('127.0.0.1', 300)
+        self.progress = mock.Mock()
+        self.manager = UploadManager(self.connection, retries=2, backoff=1, max_backoff=1, progress=self.progress)
+
+    def __fake_upload(self, sent_chunks, error=None):
+        def post_multipart(uri, file_path, base_name, progress):
+            for sent in sent_chunks:
+                progress(sent, 300)
+            if error:
+                raise error
+            return None, {'name': base_name}
+        return post_multipart
+
+    @mock.patch.object(connection, 'post_multipart_with_response_handling')
+    def test_upload_should_return_task_and_body(self, mock_post_multipart):
+        mock_post_multipart.side_effect = self.__fake_upload([100, 200, 300])
+
+        task, body = self.manager.upload('/rest/firmware-bundles', '/tmp/spp.iso')
+
+        self.assertIsNone(task)
+        self.assertEqual(body, {'name': 'spp.iso'})
+        mock_post_multipart.assert_called_once_with('/rest/firmware-bundles', '/tmp/spp.iso', 'spp.iso',
+                                                    progress=mock.ANY)
+
+    @mock.patch.object(connection, 'post_multipart_with_response_handling')
+    def test_upload_should_report_progress(self, mock_post_multipart):
+        reported = []
+        self.progress.side_effect = lambda status: reported.append((status.bytes_sent, status.total_bytes,
+                                                                    round(status.percent), status.attempt))
+        mock_post_multipart.side_effect = self.__fake_upload([150, 300])
+
+        self.manager.upload('/rest/firmware-bundles', '/tmp/spp.iso')
+
+        self.assertEqual(reported, [(150, 300, 50, 1), (300, 300, 100, 1)])
+
+    @mock.patch.object(connection, 'post_multipart_with_response_handling')
+    @mock.patch('time.sleep')
+    def test_upload_should_restart_after_transient_error(self, mock_sleep, mock_post_multipart):
+        attempts = [self.__fake_upload([100], socket.error(ECONNRESET, 'reset')), self.__fake_upload([300])]
+        mock_post_multipart.side_effect = lambda *args, **kwargs: attempts.pop(0)(*args, **kwargs)
+
+        task, body = self.manager.upload('/rest/firmware-bundles', '/tmp/spp.iso')
+
+        self.assertEqual(body, {'name': 'spp.iso'})
+        self.assertEqual(mock_post_multipart.call_count, 2)
+        mock_sleep.assert_called_once_with(1)
+        self.assertEqual(self.progress.call_args[0][0].attempt, 2)
+
+    @mock.patch.object(connection, 'post_multipart_with_response_handling')
+    @mock.patch('time.sleep')
+    def test_upload_should_not_retry_when_file_was_fully_sent(self, mock_sleep, mock_post_multipart):
+        mock_post_multipart.side_effect = self.__fake_upload([300], socket.error(ECONNRESET, 'reset'))
+
+        self.assertRaises(socket.error, self.manager.upload, '/rest/firmware-bundles', '/tmp/spp.iso')
+
+        self.assertEqual(mock_post_multipart.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(connection, 'post_multipart_with_response_handling')
+    @mock.patch('time.sleep')
+    def test_upload_should_give_up_after_the_retries(self, mock_sleep, mock_post_multipart):
+        mock_post_multipart.side_effect = socket.error(ECONNRESET, 'reset')
+
+        self.assertRaises(socket.error, self.manager.upload, '/rest/firmware-bundles', '/tmp/spp.iso')
+
+        self.assertEqual(mock_post_multipart.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @mock.patch.object(connection, 'post_multipart_with_response_handling')
+    @mock.patch('time.sleep')
+    def test_upload_should_double_the_backoff_up_to_the_limit(self, mock_sleep, mock_post_multipart):
+        mock_post_multipart.side_effect = socket.error(ECONNRESET, 'reset')
+        manager = UploadManager(self.connection, retries=4, backoff=2, max_backoff=10)
+
+        self.assertRaises(socket.error, manager.upload, '/rest/firmware-bundles', '/tmp/spp.iso')
+
+        mock_sleep.assert_has_calls([mock.call(2), mock.call(4), mock.call(8), mock.call(10)])
+
+
+class UploadProgressTest(unittest.TestCase):
+    def test_throughput(self):
+        status = UploadProgress('/tmp/spp.iso', 1)
+        status.bytes_sent = 3000
+        status.total_bytes = 12000
+        status.elapsed = 2.0
+
+        self.assertEqual(status.throughput, 1500.0)
+        self.assertEqual(status.percent, 25.0)
+        self.assertFalse(status.complete)
+
+    def test_values_before_the_first_chunk(self):
+        status = UploadProgress('/tmp/spp.iso', 1)
+
+        self.assertEqual(status.throughput, 0.0)
+        self.assertEqual(status.percent, 0.0)
+        self.assertFalse(status.complete)
+
+
+class FileChecksumTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'spp.iso')
+        with open(self.file_path, 'wb') as output_file:
+            output_file.write(b'x' * 2500000)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_file_checksum(self):
+        self.assertEqual(file_checksum(self.file_path), hashlib.sha256(b'x' * 2500000).hexdigest())
+
+    def test_file_checksum_with_algorithm(self):
+        self.assertEqual(file_checksum(self.file_path, 'md5'), hashlib.md5(b'x' * 2500000).hexdigest())
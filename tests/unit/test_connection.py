@@ -21,17 +21,24 @@
 # THE SOFTWARE.
 ###
 import json
+import socket
 import ssl
+import threading
+import time
 import unittest
-import mmap
+import zlib
 import os
 import shutil
 import os.path
 
-from mock import patch, call, Mock, ANY
+from errno import ECONNRESET, ETIMEDOUT
+
+from mock import patch, call, Mock, MagicMock, ANY
 from http.client import HTTPSConnection, BadStatusLine, HTTPException
-from hpOneView.connection import connection
+from hpOneView.connection import connection, AdaptiveRateLimiter, ConnectionPool, ResponseCache, \
+    ResponseCompression, ResumableHTTPSConnection, RetryPolicy, TLSSessionCache, get_retry_after
 from hpOneView.exceptions import HPOneViewException
+from hpOneView.json_backend import RawBody
 
 
 class ConnectionTest(unittest.TestCase):
@@ -71,15 +78,35 @@ class ConnectionTest(unittest.TestCase):
             mock_response.getheader.return_value = '/task/uri'
         return mock_response
 
-    def __create_fake_mapped_file(self):
-        mock_mapped_file = Mock()
-        mock_mapped_file.tell.side_effect = [0, 1048576, 2097152, 2621440]  # 0, 1MB, 2MB 2.5MB
-        mock_mapped_file.size.return_value = 2621440  # 2.5MB
-        mock_mapped_file.read.side_effect = ['data chunck 1', 'data chunck 2', 'data chunck 3']
-        return mock_mapped_file
+    @staticmethod
+    def __fake_readinto(response, chunks):
+        chunks = list(chunks)
+
+        def readinto(buffer):
+            if not chunks:
+                return 0
+            chunk = chunks.pop(0)
+            buffer[:len(chunk)] = chunk
+            return len(chunk)
+
+        response.readinto.side_effect = readinto
+
+    @staticmethod
+    def __stream_collecting_writes():
+        stream = Mock()
+        stream.written = []
+        stream.write.side_effect = lambda data: stream.written.append(bytes(data))
+        return stream
+
+    def __create_fake_file(self):
+        mock_file = MagicMock()
+        mock_file.__enter__.return_value = mock_file
+        mock_file.read.side_effect = [b'data chunck 1', b'data chunck 2', b'data chunck 3', b'']
+        return mock_file
 
     def __prepare_connection_to_post_multipart(self, response_status=200):
         fake_connection = Mock()
+        fake_connection.sock = Mock(spec=ssl.SSLSocket)
         fake_connection.getresponse.return_value.read.return_value = json.dumps(self.response_body).encode('utf-8')
         fake_connection.getresponse.return_value.status = response_status
 
@@ -87,13 +114,10 @@ class ConnectionTest(unittest.TestCase):
         self.connection.get_connection.return_value = fake_connection
 
         self.connection._open = Mock()
+        self.connection._open.return_value = self.__create_fake_file()
 
         self.connection._headers['auth'] = 'LTIxNjUzMjc0OTUzzHoF7eEkZLEUWVA-fuOZP4VGA3U8e67E'
 
-        encode_multipart = "multipart/form-data; boundary=----------ThIs_Is_tHe_bouNdaRY_$"
-        self.connection.encode_multipart_formdata = Mock()
-        self.connection.encode_multipart_formdata.return_value = encode_multipart
-
     def test_default_headers(self):
         self.assertEqual(self.default_headers, self.connection._headers)
 
@@ -536,15 +560,128 @@ class ConnectionTest(unittest.TestCase):
 
         mock_response = mock_conn.getresponse.return_value
         # Stops at the fourth read call
-        mock_response.read.side_effect = ['111', '222', '333', None]
+        self.__fake_readinto(mock_response, [b'111', b'222', b'333'])
         mock_response.status = 200
 
-        mock_stream = Mock()
+        mock_stream = self.__stream_collecting_writes()
 
         result = self.connection.download_to_stream(mock_stream, '/rest/download.zip')
 
         self.assertTrue(result)
-        mock_stream.write.assert_has_calls([call('111'), call('222'), call('333')])
+        self.assertEqual(mock_stream.written, [b'111', b'222', b'333'])
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_decode_compressed_body_incrementally(self, mock_get_conn):
+        content = b'0123456789' * 1000
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        encoded = compressor.compress(content) + compressor.flush()
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 200
+        mock_response.getheader.side_effect = lambda name: 'gzip' if name == 'Content-Encoding' else None
+        self.__fake_readinto(mock_response, [encoded[i:i + 10] for i in range(0, len(encoded), 10)])
+        mock_stream = self.__stream_collecting_writes()
+        self.connection.enable_compression()
+
+        self.connection.download_to_stream(mock_stream, '/rest/download.zip', custom_headers={'Accept': '*/*'})
+
+        headers = mock_get_conn.return_value.request.call_args[0][3]
+        self.assertEqual((headers['Accept-Encoding'], headers['Accept']), ('gzip, deflate', '*/*'))
+        self.assertGreater(len(mock_stream.written), 1)
+        self.assertEqual(b''.join(mock_stream.written), content)
+        stats = self.connection.get_compression_stats()
+        self.assertEqual((stats['bytes_received'], stats['bytes_decoded']), (len(encoded), len(content)))
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_pass_copies_to_the_writers_keeping_the_chunks(self, mock_get_conn):
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 200
+        self.__fake_readinto(mock_response, [b'111', b'222'])
+        written = []
+        mock_stream = Mock(spec=['write'], write=written.append)
+
+        self.connection.download_to_stream(mock_stream, '/rest/download.zip')
+
+        self.assertEqual(written, [b'111', b'222'])
+        self.assertTrue(all(isinstance(chunk, bytes) for chunk in written))
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_pass_views_to_the_writers_accepting_them(self, mock_get_conn):
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 200
+        self.__fake_readinto(mock_response, [b'111'])
+        written = []
+        mock_stream = Mock(spec=['write', 'accepts_memoryview'], accepts_memoryview=True,
+                           write=lambda data: written.append((type(data), bytes(data))))
+
+        self.connection.download_to_stream(mock_stream, '/rest/download.zip')
+
+        self.assertEqual(written, [(memoryview, b'111')])
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_grow_the_buffer_while_reads_fill_it(self, mock_get_conn):
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 200
+        sizes = []
+
+        def readinto(buffer):
+            sizes.append(len(buffer))
+            return len(buffer) if len(sizes) < 8 else 0
+
+        mock_response.readinto.side_effect = readinto
+
+        self.connection.download_to_stream(Mock(), '/rest/download.zip')
+
+        self.assertEqual(sizes, [65536, 131072, 262144, 524288, 1048576, 2097152, 4194304, 4194304])
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_read_when_response_has_no_readinto(self, mock_get_conn):
+        mock_response = Mock(spec=['read', 'status', 'will_close'], status=200, will_close=False)
+        mock_response.read.side_effect = [b'111', b'222', b'']
+        mock_get_conn.return_value.getresponse.return_value = mock_response
+        mock_stream = Mock()
+
+        self.connection.download_to_stream(mock_stream, '/rest/download.zip')
+
+        mock_stream.write.assert_has_calls([call(b'111'), call(b'222')])
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_not_try_again_when_part_of_the_body_was_received(self, mock_get_conn):
+        mock_conn = Mock()
+        mock_conn.sock = Mock()
+        mock_get_conn.return_value = mock_conn
+        mock_response = mock_conn.getresponse.return_value
+        mock_response.status = 200
+        mock_response.readinto.side_effect = [3, socket.error(ECONNRESET, 'Connection reset')]
+
+        self.assertRaises(socket.error, self.connection.download_to_stream, Mock(), '/rest/download.zip')
+
+        self.assertEqual(mock_conn.request.call_count, 1)
+
+    @patch.object(connection, 'get_connection')
+    def test_download_range_should_return_total_size_from_content_range(self, mock_get_conn):
+        mock_conn = mock_get_conn.return_value
+        mock_response = mock_conn.getresponse.return_value
+        mock_response.status = 206
+        mock_response.getheader.side_effect = lambda name: {'Content-Range': 'bytes 0-2/9000'}.get(name)
+        self.__fake_readinto(mock_response, [b'123'])
+        mock_stream = self.__stream_collecting_writes()
+
+        status, total = self.connection.download_range(mock_stream, '/rest/download.zip', 0, 2)
+
+        self.assertEqual((status, total), (206, 9000))
+        self.assertEqual(mock_stream.written, [b'123'])
+        self.assertEqual(mock_conn.request.call_args[0][3]['Range'], 'bytes=0-2')
+
+    @patch.object(connection, 'get_connection')
+    def test_download_range_should_return_content_length_when_range_is_ignored(self, mock_get_conn):
+        mock_response = mock_get_conn.return_value.getresponse.return_value
+        mock_response.status = 200
+        mock_response.getheader.side_effect = lambda name: {'Content-Length': '6'}.get(name)
+        self.__fake_readinto(mock_response, [b'123456'])
+
+        status, total = self.connection.download_range(Mock(), '/rest/download.zip', 0, 2)
+
+        self.assertEqual((status, total), (200, 6))
 
     @patch('time.sleep')
     @patch.object(connection, 'get_connection')
@@ -618,13 +755,9 @@ class ConnectionTest(unittest.TestCase):
 
         self.assertTrue('timed out' in context.exception.msg)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_put_request(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_put_request(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
@@ -634,13 +767,9 @@ class ConnectionTest(unittest.TestCase):
         internal_conn = self.connection.get_connection.return_value
         internal_conn.putrequest.assert_called_once_with('POST', '/rest/resources/')
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_put_headers(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_put_headers(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
         mock_path_size.return_value = 2621440  # 2.5 MB
 
         self.connection.post_multipart(uri='/rest/resources/',
@@ -652,39 +781,26 @@ class ConnectionTest(unittest.TestCase):
             call('uploadfilename', 'archive.zip'),
             call('auth', 'LTIxNjUzMjc0OTUzzHoF7eEkZLEUWVA-fuOZP4VGA3U8e67E'),
             call('Content-Type', 'multipart/form-data; boundary=----------ThIs_Is_tHe_bouNdaRY_$'),
-            call('Content-Length', 2621440),
+            call('Content-Length', 147 + 2621440 + 42),
             call('X-API-Version', 300)]
 
         internal_conn = self.connection.get_connection.return_value
         internal_conn.putheader.assert_has_calls(expected_putheader_calls)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_read_file_in_chunks_of_1mb(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_read_file_in_chunks_of_1mb(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
                                        files="/a/path/filename.zip",
                                        baseName="archive.zip")
 
-        expected_mmap_read_calls = [
-            call(1048576),
-            call(1048576),
-            call(1048576)]
+        self.connection._open.return_value.read.assert_has_calls([call(1048576)] * 4)
 
-        mock_mmap.return_value.read.assert_has_calls(expected_mmap_read_calls)
-
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_send_file_in_chuncks_of_1mb(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_send_file_in_chuncks_of_1mb(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
@@ -692,36 +808,86 @@ class ConnectionTest(unittest.TestCase):
                                        baseName="archive.zip")
 
         expected_conn_send_calls = [
-            call('data chunck 1'),
-            call('data chunck 2'),
-            call('data chunck 3')]
+            call(bytearray(b'------------ThIs_Is_tHe_bouNdaRY_$\r\n'
+                           b'Content-Disposition: form-data; name="file"; filename="archive.zip"\r\n'
+                           b'Content-Type: application/octet-stream\r\n\r\n')),
+            call(b'data chunck 1'),
+            call(b'data chunck 2'),
+            call(b'data chunck 3'),
+            call(bytearray(b'\r\n------------ThIs_Is_tHe_bouNdaRY_$--\r\n\r\n'))]
 
         internal_conn = self.connection.get_connection.return_value
         internal_conn.send.assert_has_calls(expected_conn_send_calls)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
     @patch.object(os, 'remove')
-    def test_post_multipart_should_remove_temp_encoded_file(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_not_create_encoded_copy(self, mock_rm, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
                                        files="/a/path/filename.zip",
                                        baseName="archive.zip")
 
-        mock_rm.assert_called_once_with('/a/path/filename.zip.b64')
+        self.connection._open.assert_called_once_with('/a/path/filename.zip', 'rb')
+        mock_rm.assert_not_called()
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_raise_exception_when_response_status_400(self, mock_rm, mock_path_size, mock_copy,
-                                                                            mock_mmap):
+    def test_post_multipart_should_report_progress_of_each_chunk(self, mock_path_size):
+        mock_path_size.return_value = 39
+        self.__prepare_connection_to_post_multipart()
+        progress = Mock()
+
+        self.connection.post_multipart(uri='/rest/resources/', fields=None, files="/a/path/filename.zip",
+                                       baseName="archive.zip", progress=progress)
+
+        progress.assert_has_calls([call(13, 39), call(26, 39), call(39, 39)])
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_report_progress_when_using_sendfile(self, mock_path_size):
+        mock_path_size.return_value = 1048576 + 10
+        self.__prepare_connection_to_post_multipart()
+        internal_conn = self.connection.get_connection.return_value
+        internal_conn.sock = Mock()
+        internal_conn.sock.sendfile.side_effect = [1048576, 10]
+        progress = Mock()
+
+        self.connection.post_multipart(uri='/rest/resources/', fields=None, files="/a/path/filename.zip",
+                                       baseName="archive.zip", progress=progress)
+
+        fake_file = self.connection._open.return_value
+        internal_conn.sock.sendfile.assert_has_calls([call(fake_file, 0, 1048576), call(fake_file, 1048576, 10)])
+        progress.assert_has_calls([call(1048576, 1048586), call(1048586, 1048586)])
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_use_sendfile_when_socket_is_not_tls(self, mock_path_size):
+        self.__prepare_connection_to_post_multipart()
+        internal_conn = self.connection.get_connection.return_value
+        internal_conn.sock = Mock()
+
+        self.connection.post_multipart(uri='/rest/resources/',
+                                       fields=None,
+                                       files="/a/path/filename.zip",
+                                       baseName="archive.zip")
+
+        internal_conn.sock.sendfile.assert_called_once_with(self.connection._open.return_value)
+        self.assertEqual(internal_conn.send.call_count, 2)
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_close_connection_when_sending_fails(self, mock_path_size):
+        self.__prepare_connection_to_post_multipart()
+        internal_conn = self.connection.get_connection.return_value
+        internal_conn.send.side_effect = socket.error(ECONNRESET, 'Connection reset')
+
+        self.assertRaises(socket.error, self.connection.post_multipart, uri='/rest/resources/', fields=None,
+                          files="/a/path/filename.zip", baseName="archive.zip")
+
+        internal_conn.close.assert_called_once_with()
+        self.assertEqual(len(self.connection._pool), 0)
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_raise_exception_when_response_status_400(self, mock_path_size):
         self.__prepare_connection_to_post_multipart(response_status=400)
-        mock_mmap.return_value = self.__create_fake_mapped_file()
 
         try:
             self.connection.post_multipart(uri='/rest/resources/',
@@ -733,14 +899,9 @@ class ConnectionTest(unittest.TestCase):
         else:
             self.fail()
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_return_response_and_body_when_response_status_200(self, mock_rm, mock_path_size,
-                                                                                     mock_copy, mock_mmap):
+    def test_post_multipart_should_return_response_and_body_when_response_status_200(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
 
         response, body = self.connection.post_multipart(uri='/rest/resources/',
                                                         fields=None,
@@ -750,15 +911,10 @@ class ConnectionTest(unittest.TestCase):
         self.assertEqual(body, self.expected_response_body)
         self.assertEqual(response.status, 200)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
     @patch.object(json, 'loads')
-    def test_post_multipart_should_handle_json_load_exception(self, mock_json_loads, mock_rm, mock_path_size, mock_copy,
-                                                              mock_mmap):
+    def test_post_multipart_should_handle_json_load_exception(self, mock_json_loads, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
         mock_json_loads.side_effect = ValueError("Invalid JSON")
 
         response, body = self.connection.post_multipart(uri='/rest/resources/',
@@ -818,11 +974,11 @@ class ConnectionTest(unittest.TestCase):
 
         mock_conn = mock_get_connection.return_value = Mock()
         mock_conn.getresponse.return_value = Mock()
-        mock_conn.getresponse.return_value.read.side_effect = UnicodeDecodeError("utf8", b"response", 0, 4, "reason")
+        mock_conn.getresponse.return_value.read.return_value = b"\xff\xfe binary"
 
         _, body = self.connection.do_http('POST', '/rest/test', 'body')
 
-        self.assertEqual(body, '')
+        self.assertEqual(body, b"\xff\xfe binary")
 
         mock_conn.request.assert_called_once_with('POST', '/rest/test', 'body',
                                                   {'Content-Type': 'application/json',
@@ -830,6 +986,69 @@ class ConnectionTest(unittest.TestCase):
 
         mock_conn.close.assert_called_once()
 
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_parse_body_bytes(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{"name": "caf\xc3\xa9"}'
+
+        with patch('hpOneView.instrumentation.NullRequestEvent.decode_json') as mock_decode_json:
+            self.connection.do_http('GET', '/rest/test', '')
+
+        mock_decode_json.assert_called_once_with(b'{"name": "caf\xc3\xa9"}')
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_decode_compressed_body(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = zlib.compress(b'{"members": []}')
+        mock_conn.getresponse.return_value.getheader.return_value = 'deflate'
+        self.connection.enable_compression()
+
+        resp, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, {'members': []})
+        self.assertEqual(mock_conn.request.call_args[0][3]['Accept-Encoding'], 'gzip, deflate')
+        self.assertEqual(self.connection.get_compression_stats()['compressed'], 1)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_ask_for_compression_when_disabled(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        self.connection.enable_compression()
+        self.connection.disable_compression()
+
+        self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertNotIn('Accept-Encoding', mock_conn.request.call_args[0][3])
+        self.assertIsNone(self.connection.get_compression_stats())
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_return_raw_body(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{"members": []}'
+
+        resp, body = self.connection.do_http('GET', '/rest/test', '', raw=True)
+
+        self.assertIsInstance(body, RawBody)
+        self.assertEqual(body.content, b'{"members": []}')
+        self.assertEqual(body.json(), {'members': []})
+
+    @patch.object(connection, 'get_connection')
+    def test_get_raw_should_parse_error_body(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=404, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{"message": "not found"}'
+
+        try:
+            self.connection.get('/rest/test', raw=True)
+        except HPOneViewException as e:
+            self.assertEqual(e.msg, 'not found')
+        else:
+            self.fail()
+
     @patch.object(connection, 'get_connection')
     def test_do_http_with_invalid_json_return(self, mock_get_connection):
 
@@ -847,6 +1066,202 @@ class ConnectionTest(unittest.TestCase):
 
         mock_conn.close.assert_called_once()
 
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_notify_hooks(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock(sock=None)
+        mock_conn.getresponse.return_value = Mock(status=200)
+        mock_conn.getresponse.return_value.read.return_value = b'{"name": "name"}'
+        hook = Mock()
+        self.connection.add_hook(hook)
+
+        self.connection.do_http('GET', '/rest/fake/6fee02f3-b7c7-42bd-a528-04341e16bad6?view=expand', 'body')
+
+        event = hook.after_request.call_args[0][0]
+        hook.before_request.assert_called_once_with(event)
+        self.assertEqual((event.method, event.uri_template, event.status), ('GET', '/rest/fake/{id}', 200))
+        self.assertEqual((event.bytes_sent, event.bytes_received), (4, 16))
+        self.assertIsNotNone(event.tls_time)
+        self.assertIsNotNone(event.server_time)
+        self.assertIsNotNone(event.decode_time)
+        self.assertIsNotNone(event.duration)
+        self.assertIsNone(event.error)
+        mock_conn.connect.assert_called_once_with()
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_notify_hooks_of_errors(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_conn.getresponse.side_effect = HTTPException('Failure')
+        hook = Mock()
+        self.connection.add_hook(hook)
+
+        self.assertRaises(HPOneViewException, self.connection.do_http, 'GET', '/rest/fake', '')
+
+        event = hook.after_request.call_args[0][0]
+        self.assertIsInstance(event.error, HPOneViewException)
+        self.assertIsNone(event.status)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_notify_removed_hooks(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        hook = Mock()
+        self.connection.add_hook(hook)
+        self.connection.remove_hook(hook)
+
+        self.connection.do_http('GET', '/rest/fake', '')
+
+        hook.before_request.assert_not_called()
+        hook.after_request.assert_not_called()
+
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_notify_received_bytes(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_conn.getresponse.return_value = Mock(status=200)
+        self.__fake_readinto(mock_conn.getresponse.return_value, [b'12345', b'678'])
+        hook = Mock()
+        self.connection.add_hook(hook)
+
+        self.connection.download_to_stream(Mock(), '/rest/fake/file')
+
+        self.assertEqual(hook.after_request.call_args[0][0].bytes_received, 8)
+
+    @staticmethod
+    def __make_throttling_response(status, retry_after=None):
+        response = Mock(status=status, will_close=True)
+        response.read.return_value = b'{}'
+        response.getheader.side_effect = lambda name: retry_after if name == 'Retry-After' else None
+        return response
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_send_again_when_throttled(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.side_effect = [self.__make_throttling_response(503, '0'),
+                                             self.__make_throttling_response(200)]
+        self.connection.enable_rate_limiter(rate=1000, max_rate=1000)
+
+        resp, body = self.connection.do_http('GET', '/rest/fake', '')
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(mock_conn.request.call_count, 2)
+        stats = self.connection.get_rate_limiter_stats()
+        self.assertAlmostEqual(stats['rate'], 500, places=1)
+        self.assertEqual((stats['throttled'], stats['in_flight']), (1, 0))
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_return_throttled_response_after_max_retries(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.side_effect = lambda: self.__make_throttling_response(429)
+        self.connection.enable_rate_limiter(rate=1000, min_rate=1000, max_rate=1000, max_retries=2)
+
+        resp, body = self.connection.do_http('GET', '/rest/fake', '')
+
+        self.assertEqual(resp.status, 429)
+        self.assertEqual(mock_conn.request.call_count, 3)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_release_rate_limiter_when_request_fails(self, mock_get_connection):
+        mock_get_connection.return_value.getresponse.side_effect = HTTPException('timed out')
+        self.connection.enable_rate_limiter()
+
+        self.assertRaises(HPOneViewException, self.connection.do_http, 'GET', '/rest/fake', '')
+
+        self.assertEqual(self.connection.get_rate_limiter_stats()['in_flight'], 0)
+
+    def test_rate_limiter_stats_should_be_none_when_disabled(self):
+        self.connection.enable_rate_limiter()
+        self.connection.disable_rate_limiter()
+
+        self.assertIsNone(self.connection.get_rate_limiter_stats())
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_retry_idempotent_request_on_transient_error(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.sock = None
+        mock_conn.getresponse.side_effect = [socket.error(ETIMEDOUT, 'timed out'), self.__make_throttling_response(200)]
+
+        resp, body = self.connection.do_http('GET', '/rest/fake', '')
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(mock_conn.request.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_raise_after_max_attempts(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.sock = None
+        mock_conn.getresponse.side_effect = BadStatusLine(0)
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=4))
+
+        self.assertRaises(HPOneViewException, self.connection.do_http, 'GET', '/rest/fake', '')
+
+        self.assertEqual(mock_conn.request.call_count, 4)
+        self.assertEqual(mock_sleep.call_count, 3)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_retry_post_on_transient_error(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.sock = None
+        mock_conn.getresponse.side_effect = BadStatusLine(0)
+
+        with self.assertRaises(HPOneViewException) as context:
+            self.connection.do_http('POST', '/rest/fake', '{}')
+        self.assertIsInstance(context.exception.__cause__, BadStatusLine)
+
+        self.assertEqual(mock_conn.request.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_retry_put_after_disable_etag_validation(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.sock = None
+        mock_conn.getresponse.side_effect = BadStatusLine(0)
+        self.connection.disable_etag_validation()
+
+        self.assertRaises(HPOneViewException, self.connection.do_http, 'PUT', '/rest/fake', '{"name": "a"}')
+
+        self.assertEqual(mock_conn.request.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_retry_idempotent_request_on_retryable_status(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.side_effect = [self.__make_throttling_response(502),
+                                             self.__make_throttling_response(503, '7'),
+                                             self.__make_throttling_response(200)]
+
+        resp, body = self.connection.do_http('PUT', '/rest/fake', '{"eTag": "1"}')
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(mock_conn.request.call_count, 3)
+        self.assertGreaterEqual(mock_sleep.call_args_list[1][0][0], 7)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_return_retryable_status_when_retry_policy_is_disabled(self, mock_get_connection, mock_sleep):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.side_effect = lambda: self.__make_throttling_response(504)
+        self.connection.set_retry_policy(None)
+
+        resp, body = self.connection.do_http('GET', '/rest/fake', '')
+
+        self.assertEqual(resp.status, 504)
+        self.assertEqual(mock_conn.request.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    def test_record_task_wait_should_notify_hooks(self):
+        hook = Mock()
+        self.connection.add_hook(hook)
+
+        self.connection.record_task_wait('/rest/tasks/1', 2.5, 3)
+
+        event = hook.after_task_wait.call_args[0][0]
+        self.assertEqual((event.uri, event.duration, event.poll_count, event.error), ('/rest/tasks/1', 2.5, 3, None))
+
     @patch.object(connection, 'get_connection')
     def test_do_http_with_bad_status_line(self, mock_get_connection):
 
@@ -976,14 +1391,13 @@ class ConnectionTest(unittest.TestCase):
                                     call('/a/path/filename.zip.b64', 'wb')])
 
         mock_out.write.assert_has_calls(
-            [call(bytearray(b'------------ThIs_Is_tHe_bouNdaRY_$\r\n')),
-             call(bytearray(
-                 b'Content-Disposition: form-data; name="file"; filename="filename.zip"\r\n')),
-             call(bytearray(b'Content-Type: application/octet-stream\r\n')),
-             call(bytearray(b'\r\n')),
-             call(bytearray(b'\r\n')),
-             call(bytearray(b'------------ThIs_Is_tHe_bouNdaRY_$--\r\n')),
-             call(bytearray(b'\r\n'))])
+            [call(bytearray(b'------------ThIs_Is_tHe_bouNdaRY_$\r\n'
+                            b'Content-Disposition: form-data; name="file"; filename="filename.zip"\r\n'
+                            b'Content-Type: application/octet-stream\r\n'
+                            b'\r\n')),
+             call(bytearray(b'\r\n'
+                            b'------------ThIs_Is_tHe_bouNdaRY_$--\r\n'
+                            b'\r\n'))])
 
         mock_in.close.assert_called_once()
         mock_out.close.assert_called_once()
@@ -1029,6 +1443,585 @@ class ConnectionTest(unittest.TestCase):
         self.assertEqual(conn.port, 443)
         self.assertEqual(conn._context.protocol, ssl.PROTOCOL_TLSv1_2)
 
+    def test_do_http_should_keep_connection_open_when_response_allows_keep_alive(self):
+        mock_conn = Mock(sock=None)
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=False)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        self.connection.get_connection = Mock(return_value=mock_conn)
+
+        def fake_request(*args):
+            mock_conn.sock = Mock()
+        mock_conn.request.side_effect = fake_request
+
+        with patch('select.select', return_value=([], [], [])):
+            self.connection.do_http('GET', '/rest/test', '')
+            self.connection.do_http('GET', '/rest/test', '')
+
+        self.connection.get_connection.assert_called_once_with()
+        mock_conn.close.assert_not_called()
+        self.assertEqual(len(self.connection._pool), 1)
+
+    def test_do_http_should_close_connection_when_response_asks_to_close(self):
+        mock_conn = Mock()
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        self.connection.get_connection = Mock(return_value=mock_conn)
+
+        self.connection.do_http('GET', '/rest/test', '')
+
+        mock_conn.close.assert_called_once_with()
+        self.assertEqual(len(self.connection._pool), 0)
+
+    @patch('time.sleep')
+    def test_do_http_should_retry_without_waiting_when_keep_alive_connection_was_dropped(self, mock_sleep):
+        dropped_conn = Mock()
+        dropped_conn.request.side_effect = socket.error(ECONNRESET, 'Connection reset by peer')
+        new_conn = Mock(sock=None)
+        new_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        new_conn.getresponse.return_value.read.return_value = b'{}'
+        self.connection._pool.acquire = Mock(side_effect=[dropped_conn, new_conn])
+
+        resp, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, {})
+        dropped_conn.close.assert_called_once_with()
+        mock_sleep.assert_not_called()
+
+    def test_do_http_should_raise_connection_errors_of_new_connections(self):
+        new_conn = Mock(sock=None)
+        new_conn.request.side_effect = socket.error(ECONNRESET, 'Connection reset by peer')
+        self.connection._pool.acquire = Mock(return_value=new_conn)
+
+        self.assertRaises(socket.error, self.connection.do_http, 'GET', '/rest/test', '')
+
+    def test_set_proxy_should_close_idle_connections(self):
+        idle_conn = Mock()
+        self.connection._pool.release(idle_conn)
+
+        self.connection.set_proxy('10.0.0.1', 3128)
+
+        idle_conn.close.assert_called_once_with()
+        self.assertEqual(len(self.connection._pool), 0)
+
+    @patch.object(ssl.SSLContext, 'load_verify_locations')
+    def test_get_connection_should_reuse_ssl_context(self, mock_lvl):
+        self.connection.set_trusted_ssl_bundle('/test')
+
+        first_conn = self.connection.get_connection()
+        second_conn = self.connection.get_connection()
+
+        self.assertIs(first_conn._context, second_conn._context)
+        mock_lvl.assert_called_once_with('/test')
+
+    @patch.object(ssl.SSLContext, 'load_verify_locations')
+    def test_set_trusted_ssl_bundle_should_rebuild_ssl_context(self, mock_lvl):
+        first_context = self.connection.get_ssl_context()
+
+        self.connection.set_trusted_ssl_bundle('/test')
+
+        self.assertIsNot(self.connection.get_ssl_context(), first_context)
+        self.assertEqual(self.connection.get_ssl_context().verify_mode, ssl.CERT_REQUIRED)
+
+    def test_get_connection_should_share_tls_sessions(self):
+        conn = self.connection.get_connection()
+
+        self.assertIsInstance(conn, ResumableHTTPSConnection)
+        self.assertIs(conn._tls_sessions, self.connection._tls_sessions)
+
+    def test_get_tls_handshake_stats(self):
+        self.assertEqual(self.connection.get_tls_handshake_stats(), dict(full_handshakes=0, resumed_handshakes=0))
+
+    def test_set_connection_pool(self):
+        self.connection.set_connection_pool(max_size=2, idle_timeout=30)
+
+        self.assertEqual(self.connection._pool.max_size, 2)
+        self.assertEqual(self.connection._pool.idle_timeout, 30)
+
+    def test_get_pagination_should_return_the_set_pagination(self):
+        default_max_workers = self.connection.get_pagination()['max_workers']
+
+        self.connection.set_pagination(page_size=500)
+
+        self.assertEqual(self.connection.get_pagination(), dict(page_size=500, max_workers=default_max_workers))
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_not_send_if_none_match_when_response_cache_is_disabled(self, mock_do_http):
+        mock_do_http.return_value = (Mock(status=200), {'uri': '/rest/fake/1', 'eTag': '1'})
+
+        self.connection.get('/rest/fake/1')
+        self.connection.get('/rest/fake/1')
+
+        mock_do_http.assert_called_with('GET', '/rest/fake/1', '')
+        self.assertIsNone(self.connection.get_response_cache_stats())
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_serve_cached_body_when_not_modified(self, mock_do_http):
+        response = Mock(status=200)
+        response.getheader.return_value = '"etag-1"'
+        mock_do_http.side_effect = [(response, {'uri': '/rest/fake/1', 'name': 'name'}), (Mock(status=304), '')]
+        self.connection.enable_response_cache()
+
+        first = self.connection.get('/rest/fake/1')
+        second = self.connection.get('/rest/fake/1')
+
+        self.assertEqual(second, first)
+        self.assertIsNot(second, first)
+        mock_do_http.assert_called_with('GET', '/rest/fake/1', '', custom_headers={'If-None-Match': '"etag-1"'})
+        self.assertEqual(self.connection.get_response_cache_stats(), dict(entries=1, hits=1, misses=1))
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_use_body_etag_when_header_is_missing(self, mock_do_http):
+        response = Mock(status=200)
+        response.getheader.return_value = None
+        mock_do_http.return_value = (response, {'uri': '/rest/fake/1', 'eTag': 'etag-1'})
+        self.connection.enable_response_cache()
+
+        self.connection.get('/rest/fake/1')
+        self.connection.get('/rest/fake/1')
+
+        mock_do_http.assert_called_with('GET', '/rest/fake/1', '', custom_headers={'If-None-Match': 'etag-1'})
+
+    @patch.object(connection, 'do_http')
+    def test_put_should_invalidate_cached_resource(self, mock_do_http):
+        self.connection.enable_response_cache()
+        self.connection._response_cache.update('/rest/fake/1', 'etag-1', {'name': 'name'})
+        mock_do_http.return_value = (Mock(status=200), {'name': 'changed'})
+
+        self.connection.put('/rest/fake/1?force=True', {'name': 'changed'})
+
+        self.assertIsNone(self.connection._response_cache.lookup('/rest/fake/1'))
+
+    def test_invalidate_response_cache_should_remove_the_changed_resource(self):
+        self.connection.enable_response_cache()
+        self.connection._response_cache.update('/rest/fake/1', 'etag', {'name': 'cached'})
+
+        self.connection.invalidate_response_cache('/rest/fake/1')
+
+        self.assertIsNone(self.connection._response_cache.lookup('/rest/fake/1'))
+
+    def test_disable_response_cache(self):
+        self.connection.enable_response_cache()
+        self.connection.disable_response_cache()
+
+        self.assertIsNone(self.connection._response_cache)
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.factory = Mock(side_effect=lambda: Mock(sock=Mock()))
+        self.pool = ConnectionPool(self.factory, max_size=2, idle_timeout=60)
+
+    def test_acquire_should_create_connection_when_pool_is_empty(self):
+        self.pool.acquire()
+
+        self.factory.assert_called_once_with()
+
+    @patch('select.select', return_value=([], [], []))
+    def test_acquire_should_reuse_released_connection(self, mock_select):
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+
+        self.assertIs(self.pool.acquire(), conn)
+        self.factory.assert_called_once_with()
+
+    @patch('select.select')
+    def test_acquire_should_discard_connection_closed_by_the_server(self, mock_select):
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        mock_select.return_value = ([conn.sock], [], [])
+
+        new_conn = self.pool.acquire()
+
+        self.assertIsNot(new_conn, conn)
+        conn.close.assert_called_once_with()
+
+    @patch('time.time')
+    def test_acquire_should_discard_expired_connection(self, mock_time):
+        mock_time.return_value = 1000
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        mock_time.return_value = 1061
+
+        new_conn = self.pool.acquire()
+
+        self.assertIsNot(new_conn, conn)
+        conn.close.assert_called_once_with()
+
+    def test_release_should_close_connection_when_not_reusable(self):
+        conn = self.pool.acquire()
+
+        self.pool.release(conn, reusable=False)
+
+        conn.close.assert_called_once_with()
+        self.assertEqual(len(self.pool), 0)
+
+    def test_release_should_close_connection_when_pool_is_full(self):
+        conns = [self.pool.acquire() for _ in range(3)]
+
+        for conn in conns:
+            self.pool.release(conn)
+
+        self.assertEqual(len(self.pool), 2)
+        conns[2].close.assert_called_once_with()
+
+    def test_configure_should_evict_connections_exceeding_the_new_size(self):
+        conns = [self.pool.acquire() for _ in range(2)]
+        for conn in conns:
+            self.pool.release(conn)
+
+        self.pool.configure(max_size=1)
+
+        self.assertEqual(len(self.pool), 1)
+        conns[0].close.assert_called_once_with()
+        conns[1].close.assert_not_called()
+
+    def test_clear_should_close_idle_connections(self):
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+
+        self.pool.clear()
+
+        conn.close.assert_called_once_with()
+        self.assertEqual(len(self.pool), 0)
+
+
+class ResumableHTTPSConnectionTest(unittest.TestCase):
+    def setUp(self):
+        self.tls_sessions = TLSSessionCache()
+        self.context = Mock()
+        self.conn = ResumableHTTPSConnection('127.0.0.1', context=self.context, tls_sessions=self.tls_sessions)
+
+    @patch('http.client.HTTPConnection.connect')
+    def test_connect_should_offer_cached_session(self, mock_connect):
+        session = Mock()
+        self.tls_sessions._session = session
+        self.context.wrap_socket.return_value = Mock(session=session, session_reused=True)
+
+        self.conn.connect()
+
+        self.context.wrap_socket.assert_called_once_with(ANY, server_hostname='127.0.0.1', session=session)
+        self.assertEqual(self.tls_sessions.get_stats(), dict(full_handshakes=0, resumed_handshakes=1))
+
+    @patch('http.client.HTTPConnection.connect')
+    def test_connect_should_keep_negotiated_session(self, mock_connect):
+        session = Mock()
+        self.context.wrap_socket.return_value = Mock(session=session, session_reused=False)
+
+        self.conn.connect()
+
+        self.context.wrap_socket.assert_called_once_with(ANY, server_hostname='127.0.0.1', session=None)
+        self.assertIs(self.tls_sessions.get(), session)
+        self.assertEqual(self.tls_sessions.get_stats(), dict(full_handshakes=1, resumed_handshakes=0))
+
+    @patch('http.client.HTTPConnection.connect')
+    def test_connect_through_proxy_should_use_appliance_as_server_hostname(self, mock_connect):
+        self.context.wrap_socket.return_value = Mock(session=None, session_reused=False)
+        self.conn = ResumableHTTPSConnection('10.0.0.1', 3128, context=self.context, tls_sessions=self.tls_sessions)
+        self.conn.set_tunnel('127.0.0.1', 443)
+
+        self.conn.connect()
+
+        self.context.wrap_socket.assert_called_once_with(ANY, server_hostname='127.0.0.1', session=None)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(max_size=2, ttl=60, resource_ttls={'/rest/tasks': 0, '/rest/server-hardware': 600})
+
+    def test_lookup_should_return_stored_entry(self):
+        self.cache.update('/rest/fake/1', 'etag-1', {'name': 'name'})
+
+        self.assertEqual(self.cache.lookup('/rest/fake/1'), ('etag-1', {'name': 'name'}))
+
+    def test_update_should_evict_least_recently_used(self):
+        self.cache.update('/rest/fake/1', 'etag-1', {})
+        self.cache.update('/rest/fake/2', 'etag-2', {})
+        self.cache.revalidated('/rest/fake/1', self.cache.lookup('/rest/fake/1'))
+
+        self.cache.update('/rest/fake/3', 'etag-3', {})
+
+        self.assertIsNotNone(self.cache.lookup('/rest/fake/1'))
+        self.assertIsNone(self.cache.lookup('/rest/fake/2'))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_update_without_etag_should_remove_entry(self):
+        self.cache.update('/rest/fake/1', 'etag-1', {})
+
+        self.cache.update('/rest/fake/1', None, {})
+
+        self.assertIsNone(self.cache.lookup('/rest/fake/1'))
+
+    @patch('time.time')
+    def test_lookup_should_discard_expired_entry(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.update('/rest/fake/1', 'etag-1', {})
+        self.cache.update('/rest/server-hardware/1', 'etag-1', {})
+
+        mock_time.return_value = 1061
+
+        self.assertIsNone(self.cache.lookup('/rest/fake/1'))
+        self.assertIsNotNone(self.cache.lookup('/rest/server-hardware/1'))
+
+    @patch('time.time')
+    def test_revalidated_entry_should_outlive_its_original_ttl(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.update('/rest/fake/1', 'etag-1', {'name': 'name'})
+
+        mock_time.return_value = 1050
+        self.cache.revalidated('/rest/fake/1', self.cache.lookup('/rest/fake/1'))
+        mock_time.return_value = 1100
+
+        self.assertEqual(self.cache.lookup('/rest/fake/1'), ('etag-1', {'name': 'name'}))
+
+        mock_time.return_value = 1111
+
+        self.assertIsNone(self.cache.lookup('/rest/fake/1'))
+
+    def test_resource_type_with_ttl_0_should_not_be_cached(self):
+        self.cache.update('/rest/tasks/1', 'etag-1', {})
+
+        self.assertIsNone(self.cache.lookup('/rest/tasks/1'))
+
+    def test_get_ttl_should_use_longest_prefix(self):
+        cache = ResponseCache(resource_ttls={'/rest/server-hardware': 600, '/rest/server-hardware-types': 10})
+
+        self.assertEqual(cache.get_ttl('/rest/server-hardware/1'), 600)
+        self.assertEqual(cache.get_ttl('/rest/server-hardware-types/1?view=expand'), 10)
+        self.assertEqual(cache.get_ttl('/rest/fake'), ResponseCache.DEFAULT_TTL)
+
+    def test_invalidate_should_remove_resource_subresources_and_collection(self):
+        cache = ResponseCache()
+        for uri in ['/rest/fake/1', '/rest/fake/1/utilization', '/rest/fake?start=0&count=-1', '/rest/fake/2']:
+            cache.update(uri, 'etag', {})
+
+        cache.invalidate('/rest/fake/1')
+
+        self.assertIsNotNone(cache.lookup('/rest/fake/2'))
+        self.assertEqual(len(cache), 1)
+
+    def test_revalidated_should_return_a_copy(self):
+        self.cache.update('/rest/fake/1', 'etag-1', {'list': [1]})
+
+        body = self.cache.revalidated('/rest/fake/1', self.cache.lookup('/rest/fake/1'))
+        body['list'].append(2)
+
+        self.assertEqual(self.cache.lookup('/rest/fake/1')[1], {'list': [1]})
+        self.assertEqual(self.cache.get_stats(), dict(entries=1, hits=1, misses=1))
+
+
+class AdaptiveRateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.limiter = AdaptiveRateLimiter(rate=10, min_rate=2, max_rate=12, max_in_flight=2, target_latency=5)
+
+    def test_release_should_increase_rate_after_success(self):
+        self.limiter.acquire()
+        self.limiter.release(200, 0.1)
+
+        self.assertAlmostEqual(self.limiter.rate, 10.1)
+
+    def test_release_should_not_exceed_max_rate(self):
+        limiter = AdaptiveRateLimiter(rate=100, max_rate=100.5, increase=10)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(200, 0.1)
+
+        self.assertEqual(limiter.rate, 100.5)
+
+    def test_release_should_halve_rate_when_throttled(self):
+        self.limiter.acquire()
+        self.limiter.release(503, 0.1)
+
+        self.assertEqual(self.limiter.rate, 5)
+        self.assertEqual(self.limiter.get_stats(), dict(rate=5, in_flight=0, throttled=1, slow=0))
+
+    def test_release_should_halve_rate_when_response_is_slow(self):
+        self.limiter.acquire()
+        self.limiter.release(200, 6)
+
+        self.assertEqual(self.limiter.rate, 5)
+        self.assertEqual(self.limiter.get_stats()['slow'], 1)
+
+    def test_release_should_cut_rate_once_for_concurrent_signals(self):
+        self.limiter.acquire()
+        self.limiter.acquire()
+        self.limiter.release(429, 0.1)
+        self.limiter.release(429, 0.1)
+
+        self.assertEqual(self.limiter.rate, 5)
+
+    @patch('time.time')
+    def test_release_should_not_go_below_min_rate(self, mock_time):
+        mock_time.return_value = 1000
+        limiter = AdaptiveRateLimiter(rate=10, min_rate=2, target_latency=5)
+        for now in range(10, 60, 10):
+            # Each cut is past the target latency of the previous one
+            mock_time.return_value = 1000 + now
+            limiter.acquire()
+            limiter.release(503, 0.1)
+
+        self.assertEqual(limiter.rate, 2)
+
+    def test_release_should_ignore_errors_without_response(self):
+        self.limiter.acquire()
+        self.limiter.release(None, 0.1)
+
+        self.assertEqual(self.limiter.rate, 10)
+        self.assertEqual(self.limiter.get_stats()['in_flight'], 0)
+
+    def test_acquire_should_wait_for_tokens(self):
+        limiter = AdaptiveRateLimiter(rate=20, max_in_flight=10)
+        started = time.time()
+
+        for _ in range(4):
+            limiter.acquire()
+
+        self.assertGreaterEqual(time.time() - started, 0.14)
+
+    def test_acquire_should_wait_for_requests_in_flight(self):
+        limiter = AdaptiveRateLimiter(rate=1000, max_in_flight=1)
+        limiter.acquire()
+        acquired = threading.Event()
+        thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        thread.start()
+
+        self.assertFalse(acquired.wait(0.1))
+        limiter.release(200, 0.1)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+    def test_acquire_should_pause_after_retry_after(self):
+        limiter = AdaptiveRateLimiter(rate=1000)
+        limiter.acquire()
+        limiter.release(429, 0.1, retry_after=0.2)
+        started = time.time()
+
+        limiter.acquire()
+
+        self.assertGreaterEqual(time.time() - started, 0.19)
+
+
+class ResponseCompressionTest(unittest.TestCase):
+    CONTENT = b'{"members": [' + b', '.join([b'{"name": "server"}'] * 100) + b']}'
+
+    def setUp(self):
+        self.compression = ResponseCompression()
+
+    @staticmethod
+    def __response(encoding):
+        return Mock(getheader=Mock(side_effect=lambda name: encoding if name == 'Content-Encoding' else None))
+
+    def __encode(self, wbits):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, wbits)
+        return compressor.compress(self.CONTENT) + compressor.flush()
+
+    def test_decode_gzip(self):
+        self.assertEqual(self.compression.decode(self.__response('gzip'), self.__encode(16 + zlib.MAX_WBITS)),
+                         self.CONTENT)
+
+    def test_decode_deflate_with_and_without_zlib_header(self):
+        self.assertEqual(self.compression.decode(self.__response('deflate'), self.__encode(zlib.MAX_WBITS)),
+                         self.CONTENT)
+        self.assertEqual(self.compression.decode(self.__response('Deflate'), self.__encode(-zlib.MAX_WBITS)),
+                         self.CONTENT)
+
+    def test_decode_should_return_identity_body_as_is(self):
+        self.assertIs(self.compression.decode(self.__response(None), self.CONTENT), self.CONTENT)
+
+    def test_writer_should_decode_chunk_by_chunk(self):
+        encoded = self.__encode(16 + zlib.MAX_WBITS)
+        written = []
+        writer = self.compression.get_writer(self.__response('gzip'), written.append)
+
+        for index in range(0, len(encoded), 7):
+            writer.write(memoryview(encoded)[index:index + 7])
+        writer.close()
+
+        self.assertEqual(b''.join(written), self.CONTENT)
+
+    def test_get_stats_should_report_the_ratio(self):
+        encoded = self.__encode(16 + zlib.MAX_WBITS)
+        self.compression.decode(self.__response('gzip'), encoded)
+        self.compression.decode(self.__response(None), b'{}')
+
+        stats = self.compression.get_stats()
+
+        self.assertEqual((stats['responses'], stats['compressed']), (2, 1))
+        self.assertEqual(stats['bytes_received'], len(encoded) + 2)
+        self.assertEqual(stats['bytes_decoded'], len(self.CONTENT) + 2)
+        self.assertAlmostEqual(stats['ratio'], (len(self.CONTENT) + 2.0) / (len(encoded) + 2))
+
+    def test_get_stats_without_responses(self):
+        self.assertIsNone(self.compression.get_stats()['ratio'])
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, backoff=2, max_backoff=5)
+
+    def test_is_idempotent(self):
+        self.assertTrue(self.policy.is_idempotent('GET'))
+        self.assertTrue(self.policy.is_idempotent('delete'))
+        self.assertFalse(self.policy.is_idempotent('POST', {}, '{"eTag": "1"}'))
+        self.assertFalse(self.policy.is_idempotent('PATCH', {'If-Match': '1'}, '[]'))
+
+    def test_put_is_idempotent_only_with_etag(self):
+        self.assertTrue(self.policy.is_idempotent('PUT', {'If-Match': '"1"'}, '{}'))
+        self.assertTrue(self.policy.is_idempotent('PUT', {}, json.dumps({'name': 'a', 'eTag': '1'})))
+        self.assertTrue(self.policy.is_idempotent('PUT', {}, {'eTag': '1'}))
+        self.assertFalse(self.policy.is_idempotent('PUT', {}, '{"name": "a"}'))
+        self.assertFalse(self.policy.is_idempotent('PUT', {}, '{"eTag": null}'))
+        self.assertFalse(self.policy.is_idempotent('PUT', {}, '"eTag"}'))
+
+    def test_put_with_wildcard_etag_is_not_idempotent(self):
+        self.assertFalse(self.policy.is_idempotent('PUT', {'If-Match': '*'}, '{}'))
+        self.assertFalse(self.policy.is_idempotent('PUT', {}, '{"name": "a", "eTag": "*"}'))
+        self.assertFalse(self.policy.is_idempotent('PUT', {}, {'eTag': '*'}))
+
+    def test_is_retryable_error(self):
+        self.assertTrue(self.policy.is_retryable_error(BadStatusLine(0)))
+        self.assertTrue(self.policy.is_retryable_error(socket.timeout()))
+        self.assertTrue(self.policy.is_retryable_error(socket.error(ECONNRESET, 'reset')))
+        self.assertFalse(self.policy.is_retryable_error(socket.error(2, 'not found')))
+        self.assertFalse(self.policy.is_retryable_error(ValueError()))
+
+    def test_get_delay_should_be_jittered_and_capped(self):
+        with patch('random.uniform', side_effect=lambda low, high: high) as mock_uniform:
+            self.assertEqual([self.policy.get_delay(attempt) for attempt in (1, 2, 3)], [2, 4, 5])
+        self.assertEqual(mock_uniform.call_args[0][0], 0)
+
+    @patch('time.sleep')
+    def test_attempts_should_stop_at_max_attempts(self, mock_sleep):
+        attempts = self.policy.start('GET')
+
+        self.assertTrue(attempts.retry_error(BadStatusLine(0)))
+        self.assertTrue(attempts.retry_response(Mock(status=503, getheader=Mock(return_value=None))))
+        self.assertFalse(attempts.retry_error(BadStatusLine(0)))
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch('time.sleep')
+    def test_attempts_should_not_retry_non_retryable_status(self, mock_sleep):
+        attempts = self.policy.start('GET')
+
+        self.assertFalse(attempts.retry_response(Mock(status=500)))
+        mock_sleep.assert_not_called()
+
+
+class GetRetryAfterTest(unittest.TestCase):
+    def test_get_retry_after_with_seconds(self):
+        self.assertEqual(get_retry_after(Mock(getheader=Mock(return_value='30'))), 30)
+
+    @patch('time.time')
+    def test_get_retry_after_with_http_date(self, mock_time):
+        mock_time.return_value = 1445412480
+        response = Mock(getheader=Mock(return_value='Wed, 21 Oct 2015 07:28:20 GMT'))
+
+        self.assertEqual(get_retry_after(response), 20)
+
+    def test_get_retry_after_without_header(self):
+        self.assertIsNone(get_retry_after(Mock(getheader=Mock(return_value=None))))
+        self.assertIsNone(get_retry_after(Mock(getheader=Mock(return_value='soon'))))
+        self.assertIsNone(get_retry_after(None))
+
 
 if __name__ == '__main__':
     unittest.main()
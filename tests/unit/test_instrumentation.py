@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import unittest
+
+import mock
+
+from hpOneView.instrumentation import HistogramCollector, Histogram, RequestEvent, TaskWaitEvent, NULL_REQUEST_EVENT
+from hpOneView.instrumentation import export_prometheus_text, get_uri_template
+
+
+class GetUriTemplateTest(unittest.TestCase):
+    def test_get_uri_template_should_replace_ids(self):
+        self.assertEqual(get_uri_template('/rest/server-profiles/6fee02f3-b7c7-42bd-a528-04341e16bad6?view=expand'),
+                         '/rest/server-profiles/{id}')
+        self.assertEqual(get_uri_template('/rest/server-hardware/30373237-3132-4D32-3235-303930524D52/utilization'),
+                         '/rest/server-hardware/{id}/utilization')
+        self.assertEqual(get_uri_template('/rest/enclosures/09SGH100X6J1'), '/rest/enclosures/{id}')
+
+    def test_get_uri_template_should_keep_collection_names(self):
+        self.assertEqual(get_uri_template('/rest/id-pools/ipv4/subnets'), '/rest/id-pools/ipv4/subnets')
+        self.assertEqual(get_uri_template('/rest/logindetails'), '/rest/logindetails')
+
+
+class RequestEventTest(unittest.TestCase):
+    @mock.patch('hpOneView.instrumentation.default_timer')
+    def test_request_event_should_measure_times(self, mock_timer):
+        mock_timer.side_effect = [0.0, 0.5, 1.0, 2.0, 4.0, 5.0, 5.5, 8.0]
+        conn = mock.Mock(sock=None)
+        event = RequestEvent('GET', '/rest/fake')
+
+        event.connect(conn)
+        event.request_sent()
+        event.response_received(mock.Mock(status=200))
+        self.assertEqual(event.decode_json('{"a": 1}'), {'a': 1})
+        event.finish()
+
+        self.assertEqual((event.tls_time, event.server_time, event.decode_time, event.duration), (0.5, 2.0, 0.5, 8.0))
+        self.assertEqual(event.status, 200)
+
+    def test_connect_should_not_measure_reused_connection(self):
+        conn = mock.Mock()
+        event = RequestEvent('GET', '/rest/fake')
+
+        event.connect(conn)
+
+        self.assertIsNone(event.tls_time)
+        conn.connect.assert_not_called()
+
+    def test_null_request_event_should_decode_json(self):
+        self.assertEqual(NULL_REQUEST_EVENT.decode_json('{"a": 1}'), {'a': 1})
+        self.assertRaises(ValueError, NULL_REQUEST_EVENT.decode_json, 'not json')
+
+
+class HistogramTest(unittest.TestCase):
+    def test_observe_should_count_values_in_buckets(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+
+        for value in [0.05, 0.1, 0.5, 2.0]:
+            histogram.observe(value)
+
+        self.assertEqual(histogram.get_cumulative_counts(), [(0.1, 2), (1.0, 3), (float('inf'), 4)])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 2.65)
+
+
+class HistogramCollectorTest(unittest.TestCase):
+    def setUp(self):
+        self.collector = HistogramCollector(buckets=(0.1, 1.0))
+
+    def request_event(self, status=200, tls_time=None):
+        event = RequestEvent('GET', '/rest/fake/6fee02f3-b7c7-42bd-a528-04341e16bad6', 10)
+        event.status = status
+        event.bytes_received = 100
+        event.server_time = 0.05
+        event.tls_time = tls_time
+        event.duration = 0.5
+        return event
+
+    def test_after_request_should_observe_measures(self):
+        self.collector.after_request(self.request_event(tls_time=0.02))
+        self.collector.after_request(self.request_event())
+
+        histograms = self.collector.get_histograms()
+        labels = (('method', 'GET'), ('uri', '/rest/fake/{id}'))
+        self.assertEqual(histograms[('oneview_request_duration_seconds', labels + (('status', '200'),))].count, 2)
+        self.assertEqual(histograms[('oneview_request_tls_seconds', labels)].count, 1)
+        self.assertNotIn(('oneview_response_decode_seconds', labels), histograms)
+        self.assertEqual(self.collector.get_counters()[('oneview_response_received_bytes_total', labels)], 200)
+
+    def test_after_request_should_label_failed_requests(self):
+        self.collector.after_request(self.request_event(status=None))
+
+        keys = [labels for name, labels in self.collector.get_histograms() if name == 'oneview_request_duration_seconds']
+        self.assertEqual(dict(keys[0])['status'], 'error')
+
+    def test_after_task_wait_should_observe_duration_and_polls(self):
+        self.collector.after_task_wait(TaskWaitEvent('/rest/tasks/1', 12.0, 4))
+
+        labels = (('status', 'completed'),)
+        self.assertEqual(self.collector.get_histograms()[('oneview_task_wait_seconds', labels)].sum, 12.0)
+        self.assertEqual(self.collector.get_counters()[('oneview_task_polls_total', labels)], 4)
+
+    def test_clear(self):
+        self.collector.after_request(self.request_event())
+
+        self.collector.clear()
+
+        self.assertEqual(self.collector.get_histograms(), {})
+        self.assertEqual(self.collector.get_counters(), {})
+
+
+class ExportPrometheusTextTest(unittest.TestCase):
+    def test_export_prometheus_text(self):
+        collector = HistogramCollector(buckets=(1.0,))
+        collector.after_task_wait(TaskWaitEvent('/rest/tasks/1', 0.5, 2))
+
+        self.assertEqual(export_prometheus_text(collector),
+                         '# TYPE oneview_task_wait_seconds histogram\n'
+                         'oneview_task_wait_seconds_bucket{status="completed",le="1.0"} 1\n'
+                         'oneview_task_wait_seconds_bucket{status="completed",le="+Inf"} 1\n'
+                         'oneview_task_wait_seconds_sum{status="completed"} 0.5\n'
+                         'oneview_task_wait_seconds_count{status="completed"} 1\n'
+                         '# TYPE oneview_task_polls_total counter\n'
+                         'oneview_task_polls_total{status="completed"} 2\n')
+
+    def test_export_prometheus_text_should_escape_label_values(self):
+        collector = HistogramCollector()
+        event = RequestEvent('GET', '/rest/"fake"')
+        event.duration = 0.1
+        collector.after_request(event)
+
+        self.assertIn('uri="/rest/\\"fake\\""', export_prometheus_text(collector))
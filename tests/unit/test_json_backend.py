@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2018) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import unittest
+
+import mock
+
+from hpOneView import json_backend
+from hpOneView.json_backend import RawBody
+
+
+class JsonBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.backend = json_backend.get_backend()
+
+    def tearDown(self):
+        json_backend.set_backend(self.backend)
+
+    def test_set_backend_should_select_the_first_installed_parser(self):
+        with mock.patch('importlib.import_module', side_effect=ImportError):
+            json_backend.set_backend()
+
+        self.assertEqual(json_backend.get_backend(), 'json')
+
+    def test_set_backend_should_raise_when_parser_is_not_installed(self):
+        with mock.patch('importlib.import_module', side_effect=ImportError):
+            self.assertRaises(ValueError, json_backend.set_backend, 'ujson')
+
+        self.assertEqual(json_backend.get_backend(), self.backend)
+
+    def test_loads_should_parse_bytes_with_every_backend(self):
+        for backend in json_backend.BACKENDS:
+            try:
+                json_backend.set_backend(backend)
+            except ValueError:
+                continue
+            self.assertEqual(json_backend.loads(b'{"name": "caf\xc3\xa9", "count": 2}'), {'name': u'caf\xe9', 'count': 2})
+            self.assertEqual(json_backend.loads('[1, 2.5]'), [1, 2.5])
+
+    def test_loads_should_fall_back_to_json_module(self):
+        fast_loads = mock.Mock(side_effect=ValueError)
+        with mock.patch.object(json_backend, '_loads', fast_loads):
+            self.assertEqual(json_backend.loads(b'{"a": 1}'), {'a': 1})
+
+        fast_loads.assert_called_once_with(b'{"a": 1}')
+
+    def test_loads_should_raise_value_error_when_not_json(self):
+        self.assertRaises(ValueError, json_backend.loads, b'not json')
+        self.assertRaises(ValueError, json_backend.loads, b'\xff\xfe')
+
+
+class RawBodyTest(unittest.TestCase):
+    def test_json_should_be_parsed_once(self):
+        body = RawBody(b'{"members": []}')
+
+        with mock.patch.object(json_backend, 'loads', wraps=json_backend.loads) as mock_loads:
+            self.assertEqual(body.json(), {'members': []})
+            self.assertIs(body.json(), body.json())
+
+        mock_loads.assert_called_once_with(b'{"members": []}')
+
+    def test_raw_body_content(self):
+        body = RawBody(b'{"a": 1}')
+
+        self.assertEqual(body.content, b'{"a": 1}')
+        self.assertEqual(body.text, '{"a": 1}')
+        self.assertEqual(len(body), 8)
+        self.assertIsNone(RawBody(b'').json())
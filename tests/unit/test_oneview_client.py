@@ -22,11 +22,19 @@
 ###
 
 import io
+import json
+import os
+import subprocess
+import sys
 import unittest
 import mock
 
+import hpOneView
+
 from hpOneView.connection import connection
-from hpOneView.oneview_client import OneViewClient
+from hpOneView import oneview_client
+from hpOneView.oneview_client import OneViewClient, RESOURCE_MODULES, get_resource_class
+from hpOneView.resources.resource import ResourceClient
 from hpOneView.resources.security.certificate_authority import CertificateAuthority
 from hpOneView.resources.data_services.metric_streaming import MetricStreaming
 from hpOneView.resources.facilities.power_devices import PowerDevices
@@ -239,6 +247,104 @@ class OneViewClientTest(unittest.TestCase):
         self.assertEqual(200, oneview_client.connection._apiVersion)
         self.assertEqual(200, oneview_client.api_version)
 
+    @mock.patch.object(connection, 'login')
+    @mock.patch.object(connection, 'set_connection_pool')
+    def test_create_oneview_client_with_connection_pool(self, mock_set_connection_pool, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {"userName": "administrator", "password": ""},
+                  "connection_pool": {"max_size": 20, "idle_timeout": 30}}
+
+        OneViewClient(config)
+
+        mock_set_connection_pool.assert_called_once_with(max_size=20, idle_timeout=30)
+
+    @mock.patch.object(connection, 'login')
+    @mock.patch.object(connection, 'set_pagination')
+    def test_create_oneview_client_with_pagination(self, mock_set_pagination, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {"userName": "administrator", "password": ""},
+                  "pagination": {"page_size": 500, "max_workers": 8}}
+
+        OneViewClient(config)
+
+        mock_set_pagination.assert_called_once_with(page_size=500, max_workers=8)
+
+    @mock.patch.object(ResourceClient, 'get_many')
+    def test_get_many_should_accept_uris_of_any_collection(self, mock_get_many):
+        uris = ['/rest/server-profiles/1', '/rest/server-hardware/1']
+        mock_get_many.return_value = {}
+
+        self._oneview.get_many(uris)
+
+        mock_get_many.assert_called_once_with(uris, skip_errors=False)
+
+    @mock.patch.object(connection, 'login')
+    @mock.patch.object(connection, 'enable_response_cache')
+    def test_create_oneview_client_with_response_cache(self, mock_enable_response_cache, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {"userName": "administrator", "password": ""},
+                  "response_cache": {"max_size": 100, "resource_ttls": {"/rest/tasks": 0}}}
+
+        OneViewClient(config)
+
+        mock_enable_response_cache.assert_called_once_with(max_size=100, resource_ttls={"/rest/tasks": 0})
+
+    @mock.patch.object(connection, 'login')
+    @mock.patch.object(connection, 'enable_rate_limiter')
+    def test_create_oneview_client_with_rate_limiter(self, mock_enable_rate_limiter, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {"userName": "administrator", "password": ""},
+                  "rate_limiter": {"rate": 20, "max_in_flight": 8}}
+
+        OneViewClient(config)
+
+        mock_enable_rate_limiter.assert_called_once_with(rate=20, max_in_flight=8)
+
+    @mock.patch.object(connection, 'login')
+    @mock.patch.object(connection, 'enable_compression')
+    def test_create_oneview_client_with_compression(self, mock_enable_compression, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {"userName": "administrator", "password": ""},
+                  "compression": True}
+
+        OneViewClient(config)
+
+        mock_enable_compression.assert_called_once_with()
+
+    @mock.patch.object(connection, 'login')
+    def test_create_oneview_client_with_inventory_snapshots(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {"userName": "administrator", "password": ""},
+                  "inventory_snapshots": {"/rest/server-hardware": {"indexes": ["mpHostInfo"], "max_age": 600,
+                                                                    "unknown": 1},
+                                          "/rest/enclosures": {}}}
+
+        oneview_client = OneViewClient(config)
+
+        snapshot = oneview_client.connection.get_inventory_snapshot("/rest/server-hardware")
+        self.assertTrue(snapshot.is_indexed("mpHostInfo"))
+        self.assertEqual(snapshot.max_age, 600)
+        self.assertTrue(oneview_client.connection.get_inventory_snapshot("/rest/enclosures").is_indexed("name"))
+
+    @mock.patch.object(connection, 'login')
+    def test_create_oneview_client_with_retry_policy(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {"userName": "administrator", "password": ""},
+                  "retry_policy": {"max_attempts": 5, "max_backoff": 10, "unknown": 1}}
+
+        oneview_client = OneViewClient(config)
+
+        policy = oneview_client.connection.get_retry_policy()
+        self.assertEqual(policy.max_attempts, 5)
+        self.assertEqual(policy.max_backoff, 10)
+
+    @mock.patch.object(connection, 'login')
+    @mock.patch.object(connection, 'enable_response_cache')
+    def test_create_oneview_client_without_response_cache(self, mock_enable_response_cache, mock_login):
+        OneViewClient({"ip": "172.16.102.59", "credentials": {"userName": "administrator", "password": ""}})
+
+        mock_enable_response_cache.assert_not_called()
+
     @mock.patch.object(connection, 'login')
     @mock.patch.object(connection, 'set_proxy')
     @mock.patch.dict('os.environ', OS_ENVIRON_CONFIG_MINIMAL)
@@ -422,6 +528,18 @@ class OneViewClientTest(unittest.TestCase):
         tasks = self._oneview.tasks
         self.assertEqual(tasks, self._oneview.tasks)
 
+    def test_lazy_loading_task_watcher(self):
+        task_watcher = self._oneview.task_watcher
+        self.assertIs(task_watcher, self._oneview.task_watcher)
+
+    def test_lazy_loading_state_change_consumer(self):
+        state_change_consumer = self._oneview.state_change_consumer
+        self.assertIs(state_change_consumer, self._oneview.state_change_consumer)
+
+    def test_lazy_loading_utilization_aggregator(self):
+        utilization_aggregator = self._oneview.utilization_aggregator
+        self.assertIs(utilization_aggregator, self._oneview.utilization_aggregator)
+
     def test_lazy_loading_connection_templates(self):
         connection_templates = self._oneview.connection_templates
         self.assertEqual(connection_templates, self._oneview.connection_templates)
@@ -941,3 +1059,54 @@ class OneViewClientTest(unittest.TestCase):
     def test_lazy_loading_appliance_version_information(self):
         versions = self._oneview.versions
         self.assertEqual(versions, self._oneview.versions)
+
+    def test_get_resource_class_should_import_the_class_module(self):
+        self.assertIs(get_resource_class('FcNetworks'), FcNetworks)
+        self.assertIn('hpOneView.resources.networking.fc_networks', sys.modules)
+
+    def test_resource_classes_should_still_be_importable_from_the_module(self):
+        from hpOneView.oneview_client import Racks as OneViewClientRacks
+
+        self.assertIs(OneViewClientRacks, Racks)
+
+    def test_lazy_exports_module_should_stand_in_for_the_module(self):
+        module = sys.modules['hpOneView.oneview_client']
+        lazy_module = oneview_client._LazyExportsModule(module)
+
+        with mock.patch.dict(sys.modules, {'hpOneView.oneview_client': lazy_module}):
+            from hpOneView.oneview_client import FcNetworks as LazyFcNetworks, OneViewClient as LazyOneViewClient
+
+            with mock.patch('hpOneView.oneview_client.ONEVIEW_CLIENT_INVALID_PROXY', 'patched'):
+                self.assertEqual(module.ONEVIEW_CLIENT_INVALID_PROXY, 'patched')
+
+        self.assertIs(LazyFcNetworks, FcNetworks)
+        self.assertIs(LazyOneViewClient, OneViewClient)
+        self.assertEqual(lazy_module.__file__, module.__file__)
+        self.assertRaises(AttributeError, getattr, lazy_module, 'Unknown')
+
+
+class OneViewClientImportTest(unittest.TestCase):
+    # Runs in a new interpreter, where no resource module was imported yet
+    IMPORT_SCRIPT = """
+import json, sys
+import hpOneView.oneview_client
+imported = sorted(name for name in sys.modules if name.startswith('hpOneView.'))
+shims = sorted(name for name in sys.modules if name.split('.')[0] in ('future', 'past'))
+print(json.dumps(dict(imported=imported, shims=shims)))
+"""
+
+    def __run_import_script(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(hpOneView.__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        output = subprocess.check_output([sys.executable, '-c', self.IMPORT_SCRIPT], env=env)
+        return json.loads(output.decode('utf-8'))
+
+    def test_import_should_not_import_the_resource_modules(self):
+        result = self.__run_import_script()
+
+        self.assertFalse(set(RESOURCE_MODULES.values()) & set(result['imported']))
+        self.assertFalse([name for name in result['imported'] if name.startswith('hpOneView.resources.')])
+
+    @unittest.skipIf(sys.version_info < (3,), 'the future shims are needed on Python 2')
+    def test_modules_should_not_load_the_future_shims_on_python_3(self):
+        self.assertEqual(self.__run_import_script()['shims'], [])